@@ -1,4 +1,7 @@
-from flask import jsonify, request, current_app
+import json
+from typing import Optional
+
+from flask import Response, jsonify, request, current_app, stream_with_context
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine, text
 from datetime import datetime, timezone, timedelta
@@ -180,8 +183,18 @@ def optimize_strategy():
             "rsi_period": [10, 14, 20],
             "overbought": [70, 75, 80],
             "oversold": [20, 25, 30]
-        }
+        },
+        "max_workers": 4,
+        "patience": 50,
+        "stream": false
     }
+
+    Combinations are evaluated on a process pool; max_workers is capped by the
+    server (CPU count, BACKTEST_MAX_WORKERS) and the grid by
+    BACKTEST_MAX_COMBINATIONS (400 when exceeded). `patience` stops the search
+    after that many evaluations without a new best. With "stream": true the
+    response is NDJSON: one progress line per evaluated combination (with the
+    running best) and a final line with "done": true.
     """
     try:
         data = request.get_json()
@@ -199,6 +212,18 @@ def optimize_strategy():
         start_date_str = data['start_date']
         end_date_str = data['end_date']
         parameter_ranges = data['parameter_ranges']
+        patience = data.get('patience')
+
+        if not isinstance(parameter_ranges, dict) or not all(
+            isinstance(values, list) and values for values in parameter_ranges.values()
+        ):
+            return jsonify({'error': 'parameter_ranges must map parameter names to non-empty lists'}), 400
+
+        try:
+            max_workers = _positive_int(data, 'max_workers')
+            backtesting_engine.grid_size(parameter_ranges)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
         # Parse dates
         try:
@@ -212,13 +237,33 @@ def optimize_strategy():
         if not strategy_class:
             return jsonify({'error': f'Unknown strategy: {strategy_name}'}), 400
 
+        if data.get('stream'):
+            updates = backtesting_engine.iter_optimize_strategy(
+                strategy_class=strategy_class,
+                symbols=symbols,
+                start_date=start_date,
+                end_date=end_date,
+                parameter_ranges=parameter_ranges,
+                max_workers=max_workers,
+                patience=patience
+            )
+
+            def generate():
+                for update in updates:
+                    update.pop('symbol_data', None)
+                    yield json.dumps(update) + '\n'
+
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
         # Run optimization
         optimization_result = backtesting_engine.optimize_strategy(
             strategy_class=strategy_class,
             symbols=symbols,
             start_date=start_date,
             end_date=end_date,
-            parameter_ranges=parameter_ranges
+            parameter_ranges=parameter_ranges,
+            max_workers=max_workers,
+            patience=patience
         )
 
         best_result = optimization_result['best_result']
@@ -228,6 +273,9 @@ def optimize_strategy():
             'optimization_result': {
                 'best_parameters': optimization_result['best_parameters'],
                 'best_score': optimization_result['best_score'],
+                'evaluated': optimization_result['evaluated'],
+                'total_combinations': optimization_result['total_combinations'],
+                'stopped_early': optimization_result['stopped_early'],
                 'performance': {
                     'total_return': float(best_result.total_return),
                     'max_drawdown': float(best_result.max_drawdown),
@@ -245,6 +293,77 @@ def optimize_strategy():
         return jsonify({'error': 'Failed to optimize strategy'}), 500
 
 
+@api_bp.route('/backtest/walk-forward', methods=['POST'])
+def walk_forward_optimization():
+    """
+    Walk-forward optimization over rolling in-sample/out-of-sample windows.
+
+    Request body:
+    {
+        "strategy_name": "RSI_Strategy",
+        "symbols": ["AAPL", "MSFT"],
+        "start_date": "2020-01-01T00:00:00Z",
+        "end_date": "2023-12-31T23:59:59Z",
+        "parameter_ranges": {"rsi_period": [10, 14, 20], "oversold": [25, 30]},
+        "in_sample_days": 252,
+        "out_of_sample_days": 63,
+        "step_days": 63,
+        "anchored": false,
+        "max_workers": 4
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({'error': 'Request body required'}), 400
+
+        required_fields = ['strategy_name', 'symbols', 'start_date', 'end_date', 'parameter_ranges']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'error': f'{field} is required'}), 400
+
+        parameter_ranges = data['parameter_ranges']
+        if not isinstance(parameter_ranges, dict) or not all(
+            isinstance(values, list) and values for values in parameter_ranges.values()
+        ):
+            return jsonify({'error': 'parameter_ranges must map parameter names to non-empty lists'}), 400
+        max_workers = _positive_int(data, 'max_workers')
+
+        # Parse dates
+        try:
+            start_date = datetime.fromisoformat(data['start_date'].replace('Z', '+00:00'))
+            end_date = datetime.fromisoformat(data['end_date'].replace('Z', '+00:00'))
+        except ValueError as e:
+            return jsonify({'error': f'Invalid date format: {e}'}), 400
+
+        strategy_class = _get_strategy_class(data['strategy_name'])
+        if not strategy_class:
+            return jsonify({'error': f"Unknown strategy: {data['strategy_name']}"}), 400
+
+        result = backtesting_engine.walk_forward(
+            strategy_class=strategy_class,
+            symbols=data['symbols'],
+            start_date=start_date,
+            end_date=end_date,
+            parameter_ranges=parameter_ranges,
+            in_sample_days=data.get('in_sample_days', 252),
+            out_of_sample_days=data.get('out_of_sample_days', 63),
+            step_days=data.get('step_days'),
+            anchored=bool(data.get('anchored', False)),
+            max_workers=max_workers
+        )
+
+        return jsonify({'strategy_name': data['strategy_name'], 'walk_forward': result}), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        current_app.logger.error(f"Walk-forward optimization error: {e}")
+        return jsonify({'error': 'Failed to run walk-forward optimization'}), 500
+
+
 @api_bp.route('/backtest/monte-carlo', methods=['POST'])
 def monte_carlo_simulation():
     """
@@ -257,8 +376,17 @@ def monte_carlo_simulation():
         "symbols": ["AAPL", "MSFT"],
         "start_date": "2023-01-01T00:00:00Z",
         "end_date": "2023-12-31T23:59:59Z",
-        "num_simulations": 1000
+        "num_simulations": 1000,
+        "method": "block",
+        "block_size": null,
+        "seed": 42,
+        "max_workers": null
     }
+
+    method is one of bootstrap, block, trades (resampling the base run, fast
+    enough for 100k paths) or price_paths (re-runs the strategy on resampled
+    bars across worker processes). num_simulations is limited per method
+    (BACKTEST_MAX_SIMULATIONS, BACKTEST_MAX_PRICE_PATHS); larger requests get a 400.
     """
     try:
         data = request.get_json()
@@ -276,7 +404,10 @@ def monte_carlo_simulation():
         symbols = data['symbols']
         start_date_str = data['start_date']
         end_date_str = data['end_date']
-        num_simulations = data.get('num_simulations', 1000)
+        num_simulations = _positive_int(data, 'num_simulations', 1000)
+        block_size = _positive_int(data, 'block_size')
+        max_workers = _positive_int(data, 'max_workers')
+        method = data.get('method', 'block')
 
         # Parse dates
         try:
@@ -296,11 +427,18 @@ def monte_carlo_simulation():
             symbols=symbols,
             start_date=start_date,
             end_date=end_date,
-            num_simulations=num_simulations
+            num_simulations=num_simulations,
+            method=method,
+            block_size=block_size,
+            seed=data.get('seed'),
+            max_workers=max_workers
         )
 
         return jsonify(simulation_result), 200
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         current_app.logger.error(f"Monte Carlo simulation error: {e}")
         return jsonify({'error': 'Failed to run Monte Carlo simulation'}), 500
@@ -435,6 +573,16 @@ def save_backtest_result():
         return jsonify({'error': 'Failed to save backtest result'}), 500
 
 
+def _positive_int(data: dict, field: str, default: Optional[int] = None) -> Optional[int]:
+    """data[field] as a positive integer (default when absent); ValueError naming the field otherwise."""
+    value = data.get(field)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f'{field} must be a positive integer')
+    return value
+
+
 def _create_strategy(strategy_name: str, parameters: dict) -> Optional[TradingStrategy]:
     """Create strategy instance from name and parameters."""
     if strategy_name == 'RSI_Strategy':
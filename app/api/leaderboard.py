@@ -136,43 +136,32 @@ def get_user_position(user_id: str):
     Get a user's position in the leaderboard.
 
     Returns rank, percentile, and nearby traders.
+
+    Query parameters:
+    - timeframe: 'all', 'month', 'week', 'today' (default: 'all')
     """
     try:
-        # Get user's rankings
-        user_rankings = leaderboard_service.get_user_rankings(user_id)
-
-        # Get global leaderboard to find nearby traders
-        global_board = leaderboard_service.get_global_leaderboard(limit=100)
-
-        # Find user's position and nearby traders
-        user_position = None
-        nearby_traders = []
+        timeframe = request.args.get('timeframe', 'all')
 
-        for trader in global_board:
-            if trader['user_id'] == user_id:
-                user_position = trader['rank']
-                break
+        if timeframe not in ['all', 'month', 'week', 'today']:
+            return jsonify({'error': 'Invalid timeframe. Must be: all, month, week, or today'}), 400
 
-        if user_position:
-            # Get traders around the user's position
-            start_idx = max(0, user_position - 6)
-            end_idx = min(len(global_board), user_position + 5)
-            nearby_traders = global_board[start_idx:end_idx]
+        # Get user's rankings
+        user_rankings = leaderboard_service.get_user_rankings(user_id)
 
-            # Calculate percentile
-            total_traders = len(global_board)
-            percentile = ((total_traders - user_position + 1) / total_traders) * 100
-        else:
-            percentile = 0
+        # Rank, percentile and neighbours come from the rank index
+        position = leaderboard_service.get_user_position(user_id, timeframe=timeframe)
 
         return jsonify({
             'user_id': user_id,
-            'position': user_position,
-            'percentile': round(percentile, 1),
-            'nearby_traders': nearby_traders,
+            'position': position['position'],
+            'percentile': round(position['percentile'], 1),
+            'total_traders': position['total_traders'],
+            'nearby_traders': position['nearby_traders'],
             'rankings': user_rankings.get('rankings', {}),
             'stats': user_rankings.get('stats', {}),
-            'last_updated': leaderboard_service.get_leaderboard_stats().get('last_updated')
+            'timeframe': timeframe,
+            'last_updated': position['last_updated']
         }), 200
 
     except Exception as e:
@@ -172,7 +172,8 @@ def get_market_history(symbol: str):
     - period: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max (default: 1mo)
     - interval: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo (default: 1d)
 
-    Supported symbols: ^GSPC (S&P 500), ^IXIC (NASDAQ), ^DJI (Dow Jones), GC=F (Gold)
+    Any Yahoo Finance symbol, e.g. ^GSPC (S&P 500), ^IXIC (NASDAQ), ^DJI (Dow Jones), GC=F (Gold).
+    Bars are served from the local history store and backfilled incrementally.
 
     Returns data formatted for TradingView Lightweight Charts.
     """
@@ -273,6 +274,7 @@ def get_market_health():
                 'cache_size': len(market_data.price_cache),
                 'cache_expiry_count': len(market_data.cache_expiry)
             },
+            'rate_limits': market_data.rate_limiter.stats(),
             'last_checked': datetime.now(timezone.utc).isoformat(),
             'success': True
         }), 200
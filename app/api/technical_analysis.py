@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 
 from . import api_bp
 from app.technical_analysis import technical_analysis_engine
+from app.infrastructure.history_store import INTERVAL_SECONDS
 
 
 def get_db_session():
@@ -181,14 +182,10 @@ def get_support_resistance(symbol):
         lookback_periods = int(request.args.get('lookback_periods', 20))
         tolerance = float(request.args.get('tolerance', 0.02))
 
-        # Get price data
-        price_data = technical_analysis_engine._get_price_data(symbol)
-        if not price_data:
+        levels = technical_analysis_engine.get_support_resistance(symbol, lookback_periods, tolerance)
+        if levels is None:
             return jsonify({'error': f'No price data available for {symbol}'}), 404
 
-        from app.technical_analysis import ChartAnalysis
-        levels = ChartAnalysis.detect_support_resistance(price_data, lookback_periods, tolerance)
-
         result = {
             'symbol': symbol,
             'timestamp': datetime.now(timezone.utc).isoformat(),
@@ -217,26 +214,18 @@ def get_fibonacci_levels(symbol):
         symbol = symbol.upper()
         lookback_periods = int(request.args.get('lookback_periods', 20))
 
-        # Get price data
-        price_data = technical_analysis_engine._get_price_data(symbol)
-        if not price_data:
+        # High/low over the lookback period and the retracement levels between them
+        fibonacci = technical_analysis_engine.get_fibonacci_levels(symbol, lookback_periods)
+        if fibonacci is None:
             return jsonify({'error': f'No price data available for {symbol}'}), 404
 
-        # Find high and low in lookback period
-        recent_prices = price_data[-lookback_periods:]
-        high_price = max(p.high for p in recent_prices)
-        low_price = min(p.low for p in recent_prices)
-
-        from app.technical_analysis import TechnicalIndicators
-        fib_levels = TechnicalIndicators.fibonacci_retracement(high_price, low_price)
-
         result = {
             'symbol': symbol,
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'lookback_periods': lookback_periods,
-            'high_price': float(high_price),
-            'low_price': float(low_price),
-            'fibonacci_levels': {k: float(v) for k, v in fib_levels.items()}
+            'high_price': float(fibonacci['high_price']),
+            'low_price': float(fibonacci['low_price']),
+            'fibonacci_levels': {k: float(v) for k, v in fibonacci['levels'].items()}
         }
 
         return jsonify(result), 200
@@ -292,17 +281,22 @@ def get_trading_signals(symbol):
     Query parameters:
     - indicators: comma-separated list of indicators to analyze (optional)
     - min_strength: minimum signal strength (WEAK, MEDIUM, STRONG) (default: WEAK)
+    - timeframe: bar interval of the streaming indicators (default: 1d)
     """
     try:
         symbol = symbol.upper()
         indicators_param = request.args.get('indicators', '')
         indicators = indicators_param.split(',') if indicators_param else None
         min_strength = request.args.get('min_strength', 'WEAK').upper()
+        timeframe = request.args.get('timeframe', '1d')
+
+        if timeframe not in INTERVAL_SECONDS:
+            return jsonify({'error': f'Unsupported timeframe: {timeframe}'}), 400
 
         strength_levels = {'WEAK': 0, 'MEDIUM': 1, 'STRONG': 2}
         min_strength_level = strength_levels.get(min_strength, 0)
 
-        analysis = technical_analysis_engine.get_technical_analysis(symbol, indicators)
+        analysis = technical_analysis_engine.get_streaming_analysis(symbol, timeframe, indicators)
 
         if 'error' in analysis:
             return jsonify(analysis), 404
@@ -316,6 +310,7 @@ def get_trading_signals(symbol):
 
         result = {
             'symbol': symbol,
+            'timeframe': timeframe,
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'total_signals': len(analysis.get('signals', [])),
             'filtered_signals': len(filtered_signals),
@@ -324,6 +324,7 @@ def get_market_prices():
     - change_percent: Percentage change
     - source: Data source (yahoo, casablanca, mock)
     - last_updated: Timestamp of data
+    - age_seconds: Seconds since the price was fetched from its source
     """
     try:
         symbols_param = request.args.get("symbols", "")
@@ -370,6 +371,7 @@ def get_market_prices():
                     "change_percent": round(change_percent, 2),
                     "source": source,
                     "last_updated": now,
+                    "age_seconds": round(market_data.get_price_age(symbol) or 0.0, 1),
                     "currency": "MAD" if symbol.endswith(".MA") else "USD",
                 }
             else:
@@ -904,12 +906,74 @@ def create_bracket_order():
         session.close()
 
 
+def record_order_executions(session, executions):
+    """Mark triggered orders filled and insert their trade records."""
+    for execution in executions:
+        order_id = execution["order_id"]
+
+        # Update order status
+        session.execute(
+            text("""
+            UPDATE orders
+            SET status = :status, filled_quantity = :filled_quantity,
+                remaining_quantity = :remaining_quantity,
+                average_fill_price = :avg_price, updated_at = :updated_at
+            WHERE id = :order_id
+        """),
+            {
+                "order_id": order_id,
+                "status": "FILLED",
+                "filled_quantity": execution["fill_quantity"],
+                "remaining_quantity": 0,
+                "avg_price": execution["execution_price"],
+                "updated_at": datetime.now(timezone.utc),
+            },
+        )
+
+        # Create trade record
+        session.execute(
+            text("""
+            INSERT INTO trades (
+                id, challenge_id, order_id, symbol, side, quantity, price,
+                realized_pnl, executed_at, commission
+            ) VALUES (
+                :id, :challenge_id, :order_id, :symbol, :side, :quantity, :price,
+                :pnl, :executed_at, :commission
+            )
+        """),
+            {
+                "id": str(uuid4()),
+                "challenge_id": execution["challenge_id"],
+                "order_id": order_id,
+                "symbol": execution["symbol"],
+                "side": execution["side"],
+                "quantity": execution["quantity"],
+                "price": execution["execution_price"],
+                "pnl": 0.0,  # Will be calculated later
+                "executed_at": datetime.now(timezone.utc),
+                "commission": 0.0,
+            },
+        )
+
+    session.commit()
+
+
+def persist_order_fill(execution):
+    """ORDER_FILLED handler: record a fill published by the order monitor."""
+    session = get_db_session()
+    try:
+        record_order_executions(session, [execution])
+    finally:
+        session.close()
+
+
 @api_bp.route("/orders/monitor", methods=["POST"])
 def monitor_orders():
     """
     Monitor active orders and execute triggered orders.
 
-    This endpoint should be called periodically to check for order triggers.
+    Orders are normally triggered on price ticks by the order monitor; this
+    endpoint forces a sweep over every symbol with resting orders.
     """
     try:
         # Monitor all active orders
@@ -918,54 +982,7 @@ def monitor_orders():
         session = get_db_session()
 
         # Update triggered orders in database
-        for execution in triggered_orders:
-            order_id = execution["order_id"]
-
-            # Update order status
-            session.execute(
-                text("""
-                UPDATE orders
-                SET status = :status, filled_quantity = :filled_quantity,
-                    remaining_quantity = :remaining_quantity,
-                    average_fill_price = :avg_price, updated_at = :updated_at
-                WHERE id = :order_id
-            """),
-                {
-                    "order_id": order_id,
-                    "status": "FILLED",
-                    "filled_quantity": execution["fill_quantity"],
-                    "remaining_quantity": 0,
-                    "avg_price": execution["execution_price"],
-                    "updated_at": datetime.now(timezone.utc),
-                },
-            )
-
-            # Create trade record
-            session.execute(
-                text("""
-                INSERT INTO trades (
-                    id, challenge_id, order_id, symbol, side, quantity, price,
-                    realized_pnl, executed_at, commission
-                ) VALUES (
-                    :id, :challenge_id, :order_id, :symbol, :side, :quantity, :price,
-                    :pnl, :executed_at, :commission
-                )
-            """),
-                {
-                    "id": str(uuid.uuid4()),
-                    "challenge_id": execution["challenge_id"],
-                    "order_id": order_id,
-                    "symbol": execution["symbol"],
-                    "side": execution["side"],
-                    "quantity": execution["quantity"],
-                    "price": execution["execution_price"],
-                    "pnl": 0.0,  # Will be calculated later
-                    "executed_at": datetime.now(timezone.utc),
-                    "commission": 0.0,
-                },
-            )
-
-        session.commit()
+        record_order_executions(session, triggered_orders)
 
         return jsonify(
             {
@@ -4,23 +4,37 @@ Professional Backtesting Engine
 Features:
 - Historical data simulation
 - Strategy testing framework
+- Vectorized signal backtests for stateless strategies
 - Performance metrics calculation
 - Risk analysis
+- Parallel grid search with early stopping
 - Walk-forward optimization
-- Monte Carlo simulation
+- Monte Carlo simulation (bootstrap, block and price-path resampling)
 """
 
 from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple, Any, Callable
+from typing import Dict, List, Optional, Tuple, Any, Callable, Iterator
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+import bisect
+import itertools
+import logging
+import math
+import os
 import statistics
 import random
 import uuid
+from collections.abc import Sequence
 
-from app.technical_analysis import PriceData, TechnicalIndicators, ChartAnalysis
+import numpy as np
+
+from app.technical_analysis import PriceData, TechnicalIndicators, VectorIndicators, ChartAnalysis, IndicatorCache
 from app.market_data import market_data
 
+logger = logging.getLogger(__name__)
+
 
 class Trade:
     """Represents a backtested trade."""
@@ -240,8 +254,22 @@ class BacktestResult:
         return None
 
 
+def _present(values: np.ndarray) -> np.ndarray:
+    """Mask of defined, non-zero values - the array form of `if value` on the Decimal path."""
+    return ~np.isnan(values) & (values != 0)
+
+
 class TradingStrategy(ABC):
-    """Abstract base class for trading strategies."""
+    """
+    Abstract base class for trading strategies.
+
+    Strategies are driven bar by bar through the should_* callbacks. Strategies
+    whose rules depend only on the bar history can also set `vectorized` and
+    declare them as array expressions (indicator_columns/signal_columns); the
+    engine then evaluates the whole series in one pass.
+    """
+
+    vectorized = False
 
     def __init__(self, name: str, parameters: Dict[str, Any] = None):
         self.name = name
@@ -272,15 +300,36 @@ class TradingStrategy(ABC):
         # Default: 10% of portfolio per position
         return (portfolio_value * Decimal('0.1')) / entry_price
 
+    def indicator_columns(self, bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Indicator arrays over a symbol's full series (vectorized mode).
+
+        `bars` holds float64 open/high/low/close/volume columns; returned arrays
+        must have the same length and may only look backwards.
+        """
+        return {}
+
+    def signal_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Boolean enter_long/enter_short/exit_long/exit_short arrays (vectorized mode).
+
+        `columns` holds the bar columns plus indicator_columns(). Element i is the
+        answer the matching should_* callback would give on the first i + 1 bars;
+        missing keys mean "never".
+        """
+        raise NotImplementedError(f"{self.name} has no vectorized signals")
+
 
 class RSIStrategy(TradingStrategy):
     """RSI-based mean reversion strategy."""
 
+    vectorized = True
+
     def __init__(self, parameters: Dict[str, Any] = None):
         super().__init__("RSI_Strategy", parameters)
-        self.rsi_period = parameters.get('rsi_period', 14)
-        self.overbought_level = parameters.get('overbought', 70)
-        self.oversold_level = parameters.get('oversold', 30)
+        self.rsi_period = self.parameters.get('rsi_period', 14)
+        self.overbought_level = self.parameters.get('overbought', 70)
+        self.oversold_level = self.parameters.get('oversold', 30)
 
     def should_enter_long(self, symbol: str, price_data: List[PriceData], current_positions: Dict[str, Position]) -> bool:
         if symbol in current_positions:
@@ -326,15 +375,30 @@ class RSIStrategy(TradingStrategy):
 
         return False
 
+    def indicator_columns(self, bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        return {'rsi': VectorIndicators.rsi(bars['close'], self.rsi_period)}
+
+    def signal_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        rsi = columns['rsi']
+        present = _present(rsi)
+        return {
+            'enter_long': present & (rsi < self.oversold_level),
+            'enter_short': present & (rsi > self.overbought_level),
+            'exit_long': present & (rsi >= 50),
+            'exit_short': present & (rsi <= 50),
+        }
+
 
 class MACDStrategy(TradingStrategy):
     """MACD trend-following strategy."""
 
+    vectorized = True
+
     def __init__(self, parameters: Dict[str, Any] = None):
         super().__init__("MACD_Strategy", parameters)
-        self.fast_period = parameters.get('fast_period', 12)
-        self.slow_period = parameters.get('slow_period', 26)
-        self.signal_period = parameters.get('signal_period', 9)
+        self.fast_period = self.parameters.get('fast_period', 12)
+        self.slow_period = self.parameters.get('slow_period', 26)
+        self.signal_period = self.parameters.get('signal_period', 9)
 
     def should_enter_long(self, symbol: str, price_data: List[PriceData], current_positions: Dict[str, Position]) -> bool:
         if symbol in current_positions:
@@ -386,14 +450,37 @@ class MACDStrategy(TradingStrategy):
         # Exit on opposite MACD signal
         return self.should_enter_long(symbol, price_data, {})
 
+    def indicator_columns(self, bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        macd_line, signal_line, _ = VectorIndicators.macd(
+            bars['close'], self.fast_period, self.slow_period, self.signal_period
+        )
+        return {'macd': macd_line, 'macd_signal': signal_line}
+
+    def signal_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        # Undefined values count as 0, and the crossover compares against two bars back
+        macd_line = np.nan_to_num(columns['macd'], nan=0.0)
+        signal_line = np.nan_to_num(columns['macd_signal'], nan=0.0)
+        cross_up = np.zeros(len(macd_line), dtype=bool)
+        cross_down = np.zeros(len(macd_line), dtype=bool)
+        cross_up[2:] = (macd_line[:-2] <= signal_line[:-2]) & (macd_line[2:] > signal_line[2:])
+        cross_down[2:] = (macd_line[:-2] >= signal_line[:-2]) & (macd_line[2:] < signal_line[2:])
+        return {
+            'enter_long': cross_up,
+            'enter_short': cross_down,
+            'exit_long': cross_down,
+            'exit_short': cross_up,
+        }
+
 
 class MeanReversionStrategy(TradingStrategy):
     """Bollinger Bands mean reversion strategy."""
 
+    vectorized = True
+
     def __init__(self, parameters: Dict[str, Any] = None):
         super().__init__("Mean_Reversion_Strategy", parameters)
-        self.bb_period = parameters.get('bb_period', 20)
-        self.bb_std = parameters.get('bb_std', 2.0)
+        self.bb_period = self.parameters.get('bb_period', 20)
+        self.bb_std = self.parameters.get('bb_std', 2.0)
 
     def should_enter_long(self, symbol: str, price_data: List[PriceData], current_positions: Dict[str, Position]) -> bool:
         if symbol in current_positions:
@@ -453,13 +540,377 @@ class MeanReversionStrategy(TradingStrategy):
 
         return False
 
+    def indicator_columns(self, bars: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        sma, upper, lower = VectorIndicators.bollinger_bands(bars['close'], self.bb_period, self.bb_std)
+        return {'bb_middle': sma, 'bb_upper': upper, 'bb_lower': lower}
+
+    def signal_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        close = columns['close']
+        middle, upper, lower = columns['bb_middle'], columns['bb_upper'], columns['bb_lower']
+        return {
+            'enter_long': _present(lower) & (close <= lower),
+            'enter_short': _present(upper) & (close >= upper),
+            'exit_long': _present(middle) & (close >= middle),
+            'exit_short': _present(middle) & (close <= middle),
+        }
+
+
+class PriceWindow(Sequence):
+    """
+    Read-only view of a symbol's bars up to the current cursor.
+
+    Behaves like the list of PriceData a strategy used to receive, but shares the
+    underlying list instead of slicing it at every bar. Slices are views too.
+    """
+
+    __slots__ = ('_data', '_start', '_stop')
+
+    def __init__(self, data: List[PriceData], stop: int, start: int = 0):
+        self._data = data
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return PriceWindow(self._data, self._start + max(start, stop), self._start + start)
+            return [self._data[self._start + i] for i in range(start, stop, step)]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('PriceWindow index out of range')
+        return self._data[self._start + index]
+
+    def __iter__(self):
+        return itertools.islice(self._data, self._start, self._stop)
+
+
+class BacktestTimeline:
+    """
+    All symbols aligned onto one sorted timestamp index.
+
+    For every step of the index and every symbol it precomputes the bar at that
+    exact timestamp (if any) and a cursor: how many of the symbol's bars are at
+    or before it. Lookups during the simulation are then O(1).
+    """
+
+    def __init__(self, symbol_data: Dict[str, List[PriceData]], start_date: datetime, end_date: datetime):
+        self.symbol_data = symbol_data
+        self.timestamps = sorted({
+            p.timestamp for data in symbol_data.values() for p in data
+            if start_date <= p.timestamp <= end_date
+        })
+
+        self._bar_index: Dict[str, List[int]] = {}
+        self._cursor: Dict[str, List[int]] = {}
+        for symbol, data in symbol_data.items():
+            times = [p.timestamp for p in data]
+            cursors = [bisect.bisect_right(times, t) for t in self.timestamps]
+            self._cursor[symbol] = cursors
+            self._bar_index[symbol] = [
+                c - 1 if c and times[c - 1] == t else -1
+                for c, t in zip(cursors, self.timestamps)
+            ]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def bar_at(self, symbol: str, step: int) -> Optional[PriceData]:
+        """The symbol's bar at exactly this step's timestamp, or None."""
+        index = self._bar_index[symbol][step]
+        return self.symbol_data[symbol][index] if index >= 0 else None
+
+    def window(self, symbol: str, step: int) -> PriceWindow:
+        """The symbol's bars up to and including this step's timestamp."""
+        return PriceWindow(self.symbol_data[symbol], self._cursor[symbol][step])
+
+    def indices(self, symbol: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-step index arrays for vectorized lookups: the bar at each step (-1 if
+        none) and the last bar at or before it (-1 if none yet).
+        """
+        return (
+            np.asarray(self._bar_index[symbol], dtype=np.int64),
+            np.asarray(self._cursor[symbol], dtype=np.int64) - 1,
+        )
+
+
+def _strategy_key(strategy: TradingStrategy) -> Tuple[str, str]:
+    """Identity of a strategy configuration: its class and instance attributes."""
+    cls = type(strategy)
+    return f"{cls.__module__}.{cls.__qualname__}", repr(sorted(vars(strategy).items()))
+
+
+def _series_fingerprint(data: List[PriceData], length: int) -> Tuple:
+    """Cheap identity of the first `length` bars of a series."""
+    if not length:
+        return (0,)
+    return length, data[0].timestamp, data[length - 1].timestamp, data[length - 1].close, data[length // 2].close
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class SharedPriceData:
+    """
+    Bars for a set of symbols packed into one shared-memory block.
+
+    Worker processes attach by name and rebuild their PriceData lists once,
+    instead of receiving the bars pickled with every task. Rows are time
+    (microseconds since the epoch), open, high, low, close and volume.
+    """
+
+    def __init__(self, symbol_data: Dict[str, List[PriceData]]):
+        total = sum(len(data) for data in symbol_data.values())
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, 6 * total * 8))
+        self.total = total
+        # symbol -> (offset, length, tz-naive timestamps)
+        self.layout: Dict[str, Tuple[int, int, bool]] = {}
+
+        matrix = np.ndarray((6, total), dtype=np.float64, buffer=self._shm.buf)
+        offset = 0
+        for symbol, data in symbol_data.items():
+            end = offset + len(data)
+            matrix[0, offset:end] = [
+                (BacktestingEngine._as_utc(p.timestamp) - _EPOCH) // _MICROSECOND for p in data
+            ]
+            for row, field in enumerate(('open', 'high', 'low', 'close', 'volume'), start=1):
+                matrix[row, offset:end] = [float(getattr(p, field)) for p in data]
+            naive = bool(data) and data[0].timestamp.tzinfo is None
+            self.layout[symbol] = (offset, len(data), naive)
+            offset = end
+        del matrix  # release the buffer export so the block can be closed
+
+    def descriptor(self) -> Tuple[str, int, Dict[str, Tuple[int, int, bool]]]:
+        """What a worker needs to attach: block name, bar count and layout."""
+        return self._shm.name, self.total, self.layout
+
+    def close(self):
+        """Release and remove the block (owner side)."""
+        self._shm.close()
+        self._shm.unlink()
+
+    @staticmethod
+    def load(descriptor: Tuple[str, int, Dict[str, Tuple[int, int, bool]]]) -> Dict[str, List[PriceData]]:
+        """Attach to a block and rebuild the PriceData lists."""
+        name, total, layout = descriptor
+        shm = _attach_shared_memory(name)
+        try:
+            matrix = np.ndarray((6, total), dtype=np.float64, buffer=shm.buf)
+            symbol_data = {}
+            for symbol, (offset, length, naive) in layout.items():
+                tz = None if naive else timezone.utc
+                columns = matrix[:, offset:offset + length].tolist()
+                symbol_data[symbol] = [
+                    PriceData(
+                        timestamp=(_EPOCH + timedelta(microseconds=int(t))).replace(tzinfo=tz),
+                        open_price=Decimal(repr(o)),
+                        high_price=Decimal(repr(h)),
+                        low_price=Decimal(repr(l)),
+                        close_price=Decimal(repr(c)),
+                        volume=Decimal(repr(v))
+                    )
+                    for t, o, h, l, c, v in zip(*columns)
+                ]
+            del matrix
+        finally:
+            shm.close()
+        return symbol_data
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach without letting this process's resource tracker unlink the owner's block."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track flag
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+
+# Per-process state of backtest pool workers, set by _init_backtest_worker
+_worker_context: Dict[str, Any] = {}
+
+
+def _init_backtest_worker(descriptor, commission: Decimal, context: Dict[str, Any]):
+    """Pool initializer: attach the shared bars once per worker process."""
+    engine = BacktestingEngine()
+    engine.commission_per_trade = commission
+    _worker_context.clear()
+    _worker_context.update(context, engine=engine, symbol_data=SharedPriceData.load(descriptor))
+
+
+def _run_in_worker(task: Callable, *args):
+    return task(_worker_context, *args)
+
+
+def _evaluate_parameters(context: Dict[str, Any], index: int, parameters: Dict[str, Any]):
+    """Backtest one parameter combination; returns (index, parameters, score, performance)."""
+    result = context['engine'].run_backtest(
+        context['strategy_class'](parameters),
+        context['symbols'],
+        context['start_date'],
+        context['end_date'],
+        initial_balance=context['initial_balance'],
+        max_positions=context['max_positions'],
+        symbol_data=context['symbol_data']
+    )
+    # Score based on Sharpe ratio and total return
+    score = float(result.sharpe_ratio or 0) + float(result.total_return / 100)
+    return index, parameters, score, _performance_summary(result)
+
+
+def _walk_forward_window(
+    context: Dict[str, Any],
+    index: int,
+    window: Tuple[datetime, datetime, datetime, datetime],
+    known_in_sample: Dict[int, Tuple[float, Dict[str, Any]]],
+    known_out_of_sample: Dict[int, Dict[str, Any]]
+):
+    """
+    Optimize one walk-forward window in-sample and test the winner out-of-sample.
+
+    Results the caller already has cached are passed in and not recomputed.
+    Returns (index, in-sample results by combination, best combination, its
+    out-of-sample performance or None if it was known).
+    """
+    in_start, in_end, out_start, out_end = window
+    in_sample = {}
+    for combo, parameters in enumerate(context['combinations']):
+        if combo in known_in_sample:
+            continue
+        _, _, score, performance = _evaluate_parameters(
+            dict(context, start_date=in_start, end_date=in_end), combo, parameters
+        )
+        in_sample[combo] = (score, performance)
+
+    scores = {**known_in_sample, **in_sample}
+    best = max(sorted(scores), key=lambda combo: scores[combo][0]) if scores else None
+
+    out_of_sample = None
+    if best is not None and best not in known_out_of_sample:
+        _, _, _, out_of_sample = _evaluate_parameters(
+            dict(context, start_date=out_start, end_date=out_end), best, context['combinations'][best]
+        )
+    return index, in_sample, best, out_of_sample
+
+
+def _resampled_backtest(context: Dict[str, Any], index: int):
+    """Backtest one Monte Carlo path: every symbol's bars block-resampled with its own seed."""
+    rng = np.random.default_rng([context['seed'], index])
+    symbol_data = {
+        symbol: _resample_bars(data, rng, context['block_size'])
+        for symbol, data in context['symbol_data'].items()
+    }
+    result = context['engine'].run_backtest(
+        context['strategy'],
+        context['symbols'],
+        context['start_date'],
+        context['end_date'],
+        initial_balance=context['initial_balance'],
+        max_positions=context['max_positions'],
+        symbol_data=symbol_data
+    )
+    return index, _performance_summary(result)
+
+
+def _performance_summary(result: BacktestResult) -> Dict[str, Any]:
+    return {
+        'total_return': float(result.total_return),
+        'max_drawdown': float(result.max_drawdown),
+        'sharpe_ratio': float(result.sharpe_ratio or 0),
+        'win_rate': float(result.win_rate),
+        'total_trades': result.total_trades,
+    }
+
+
+def _block_indices(rng: np.random.Generator, paths: int, length: int, block_size: int) -> np.ndarray:
+    """
+    (paths, length) resampling indices built from circular blocks of consecutive
+    positions with random starts. block_size=1 is the plain bootstrap.
+    """
+    blocks = -(-length // block_size)
+    starts = rng.integers(0, length, size=(paths, blocks, 1))
+    return ((starts + np.arange(block_size)) % length).reshape(paths, -1)[:, :length]
+
+
+def _resample_bars(data: List[PriceData], rng: np.random.Generator, block_size: int) -> List[PriceData]:
+    """
+    A synthetic series with the same timestamps and first close, built from
+    block-resampled log returns. Each bar keeps the open/high/low shape of the
+    bar its return was drawn from.
+    """
+    if len(data) < 2:
+        return data
+
+    closes = np.array([float(p.close) for p in data])
+    shape = np.array([[float(p.open), float(p.high), float(p.low)] for p in data]) / closes[:, None]
+    source = _block_indices(rng, 1, len(data) - 1, block_size)[0] + 1
+    log_returns = np.log(closes[source] / closes[source - 1])
+
+    new_closes = closes[0] * np.exp(np.concatenate(([0.0], np.cumsum(log_returns))))
+    new_shape = np.vstack((shape[:1], shape[source]))
+    ohl = new_shape * new_closes[:, None]
+    return [
+        PriceData(
+            timestamp=p.timestamp,
+            open_price=Decimal(repr(o)),
+            high_price=Decimal(repr(h)),
+            low_price=Decimal(repr(l)),
+            close_price=Decimal(repr(c)),
+            volume=p.volume
+        )
+        for p, (o, h, l), c in zip(data, ohl.tolist(), new_closes.tolist())
+    ]
+
+
+def _path_metrics(equity: np.ndarray, periods_per_year: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Total return %, max drawdown % and annualized Sharpe ratio for each row of
+    an equity matrix whose first column is the initial balance.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_return = (equity[:, -1] / equity[:, 0] - 1) * 100
+        peaks = np.maximum.accumulate(equity, axis=1)
+        max_drawdown = np.nanmax((peaks - equity) / peaks, axis=1) * 100
+
+        returns = equity[:, 1:] / equity[:, :-1] - 1
+        if returns.shape[1] > 1:
+            std = returns.std(axis=1, ddof=1)
+            sharpe = returns.mean(axis=1) * periods_per_year / (std * np.sqrt(periods_per_year))
+            sharpe = np.where(std > 0, sharpe, 0.0)
+        else:
+            sharpe = np.zeros(len(equity))
+    return total_return, max_drawdown, np.nan_to_num(sharpe)
+
 
 class BacktestingEngine:
     """Professional backtesting engine."""
 
+    MONTE_CARLO_METHODS = ('bootstrap', 'block', 'trades', 'price_paths')
+    # Upper bound on simulated values held in memory at once
+    MONTE_CARLO_CHUNK_VALUES = 4_000_000
+    # Ceilings on request-controlled work: worker processes and grid search size
+    MAX_WORKERS = int(os.getenv('BACKTEST_MAX_WORKERS', os.cpu_count() or 1))
+    MAX_GRID_COMBINATIONS = int(os.getenv('BACKTEST_MAX_COMBINATIONS', 10_000))
+    # Monte Carlo paths per request; price_paths re-runs the strategy per path, so it gets less
+    MAX_SIMULATIONS = int(os.getenv('BACKTEST_MAX_SIMULATIONS', 200_000))
+    MAX_PRICE_PATH_SIMULATIONS = int(os.getenv('BACKTEST_MAX_PRICE_PATHS', 1_000))
+
     def __init__(self):
         self.strategies: Dict[str, TradingStrategy] = {}
         self.commission_per_trade = Decimal('0.001')  # 0.1% per trade
+        # Backtest on real bars from the history store when available
+        self.use_stored_history = True
+        # Vectorized signal columns, and per-window results for walk-forward studies
+        self.indicator_cache = IndicatorCache(max_entries=1024, max_bytes=256 * 1024 * 1024)
+        self.result_cache = IndicatorCache(max_entries=100_000)
 
     def register_strategy(self, strategy: TradingStrategy):
         """Register a trading strategy."""
@@ -472,7 +923,9 @@ class BacktestingEngine:
         start_date: datetime,
         end_date: datetime,
         initial_balance: Decimal = Decimal('100000'),
-        max_positions: int = 5
+        max_positions: int = 5,
+        mode: str = 'auto',
+        symbol_data: Optional[Dict[str, List[PriceData]]] = None
     ) -> BacktestResult:
         """
         Run a backtest for a strategy.
@@ -484,7 +937,16 @@ class BacktestingEngine:
             end_date: End date for backtest
             initial_balance: Starting balance
             max_positions: Maximum concurrent positions
+            mode: 'bar' drives the should_* callbacks at every bar, 'vectorized'
+                evaluates the strategy's signal columns over the whole series,
+                'auto' picks vectorized when the strategy supports it
+            symbol_data: Preloaded bars per symbol (loaded when omitted)
         """
+        if mode not in ('auto', 'bar', 'vectorized'):
+            raise ValueError(f"Unknown backtest mode: {mode}")
+        if mode == 'vectorized' and not strategy.vectorized:
+            raise ValueError(f"Strategy {strategy.name} does not support vectorized backtests")
+
         result = BacktestResult(strategy.name)
         result.initial_balance = initial_balance
         result.final_balance = initial_balance
@@ -492,37 +954,32 @@ class BacktestingEngine:
         result.end_date = end_date
 
         current_balance = initial_balance
+        total_equity = initial_balance
         positions: Dict[str, Position] = {}
         equity_curve = [(start_date, initial_balance)]
 
-        # Generate synthetic historical data for each symbol
-        symbol_data = {}
-        for symbol in symbols:
-            symbol_data[symbol] = self._generate_historical_data(symbol, start_date, end_date)
+        # Load historical data for each symbol
+        if symbol_data is None:
+            symbol_data = self._load_symbol_data(symbols, start_date, end_date)
 
-        # Sort all timestamps
-        all_timestamps = set()
-        for data in symbol_data.values():
-            all_timestamps.update(p.timestamp for p in data)
-        sorted_timestamps = sorted(all_timestamps)
+        timeline = BacktestTimeline(symbol_data, start_date, end_date)
 
-        for current_time in sorted_timestamps:
-            if current_time < start_date or current_time > end_date:
-                continue
+        if mode != 'bar' and strategy.vectorized:
+            return self._run_vectorized(strategy, symbols, timeline, result, max_positions)
 
+        for step, current_time in enumerate(timeline.timestamps):
             # Update positions with current prices
             for symbol, position in positions.items():
-                price_data = symbol_data[symbol]
-                current_price = self._get_price_at_time(price_data, current_time)
-                if current_price:
-                    position.update_price(current_price)
+                bar = timeline.bar_at(symbol, step)
+                if bar is not None:
+                    position.update_price(bar.close)
 
             # Check exit conditions
             positions_to_close = []
             for symbol, position in positions.items():
-                price_data = symbol_data[symbol][:symbol_data[symbol].index(
-                    next(p for p in symbol_data[symbol] if p.timestamp >= current_time)
-                ) + 1]
+                price_data = timeline.window(symbol, step)
+                if not price_data:
+                    continue
 
                 if position.side == 'BUY' and strategy.should_exit_long(symbol, position, price_data):
                     positions_to_close.append((symbol, position))
@@ -551,37 +1008,36 @@ class BacktestingEngine:
                 current_balance += trade.pnl if trade.pnl else Decimal('0')
                 del positions[symbol]
 
-            # Check entry conditions if we have capacity
-            if len(positions) < max_positions:
-                for symbol in symbols:
-                    if symbol in positions:
+            # Check entry conditions while we have capacity
+            for symbol in symbols:
+                if len(positions) >= max_positions:
+                    break
+                if symbol in positions:
+                    continue
+
+                bar = timeline.bar_at(symbol, step)
+                if bar is None:
+                    continue
+                current_price = bar.close
+                price_data = timeline.window(symbol, step)
+
+                # Check for long entry
+                if strategy.should_enter_long(symbol, price_data, positions):
+                    position_size = strategy.calculate_position_size(symbol, current_price, current_balance)
+                    if position_size > 0 and position_size * current_price <= current_balance:
+                        position = Position(symbol, 'BUY', position_size, current_price, current_time)
+                        positions[symbol] = position
                         continue
 
-                    price_data = symbol_data[symbol][:symbol_data[symbol].index(
-                        next(p for p in symbol_data[symbol] if p.timestamp >= current_time)
-                    ) + 1]
-
-                    current_price = self._get_price_at_time(price_data, current_time)
-                    if not current_price:
-                        continue
-
-                    # Check for long entry
-                    if strategy.should_enter_long(symbol, price_data, positions):
-                        position_size = strategy.calculate_position_size(symbol, current_price, current_balance)
-                        if position_size > 0 and position_size * current_price <= current_balance:
-                            position = Position(symbol, 'BUY', position_size, current_price, current_time)
-                            positions[symbol] = position
-                            continue
-
-                    # Check for short entry
-                    if strategy.should_enter_short(symbol, price_data, positions):
-                        position_size = strategy.calculate_position_size(symbol, current_price, current_balance)
-                        if position_size > 0:  # Short selling - no balance requirement
-                            position = Position(symbol, 'SELL', position_size, current_price, current_time)
-                            positions[symbol] = position
+                # Check for short entry
+                if strategy.should_enter_short(symbol, price_data, positions):
+                    position_size = strategy.calculate_position_size(symbol, current_price, current_balance)
+                    if position_size > 0:  # Short selling - no balance requirement
+                        position = Position(symbol, 'SELL', position_size, current_price, current_time)
+                        positions[symbol] = position
 
             # Update equity curve
-            unrealized_pnl = sum(p.unrealized_pnl for p in positions.values())
+            unrealized_pnl = sum((p.unrealized_pnl for p in positions.values()), Decimal('0'))
             total_equity = current_balance + unrealized_pnl
             equity_curve.append((current_time, total_equity))
 
@@ -590,6 +1046,172 @@ class BacktestingEngine:
 
         return result
 
+    def _run_vectorized(
+        self,
+        strategy: TradingStrategy,
+        symbols: List[str],
+        timeline: BacktestTimeline,
+        result: BacktestResult,
+        max_positions: int
+    ) -> BacktestResult:
+        """
+        Vectorized simulation with the same fill rules as the bar loop.
+
+        Signals are computed once per symbol over its full series and mapped onto
+        the timeline. Only steps where some signal fires are visited to apply
+        fills, because position limits and sizing depend on the running balance;
+        the equity curve is then rebuilt from the trades with array operations.
+        """
+        steps = len(timeline)
+        signals = {symbol: self._signals_on_timeline(strategy, timeline, symbol) for symbol in symbols}
+
+        active = np.zeros(steps, dtype=bool)
+        for columns in signals.values():
+            for name in ('enter_long', 'enter_short', 'exit_long', 'exit_short'):
+                active |= columns[name]
+        flags = {
+            symbol: {name: values.tolist() for name, values in columns.items() if values.dtype == bool}
+            for symbol, columns in signals.items()
+        }
+
+        current_balance = result.initial_balance
+        positions: Dict[str, Position] = {}
+        entry_steps: Dict[str, int] = {}
+        # (symbol, position, entry step, exit step) for every position ever held
+        holdings: List[Tuple[str, Position, int, int]] = []
+        exits: List[Tuple[int, Decimal]] = []
+
+        for step in np.flatnonzero(active).tolist():
+            current_time = timeline.timestamps[step]
+
+            for symbol in [s for s, p in positions.items()
+                           if flags[s]['exit_long' if p.side == 'BUY' else 'exit_short'][step]]:
+                position = positions.pop(symbol)
+                trade = Trade(
+                    symbol=symbol,
+                    side=position.side,
+                    quantity=position.quantity,
+                    entry_price=position.entry_price,
+                    entry_time=position.entry_time,
+                    exit_price=timeline.symbol_data[symbol][signals[symbol]['last'][step]].close,
+                    exit_time=current_time,
+                    commission=self.commission_per_trade,
+                    strategy_name=strategy.name
+                )
+                result.trades.append(trade)
+                pnl = trade.pnl if trade.pnl else Decimal('0')
+                current_balance += pnl
+                holdings.append((symbol, position, entry_steps.pop(symbol), step))
+                exits.append((step, pnl))
+
+            for symbol in symbols:
+                if len(positions) >= max_positions:
+                    break
+                if symbol in positions:
+                    continue
+
+                enter_long = flags[symbol]['enter_long'][step]
+                enter_short = flags[symbol]['enter_short'][step]
+                if not (enter_long or enter_short):
+                    continue
+                current_price = timeline.symbol_data[symbol][signals[symbol]['bar'][step]].close
+
+                if enter_long:
+                    position_size = strategy.calculate_position_size(symbol, current_price, current_balance)
+                    if position_size > 0 and position_size * current_price <= current_balance:
+                        positions[symbol] = Position(symbol, 'BUY', position_size, current_price, current_time)
+                        entry_steps[symbol] = step
+                        continue
+
+                if enter_short:
+                    position_size = strategy.calculate_position_size(symbol, current_price, current_balance)
+                    if position_size > 0:  # Short selling - no balance requirement
+                        positions[symbol] = Position(symbol, 'SELL', position_size, current_price, current_time)
+                        entry_steps[symbol] = step
+
+        holdings.extend((symbol, position, entry_steps[symbol], steps) for symbol, position in positions.items())
+
+        # Equity = initial balance + realized P&L so far + mark-to-market of open positions
+        realized = np.zeros(steps)
+        for step, pnl in exits:
+            realized[step] += float(pnl)
+        equity = float(result.initial_balance) + np.cumsum(realized)
+        for symbol, position, entry_step, exit_step in holdings:
+            direction = 1.0 if position.side == 'BUY' else -1.0
+            closes = signals[symbol]['close'][entry_step:exit_step]
+            equity[entry_step:exit_step] += direction * float(position.quantity) * (closes - float(position.entry_price))
+
+        result.equity_curve = [(result.start_date, result.initial_balance)] + [
+            (current_time, Decimal(repr(value))) for current_time, value in zip(timeline.timestamps, equity.tolist())
+        ]
+        result.final_balance = result.equity_curve[-1][1]
+        return result
+
+    def _signals_on_timeline(self, strategy: TradingStrategy, timeline: BacktestTimeline, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        A symbol's signal columns mapped onto the timeline.
+
+        Entries need a bar at the step itself; exits are evaluated on the last
+        known bar, like the bar loop does on days the symbol has no bar. Columns
+        are memoized per (strategy, parameters, series): indicators only look
+        back, so every window over the same bars reuses them.
+        """
+        data = timeline.symbol_data[symbol]
+        bar, last = timeline.indices(symbol)
+        mapped = {'bar': bar, 'last': last}
+        if not data:
+            for name in ('enter_long', 'enter_short', 'exit_long', 'exit_short'):
+                mapped[name] = np.zeros(len(timeline), dtype=bool)
+            mapped['close'] = np.full(len(timeline), np.nan)
+            return mapped
+
+        def compute():
+            bars = {
+                'open': np.array([float(p.open) for p in data]),
+                'high': np.array([float(p.high) for p in data]),
+                'low': np.array([float(p.low) for p in data]),
+                'close': np.array([float(p.close) for p in data]),
+                'volume': np.array([float(p.volume) for p in data]),
+            }
+            columns = dict(bars)
+            columns.update(strategy.indicator_columns(bars))
+            conditions = strategy.signal_columns(columns)
+            conditions['close'] = bars['close']
+            return conditions
+
+        conditions = self.indicator_cache.get_or_compute(
+            (_strategy_key(strategy), symbol, _series_fingerprint(data, len(data))), compute
+        )
+
+        never = np.zeros(len(data), dtype=bool)
+        for name, index in (('enter_long', bar), ('enter_short', bar), ('exit_long', last), ('exit_short', last)):
+            values = np.asarray(conditions.get(name, never), dtype=bool)
+            mapped[name] = (index >= 0) & values[index]
+        mapped['close'] = np.where(last >= 0, conditions['close'][last], np.nan)
+        return mapped
+
+    def _load_symbol_data(self, symbols: List[str], start_date: datetime, end_date: datetime) -> Dict[str, List[PriceData]]:
+        """Historical bars for each symbol."""
+        return {symbol: self._load_historical_data(symbol, start_date, end_date) for symbol in symbols}
+
+    def _load_historical_data(self, symbol: str, start_date: datetime, end_date: datetime) -> List[PriceData]:
+        """Load daily bars from the local history store, falling back to synthetic data."""
+        if self.use_stored_history:
+            bars = market_data.get_bars(
+                symbol, '1d',
+                start=int(self._as_utc(start_date).timestamp()),
+                end=int(self._as_utc(end_date).timestamp())
+            )
+            if len(bars):
+                return PriceData.from_bars(bars, naive=start_date.tzinfo is None)
+
+        return self._generate_historical_data(symbol, start_date, end_date)
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        """Treat naive datetimes as UTC."""
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
     def _generate_historical_data(self, symbol: str, start_date: datetime, end_date: datetime) -> List[PriceData]:
         """Generate synthetic historical price data."""
         # This is a simplified version - in production, you'd load real historical data
@@ -625,12 +1247,68 @@ class BacktestingEngine:
 
         return data
 
-    def _get_price_at_time(self, price_data: List[PriceData], timestamp: datetime) -> Optional[Decimal]:
-        """Get price at specific timestamp."""
-        for price in price_data:
-            if price.timestamp == timestamp:
-                return price.close
-        return None
+    @classmethod
+    def _worker_count(cls, max_workers: Optional[int], tasks: int) -> int:
+        """
+        Worker processes to use: explicit, BACKTEST_WORKERS, or the CPU count.
+
+        Capped by the task count, the CPU count and MAX_WORKERS whatever the caller asks for.
+        """
+        limit = min(os.cpu_count() or 1, cls.MAX_WORKERS)
+        if max_workers is None:
+            max_workers = int(os.getenv('BACKTEST_WORKERS', limit))
+        return max(1, min(max_workers, limit, tasks))
+
+    def grid_size(self, parameter_ranges: Dict[str, List[Any]]) -> int:
+        """Number of parameter combinations; ValueError past MAX_GRID_COMBINATIONS."""
+        size = math.prod(len(values) for values in parameter_ranges.values())
+        if size > self.MAX_GRID_COMBINATIONS:
+            raise ValueError(
+                f"parameter_ranges has {size} combinations; at most {self.MAX_GRID_COMBINATIONS} are allowed"
+            )
+        return size
+
+    def _parameter_grid(self, parameter_ranges: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """Every parameter combination, in grid order."""
+        self.grid_size(parameter_ranges)
+        param_names = list(parameter_ranges.keys())
+        return [dict(zip(param_names, values)) for values in itertools.product(*parameter_ranges.values())]
+
+    def _map_on_workers(
+        self,
+        task: Callable,
+        items: List[tuple],
+        context: Dict[str, Any],
+        max_workers: int
+    ) -> Iterator[Any]:
+        """
+        Run task(context, *item) for every item, yielding results as they complete.
+
+        With one worker everything runs in-process. Otherwise context['symbol_data']
+        goes into shared memory once and a process pool runs the tasks; closing the
+        iterator cancels whatever is still pending and releases the block. `task`
+        must be a module-level function so it can be sent to the workers.
+        """
+        if max_workers <= 1:
+            for item in items:
+                yield task(context, *item)
+            return
+
+        shared = SharedPriceData(context['symbol_data'])
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_backtest_worker,
+            initargs=(shared.descriptor(), self.commission_per_trade, {
+                key: value for key, value in context.items() if key not in ('engine', 'symbol_data')
+            })
+        )
+        try:
+            futures = [pool.submit(_run_in_worker, task, *item) for item in items]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            shared.close()
 
     def optimize_strategy(
         self,
@@ -638,7 +1316,10 @@ class BacktestingEngine:
         symbols: List[str],
         start_date: datetime,
         end_date: datetime,
-        parameter_ranges: Dict[str, List[Any]]
+        parameter_ranges: Dict[str, List[Any]],
+        max_workers: Optional[int] = None,
+        patience: Optional[int] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Optimize strategy parameters using grid search.
@@ -648,34 +1329,285 @@ class BacktestingEngine:
             symbols: Symbols to trade
             start_date, end_date: Backtest period
             parameter_ranges: Dict of parameter names to lists of values to test
+            max_workers: Worker processes (BACKTEST_WORKERS / CPU count by default)
+            patience: Stop after this many evaluations in a row without a new best
+            on_progress: Called with every progress update from iter_optimize_strategy
         """
+        final = None
+        for update in self.iter_optimize_strategy(
+            strategy_class, symbols, start_date, end_date, parameter_ranges,
+            max_workers=max_workers, patience=patience
+        ):
+            if on_progress:
+                on_progress(update)
+            final = update
+
         best_result = None
-        best_parameters = None
-        best_score = float('-inf')
+        if final['best_parameters'] is not None:
+            best_result = self.run_backtest(
+                strategy_class(final['best_parameters']), symbols, start_date, end_date,
+                symbol_data=final.pop('symbol_data')
+            )
+        final.pop('symbol_data', None)
 
-        # Generate all parameter combinations
-        import itertools
-        param_names = list(parameter_ranges.keys())
-        param_values = list(parameter_ranges.values())
+        return {
+            'best_parameters': final['best_parameters'],
+            'best_result': best_result,
+            'best_score': final['best_score'],
+            'evaluated': final['evaluated'],
+            'total_combinations': final['total'],
+            'stopped_early': final['stopped_early'],
+        }
+
+    def iter_optimize_strategy(
+        self,
+        strategy_class: type,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        parameter_ranges: Dict[str, List[Any]],
+        max_workers: Optional[int] = None,
+        patience: Optional[int] = None,
+        initial_balance: Decimal = Decimal('100000'),
+        max_positions: int = 5
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Grid search that yields a progress update after every evaluated combination.
+
+        Bars are loaded once. With more than one worker they are packed into shared
+        memory and the combinations are farmed out to a process pool; each task only
+        carries its parameters. Updates carry the running best, so callers can
+        stream partial results. The last update has done=True (and, for
+        optimize_strategy, the loaded bars under 'symbol_data').
+
+        Ties are broken by grid order, so without early stopping the result does not
+        depend on the number of workers.
+        """
+        combinations = self._parameter_grid(parameter_ranges)
+        symbol_data = self._load_symbol_data(symbols, start_date, end_date)
+        context = {
+            'engine': self,
+            'strategy_class': strategy_class,
+            'symbols': symbols,
+            'symbol_data': symbol_data,
+            'start_date': start_date,
+            'end_date': end_date,
+            'initial_balance': initial_balance,
+            'max_positions': max_positions,
+        }
 
-        for param_combo in itertools.product(*param_values):
-            parameters = dict(zip(param_names, param_combo))
+        max_workers = self._worker_count(max_workers, len(combinations))
+        best = {'index': None, 'parameters': None, 'score': float('-inf'), 'performance': None}
+        evaluated = 0
+        since_improvement = 0
+        stopped_early = False
 
-            strategy = strategy_class(parameters)
-            result = self.run_backtest(strategy, symbols, start_date, end_date)
+        evaluations = self._map_on_workers(
+            _evaluate_parameters, list(enumerate(combinations)), context, max_workers
+        )
+        try:
+            for index, parameters, score, performance in evaluations:
+                evaluated += 1
+                improved = best['index'] is None or score > best['score'] or (score == best['score'] and index < best['index'])
+                if improved:
+                    best = {'index': index, 'parameters': parameters, 'score': score, 'performance': performance}
+                    since_improvement = 0
+                else:
+                    since_improvement += 1
+
+                stopped_early = bool(patience) and since_improvement >= patience and evaluated < len(combinations)
+                yield {
+                    'done': False,
+                    'evaluated': evaluated,
+                    'total': len(combinations),
+                    'parameters': parameters,
+                    'score': score,
+                    'improved': improved,
+                    'best_parameters': best['parameters'],
+                    'best_score': best['score'],
+                    'best_performance': best['performance'],
+                }
+                if stopped_early:
+                    logger.info("Optimization stopped early", extra={
+                        'strategy': strategy_class.__name__, 'evaluated': evaluated, 'total': len(combinations),
+                    })
+                    break
+        finally:
+            evaluations.close()
+
+        yield {
+            'done': True,
+            'evaluated': evaluated,
+            'total': len(combinations),
+            'stopped_early': stopped_early,
+            'best_parameters': best['parameters'],
+            'best_score': best['score'],
+            'best_performance': best['performance'],
+            'symbol_data': symbol_data,
+        }
 
-            # Score based on Sharpe ratio and total return
-            score = float(result.sharpe_ratio or 0) + float(result.total_return / 100)
+    @staticmethod
+    def walk_forward_windows(
+        start_date: datetime,
+        end_date: datetime,
+        in_sample_days: int,
+        out_of_sample_days: int,
+        step_days: Optional[int] = None,
+        anchored: bool = False
+    ) -> List[Tuple[datetime, datetime, datetime, datetime]]:
+        """
+        Rolling (in-sample start, in-sample end, out-of-sample start, out-of-sample end)
+        windows. Windows advance by step_days (the out-of-sample length by default);
+        anchored windows keep the in-sample start fixed at start_date.
+        """
+        if in_sample_days <= 0 or out_of_sample_days <= 0 or (step_days is not None and step_days <= 0):
+            raise ValueError("Window lengths must be positive")
+
+        step = timedelta(days=step_days or out_of_sample_days)
+        in_start = start_date
+        out_start = start_date + timedelta(days=in_sample_days)
+        windows = []
+        while out_start < end_date:
+            out_end = min(out_start + timedelta(days=out_of_sample_days), end_date)
+            windows.append((in_start, out_start - _MICROSECOND, out_start, out_end))
+            out_start += step
+            if not anchored:
+                in_start += step
+        return windows
+
+    def walk_forward(
+        self,
+        strategy_class: type,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        parameter_ranges: Dict[str, List[Any]],
+        in_sample_days: int = 252,
+        out_of_sample_days: int = 63,
+        step_days: Optional[int] = None,
+        anchored: bool = False,
+        max_workers: Optional[int] = None,
+        initial_balance: Decimal = Decimal('100000'),
+        max_positions: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Walk-forward optimization.
+
+        Each window grid-searches the parameters on its in-sample range and
+        backtests the best combination on the following out-of-sample range.
+        Windows run concurrently on the worker pool. Per-window results are
+        memoized in result_cache, keyed by strategy, parameters, window and the
+        bars up to the window end, so overlapping or repeated studies only
+        compute what is new; vectorized indicator columns are shared across
+        windows through indicator_cache.
+        """
+        windows = self.walk_forward_windows(
+            start_date, end_date, in_sample_days, out_of_sample_days, step_days, anchored
+        )
+        combinations = self._parameter_grid(parameter_ranges)
+        symbol_data = self._load_symbol_data(symbols, start_date, end_date)
+        timestamps = {symbol: [p.timestamp for p in data] for symbol, data in symbol_data.items()}
+
+        def result_key(combo: int, window_start: datetime, window_end: datetime) -> Tuple:
+            fingerprint = tuple(
+                (symbol, _series_fingerprint(data, bisect.bisect_right(timestamps[symbol], window_end)))
+                for symbol, data in symbol_data.items()
+            )
+            strategy_key = f"{strategy_class.__module__}.{strategy_class.__qualname__}"
+            return (strategy_key, repr(sorted(combinations[combo].items())), tuple(symbols),
+                    window_start, window_end, initial_balance, max_positions, self.commission_per_trade, fingerprint)
+
+        # Look up what is already cached and only send the rest to the workers
+        tasks = []
+        cached = {}
+        for index, (in_start, in_end, out_start, out_end) in enumerate(windows):
+            known_in_sample = {}
+            known_out_of_sample = {}
+            for combo in range(len(combinations)):
+                hit = self.result_cache.get(result_key(combo, in_start, in_end))
+                if hit is not None:
+                    known_in_sample[combo] = hit
+                hit = self.result_cache.get(result_key(combo, out_start, out_end))
+                if hit is not None:
+                    known_out_of_sample[combo] = hit
+
+            best = max(sorted(known_in_sample), key=lambda c: known_in_sample[c][0]) if known_in_sample else None
+            if len(known_in_sample) == len(combinations) and (best is None or best in known_out_of_sample):
+                cached[index] = (index, {}, best, None)
+            tasks.append((index, windows[index], known_in_sample, known_out_of_sample))
+
+        context = {
+            'engine': self,
+            'strategy_class': strategy_class,
+            'symbols': symbols,
+            'symbol_data': symbol_data,
+            'initial_balance': initial_balance,
+            'max_positions': max_positions,
+            'combinations': combinations,
+        }
+        pending = [task for task in tasks if task[0] not in cached]
+        outcomes = dict(cached)
+        for outcome in self._map_on_workers(
+            _walk_forward_window, pending, context, self._worker_count(max_workers, len(pending))
+        ):
+            outcomes[outcome[0]] = outcome
+
+        reports = []
+        for index, (in_start, in_end, out_start, out_end) in enumerate(windows):
+            _, in_sample, best, out_of_sample = outcomes[index]
+            for combo, value in in_sample.items():
+                self.result_cache.put(result_key(combo, in_start, in_end), value)
+            if out_of_sample is not None:
+                self.result_cache.put(result_key(best, out_start, out_end), out_of_sample)
+
+            report = {
+                'in_sample': {'start': in_start.isoformat(), 'end': in_end.isoformat()},
+                'out_of_sample': {'start': out_start.isoformat(), 'end': out_end.isoformat()},
+                'best_parameters': None,
+                'in_sample_score': None,
+                'in_sample_performance': None,
+                'out_of_sample_performance': None,
+            }
+            if best is not None:
+                known_in_sample, known_out_of_sample = tasks[index][2], tasks[index][3]
+                score, performance = in_sample.get(best) or known_in_sample[best]
+                report.update(
+                    best_parameters=combinations[best],
+                    in_sample_score=score,
+                    in_sample_performance=performance,
+                    out_of_sample_performance=out_of_sample or known_out_of_sample[best],
+                )
+            reports.append(report)
 
-            if score > best_score:
-                best_score = score
-                best_result = result
-                best_parameters = parameters
+        return {
+            'windows': reports,
+            'summary': self._walk_forward_summary(reports, in_sample_days, out_of_sample_days),
+            'cache': self.result_cache.stats(),
+        }
 
+    @staticmethod
+    def _walk_forward_summary(reports: List[Dict[str, Any]], in_sample_days: int, out_of_sample_days: int) -> Dict[str, Any]:
+        """Aggregate out-of-sample results; efficiency compares annualized OOS and IS returns."""
+        tested = [r for r in reports if r['out_of_sample_performance']]
+        if not tested:
+            return {'windows': len(reports), 'tested_windows': 0}
+
+        in_returns = [r['in_sample_performance']['total_return'] for r in tested]
+        out_returns = [r['out_of_sample_performance']['total_return'] for r in tested]
+        compounded = 1.0
+        for value in out_returns:
+            compounded *= 1 + value / 100
+
+        annual_in = statistics.mean(in_returns) * 365.25 / in_sample_days
+        annual_out = statistics.mean(out_returns) * 365.25 / out_of_sample_days
         return {
-            'best_parameters': best_parameters,
-            'best_result': best_result,
-            'best_score': best_score
+            'windows': len(reports),
+            'tested_windows': len(tested),
+            'mean_in_sample_return': statistics.mean(in_returns),
+            'mean_out_of_sample_return': statistics.mean(out_returns),
+            'compounded_out_of_sample_return': (compounded - 1) * 100,
+            'profitable_windows': len([v for v in out_returns if v > 0]) / len(out_returns),
+            'walk_forward_efficiency': annual_out / annual_in if annual_in else None,
         }
 
     def monte_carlo_simulation(
@@ -684,47 +1616,148 @@ class BacktestingEngine:
         symbols: List[str],
         start_date: datetime,
         end_date: datetime,
-        num_simulations: int = 1000
+        num_simulations: int = 1000,
+        method: str = 'block',
+        block_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        initial_balance: Decimal = Decimal('100000'),
+        max_positions: int = 5
     ) -> Dict[str, Any]:
-        """Run Monte Carlo simulation to assess strategy robustness."""
-        results = []
-
-        for i in range(num_simulations):
-            # Add random noise to historical data
-            result = self.run_backtest(strategy, symbols, start_date, end_date)
-            results.append({
-                'total_return': float(result.total_return),
-                'max_drawdown': float(result.max_drawdown),
-                'sharpe_ratio': float(result.sharpe_ratio or 0),
-                'win_rate': float(result.win_rate),
-                'total_trades': result.total_trades
-            })
+        """
+        Run Monte Carlo simulation to assess strategy robustness.
+
+        The strategy is backtested once; simulated paths are resampled from it.
+
+        Methods:
+            bootstrap: daily equity returns drawn with replacement
+            block: circular blocks of consecutive daily returns, which keeps
+                volatility clustering and autocorrelation
+            trades: closed-trade P&L drawn with replacement (sequence risk)
+            price_paths: the bars of every symbol are block-resampled and the
+                strategy re-run on each path; path-dependent, so the runs are
+                fanned out to the worker pool
+
+        The first three are evaluated as matrices in chunks, so hundreds of
+        thousands of paths take seconds. `seed` makes any method reproducible
+        (also across worker counts); the seed used is returned.
+        """
+        if method not in self.MONTE_CARLO_METHODS:
+            raise ValueError(f"Unknown Monte Carlo method: {method}")
+        if num_simulations < 1:
+            raise ValueError("num_simulations must be positive")
+        limit = self.MAX_PRICE_PATH_SIMULATIONS if method == 'price_paths' else self.MAX_SIMULATIONS
+        if num_simulations > limit:
+            raise ValueError(f"num_simulations must be at most {limit} for method {method}")
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % (2 ** 63))
+
+        symbol_data = self._load_symbol_data(symbols, start_date, end_date)
+        base = self.run_backtest(
+            strategy, symbols, start_date, end_date,
+            initial_balance=initial_balance, max_positions=max_positions, symbol_data=symbol_data
+        )
 
-        # Calculate statistics
-        returns = [r['total_return'] for r in results]
-        drawdowns = [r['max_drawdown'] for r in results]
-        sharpe_ratios = [r['sharpe_ratio'] for r in results]
+        if method == 'price_paths':
+            bars = max((len(data) for data in symbol_data.values()), default=0)
+            context = {
+                'engine': self,
+                'strategy': strategy,
+                'symbols': symbols,
+                'symbol_data': symbol_data,
+                'start_date': start_date,
+                'end_date': end_date,
+                'initial_balance': initial_balance,
+                'max_positions': max_positions,
+                'seed': seed,
+                'block_size': block_size or self._default_block_size(bars),
+            }
+            runs = sorted(self._map_on_workers(
+                _resampled_backtest, [(i,) for i in range(num_simulations)], context,
+                self._worker_count(max_workers, num_simulations)
+            ), key=lambda run: run[0])
+            returns = np.array([r['total_return'] for _, r in runs])
+            drawdowns = np.array([r['max_drawdown'] for _, r in runs])
+            sharpe_ratios = np.array([r['sharpe_ratio'] for _, r in runs])
+        else:
+            returns, drawdowns, sharpe_ratios = self._resample_equity(
+                base, method, num_simulations, block_size, np.random.default_rng(seed)
+            )
 
         return {
             'num_simulations': num_simulations,
+            'method': method,
+            'seed': seed,
+            'base_result': _performance_summary(base),
             'return_stats': {
-                'mean': statistics.mean(returns),
-                'std': statistics.stdev(returns) if len(returns) > 1 else 0,
-                'min': min(returns),
-                'max': max(returns),
-                'percentile_5': statistics.quantiles(returns, n=20)[0] if returns else 0,
-                'percentile_95': statistics.quantiles(returns, n=20)[-1] if returns else 0
+                'mean': float(returns.mean()),
+                'std': float(returns.std(ddof=1)) if len(returns) > 1 else 0,
+                'min': float(returns.min()),
+                'max': float(returns.max()),
+                # Same (exclusive) definition as statistics.quantiles
+                'percentile_5': float(np.percentile(returns, 5, method='weibull')),
+                'percentile_95': float(np.percentile(returns, 95, method='weibull')),
+                'probability_of_loss': float((returns < 0).mean()),
             },
             'drawdown_stats': {
-                'mean': statistics.mean(drawdowns),
-                'max': max(drawdowns)
+                'mean': float(drawdowns.mean()),
+                'max': float(drawdowns.max()),
+                'percentile_95': float(np.percentile(drawdowns, 95, method='weibull')),
             },
             'sharpe_stats': {
-                'mean': statistics.mean(sharpe_ratios),
-                'positive_sharpe_ratio': len([s for s in sharpe_ratios if s > 0]) / len(sharpe_ratios)
+                'mean': float(sharpe_ratios.mean()),
+                'positive_sharpe_ratio': float((sharpe_ratios > 0).mean()),
             }
         }
 
+    @staticmethod
+    def _default_block_size(length: int) -> int:
+        """Cube-root rule of thumb for the block bootstrap."""
+        return max(1, round(length ** (1 / 3)))
+
+    def _resample_equity(
+        self,
+        base: BacktestResult,
+        method: str,
+        num_simulations: int,
+        block_size: Optional[int],
+        rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized resampling of the base run; returns per-path return, drawdown and Sharpe arrays."""
+        initial = float(base.initial_balance)
+        years = (base.end_date - base.start_date).days / 365.25 if base.start_date and base.end_date else 0
+
+        if method == 'trades':
+            steps = np.array([float(t.pnl) for t in base.trades if t.is_closed])
+            periods_per_year = len(steps) / years if years > 0 else 252
+            block_size = 1
+        else:
+            equity = np.array([float(e) for _, e in base.equity_curve])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                steps = np.nan_to_num(equity[1:] / equity[:-1] - 1) if len(equity) > 1 else np.empty(0)
+            periods_per_year = 252
+            if method == 'bootstrap':
+                block_size = 1
+            block_size = block_size or self._default_block_size(len(steps))
+
+        if len(steps) == 0:
+            zeros = np.zeros(num_simulations)
+            return zeros, zeros.copy(), zeros.copy()
+
+        chunk = max(1, self.MONTE_CARLO_CHUNK_VALUES // len(steps))
+        results = []
+        for offset in range(0, num_simulations, chunk):
+            paths = min(chunk, num_simulations - offset)
+            sampled = steps[_block_indices(rng, paths, len(steps), min(block_size, len(steps)))]
+            if method == 'trades':
+                path = initial + np.cumsum(sampled, axis=1)
+            else:
+                path = initial * np.cumprod(1 + sampled, axis=1)
+            equity = np.hstack((np.full((paths, 1), initial), path))
+            results.append(_path_metrics(equity, periods_per_year))
+
+        return tuple(np.concatenate(parts) for parts in zip(*results))
+
 
 # Initialize backtesting engine with default strategies
 backtesting_engine = BacktestingEngine()
@@ -0,0 +1,256 @@
+"""
+OHLCV History Store - Shared Infrastructure Component
+
+Local on-disk bar store for historical market data, one series per
+(symbol, interval). Charts, technical analysis and backtests read bars from
+here instead of calling the market data provider on every request.
+
+Layout:
+    <base_dir>/<interval>/<symbol>/{time,open,high,low,close,volume}.bin
+
+Each column is a flat little-endian array (int64 unix seconds for time,
+float64 for prices and volume). Files are append-only and read through
+np.memmap, so a read is a couple of stat() calls plus a binary search.
+Mappings are kept for the most recently read series only (each mapped
+column holds a file descriptor until it is released).
+
+Design Principles:
+- Append-only: bars newer than the last stored timestamp are appended,
+  never rewritten; incremental backfill only asks for what is missing
+- Readers tolerate a torn append by trimming to the shortest column
+- No network access here - fetching belongs to MarketDataService
+"""
+
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+COLUMNS = ('time', 'open', 'high', 'low', 'close', 'volume')
+COLUMN_DTYPES = {
+    'time': np.dtype('<i8'),
+    'open': np.dtype('<f8'),
+    'high': np.dtype('<f8'),
+    'low': np.dtype('<f8'),
+    'close': np.dtype('<f8'),
+    'volume': np.dtype('<f8'),
+}
+
+# Bar length per provider interval, used to decide when a series is stale
+INTERVAL_SECONDS = {
+    '1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800,
+    '60m': 3600, '90m': 5400, '1h': 3600,
+    '1d': 86400, '5d': 432000, '1wk': 604800, '1mo': 2592000, '3mo': 7776000,
+}
+
+_SAFE_NAME = re.compile(r'[^A-Za-z0-9.\-=^_]')
+
+
+def _safe_name(name: str) -> str:
+    """Filesystem-safe path component (no separators, no leading dots)."""
+    return _SAFE_NAME.sub('_', name).lstrip('.') or '_'
+
+
+class HistoryBars:
+    """
+    A read-only window of OHLCV bars backed by numpy arrays.
+
+    Columns are views onto the memory-mapped files (or onto arrays passed in),
+    so slicing never copies.
+    """
+
+    __slots__ = COLUMNS
+
+    def __init__(self, time, open, high, low, close, volume):
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def empty(cls) -> 'HistoryBars':
+        return cls(*(np.empty(0, dtype=COLUMN_DTYPES[c]) for c in COLUMNS))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.time[-1]) if len(self.time) else None
+
+    def between(self, start: Optional[int] = None, end: Optional[int] = None) -> 'HistoryBars':
+        """Bars with start <= time <= end (unix seconds, either bound optional)."""
+        lo = 0 if start is None else int(np.searchsorted(self.time, start, side='left'))
+        hi = len(self.time) if end is None else int(np.searchsorted(self.time, end, side='right'))
+        return self[lo:hi]
+
+    def tail(self, count: int) -> 'HistoryBars':
+        """The last `count` bars."""
+        return self[max(0, len(self.time) - count):]
+
+    def __getitem__(self, index: slice) -> 'HistoryBars':
+        return HistoryBars(*(getattr(self, c)[index] for c in COLUMNS))
+
+
+class HistoryStore:
+    """
+    Append-only columnar OHLCV store with memory-mapped reads.
+
+    Thread-safe within a process; appends also take an advisory file lock so
+    several workers backfilling the same series do not duplicate bars.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, max_open_series: Optional[int] = None):
+        self.base_dir = base_dir or os.getenv('HISTORY_STORE_DIR', os.path.join('data', 'history'))
+        self.max_open_series = max_open_series or int(os.getenv('HISTORY_STORE_MAX_OPEN_SERIES', '32'))
+        self._lock = threading.Lock()
+        self._series_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        # (symbol, interval) -> (column sizes in bytes, mapped bars), least recently read first.
+        # Evicted maps are only dropped, not closed: callers may still hold views onto
+        # them, and the descriptors are released once the last view goes away.
+        self._maps: 'OrderedDict[Tuple[str, str], Tuple[Tuple[int, ...], HistoryBars]]' = OrderedDict()
+
+    def series_dir(self, symbol: str, interval: str) -> str:
+        """Directory holding one series; symbol and interval are sanitised for the filesystem."""
+        return os.path.join(self.base_dir, _safe_name(interval), _safe_name(symbol.upper()))
+
+    def _column_path(self, symbol: str, interval: str, column: str) -> str:
+        return os.path.join(self.series_dir(symbol, interval), f"{column}.bin")
+
+    def read(self, symbol: str, interval: str) -> HistoryBars:
+        """
+        All stored bars for a series, memory-mapped.
+
+        The mapping is reused until a column file grows, so repeated reads of
+        an unchanged series cost only the stat() calls. At most max_open_series
+        mappings are cached; the least recently read is dropped first.
+        """
+        key = (symbol.upper(), interval)
+        paths = [self._column_path(symbol, interval, c) for c in COLUMNS]
+        try:
+            sizes = tuple(os.path.getsize(p) for p in paths)
+        except OSError:
+            return HistoryBars.empty()
+
+        with self._lock:
+            cached = self._maps.get(key)
+            if cached is not None and cached[0] == sizes:
+                self._maps.move_to_end(key)
+                return cached[1]
+
+        # A crash between column writes leaves some columns longer; ignore the torn tail
+        length = min(size // COLUMN_DTYPES[c].itemsize for size, c in zip(sizes, COLUMNS))
+        if length == 0:
+            return HistoryBars.empty()
+
+        bars = HistoryBars(*(
+            np.memmap(path, dtype=COLUMN_DTYPES[c], mode='r', shape=(length,))
+            for path, c in zip(paths, COLUMNS)
+        ))
+        with self._lock:
+            self._maps[key] = (sizes, bars)
+            self._maps.move_to_end(key)
+            while len(self._maps) > self.max_open_series:
+                self._maps.popitem(last=False)
+        return bars
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """Timestamp (unix seconds) of the newest stored bar, or None if the series is empty."""
+        return self.read(symbol, interval).last_timestamp
+
+    def append(self, symbol: str, interval: str, bars: HistoryBars) -> int:
+        """
+        Append bars newer than the last stored one. Returns how many were written.
+
+        Incoming bars are sorted by time and de-duplicated; anything at or before
+        the stored tail is dropped, which keeps the time column strictly increasing.
+        """
+        if len(bars) == 0:
+            return 0
+
+        order = np.argsort(bars.time, kind='stable')
+        times = np.asarray(bars.time, dtype=COLUMN_DTYPES['time'])[order]
+        keep = np.ones(len(times), dtype=bool)
+        keep[1:] = times[1:] != times[:-1]
+
+        with self._series_lock(symbol, interval):
+            last = self._tail_timestamp(symbol, interval)
+            if last is not None:
+                keep &= times > last
+            if not keep.any():
+                return 0
+
+            os.makedirs(self.series_dir(symbol, interval), exist_ok=True)
+            for column in COLUMNS:
+                values = np.asarray(getattr(bars, column), dtype=COLUMN_DTYPES[column])[order][keep]
+                with open(self._column_path(symbol, interval, column), 'ab') as f:
+                    f.write(values.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        written = int(keep.sum())
+        logger.debug("Appended bars to history store", extra={
+            'symbol': symbol, 'interval': interval, 'bars': written,
+        })
+        return written
+
+    def _tail_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """Last committed timestamp, trimming a torn append left by a crashed writer."""
+        paths = {c: self._column_path(symbol, interval, c) for c in COLUMNS}
+        try:
+            sizes = {c: os.path.getsize(p) for c, p in paths.items()}
+        except OSError:
+            return None
+
+        length = min(sizes[c] // COLUMN_DTYPES[c].itemsize for c in COLUMNS)
+        for column, path in paths.items():
+            expected = length * COLUMN_DTYPES[column].itemsize
+            if sizes[column] != expected:
+                os.truncate(path, expected)
+        if length == 0:
+            return None
+
+        with open(paths['time'], 'rb') as f:
+            f.seek((length - 1) * COLUMN_DTYPES['time'].itemsize)
+            return int(np.frombuffer(f.read(COLUMN_DTYPES['time'].itemsize), dtype=COLUMN_DTYPES['time'])[0])
+
+    @contextmanager
+    def _series_lock(self, symbol: str, interval: str):
+        key = (symbol.upper(), interval)
+        with self._lock:
+            lock = self._series_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if fcntl is None:
+                yield
+                return
+
+            os.makedirs(self.series_dir(symbol, interval), exist_ok=True)
+            with open(os.path.join(self.series_dir(symbol, interval), '.lock'), 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# Global history store instance
+history_store = HistoryStore()
+
+
+__all__ = ['HistoryBars', 'HistoryStore', 'history_store', 'INTERVAL_SECONDS']
@@ -0,0 +1,166 @@
+"""
+Order Journal - Shared Infrastructure Component
+
+Durable state for the order engine: an append-only write-ahead log of order
+mutations plus a periodically compacted snapshot.
+
+Layout:
+    <base_dir>/snapshot.json    {"version": 1, "rows": [...]}, replaced atomically
+    <base_dir>/wal.jsonl        one JSON row per mutation, appended
+    <base_dir>/.lock            held by the process that owns the journal
+
+Every row is the full state of one order with the order id first, so a row
+supersedes any earlier row for the same order. That makes replaying the log
+over the snapshot idempotent: a crash between writing a snapshot and
+truncating the log only replays rows the snapshot already has.
+
+Design Principles:
+- The journal knows rows, not orders; encoding lives with the order engine
+- Recovery is one json.load for the snapshot plus one json.loads per log
+  line; both files are plain JSON, so nothing on disk can run code on load
+- The owner decides what a snapshot keeps (e.g. drops expired history)
+- Readers tolerate a torn final log line left by a crashed writer
+- One owning process per directory; others run without a journal
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process ownership check
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class OrderJournal:
+    """
+    Write-ahead log with compacted snapshots, keyed by the first field of each row.
+
+    append() reports when `snapshot_every` rows have accumulated since the last
+    snapshot; the owner then calls compact() with its full current state.
+    """
+
+    VERSION = 1
+
+    def __init__(self, base_dir: Optional[str] = None, fsync: Optional[bool] = None,
+                 snapshot_every: Optional[int] = None):
+        self.base_dir = base_dir or os.getenv('ORDER_JOURNAL_DIR', os.path.join('data', 'orders'))
+        self.fsync = fsync if fsync is not None else os.getenv('ORDER_JOURNAL_FSYNC', 'false').lower() == 'true'
+        self.snapshot_every = snapshot_every or int(os.getenv('ORDER_JOURNAL_SNAPSHOT_EVERY', '10000'))
+        self.snapshot_path = os.path.join(self.base_dir, 'snapshot.json')
+        self.wal_path = os.path.join(self.base_dir, 'wal.jsonl')
+        self.records_since_snapshot = 0
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._wal = None
+        self._lock_file = None
+
+    def _open(self):
+        """Take ownership of the directory and open the log for appending."""
+        if self._wal is not None or not self.enabled:
+            return
+        os.makedirs(self.base_dir, exist_ok=True)
+        if fcntl is not None:
+            self._lock_file = open(os.path.join(self.base_dir, '.lock'), 'w')
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                logger.warning(f"Order journal {self.base_dir} is owned by another process; running without it")
+                self._lock_file.close()
+                self._lock_file = None
+                self.enabled = False
+                return
+        self._wal = open(self.wal_path, 'a', encoding='utf-8')
+
+    def load(self) -> List[list]:
+        """
+        Latest row per key: the snapshot with the log tail replayed over it.
+
+        Rows keep the position their key was first written at, so orders come
+        back in creation order.
+        """
+        with self._lock:
+            self._open()
+            if not self.enabled:
+                return []
+
+            rows = {}
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'rb') as f:
+                    snapshot = json.load(f)
+                if snapshot.get('version') != self.VERSION:
+                    raise ValueError(f"Unsupported order journal version {snapshot.get('version')}")
+                for row in snapshot['rows']:
+                    rows[row[0]] = row
+
+            replayed = 0
+            valid_bytes = 0
+            with open(self.wal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash; everything after it is unreliable
+                        logger.warning(f"Ignoring torn order journal tail at byte {valid_bytes}")
+                        break
+                    rows[row[0]] = row
+                    replayed += 1
+                    valid_bytes += len(line)
+            if valid_bytes != os.path.getsize(self.wal_path):
+                self._wal.truncate(valid_bytes)
+
+            self.records_since_snapshot = replayed
+            logger.info("Order journal loaded", extra={'rows': len(rows), 'replayed': replayed})
+            return list(rows.values())
+
+    def append(self, row: list) -> bool:
+        """Log one row. Returns True once a snapshot is due."""
+        with self._lock:
+            self._open()
+            if not self.enabled:
+                return False
+            self._wal.write(json.dumps(row, separators=(',', ':')) + '\n')
+            self._wal.flush()
+            if self.fsync:
+                os.fsync(self._wal.fileno())
+            self.records_since_snapshot += 1
+            return self.records_since_snapshot >= self.snapshot_every
+
+    def compact(self, rows: Iterable[list]):
+        """
+        Replace the snapshot with `rows` and empty the log.
+
+        Keys missing from `rows` are gone after the next load, which is how
+        the owner expires old entries.
+
+        The caller must hold off further appends until this returns, or rows
+        appended meanwhile are lost with the old log.
+        """
+        with self._lock:
+            self._open()
+            if not self.enabled:
+                return
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'rows': list(rows)}, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            self._wal.truncate(0)
+            self._wal.seek(0)
+            self.records_since_snapshot = 0
+
+    def close(self):
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
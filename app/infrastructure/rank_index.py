@@ -0,0 +1,282 @@
+"""
+Rank Index - Shared Infrastructure Component
+
+Per-board sorted sets of member scores for O(log n) rank, percentile and
+neighbourhood lookups. Boards live in Redis sorted sets so all workers share
+one index, with an in-process sorted fallback when Redis is disabled.
+
+Design Principles:
+- Higher score ranks first; ranks are 1-based
+- Boards are written incrementally (ZADD/ZREM) or swapped in whole (replace)
+- Writers across workers serialize through lock() (SET NX PX)
+- Read failures return None so callers can fall back to their own query
+"""
+
+import bisect
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.infrastructure.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class SortedScores:
+    """
+    In-process sorted set with the same ordering as the Redis index.
+
+    Entries are kept as (score, member) in ascending order, like a Redis
+    sorted set, and positions are counted from the end: the top is the
+    highest score, and equal scores come in descending member order,
+    matching ZREVRANK/ZREVRANGE.
+    """
+
+    def __init__(self):
+        self.scores: Dict[str, float] = {}
+        self._entries: List[Tuple[float, str]] = []
+
+    def add(self, member: str, score: float):
+        self.remove(member)
+        self.scores[member] = score
+        bisect.insort(self._entries, (score, member))
+
+    def remove(self, member: str) -> bool:
+        score = self.scores.pop(member, None)
+        if score is None:
+            return False
+        index = bisect.bisect_left(self._entries, (score, member))
+        del self._entries[index]
+        return True
+
+    def rank(self, member: str) -> Optional[int]:
+        """0-based position from the top, or None if absent."""
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        return len(self._entries) - 1 - bisect.bisect_left(self._entries, (score, member))
+
+    def count_below(self, score: float) -> int:
+        """Number of members with a strictly lower score."""
+        return bisect.bisect_left(self._entries, (score, ''))
+
+    def range(self, start: int, stop: int) -> List[Tuple[str, float]]:
+        """Members from position start to stop inclusive, highest score first."""
+        size = len(self._entries)
+        start = max(0, start)
+        stop = min(stop, size - 1)
+        if start > stop:
+            return []
+        window = self._entries[size - 1 - stop:size - start]
+        return [(member, score) for score, member in reversed(window)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RankIndex:
+    """
+    Sorted-set rank index keyed by board name (e.g. 'overall:all').
+
+    Uses Redis sorted sets when the shared client is enabled, otherwise one
+    SortedScores per board in this process.
+    """
+
+    KEY_PREFIX = 'rank:'
+    LOCK_PREFIX = 'rank-lock:'
+    # Delete the lock only if it is still ours (it may have expired and been re-taken)
+    UNLOCK_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, client=None):
+        self.client = client or redis_client
+        self._local: Dict[str, SortedScores] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self) -> bool:
+        return self.client.enabled
+
+    def update(self, board: str, scores: Dict[str, float]) -> bool:
+        """Set the scores of the given members (ZADD)."""
+        if not scores:
+            return True
+
+        if not self.shared:
+            with self._lock:
+                local = self._board(board)
+                for member, score in scores.items():
+                    local.add(member, float(score))
+            return True
+
+        try:
+            with self.client.connection() as conn:
+                conn.zadd(self._key(board), {member: float(score) for member, score in scores.items()})
+            return True
+        except Exception as e:
+            logger.debug("Rank index update failed", extra={'board': board, 'error': str(e)})
+            return False
+
+    def remove(self, board: str, *members: str) -> bool:
+        """Drop members from a board (ZREM)."""
+        if not members:
+            return True
+
+        if not self.shared:
+            with self._lock:
+                local = self._board(board)
+                for member in members:
+                    local.remove(member)
+            return True
+
+        try:
+            with self.client.connection() as conn:
+                conn.zrem(self._key(board), *members)
+            return True
+        except Exception as e:
+            logger.debug("Rank index remove failed", extra={'board': board, 'error': str(e)})
+            return False
+
+    def replace(self, board: str, scores: Dict[str, float]) -> bool:
+        """Swap a board's whole contents in one step, e.g. after a window rebuild."""
+        if not self.shared:
+            fresh = SortedScores()
+            for member, score in scores.items():
+                fresh.add(member, float(score))
+            with self._lock:
+                self._local[board] = fresh
+            return True
+
+        key = self._key(board)
+        try:
+            with self.client.connection() as conn:
+                if not scores:
+                    conn.delete(key)
+                    return True
+                # A staging key per swap, so concurrent swaps never write into each other
+                staging = f"{key}:staging:{uuid.uuid4().hex}"
+                try:
+                    conn.zadd(staging, {member: float(score) for member, score in scores.items()})
+                    conn.rename(staging, key)
+                except Exception:
+                    conn.delete(staging)
+                    raise
+            return True
+        except Exception as e:
+            logger.debug("Rank index replace failed", extra={'board': board, 'error': str(e)})
+            return False
+
+    @contextmanager
+    def lock(self, name: str, ttl: float) -> Iterator[bool]:
+        """
+        Hold a cross-worker lock for the block; yields False if another holder has it.
+
+        The lock expires after ttl seconds in case its holder dies. Without Redis
+        the index is per process, so the lock is always granted.
+        """
+        if not self.shared:
+            yield True
+            return
+
+        key = f"{self.LOCK_PREFIX}{name}"
+        token = uuid.uuid4().hex
+        try:
+            with self.client.connection() as conn:
+                acquired = bool(conn.set(key, token, nx=True, px=int(ttl * 1000)))
+        except Exception as e:
+            logger.debug("Rank index lock failed", extra={'lock': name, 'error': str(e)})
+            acquired = False
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    with self.client.connection() as conn:
+                        conn.eval(self.UNLOCK_SCRIPT, 1, key, token)
+                except Exception as e:
+                    logger.debug("Rank index unlock failed", extra={'lock': name, 'error': str(e)})
+
+    def rank(self, board: str, member: str) -> Optional[int]:
+        """1-based rank of a member (highest score first), or None if absent or unavailable."""
+        if not self.shared:
+            with self._lock:
+                position = self._board(board).rank(member)
+            return None if position is None else position + 1
+
+        try:
+            with self.client.connection() as conn:
+                position = conn.zrevrank(self._key(board), member)
+        except Exception as e:
+            logger.debug("Rank index lookup failed", extra={'board': board, 'error': str(e)})
+            return None
+        return None if position is None else int(position) + 1
+
+    def percentile(self, board: str, member: str) -> Optional[float]:
+        """Percentage of the board scoring strictly below the member, or None if absent."""
+        if not self.shared:
+            with self._lock:
+                local = self._board(board)
+                score = local.scores.get(member)
+                if score is None or not len(local):
+                    return None
+                return local.count_below(score) / len(local) * 100
+
+        key = self._key(board)
+        try:
+            with self.client.connection() as conn:
+                score = conn.zscore(key, member)
+                if score is None:
+                    return None
+                below = conn.zcount(key, '-inf', f"({score!r}")
+                total = conn.zcard(key)
+        except Exception as e:
+            logger.debug("Rank index percentile failed", extra={'board': board, 'error': str(e)})
+            return None
+        return below / total * 100 if total else None
+
+    def around(self, board: str, member: str, radius: int = 5) -> Optional[List[Tuple[int, str, float]]]:
+        """(rank, member, score) for up to radius members either side of the member, itself included."""
+        rank = self.rank(board, member)
+        if rank is None:
+            return None
+        start = max(0, rank - 1 - radius)
+        return self.top(board, limit=2 * radius + 1, offset=start)
+
+    def top(self, board: str, limit: int, offset: int = 0) -> Optional[List[Tuple[int, str, float]]]:
+        """(rank, member, score) for a page of the board, highest score first."""
+        stop = offset + limit - 1
+        if not self.shared:
+            with self._lock:
+                page = self._board(board).range(offset, stop)
+        else:
+            try:
+                with self.client.connection() as conn:
+                    page = conn.zrevrange(self._key(board), offset, stop, withscores=True)
+            except Exception as e:
+                logger.debug("Rank index range failed", extra={'board': board, 'error': str(e)})
+                return None
+        return [(offset + i + 1, member, float(score)) for i, (member, score) in enumerate(page)]
+
+    def size(self, board: str) -> int:
+        """Number of members on a board."""
+        if not self.shared:
+            with self._lock:
+                return len(self._board(board))
+
+        try:
+            with self.client.connection() as conn:
+                return int(conn.zcard(self._key(board)) or 0)
+        except Exception as e:
+            logger.debug("Rank index size failed", extra={'board': board, 'error': str(e)})
+            return 0
+
+    def _board(self, board: str) -> SortedScores:
+        local = self._local.get(board)
+        if local is None:
+            local = self._local[board] = SortedScores()
+        return local
+
+    def _key(self, board: str) -> str:
+        return f"{self.KEY_PREFIX}{board}"
@@ -0,0 +1,178 @@
+"""
+Token Bucket Rate Limiter - Shared Infrastructure Component
+
+Per-source token buckets for outbound calls to market data providers.
+Buckets live in Redis so all workers share one budget per source, with an
+in-process bucket as fallback when Redis is disabled or unavailable.
+
+Design Principles:
+- Never sleep on behalf of the caller: acquire() either grants a token,
+  reserves a queued slot and returns how long the caller must wait, or rejects
+- Callers on request threads pass max_wait=0 and fall back to cached data
+- Wait-time metrics per source for monitoring
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from app.infrastructure.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+# Atomic refill + take. Returns the wait in seconds as a string, or '-1' if rejected.
+# Tokens may go negative: that is a queued reservation the caller waits out.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local max_wait = tonumber(ARGV[5])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens < requested then
+    wait = (requested - tokens) / rate
+end
+
+local result = '-1'
+if wait <= max_wait then
+    tokens = tokens - requested
+    result = tostring(wait)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return result
+"""
+
+
+class TokenBucket:
+    """In-process token bucket with the same semantics as the Redis script."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1, max_wait: float = 0.0) -> Optional[float]:
+        """Take tokens. Returns seconds to wait (0 if immediate) or None if rejected."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            wait = 0.0
+            if self.tokens < tokens:
+                wait = (tokens - self.tokens) / self.rate
+                if wait > max_wait:
+                    return None
+
+            self.tokens -= tokens
+            return wait
+
+
+class RateLimiter:
+    """
+    Per-source token bucket rate limiter shared across workers.
+
+    Each source has a refill rate (tokens per second) and a burst size.
+    Unconfigured sources use the default limit.
+    """
+
+    KEY_PREFIX = 'ratelimit:'
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default_limit: Tuple[float, int] = (1.0, 1), client=None):
+        self.client = client or redis_client
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self._local_buckets: Dict[str, TokenBucket] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, source: str, rate: float, burst: int):
+        """Set the refill rate (tokens/second) and burst size for a source."""
+        with self._lock:
+            self.limits[source] = (rate, burst)
+            self._local_buckets.pop(source, None)
+
+    def acquire(self, source: str, tokens: int = 1, max_wait: float = 0.0) -> Optional[float]:
+        """
+        Take tokens from the source's bucket without blocking.
+
+        Returns 0.0 when granted immediately, the number of seconds the caller
+        must wait for its queued slot (at most max_wait), or None when rejected.
+        """
+        rate, burst = self.limits.get(source, self.default_limit)
+
+        wait = self._acquire_shared(source, rate, burst, tokens, max_wait)
+        if wait is False:
+            wait = self._local_bucket(source, rate, burst).acquire(tokens, max_wait)
+
+        self._record(source, wait)
+        return wait
+
+    def _acquire_shared(self, source: str, rate: float, burst: int, tokens: int, max_wait: float):
+        """Run the bucket in Redis. Returns the wait, None if rejected, or False if Redis is unusable."""
+        if not self.client.enabled:
+            return False
+
+        try:
+            with self.client.connection() as conn:
+                result = conn.eval(
+                    TOKEN_BUCKET_SCRIPT, 1, f"{self.KEY_PREFIX}{source}",
+                    rate, burst, f"{time.time():.6f}", tokens, max_wait
+                )
+        except Exception as e:
+            logger.debug("Shared rate limit failed, using local bucket", extra={'source': source, 'error': str(e)})
+            return False
+
+        if result is None:
+            return False
+
+        wait = float(result)
+        return None if wait < 0 else wait
+
+    def _local_bucket(self, source: str, rate: float, burst: int) -> TokenBucket:
+        with self._lock:
+            bucket = self._local_buckets.get(source)
+            if bucket is None:
+                bucket = self._local_buckets[source] = TokenBucket(rate, burst)
+            return bucket
+
+    def _record(self, source: str, wait: Optional[float]):
+        with self._lock:
+            metrics = self._metrics.setdefault(source, {
+                'allowed': 0, 'queued': 0, 'rejected': 0, 'total_wait': 0.0, 'max_wait': 0.0
+            })
+            if wait is None:
+                metrics['rejected'] += 1
+                return
+
+            metrics['allowed'] += 1
+            if wait > 0:
+                metrics['queued'] += 1
+                metrics['total_wait'] += wait
+                metrics['max_wait'] = max(metrics['max_wait'], wait)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-source counters and wait-time metrics."""
+        with self._lock:
+            return {
+                source: {
+                    **metrics,
+                    'total_wait': round(metrics['total_wait'], 3),
+                    'max_wait': round(metrics['max_wait'], 3),
+                    'avg_wait': round(metrics['total_wait'] / metrics['queued'], 3) if metrics['queued'] else 0.0,
+                }
+                for source, metrics in self._metrics.items()
+            }
@@ -190,8 +190,8 @@ class RedisClient:
             return
 
         try:
-            pubsub = self._client.pubsub()
-            pubsub.subscribe(**{channel: callback})
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
 
             logger.info("Subscribed to Redis channel", extra={'channel': channel})
 
@@ -288,6 +288,9 @@ class MockRedisConnection:
     def publish(self, channel: str, message: str) -> int:
         return 0
 
+    def eval(self, script: str, numkeys: int, *args) -> None:
+        return None
+
 
 # Global Redis client instance
 redis_client = RedisClient()
@@ -62,13 +62,49 @@ def create_app(config_object=None):
 
     # Register SocketIO event handlers
     # These are separate from HTTP routes for clean architecture
-    from app.websocket import register_socketio_handlers, setup_event_bus_forwarding
+    from app.websocket import register_socketio_handlers, setup_event_bus_forwarding, setup_indicator_forwarding
     register_socketio_handlers(socketio)
 
     # Set up event bus forwarding to WebSocket
     # This connects domain events to real-time client updates
     setup_event_bus_forwarding()
 
+    # Stream indicator updates for subscribed symbols as prices tick
+    setup_indicator_forwarding()
+
+    # Share fetched prices across workers and keep hot symbols fresh in the
+    # background (stale-while-revalidate) so requests rarely wait on providers
+    from app.market_data import market_data
+    market_data.start_shared_cache_listener()
+    if os.getenv('PRICE_REFRESHER_ENABLED', 'true').lower() == 'true':
+        market_data.start_refresher()
+
+    # Keep the leaderboard rank index synced off the request threads; workers
+    # take turns through a Redis lock, so only one writes the shared index
+    if os.getenv('LEADERBOARD_RANK_SYNC_ENABLED', 'true').lower() == 'true':
+        from app.leaderboard import leaderboard_service
+        leaderboard_service.start_rank_sync()
+
+    # Restore resting orders from the write-ahead log before anything can trigger them
+    from app.order_engine import order_engine
+    if os.getenv('ORDER_JOURNAL_ENABLED', 'true').lower() == 'true' and order_engine.journal is None:
+        from app.infrastructure.order_journal import OrderJournal
+        order_engine.recover(OrderJournal())
+
+    # Trigger resting orders on price ticks (off the request threads) and
+    # record the published fills; /api/orders/monitor remains for forced sweeps
+    if os.getenv('ORDER_MONITOR_ENABLED', 'true').lower() == 'true':
+        from app.order_engine import order_monitor
+        from app.api.trades import persist_order_fill
+        from src.core.event_bus import event_bus
+
+        def record_fill(execution):
+            with app.app_context():
+                persist_order_fill(execution)
+
+        event_bus.subscribe(order_monitor.EVENT_TYPE, record_fill)
+        order_monitor.start()
+
     @app.route('/health')
     def health_check():
         """Health check endpoint for load balancers."""
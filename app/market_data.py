@@ -6,19 +6,181 @@ Provides robust price fetching with fallback mechanisms and proper error handlin
 """
 
 import yfinance as yf
+import numpy as np
 import requests
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 from decimal import Decimal, ROUND_DOWN, InvalidOperation
 from datetime import datetime, timezone, timedelta
 import logging
+import os
+import threading
 import time
 import random
+import uuid
 from typing import Dict, Optional, Tuple, Union
 import re
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from app.infrastructure.redis_client import redis_client
+from app.infrastructure.rate_limiter import RateLimiter
+from app.infrastructure.history_store import HistoryBars, history_store, INTERVAL_SECONDS
 
 logger = logging.getLogger(__name__)
 
 
+class _InFlightCall:
+    """A fetch in progress; followers wait on `event` for the leader's result."""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Request coalescing: at most one in-flight fetch per key.
+
+    The first caller for a key becomes the leader and performs the fetch;
+    concurrent callers for the same key wait for the leader's result instead of
+    hitting the upstream source themselves. Built on threading primitives, which
+    eventlet monkey-patches, so it coalesces both threads and greenlets.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        self.stats = {'leaders': 0, 'coalesced': 0}
+
+    def acquire(self, key: str) -> Tuple[_InFlightCall, bool]:
+        """Join the in-flight call for key, or start one. Returns (call, is_leader)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.stats['coalesced'] += 1
+                return call, False
+
+            call = _InFlightCall()
+            self._calls[key] = call
+            self.stats['leaders'] += 1
+            return call, True
+
+    def release(self, key: str, call: _InFlightCall, result=None, error: Optional[BaseException] = None):
+        """Publish the leader's result (or error) and wake all followers."""
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+        call.result = result
+        call.error = error
+        call.event.set()
+
+    def do(self, key: str, fn, *args):
+        """Run fn(*args) once for all concurrent callers using the same key."""
+        call, is_leader = self.acquire(key)
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self.release(key, call, error=e)
+            raise
+
+        self.release(key, call, result=result)
+        return result
+
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+class SharedPriceCache:
+    """
+    Cross-process (L2) price cache backed by Redis.
+
+    Quotes are stored as compact "price|previous_close|fetched_at|expires_at"
+    strings under market:price:<symbol>, and every write is published on a
+    pub/sub channel so other workers can warm their in-process (L1) cache
+    without fetching. Redis is best-effort: when it is disabled or down the
+    client falls back to MockRedisConnection and this cache simply misses.
+    """
+
+    KEY_PREFIX = 'market:price:'
+    CHANNEL = 'market:prices'
+
+    def __init__(self, client=None, stale_grace: float = 60):
+        self.client = client or redis_client
+        self.stale_grace = stale_grace
+        self.instance_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._listener = None
+
+    @staticmethod
+    def serialize(price_data: Tuple[Decimal, Decimal], fetched_at: float, expires_at: float) -> str:
+        current_price, previous_close = price_data
+        return f"{current_price}|{previous_close}|{fetched_at:.3f}|{expires_at:.3f}"
+
+    @staticmethod
+    def deserialize(value: str) -> Optional[Tuple[Tuple[Decimal, Decimal], float, float]]:
+        """Parse a serialized quote into ((price, previous_close), fetched_at, expires_at)."""
+        try:
+            current_price, previous_close, fetched_at, expires_at = value.split('|')
+            return (Decimal(current_price), Decimal(previous_close)), float(fetched_at), float(expires_at)
+        except (AttributeError, ValueError, InvalidOperation):
+            return None
+
+    def get(self, symbol: str) -> Optional[Tuple[Tuple[Decimal, Decimal], float, float]]:
+        """Get a shared quote, or None if missing or Redis is unavailable."""
+        if not self.client.enabled:
+            return None
+
+        value = self.client.get_cache(f"{self.KEY_PREFIX}{symbol}")
+        return self.deserialize(value) if value else None
+
+    def put(self, symbol: str, price_data: Tuple[Decimal, Decimal], fetched_at: float, expires_at: float) -> bool:
+        """Store a quote for all workers and announce it on the invalidation channel."""
+        if not self.client.enabled or price_data[0] is None or price_data[1] is None:
+            return False
+
+        value = self.serialize(price_data, fetched_at, expires_at)
+        ttl = max(1, int(expires_at - time.time() + self.stale_grace))
+        stored = self.client.set_cache(f"{self.KEY_PREFIX}{symbol}", value, ttl_seconds=ttl)
+        self.client.publish_message(self.CHANNEL, {'symbol': symbol, 'quote': value, 'origin': self.instance_id})
+        return bool(stored)
+
+    def listen(self, on_update):
+        """
+        Start a daemon thread applying quotes published by other workers.
+
+        on_update(symbol, price_data, fetched_at, expires_at) is called for each.
+        """
+        if not self.client.enabled or self._listener is not None:
+            return
+
+        def handle(message: Dict):
+            if message.get('origin') == self.instance_id:
+                return
+            entry = self.deserialize(message.get('quote'))
+            if entry and message.get('symbol'):
+                on_update(message['symbol'], *entry)
+
+        self._listener = threading.Thread(
+            target=self.client.subscribe_to_channel,
+            args=(self.CHANNEL, handle),
+            name='price-cache-listener',
+            daemon=True
+        )
+        self._listener.start()
+
+
 class MarketDataService:
     """
     Professional market data service with multiple data sources.
@@ -30,11 +192,21 @@ class MarketDataService:
     - Rate limiting and retry logic
     """
 
-    def __init__(self):
+    def __init__(self, shared_cache: Optional[SharedPriceCache] = None):
         # Casablanca Stock Exchange URLs
         self.casablanca_base_url = "https://www.casablanca-bourse.com"
         self.casablanca_api_url = "https://www.casablanca-bourse.com/api"
 
+        # Listing pages that quote every .MA instrument; downloaded once per refresh
+        # window and parsed into a ticker -> (last, previous close) table
+        self.casablanca_listing_urls = [
+            f"{self.casablanca_base_url}/fr/live-market/marche-actions-listing",
+            f"{self.casablanca_base_url}/en/live-market/marche-actions-listing",
+        ]
+        self.casablanca_listing_ttl = 60  # seconds
+        self._casablanca_listing = {}
+        self._casablanca_listing_expiry = 0.0
+
         # Initialize HTTP session with proper headers
         self.session = requests.Session()
         self.session.headers.update({
@@ -46,34 +218,185 @@ class MarketDataService:
             'Upgrade-Insecure-Requests': '1',
         })
 
-        # Rate limiting
-        self.last_request_time = {}
-        self.request_delay = 1.0  # 1 second between requests
+        # Rate limiting: per-source token buckets shared across workers (rate/s, burst)
+        self.request_delay = 1.0  # 1 second between requests for unconfigured sources
+        self.rate_limiter = RateLimiter(
+            limits={
+                'yahoo': (2.0, 5),
+                'casablanca': (1.0, 3),
+            },
+            default_limit=(1.0 / self.request_delay, 1)
+        )
+        # Background fetches may queue for a token this long; request threads never wait
+        self.background_max_wait = 2.0
+        self._rate_limit_context = threading.local()
 
         # Cache for price data (5-minute expiry)
         self.price_cache = {}
         self.cache_expiry = {}
+        self.cache_fetched_at = {}
+
+        # Stale-while-revalidate: expired prices are still served for this many seconds
+        # while a background refresh runs
+        self.stale_grace = 60
+
+        # Shared L2 cache across workers (Redis); the dicts above are the L1
+        self.shared_cache = shared_cache or SharedPriceCache(stale_grace=self.stale_grace)
+
+        # Request frequency per symbol, used by PriceRefresher to pick hot symbols
+        self.symbol_hits = {}
+        self.refresher = None
+
+        # Callbacks for every newly cached quote: fn(symbol, price, fetched_at)
+        self._price_listeners = []
+
+        # Batched fetching: one task per data source, bounded pool, partial results after deadline
+        self.batch_max_workers = 4
+        self.batch_deadline = 5.0  # seconds
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=self.batch_max_workers,
+            thread_name_prefix='market-data'
+        )
+
+        # Coalesces concurrent cache misses so each symbol has one upstream fetch in flight
+        self._inflight = SingleFlight()
+
+        # Local OHLCV store for charts, technical analysis and backtests
+        self.history_store = history_store
+        self.history_synced_at = {}  # (symbol, interval) -> monotonic time of last backfill attempt
+        # (symbol, interval) -> (monotonic fetch time, forming bars); shown on charts, never persisted
+        self.history_forming = {}
+        # Symbols always backfilled; others only once the price provider resolves them
+        self.history_symbols = {
+            s.strip().upper() for s in os.getenv('HISTORY_SYMBOLS', '^GSPC,^IXIC,^DJI,GC=F').split(',') if s.strip()
+        }
 
-    def _rate_limit(self, source: str = 'default'):
-        """Implement rate limiting to be respectful to APIs."""
-        now = time.time()
-        if source in self.last_request_time:
-            time_diff = now - self.last_request_time[source]
-            if time_diff < self.request_delay:
-                time.sleep(self.request_delay - time_diff)
+    def _rate_limit(self, source: str = 'default') -> bool:
+        """
+        Take a rate limit token for an upstream request without blocking request threads.
 
-        self.last_request_time[source] = now
+        Returns False when the source's budget is exhausted; callers then skip the
+        request and fall back to other sources or cached data. Only fetches running
+        in the background (see _queue_for_tokens) wait for a queued token.
+        """
+        max_wait = getattr(self._rate_limit_context, 'max_wait', 0.0)
+        wait = self.rate_limiter.acquire(source, max_wait=max_wait)
+
+        if wait is None:
+            logger.warning(f"Rate limit reached for {source}, skipping upstream request")
+            return False
+
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def _queue_for_tokens(self, fn, *args):
+        """Run fn(*args) allowing rate-limited requests to queue up to background_max_wait."""
+        self._rate_limit_context.max_wait = self.background_max_wait
+        try:
+            return fn(*args)
+        finally:
+            self._rate_limit_context.max_wait = 0.0
 
     def _get_cached_price(self, symbol: str) -> Optional[Tuple[Decimal, Decimal]]:
-        """Get cached price if still valid."""
+        """Get cached price if still valid, checking the local cache before the shared one."""
         if symbol in self.cache_expiry and time.time() < self.cache_expiry[symbol]:
             return self.price_cache.get(symbol)
+
+        entry = self.shared_cache.get(symbol)
+        if entry:
+            price_data, fetched_at, expires_at = entry
+            if time.time() < expires_at:
+                self._store_local(symbol, price_data, fetched_at, expires_at)
+                return price_data
+
+        return None
+
+    def _get_stale_price(self, symbol: str) -> Optional[Tuple[Decimal, Decimal]]:
+        """Get an expired cached price that is still within the stale grace window."""
+        if symbol in self.cache_expiry and time.time() < self.cache_expiry[symbol] + self.stale_grace:
+            return self.price_cache.get(symbol)
         return None
 
     def _cache_price(self, symbol: str, price_data: Tuple[Decimal, Decimal], expiry_seconds: int = 300):
-        """Cache price data with expiry."""
+        """Cache price data with expiry, locally and in the shared cache."""
+        now = time.time()
+        self._store_local(symbol, price_data, now, now + expiry_seconds)
+        self.shared_cache.put(symbol, price_data, now, now + expiry_seconds)
+
+    def _store_local(self, symbol: str, price_data: Tuple[Decimal, Decimal], fetched_at: float, expires_at: float):
+        """Write an entry to the in-process cache, keeping the newest quote."""
+        if self.cache_fetched_at.get(symbol, 0) > fetched_at:
+            return
         self.price_cache[symbol] = price_data
-        self.cache_expiry[symbol] = time.time() + expiry_seconds
+        self.cache_expiry[symbol] = expires_at
+        self.cache_fetched_at[symbol] = fetched_at
+
+        for listener in self._price_listeners:
+            try:
+                listener(symbol, price_data[0], fetched_at)
+            except Exception as e:
+                logger.error(f"Price listener failed for {symbol}: {e}")
+
+    def add_price_listener(self, callback):
+        """Register callback(symbol, price, fetched_at), called for every newly cached quote."""
+        self._price_listeners.append(callback)
+
+    def start_shared_cache_listener(self):
+        """Warm the local cache from quotes fetched by other workers."""
+        self.shared_cache.listen(self._store_local)
+
+    def get_price_age(self, symbol: str) -> Optional[float]:
+        """Seconds since the cached price for symbol was fetched, or None if never cached."""
+        fetched_at = self.cache_fetched_at.get(symbol)
+        if fetched_at is None:
+            return None
+        return max(0.0, time.time() - fetched_at)
+
+    def _record_hit(self, symbol: str):
+        """Count a price request for hot-symbol tracking."""
+        self.symbol_hits[symbol] = self.symbol_hits.get(symbol, 0) + 1
+
+    def _refresh_in_background(self, symbol: str):
+        """Start a background fetch for symbol unless one is already in flight."""
+        call, is_leader = self._inflight.acquire(symbol)
+        if not is_leader:
+            return
+
+        source = 'casablanca' if symbol.endswith('.MA') else 'yahoo'
+        self._batch_executor.submit(self._fetch_price_group, source, [symbol], {symbol: call})
+
+    def refresh_prices(self, symbols: list) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        Fetch symbols from their data sources regardless of cache state.
+
+        Symbols already being fetched are skipped. Used by PriceRefresher.
+        """
+        calls = {}
+        groups = {}
+        for symbol in dict.fromkeys(symbols):
+            call, is_leader = self._inflight.acquire(symbol)
+            if not is_leader:
+                continue
+            calls[symbol] = call
+            source = 'casablanca' if symbol.endswith('.MA') else 'yahoo'
+            groups.setdefault(source, []).append(symbol)
+
+        prices = {}
+        for source, group_symbols in groups.items():
+            try:
+                prices.update(self._fetch_price_group(source, group_symbols, calls))
+            except Exception as e:
+                logger.error(f"Price refresh failed for {source} symbols {group_symbols}: {e}")
+
+        return prices
+
+    def start_refresher(self, **kwargs) -> 'PriceRefresher':
+        """Start the background hot-symbol refresher (idempotent)."""
+        if self.refresher is None:
+            self.refresher = PriceRefresher(self, **kwargs)
+        self.refresher.start()
+        return self.refresher
 
     def get_stock_price(self, symbol: str) -> Tuple[Optional[Decimal], Optional[Decimal]]:
         """
@@ -84,14 +407,37 @@ class MarketDataService:
         2. Casablanca Stock Exchange web scraping (for .MA symbols)
         3. Cached data as fallback
 
+        Expired prices within the stale grace window are returned immediately
+        while a background refresh runs; use get_price_age for their age.
+
         Returns (current_price, previous_close) or (None, None) if not found.
         """
+        self._record_hit(symbol)
+
         # Check cache first
         cached_price = self._get_cached_price(symbol)
         if cached_price:
             logger.debug(f"Using cached price for {symbol}")
             return cached_price
 
+        stale_price = self._get_stale_price(symbol)
+        if stale_price:
+            logger.debug(f"Using stale price for {symbol} while refreshing")
+            self._refresh_in_background(symbol)
+            return stale_price
+
+        return self._inflight.do(symbol, self._load_price, symbol)
+
+    def _load_price(self, symbol: str) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """Leader side of a coalesced fetch: re-check the cache, then hit the data sources."""
+        cached_price = self._get_cached_price(symbol)
+        if cached_price:
+            return cached_price
+
+        return self._fetch_price(symbol)
+
+    def _fetch_price(self, symbol: str) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """Fetch a single symbol from its data sources (bypassing the cache) and cache the result."""
         try:
             # Route to appropriate data source based on symbol
             if symbol.endswith('.MA'):
@@ -127,7 +473,8 @@ class MarketDataService:
         Returns (current_price, previous_close) or (None, None) on failure.
         """
         try:
-            self._rate_limit('yahoo')
+            if not self._rate_limit('yahoo'):
+                return None, None
 
             # Create ticker object
             ticker = yf.Ticker(symbol)
@@ -233,9 +580,17 @@ class MarketDataService:
 
         This scrapes the official Casablanca bourse website for live prices using BeautifulSoup.
         Implements multiple scraping strategies for robustness.
+        Symbols quoted on the shared listing pages are served from the parsed
+        listing table; only the others fall back to per-ticker pages.
         """
+        listing_price = self.get_casablanca_listing().get(symbol.replace('.MA', '').upper())
+        if listing_price:
+            logger.debug(f"Casablanca listing price for {symbol}: {listing_price[0]} MAD (prev: {listing_price[1]} MAD)")
+            return listing_price
+
         try:
-            self._rate_limit('casablanca')
+            if not self._rate_limit('casablanca'):
+                return None, None
 
             # Convert symbol format (remove .MA if present for URL)
             clean_symbol = symbol.replace('.MA', '')
@@ -433,6 +788,122 @@ class MarketDataService:
 
         return None, None
 
+    def get_casablanca_listing(self) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        Get the parsed Casablanca listing table {ticker: (last, previous_close)}.
+
+        The listing pages are downloaded at most once per casablanca_listing_ttl;
+        concurrent callers share a single download.
+        """
+        if time.time() < self._casablanca_listing_expiry:
+            return self._casablanca_listing
+        return self._inflight.do('casablanca:listing', self._load_casablanca_listing)
+
+    def _load_casablanca_listing(self) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """Download and parse all listing pages, keeping the previous table on failure."""
+        if time.time() < self._casablanca_listing_expiry:
+            return self._casablanca_listing
+
+        if not self._rate_limit('casablanca'):
+            return self._casablanca_listing
+
+        table = {}
+        for url in self.casablanca_listing_urls:
+            try:
+                response = self.session.get(url, timeout=15)
+                response.raise_for_status()
+                table.update(self._parse_casablanca_listing(response.text))
+            except requests.RequestException as e:
+                logger.debug(f"Failed to fetch Casablanca listing {url}: {e}")
+            except Exception as e:
+                logger.debug(f"Error parsing Casablanca listing {url}: {e}")
+
+            if table:
+                break
+
+        if table:
+            logger.info(f"Parsed Casablanca listing: {len(table)} instruments")
+            self._casablanca_listing = table
+        else:
+            logger.warning("Casablanca listing unavailable, falling back to per-ticker pages")
+
+        # Failed refreshes are retried after the same window to avoid hammering the site
+        self._casablanca_listing_expiry = time.time() + self.casablanca_listing_ttl
+        return self._casablanca_listing
+
+    def _parse_casablanca_listing(self, content: Union[str, bytes]) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        Parse listing page HTML into {ticker: (last, previous_close)} using lxml.
+
+        Columns are located by header keywords. When no previous close column is
+        present it is derived from the variation column, else assumed unchanged.
+        """
+        document = lxml_html.fromstring(content)
+        table = {}
+
+        for html_table in document.iter('table'):
+            rows = html_table.xpath('.//tr')
+            if len(rows) < 2:
+                continue
+
+            headers = [cell.text_content().strip().lower() for cell in rows[0].xpath('./th|./td')]
+            columns = self._listing_columns(headers)
+            if columns is None:
+                continue
+            ticker_col, last_col, prev_col, change_col = columns
+
+            for row in rows[1:]:
+                cells = [cell.text_content().strip() for cell in row.xpath('./td|./th')]
+                if len(cells) <= max(c for c in columns if c is not None):
+                    continue
+
+                ticker = cells[ticker_col].upper()
+                last_text = self._clean_price_text(cells[last_col])
+                if not ticker or not last_text:
+                    continue
+
+                try:
+                    last_price = Decimal(last_text).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+                    previous_close = None
+
+                    if prev_col is not None:
+                        prev_text = self._clean_price_text(cells[prev_col])
+                        if prev_text:
+                            previous_close = Decimal(prev_text).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+
+                    if previous_close is None and change_col is not None:
+                        change_match = re.search(r'[-+]?\d+(?:[.,]\d+)?', cells[change_col].replace('\xa0', ''))
+                        if change_match:
+                            change_pct = Decimal(change_match.group(0).replace(',', '.')) / 100
+                            if change_pct != -1:
+                                previous_close = (last_price / (1 + change_pct)).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+                except (ValueError, InvalidOperation):
+                    continue
+
+                if last_price > 0:
+                    table[ticker] = (last_price, previous_close or last_price)
+
+        return table
+
+    @staticmethod
+    def _listing_columns(headers: list) -> Optional[Tuple[int, int, Optional[int], Optional[int]]]:
+        """Locate (ticker, last, previous close, variation) columns from header labels."""
+        def find(keywords, exclude=()):
+            for index, header in enumerate(headers):
+                if any(k in header for k in keywords) and not any(e in header for e in exclude):
+                    return index
+            return None
+
+        ticker_col = find(['ticker', 'code', 'symbole', 'symbol'])
+        prev_col = find(['veille', 'référence', 'reference', 'previous', 'clôture', 'close'])
+        change_col = find(['variation', 'var.', 'var ', 'change', '%'])
+        last_col = find(['dernier cours', 'cours', 'last', 'dernier', 'price', 'prix'],
+                        exclude=['veille', 'référence', 'reference', 'previous', 'clôture', 'close', '%', 'variation'])
+
+        if ticker_col is None or last_col is None:
+            return None
+        return ticker_col, last_col, prev_col, change_col
+
     def _clean_price_text(self, text: str) -> Optional[str]:
         """
         Clean and normalize price text from various Moroccan/formatting styles.
@@ -529,23 +1000,189 @@ class MarketDataService:
 
         return None, None
 
-    def get_multiple_prices(self, symbols: list) -> Dict[str, Tuple[Optional[Decimal], Optional[Decimal]]]:
+    def get_multiple_prices(self, symbols: list,
+                            deadline: Optional[float] = None) -> Dict[str, Tuple[Optional[Decimal], Optional[Decimal]]]:
         """
         Get prices for multiple symbols efficiently.
 
+        Cache hits are served immediately. Cache misses are grouped by data source
+        (one bulk Yahoo download for non-.MA symbols, one Casablanca pass for .MA
+        symbols) and the groups run concurrently on a bounded pool. Groups that
+        have not finished within `deadline` seconds are reported as (None, None);
+        they keep running in the background and warm the cache for the next call.
+
         Returns dict of {symbol: (current_price, previous_close)}
         """
+        if deadline is None:
+            deadline = self.batch_deadline
+
         results = {}
+        misses = []
+
+        for symbol in dict.fromkeys(symbols):
+            self._record_hit(symbol)
+            cached_price = self._get_cached_price(symbol)
+            if cached_price:
+                results[symbol] = cached_price
+                continue
+
+            stale_price = self._get_stale_price(symbol)
+            if stale_price:
+                results[symbol] = stale_price
+                self._refresh_in_background(symbol)
+            else:
+                misses.append(symbol)
+
+        if misses:
+            # Join fetches already in flight; lead the rest
+            calls = {}
+            followed = {}
+            groups = {}
+            for symbol in misses:
+                call, is_leader = self._inflight.acquire(symbol)
+                if not is_leader:
+                    followed[symbol] = call
+                    continue
+
+                cached_price = self._get_cached_price(symbol)
+                if cached_price:
+                    self._inflight.release(symbol, call, result=cached_price)
+                    results[symbol] = cached_price
+                    continue
+
+                calls[symbol] = call
+                source = 'casablanca' if symbol.endswith('.MA') else 'yahoo'
+                groups.setdefault(source, []).append(symbol)
+
+            started = time.time()
+            futures = {
+                self._batch_executor.submit(self._fetch_price_group, source, group_symbols, calls): source
+                for source, group_symbols in groups.items()
+            }
+            done, not_done = wait(futures, timeout=deadline)
+
+            for future in done:
+                try:
+                    results.update(future.result())
+                except Exception as e:
+                    logger.error(f"Batched {futures[future]} fetch failed: {e}")
+
+            for symbol, call in followed.items():
+                remaining = max(0.0, deadline - (time.time() - started))
+                if call.event.wait(remaining) and call.error is None and call.result and call.result[0] is not None:
+                    results[symbol] = call.result
+
+            if not_done:
+                pending = [futures[future] for future in not_done]
+                logger.warning(f"Batched price fetch exceeded {deadline}s deadline, partial results (pending: {pending})")
+
+        return {symbol: results.get(symbol, (None, None)) for symbol in symbols}
+
+    def _fetch_price_group(self, source: str, symbols: list,
+                           calls: Optional[Dict[str, _InFlightCall]] = None) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        Fetch all cache misses of one data source and cache the results.
+
+        Mirrors the fallback order of get_stock_price: Casablanca scraping, then
+        Yahoo Finance, then mock data for .MA symbols. `calls` holds the in-flight
+        entries this group leads; they are released with the fetched prices.
+        Groups run off the request thread, so rate-limited requests may queue.
+        """
+        prices = {}
+        try:
+            self._queue_for_tokens(self._fetch_group_prices, source, symbols, prices)
+        finally:
+            for symbol in symbols:
+                if calls and symbol in calls:
+                    self._inflight.release(symbol, calls[symbol], result=prices.get(symbol, (None, None)))
+
+        return prices
+
+    def _fetch_group_prices(self, source: str, symbols: list, prices: Dict[str, Tuple[Decimal, Decimal]]):
+        """Fill `prices` for one source group, caching each resolved symbol."""
+        unresolved = list(symbols)
+
+        if source == 'casablanca':
+            for symbol in symbols:
+                price_data = self._get_casablanca_price_real(symbol)
+                if price_data[0] is not None:
+                    prices[symbol] = price_data
+            unresolved = [s for s in symbols if s not in prices]
+
+        if unresolved:
+            prices.update(self._get_yahoo_prices_bulk(unresolved))
+            unresolved = [s for s in unresolved if s not in prices]
+
+        for symbol in unresolved:
+            if source == 'casablanca':
+                price_data = self._get_casablanca_price_mock(symbol)
+            else:
+                # Not in the bulk download (e.g. no daily bars), try the quote endpoint
+                price_data = self._get_yahoo_price(symbol)
+            if price_data[0] is not None:
+                prices[symbol] = price_data
+
+        for symbol, price_data in prices.items():
+            self._cache_price(symbol, price_data)
+
+    def _get_yahoo_prices_bulk(self, symbols: list) -> Dict[str, Tuple[Decimal, Decimal]]:
+        """
+        Fetch last and previous daily close for many symbols with one yfinance download.
+
+        Symbols missing from the response are omitted from the result.
+        """
+        if not symbols:
+            return {}
+
+        try:
+            if not self._rate_limit('yahoo'):
+                return {}
+            data = yf.download(
+                symbols,
+                period='5d',
+                interval='1d',
+                group_by='ticker',
+                auto_adjust=False,
+                progress=False,
+                threads=True
+            )
+        except Exception as e:
+            logger.warning(f"Yahoo Finance bulk download failed for {symbols}: {e}")
+            return {}
+
+        if data is None or data.empty:
+            return {}
+
+        prices = {}
+        grouped = getattr(data.columns, 'nlevels', 1) > 1
 
         for symbol in symbols:
-            price_data = self.get_stock_price(symbol)
-            results[symbol] = price_data
+            try:
+                if grouped:
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    closes = data[symbol]['Close'].dropna()
+                elif len(symbols) == 1:
+                    closes = data['Close'].dropna()
+                else:
+                    continue
+
+                if closes.empty:
+                    continue
+
+                current_price = Decimal(str(float(closes.iloc[-1]))).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+                if len(closes) >= 2:
+                    previous_close = Decimal(str(float(closes.iloc[-2]))).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+                else:
+                    previous_close = current_price
 
-            # Small delay to be respectful to APIs
-            import time
-            time.sleep(0.1)
+                if current_price > 0:
+                    prices[symbol] = (current_price, previous_close)
+            except (KeyError, ValueError, InvalidOperation, TypeError) as e:
+                logger.debug(f"Invalid bulk price data for {symbol}: {e}")
 
-        return results
+        logger.info(f"Yahoo Finance bulk prices: {len(prices)}/{len(symbols)} symbols")
+        return prices
 
     def calculate_pnl(self, symbol: str, side: str, quantity: Decimal, entry_price: Decimal) -> Optional[Decimal]:
         """
@@ -754,12 +1391,180 @@ class MarketDataService:
             }
         }
 
+    # Initial backfill depth per interval: as much as the provider serves
+    HISTORY_BACKFILL_PERIODS = {
+        '1m': '7d', '2m': '60d', '5m': '60d', '15m': '60d', '30m': '60d',
+        '60m': '730d', '90m': '60d', '1h': '730d',
+    }
+
+    HISTORY_PERIOD_DAYS = {
+        '1d': 1, '5d': 5, '1mo': 30, '3mo': 91, '6mo': 182,
+        '1y': 365, '2y': 730, '5y': 1826, '10y': 3652,
+    }
+
+    HISTORY_SYMBOL_PATTERN = re.compile(r'^[\^A-Z0-9][A-Z0-9.\-=^]{0,19}$')
+
+    def get_bars(self, symbol: str, interval: str = '1d', start: Optional[int] = None,
+                 end: Optional[int] = None, sync: bool = True) -> HistoryBars:
+        """
+        Get OHLCV bars for a symbol from the local history store.
+
+        Args:
+            symbol: Ticker symbol
+            interval: Provider interval (1m ... 3mo)
+            start, end: Optional inclusive bounds as unix seconds
+            sync: Backfill newer bars first if the stored series is stale
+
+        Returns:
+            HistoryBars backed by memory-mapped columns (possibly empty).
+        """
+        symbol = symbol.upper()
+        if sync and self._history_is_stale(symbol, interval) and self._history_allowed(symbol):
+            self.sync_history(symbol, interval)
+        return self.history_store.read(symbol, interval).between(start, end)
+
+    def _history_allowed(self, symbol: str) -> bool:
+        """
+        Whether a series may be backfilled and stored.
+
+        Allow-listed symbols always may; any other symbol only if the price
+        provider resolves it, so arbitrary client-supplied tickers never reach
+        the history provider or create series on disk.
+        """
+        if symbol in self.history_symbols:
+            return True
+        if self._get_cached_price(symbol) or self._get_stale_price(symbol):
+            return True
+        return self.get_stock_price(symbol)[0] is not None
+
+    def _history_is_stale(self, symbol: str, interval: str) -> bool:
+        """A series is stale when a newer bar should have completed and we have not checked recently."""
+        bar_seconds = INTERVAL_SECONDS.get(interval, 86400)
+        synced_at = self.history_synced_at.get((symbol, interval))
+        if synced_at is not None and time.monotonic() - synced_at < max(60, min(bar_seconds, 900)):
+            return False
+
+        last = self.history_store.last_timestamp(symbol, interval)
+        return last is None or last + 2 * bar_seconds <= time.time()
+
+    def sync_history(self, symbol: str, interval: str = '1d') -> Optional[int]:
+        """
+        Incrementally backfill the stored series for symbol/interval.
+
+        Only bars newer than the last stored timestamp are requested. Concurrent
+        callers for the same series share one upstream fetch.
+
+        Returns:
+            Number of bars appended, or None if the provider could not be queried.
+        """
+        symbol = symbol.upper()
+        return self._inflight.do(f"history:{symbol}:{interval}", self._sync_history, symbol, interval)
+
+    def _sync_history(self, symbol: str, interval: str) -> Optional[int]:
+        if not self._rate_limit('yahoo'):
+            return None
+        self.history_synced_at[(symbol, interval)] = time.monotonic()
+
+        last = self.history_store.last_timestamp(symbol, interval)
+        try:
+            ticker = yf.Ticker(symbol)
+            if last is None:
+                period = self.HISTORY_BACKFILL_PERIODS.get(interval, 'max')
+                hist = ticker.history(period=period, interval=interval)
+            else:
+                hist = ticker.history(start=datetime.fromtimestamp(last, timezone.utc), interval=interval)
+        except Exception as e:
+            logger.error(f"Error backfilling history for {symbol} ({interval}): {e}")
+            return None
+
+        bars = self._bars_from_frame(hist)
+        if len(bars) == 0:
+            self.history_forming[(symbol, interval)] = (time.monotonic(), bars)
+            return 0
+
+        # Only persist completed bars; the store is append-only and cannot revise a forming bar
+        bar_seconds = INTERVAL_SECONDS.get(interval, 86400)
+        cutoff = int(time.time()) - bar_seconds
+        completed = bars.between(end=cutoff)
+        self.history_forming[(symbol, interval)] = (time.monotonic(), bars.between(start=cutoff + 1))
+        appended = self.history_store.append(symbol, interval, completed)
+        if appended:
+            logger.info(f"Backfilled {appended} {interval} bars for {symbol}")
+        return appended
+
+    def _forming_bars(self, symbol: str, interval: str) -> HistoryBars:
+        """
+        The provider's current, still-forming bar(s) for a series.
+
+        Refreshed at most every few minutes (the last backfill also fills it);
+        under rate limiting the previous copy, possibly empty, is served.
+        """
+        bar_seconds = INTERVAL_SECONDS.get(interval, 86400)
+        cached = self.history_forming.get((symbol, interval))
+        if cached is not None and time.monotonic() - cached[0] < max(60, min(bar_seconds, 300)):
+            return cached[1]
+        forming = self._inflight.do(f"forming:{symbol}:{interval}", self._fetch_forming_bars, symbol, interval)
+        if forming is None:
+            return cached[1] if cached is not None else HistoryBars.empty()
+        return forming
+
+    def _fetch_forming_bars(self, symbol: str, interval: str) -> Optional[HistoryBars]:
+        if not self._rate_limit('yahoo'):
+            return None
+        bar_seconds = INTERVAL_SECONDS.get(interval, 86400)
+        now = int(time.time())
+        try:
+            hist = yf.Ticker(symbol).history(
+                start=datetime.fromtimestamp(now - 2 * bar_seconds, timezone.utc), interval=interval
+            )
+        except Exception as e:
+            logger.warning(f"Error fetching forming bar for {symbol} ({interval}): {e}")
+            return None
+
+        forming = self._bars_from_frame(hist).between(start=now - bar_seconds + 1)
+        self.history_forming[(symbol, interval)] = (time.monotonic(), forming)
+        return forming
+
+    @staticmethod
+    def _bars_from_frame(hist) -> HistoryBars:
+        """Convert a yfinance history DataFrame into HistoryBars without iterating rows."""
+        if hist is None or hist.empty:
+            return HistoryBars.empty()
+
+        hist = hist.dropna(subset=['Open', 'High', 'Low', 'Close'])
+        volume = hist['Volume'].fillna(0).to_numpy(dtype=float) if 'Volume' in hist else np.zeros(len(hist))
+        return HistoryBars(
+            time=hist.index.as_unit('s').asi8,
+            open=hist['Open'].to_numpy(dtype=float),
+            high=hist['High'].to_numpy(dtype=float),
+            low=hist['Low'].to_numpy(dtype=float),
+            close=hist['Close'].to_numpy(dtype=float),
+            volume=volume,
+        )
+
+    def _history_window_start(self, bars: HistoryBars, period: str, interval: str) -> Optional[int]:
+        """Start of the requested period, measured back from the newest available bar."""
+        if period == 'max' or len(bars) == 0:
+            return None
+
+        if period == 'ytd':
+            return int(datetime(datetime.now(timezone.utc).year, 1, 1, tzinfo=timezone.utc).timestamp())
+
+        bar_seconds = INTERVAL_SECONDS.get(interval, 86400)
+        end = min(time.time(), bars.last_timestamp + bar_seconds)
+        return int(end - self.HISTORY_PERIOD_DAYS.get(period, 30) * 86400)
+
     def get_history(self, symbol: str, period: str = '1mo', interval: str = '1d') -> Dict[str, any]:
         """
-        Get historical price data for a symbol using yfinance.
+        Get historical price data for a symbol from the local history store.
+
+        The store is backfilled incrementally from yfinance when a newer bar is
+        due, so repeated chart requests are served from disk without network calls.
+        The current forming bar comes from the provider (refreshed every few
+        minutes) and is appended to the response without being persisted.
 
         Args:
-            symbol: Stock/index symbol (e.g., '^GSPC', '^IXIC', '^DJI', 'GC=F')
+            symbol: Stock/index symbol (e.g., '^GSPC', '^IXIC', '^DJI', 'GC=F', 'AAPL')
             period: Valid periods: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
             interval: Valid intervals: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo
 
@@ -767,23 +1572,44 @@ class MarketDataService:
             Dictionary with historical data formatted for charts, or error dict on failure.
         """
         try:
-            self._rate_limit('yahoo')
-
             # Validate symbol
-            allowed_symbols = ['^GSPC', '^IXIC', '^DJI', 'GC=F']
-            if symbol not in allowed_symbols:
+            symbol = symbol.upper()
+            if not self.HISTORY_SYMBOL_PATTERN.match(symbol):
                 return {
-                    'error': f'Symbol {symbol} not supported. Allowed symbols: {", ".join(allowed_symbols)}',
+                    'error': f'Symbol {symbol} not supported',
                     'success': False
                 }
 
-            # Create ticker object
-            ticker = yf.Ticker(symbol)
+            if not self._history_allowed(symbol):
+                return {
+                    'error': f'Symbol {symbol} not supported',
+                    'symbol': symbol,
+                    'success': False
+                }
 
-            # Fetch historical data
-            hist = ticker.history(period=period, interval=interval)
+            if self._history_is_stale(symbol, interval):
+                synced = self.sync_history(symbol, interval)
+                if synced is None and len(self.history_store.read(symbol, interval)) == 0:
+                    return {
+                        'error': 'Market data rate limit reached, retry shortly',
+                        'symbol': symbol,
+                        'period': period,
+                        'interval': interval,
+                        'success': False
+                    }
+
+            series = self.history_store.read(symbol, interval)
+            bars = series.between(start=self._history_window_start(series, period, interval))
 
-            if hist.empty:
+            # The store only holds completed bars; show the forming one as the provider would
+            forming = self._forming_bars(symbol, interval)
+            if len(bars) and len(forming):
+                forming = forming.between(start=bars.last_timestamp + 1)
+            if len(forming):
+                bars = HistoryBars(*(np.concatenate([getattr(bars, c), getattr(forming, c)])
+                                     for c in HistoryBars.__slots__))
+
+            if len(bars) == 0:
                 logger.warning(f"No historical data available for {symbol} (period={period}, interval={interval})")
                 return {
                     'error': f'No historical data available for {symbol}',
@@ -794,23 +1620,17 @@ class MarketDataService:
                 }
 
             # Format data for TradingView Lightweight Charts
-            chart_data = []
-            for timestamp, row in hist.iterrows():
-                # Convert timestamp to Unix timestamp (seconds)
-                if hasattr(timestamp, 'timestamp'):
-                    time_value = int(timestamp.timestamp())
-                else:
-                    # Handle pandas Timestamp
-                    time_value = int(timestamp.value / 1e9) if hasattr(timestamp, 'value') else int(timestamp)
-
-                chart_data.append({
-                    'time': time_value,
-                    'open': round(float(row['Open']), 2),
-                    'high': round(float(row['High']), 2),
-                    'low': round(float(row['Low']), 2),
-                    'close': round(float(row['Close']), 2),
-                    'volume': int(row['Volume']) if 'Volume' in row and not (hasattr(row['Volume'], 'isna') and row['Volume'].isna()) else 0
-                })
+            chart_data = [
+                {'time': t, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+                for t, o, h, l, c, v in zip(
+                    bars.time.tolist(),
+                    np.round(bars.open, 2).tolist(),
+                    np.round(bars.high, 2).tolist(),
+                    np.round(bars.low, 2).tolist(),
+                    np.round(bars.close, 2).tolist(),
+                    np.nan_to_num(bars.volume).astype(np.int64).tolist(),
+                )
+            ]
 
             logger.info(f"Retrieved {len(chart_data)} data points for {symbol} (period={period}, interval={interval})")
 
@@ -835,5 +1655,76 @@ class MarketDataService:
             }
 
 
+class PriceRefresher:
+    """
+    Background refresher for the most requested symbols.
+
+    Every `interval` seconds, refreshes the `top_n` hottest symbols whose cached
+    price expires within `refresh_ahead` seconds, so request threads (e.g. trade
+    execution holding a row lock) rarely pay provider latency. Hit counts are
+    halved each cycle so the hot set follows current demand.
+    """
+
+    def __init__(self, service: MarketDataService, top_n: int = 50,
+                 interval: float = 15.0, refresh_ahead: float = 30.0):
+        self.service = service
+        self.top_n = top_n
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def hot_symbols(self) -> list:
+        """Most requested symbols, hottest first."""
+        hits = dict(self.service.symbol_hits)
+        return sorted(hits, key=hits.get, reverse=True)[:self.top_n]
+
+    def run_once(self) -> list:
+        """Refresh hot symbols that are about to expire. Returns the refreshed symbols."""
+        now = time.time()
+        due = [
+            symbol for symbol in self.hot_symbols()
+            if self.service.cache_expiry.get(symbol, 0) - now <= self.refresh_ahead
+        ]
+
+        if due:
+            logger.debug(f"Refreshing {len(due)} hot symbols ahead of expiry")
+            self.service.refresh_prices(due)
+
+        # Decay hit counts so symbols nobody asks for anymore drop out
+        hits = self.service.symbol_hits
+        for symbol in list(hits):
+            remaining = hits.get(symbol, 0) // 2
+            if remaining:
+                hits[symbol] = remaining
+            else:
+                hits.pop(symbol, None)
+
+        return due
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Price refresher cycle failed: {e}", exc_info=True)
+
+    def start(self):
+        """Start the refresher thread if it is not running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='price-refresher', daemon=True)
+        self._thread.start()
+        logger.info(f"Price refresher started (top_n={self.top_n}, interval={self.interval}s)")
+
+    def stop(self):
+        """Stop the refresher thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+
 # Global instance
 market_data = MarketDataService()
\ No newline at end of file
@@ -11,12 +11,24 @@ Professional order management system supporting:
 """
 
 from decimal import Decimal, ROUND_DOWN
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
+import bisect
+import gc
+import itertools
+import logging
+import operator
+import os
+import queue
+import threading
+import time
 import uuid
 
 from app.market_data import market_data
+from app.infrastructure.order_journal import OrderJournal
+
+logger = logging.getLogger(__name__)
 
 
 class OrderType(Enum):
@@ -198,12 +210,374 @@ class Order:
         }
 
 
+# (threshold, sequence, order_id); the sequence keeps time priority among equal prices
+BookEntry = Tuple[Decimal, int, str]
+_entry_price = operator.itemgetter(0)
+
+
+def _trigger_threshold(order: Order) -> Optional[Tuple[str, Decimal]]:
+    """
+    Which way the price must cross for the order to fire, and at what level.
+
+    Mirrors Order.should_trigger: 'above' orders fire once price >= threshold,
+    'below' orders once price <= threshold. None for orders that never fire on
+    price alone (trailing stops are tracked separately).
+    """
+    buy = order.side == OrderSide.BUY
+    if order.order_type == OrderType.LIMIT and order.limit_price is not None:
+        return ('below' if buy else 'above'), order.limit_price
+    if order.order_type == OrderType.STOP_LOSS and order.stop_price is not None:
+        return ('below' if buy else 'above'), order.stop_price
+    if order.order_type == OrderType.TAKE_PROFIT and order.take_profit_price is not None:
+        return ('above' if buy else 'below'), order.take_profit_price
+    return None
+
+
+def _trigger_reason(order: Order, price: Decimal) -> str:
+    """The reason Order.should_trigger gives for a triggered order."""
+    if order.order_type == OrderType.LIMIT:
+        return f"{'Buy' if order.side == OrderSide.BUY else 'Sell'} limit triggered at {price}"
+    if order.order_type == OrderType.STOP_LOSS:
+        return f"Stop loss triggered at {price}"
+    if order.order_type == OrderType.TAKE_PROFIT:
+        return f"Take profit triggered at {price}"
+    return f"Trailing stop triggered at {price}"
+
+
+class _MarkGroup:
+    """Trailing stops sharing one high-water mark, sorted by (percent, sequence)."""
+
+    __slots__ = ('mark', 'entries')
+
+    def __init__(self, mark: Decimal, entries: List[BookEntry]):
+        self.mark = mark
+        self.entries = entries
+
+
+class TrailingStopBook:
+    """
+    Trailing stops of one symbol and side, grouped by high-water mark.
+
+    BUY trailing stops track the highest price seen and fire at
+    mark * (1 - percent); SELL ones track the lowest and fire at
+    mark * (1 + percent). A new extreme merges every group it passes into one
+    (smaller groups into the largest), so a tick costs O(groups + k) instead of
+    touching every order. Within a group the orders that fire are a prefix.
+    """
+
+    def __init__(self, side: OrderSide):
+        self.side = side
+        self._marks: List[Decimal] = []
+        self._groups: Dict[Decimal, _MarkGroup] = {}
+        self._group_of: Dict[str, Optional[_MarkGroup]] = {}
+        # Added since the last tick; their mark is the next price, like should_trigger
+        self._unmarked: List[BookEntry] = []
+
+    def __len__(self) -> int:
+        return len(self._group_of)
+
+    def add(self, percent: Decimal, sequence: int, order_id: str, mark: Optional[Decimal] = None):
+        """Add a trailing stop; `mark` restores the high-water mark of a recovered order."""
+        entry = (percent, sequence, order_id)
+        if mark is None:
+            self._unmarked.append(entry)
+            self._group_of[order_id] = None
+            return
+
+        group = self._groups.get(mark)
+        if group is None:
+            group = self._groups[mark] = _MarkGroup(mark, [])
+            bisect.insort(self._marks, mark)
+        bisect.insort(group.entries, entry)
+        self._group_of[order_id] = group
+
+    def remove(self, order_id: str) -> bool:
+        if order_id not in self._group_of:
+            return False
+        group = self._group_of.pop(order_id)
+        if group is None:
+            self._unmarked = [e for e in self._unmarked if e[2] != order_id]
+            return True
+        group.entries = [e for e in group.entries if e[2] != order_id]
+        if not group.entries:
+            self._drop(group)
+        return True
+
+    def mark_of(self, order_id: str) -> Optional[Decimal]:
+        """Current high-water mark of a resting order (None before its first tick)."""
+        group = self._group_of.get(order_id)
+        return group.mark if group else None
+
+    def on_price(self, price: Decimal) -> List[Tuple[BookEntry, Decimal]]:
+        """Apply a tick; returns the triggered entries with the mark they fired from."""
+        self._advance(price)
+
+        triggered = []
+        for mark in list(self._marks):
+            group = self._groups[mark]
+            fired = 0
+            for percent, _, _ in group.entries:
+                if self.side == OrderSide.BUY:
+                    hit = price <= mark * (1 - percent)
+                else:
+                    hit = price >= mark * (1 + percent)
+                if not hit:
+                    break
+                fired += 1
+            if fired:
+                for entry in group.entries[:fired]:
+                    del self._group_of[entry[2]]
+                    triggered.append((entry, mark))
+                del group.entries[:fired]
+                if not group.entries:
+                    self._drop(group)
+        return triggered
+
+    def _advance(self, price: Decimal):
+        """Move every group the price has passed (and new orders) onto a group at price."""
+        if self.side == OrderSide.BUY:
+            passed = self._marks[:bisect.bisect_right(self._marks, price)]
+        else:
+            passed = self._marks[bisect.bisect_left(self._marks, price):]
+        if not passed and not self._unmarked:
+            return
+
+        groups = [self._groups[m] for m in passed]
+        for group in groups:
+            self._drop(group)
+        if self._unmarked:
+            groups.append(_MarkGroup(price, sorted(self._unmarked)))
+            self._unmarked = []
+
+        groups.sort(key=lambda g: len(g.entries))
+        target = groups.pop()
+        target.mark = price
+        for entry in target.entries:
+            self._group_of[entry[2]] = target
+        for group in groups:
+            for entry in group.entries:
+                bisect.insort(target.entries, entry)
+                self._group_of[entry[2]] = target
+
+        bisect.insort(self._marks, price)
+        self._groups[price] = target
+
+    def _drop(self, group: _MarkGroup):
+        del self._groups[group.mark]
+        del self._marks[bisect.bisect_left(self._marks, group.mark)]
+
+
+class PriceTriggerBook:
+    """
+    Resting orders of one symbol indexed by trigger price.
+
+    Orders that fire when the price rises to their threshold (sell limits, sell
+    stop-losses, buy take-profits) sit in one list sorted ascending, orders that
+    fire when it falls to it (buy limits, buy stop-losses, sell take-profits) in
+    another. A tick finds the crossed prefix/suffix with one bisect, so it costs
+    O(log n + k) for k triggered orders. Trailing stops are kept in
+    TrailingStopBooks.
+    """
+
+    def __init__(self):
+        self._above: List[BookEntry] = []
+        self._below: List[BookEntry] = []
+        self._trailing = {side: TrailingStopBook(side) for side in OrderSide}
+        # order_id -> (list, entry) or trailing side
+        self._location: Dict[str, Tuple[Any, Optional[BookEntry]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._location)
+
+    def add(self, order: Order, sequence: int) -> bool:
+        """Index a resting order; False if it can never trigger on price."""
+        if order.order_type == OrderType.TRAILING_STOP:
+            if not order.trailing_stop_percent:
+                return False
+            self._trailing[order.side].add(order.trailing_stop_percent, sequence, order.order_id,
+                                           order.highest_price_since_entry)
+            self._location[order.order_id] = (order.side, None)
+            return True
+
+        threshold = _trigger_threshold(order)
+        if threshold is None:
+            return False
+        direction, price = threshold
+        book = self._above if direction == 'above' else self._below
+        entry = (price, sequence, order.order_id)
+        bisect.insort(book, entry)
+        self._location[order.order_id] = (book, entry)
+        return True
+
+    def load(self, orders: List[Tuple[Order, int]]):
+        """Index many (order, sequence) pairs at once, sorting each list once instead of per insert."""
+        above, below = [], []
+        for order, sequence in orders:
+            threshold = None if order.order_type == OrderType.TRAILING_STOP else _trigger_threshold(order)
+            if threshold is None:
+                self.add(order, sequence)
+                continue
+            direction, price = threshold
+            entry = (price, sequence, order.order_id)
+            (above if direction == 'above' else below).append(entry)
+            self._location[order.order_id] = (self._above if direction == 'above' else self._below, entry)
+        # Entries arrive in sequence order, so a stable sort on price alone gives (price, sequence) order
+        if above:
+            self._above.extend(above)
+            self._above.sort(key=_entry_price)
+        if below:
+            self._below.extend(below)
+            self._below.sort(key=_entry_price)
+
+    def remove(self, order_id: str) -> bool:
+        location = self._location.pop(order_id, None)
+        if location is None:
+            return False
+        book, entry = location
+        if entry is None:
+            return self._trailing[book].remove(order_id)
+        index = bisect.bisect_left(book, entry)
+        if index < len(book) and book[index] == entry:
+            del book[index]
+        return True
+
+    def trailing_mark(self, order: Order) -> Optional[Decimal]:
+        return self._trailing[order.side].mark_of(order.order_id)
+
+    def crossed(self, price: Decimal) -> List[Tuple[int, str, Optional[Decimal]]]:
+        """
+        Pop every order this price triggers.
+
+        Returns (sequence, order_id, trailing mark or None) in time priority.
+        """
+        triggered = []
+
+        # Thresholds <= price: a prefix of the ascending list
+        count = bisect.bisect_right(self._above, (price, float('inf')))
+        if count:
+            triggered.extend((seq, order_id, None) for _, seq, order_id in self._above[:count])
+            del self._above[:count]
+
+        # Thresholds >= price: a suffix
+        start = bisect.bisect_left(self._below, (price,))
+        if start < len(self._below):
+            triggered.extend((seq, order_id, None) for _, seq, order_id in self._below[start:])
+            del self._below[start:]
+
+        for book in self._trailing.values():
+            triggered.extend((seq, order_id, mark) for (_, seq, order_id), mark in book.on_price(price))
+
+        for _, order_id, _ in triggered:
+            del self._location[order_id]
+        triggered.sort()
+        return triggered
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+# Enum members by value; a dict lookup is much cheaper than Enum(value) during recovery
+_SIDES = {member.value: member for member in OrderSide}
+_TYPES = {member.value: member for member in OrderType}
+_STATUSES = {member.value: member for member in OrderStatus}
+
+
+def _order_to_row(order: Order) -> list:
+    """Journal row for an order; the order id comes first as the journal key."""
+    def dec(value):
+        return str(value) if value is not None else None
+
+    def ts(value):
+        return value.isoformat() if value is not None else None
+
+    return [
+        order.order_id, order.challenge_id, order.symbol, order.side.value, str(order.quantity),
+        order.order_type.value, dec(order.limit_price), dec(order.stop_price),
+        dec(order.take_profit_price), dec(order.trailing_stop_percent), order.time_in_force,
+        order.status.value, order.parent_order_id, order.linked_order_id,
+        str(order.filled_quantity), str(order.remaining_quantity), dec(order.average_fill_price),
+        ts(order.created_at), ts(order.updated_at), ts(order.expires_at),
+        dec(order.highest_price_since_entry), dec(order.trailing_stop_price), order.metadata,
+    ]
+
+
+def _order_from_row(row: list, decimals: Optional[Dict[str, Decimal]] = None) -> Order:
+    """
+    Rebuild an order from its journal row without re-running validation.
+
+    `decimals` memoizes parsed amounts across rows; quantities and price levels
+    repeat a lot, and Decimals are immutable, so recovered orders can share them.
+    """
+    (order_id, challenge_id, symbol, side, quantity, order_type, limit_price, stop_price,
+     take_profit_price, trailing_stop_percent, time_in_force, status, parent_order_id,
+     linked_order_id, filled_quantity, remaining_quantity, average_fill_price, created_at,
+     updated_at, expires_at, highest_price, trailing_stop_price, metadata) = row
+
+    if decimals is None:
+        decimals = {}
+
+    def dec(value):
+        if value is None:
+            return None
+        parsed = decimals.get(value)
+        if parsed is None:
+            parsed = decimals[value] = Decimal(value)
+        return parsed
+
+    order = Order.__new__(Order)
+    order.__dict__ = {
+        'order_id': order_id,
+        'challenge_id': challenge_id,
+        'symbol': symbol,
+        'side': _SIDES[side],
+        'quantity': dec(quantity),
+        'order_type': _TYPES[order_type],
+        'limit_price': dec(limit_price),
+        'stop_price': dec(stop_price),
+        'take_profit_price': dec(take_profit_price),
+        'trailing_stop_percent': dec(trailing_stop_percent),
+        'time_in_force': time_in_force,
+        'status': _STATUSES[status],
+        'parent_order_id': parent_order_id,
+        'linked_order_id': linked_order_id,
+        'filled_quantity': dec(filled_quantity),
+        'remaining_quantity': dec(remaining_quantity),
+        'average_fill_price': dec(average_fill_price),
+        'created_at': _datetime(created_at),
+        'updated_at': _datetime(updated_at) if updated_at != created_at else None,
+        'expires_at': _datetime(expires_at),
+        'highest_price_since_entry': dec(highest_price),
+        'trailing_stop_price': dec(trailing_stop_price),
+        'metadata': metadata,
+    }
+    if order.updated_at is None:
+        order.updated_at = order.created_at
+    return order
+
+
 class OrderEngine:
     """Professional order execution engine."""
 
-    def __init__(self):
+    def __init__(self, journal: Optional[OrderJournal] = None,
+                 history_retention: Optional[timedelta] = None):
         self.active_orders: Dict[str, Order] = {}
         self.order_history: List[Order] = []
+        # Every order by id, and resting orders per challenge
+        self.orders: Dict[str, Order] = {}
+        self.active_by_challenge: Dict[str, Dict[str, Order]] = {}
+        # Resting orders per symbol, indexed by trigger price
+        self.trigger_books: Dict[str, PriceTriggerBook] = {}
+        self._sequence = itertools.count()
+        # Orders are triggered from the OrderMonitor thread as well as request threads
+        self._lock = threading.RLock()
+        # Filled/cancelled/expired orders older than this are dropped at each snapshot
+        self.history_retention = history_retention if history_retention is not None else timedelta(
+            days=float(os.getenv('ORDER_HISTORY_RETENTION_DAYS', '30'))
+        )
+        self.journal = None
+        if journal is not None:
+            self.recover(journal)
 
     def create_order(
         self,
@@ -251,8 +625,10 @@ class OrderEngine:
             return order
         else:
             # Add to active orders for monitoring
-            self.active_orders[order_id] = order
-            order.status = OrderStatus.OPEN
+            with self._lock:
+                order.status = OrderStatus.OPEN
+                self._activate(order)
+                self._journal(order)
 
         return order
 
@@ -297,14 +673,119 @@ class OrderEngine:
         if trailing_stop_percent and (trailing_stop_percent <= 0 or trailing_stop_percent >= 1):
             raise ValueError("Trailing stop percentage must be between 0 and 1")
 
-    def execute_order(self, order: Order) -> Dict[str, Any]:
+    def _book(self, symbol: str) -> PriceTriggerBook:
+        book = self.trigger_books.get(symbol)
+        if book is None:
+            book = self.trigger_books[symbol] = PriceTriggerBook()
+        return book
+
+    def _activate(self, order: Order):
+        """Index a resting order (caller holds the lock)."""
+        self.active_orders[order.order_id] = order
+        self.orders[order.order_id] = order
+        self.active_by_challenge.setdefault(order.challenge_id, {})[order.order_id] = order
+        self._book(order.symbol).add(order, next(self._sequence))
+
+    def _archive(self, order: Order):
+        """Move an order to history (caller holds the lock)."""
+        self.order_history.append(order)
+        self.orders[order.order_id] = order
+        if self.active_orders.pop(order.order_id, None) is not None:
+            self._book(order.symbol).remove(order.order_id)
+            challenge_orders = self.active_by_challenge.get(order.challenge_id)
+            if challenge_orders is not None:
+                challenge_orders.pop(order.order_id, None)
+                if not challenge_orders:
+                    del self.active_by_challenge[order.challenge_id]
+
+    def _journal(self, order: Order):
+        """Log an order mutation, compacting once enough have accumulated (caller holds the lock)."""
+        if self.journal is not None and self.journal.append(_order_to_row(order)):
+            self.snapshot()
+
+    def snapshot(self):
+        """
+        Write a compacted snapshot and empty the write-ahead log.
+
+        The snapshot holds every resting order plus the history still within
+        history_retention; older finished orders are dropped from memory too,
+        so snapshots and recovery stay proportional to recent activity.
+        """
+        if self.journal is None:
+            return
+        with self._lock:
+            self._expire_history(datetime.now(timezone.utc) - self.history_retention)
+
+            # Trailing marks move on every tick without being logged; capture them here
+            for order in self.active_orders.values():
+                if order.order_type == OrderType.TRAILING_STOP:
+                    mark = self._book(order.symbol).trailing_mark(order)
+                    if mark is not None:
+                        order.highest_price_since_entry = mark
+            self.journal.compact(_order_to_row(order) for order in self.orders.values())
+
+    def _expire_history(self, cutoff: datetime):
+        """Forget finished orders last updated before cutoff (caller holds the lock)."""
+        expired = {
+            order_id for order_id, order in self.orders.items()
+            if order_id not in self.active_orders and order.updated_at < cutoff
+        }
+        if not expired:
+            return
+        for order_id in expired:
+            del self.orders[order_id]
+        self.order_history = [order for order in self.order_history if order.order_id not in expired]
+
+    def recover(self, journal: OrderJournal) -> int:
+        """
+        Rebuild state from the journal's snapshot plus log tail, then journal to it.
+
+        Resting orders are re-indexed in creation order, trailing stops with the
+        high-water mark of the last snapshot. Returns the number of orders loaded.
+        """
+        # Bulk-allocating 100k orders otherwise spends much of its time in cyclic GC passes
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            count = self._recover(journal)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        logger.info(f"Recovered {count} orders ({len(self.active_orders)} resting) from the order journal")
+        return count
+
+    def _recover(self, journal: OrderJournal) -> int:
+        rows = journal.load()
+        with self._lock:
+            resting: Dict[str, List[Tuple[Order, int]]] = {}
+            decimals: Dict[str, Decimal] = {}
+            for row in rows:
+                order = _order_from_row(row, decimals)
+                order_id = order.order_id
+                self.orders[order_id] = order
+                if order.status in (OrderStatus.OPEN, OrderStatus.PENDING):
+                    self.active_orders[order_id] = order
+                    self.active_by_challenge.setdefault(order.challenge_id, {})[order_id] = order
+                    resting.setdefault(order.symbol, []).append((order, next(self._sequence)))
+                else:
+                    self.order_history.append(order)
+
+            for symbol, orders in resting.items():
+                self._book(symbol).load(orders)
+            self.journal = journal
+        return len(rows)
+
+    def execute_order(self, order: Order, current_price: Optional[Decimal] = None) -> Dict[str, Any]:
         """
         Execute an order against current market prices.
 
+        current_price is the price that triggered the order; it is fetched when omitted.
         Returns execution details.
         """
         # Get current market price
-        current_price, _ = market_data.get_stock_price(order.symbol)
+        if current_price is None:
+            current_price, _ = market_data.get_stock_price(order.symbol)
 
         if current_price is None:
             raise ValueError(f"Unable to get market price for {order.symbol}")
@@ -320,15 +801,17 @@ class OrderEngine:
         fill_result = order.fill_order(execution_price, order.quantity)
 
         # Move to history
-        self.order_history.append(order)
-        if order.order_id in self.active_orders:
-            del self.active_orders[order.order_id]
+        with self._lock:
+            self._archive(order)
+            self._journal(order)
 
         return {
             'order_id': order.order_id,
+            'challenge_id': order.challenge_id,
             'symbol': order.symbol,
             'side': order.side.value,
             'quantity': order.quantity,
+            'fill_quantity': fill_result['fill_quantity'],
             'execution_price': execution_price,
             'total_value': execution_price * order.quantity,
             'status': order.status.value,
@@ -339,65 +822,86 @@ class OrderEngine:
         """
         Monitor active orders and trigger executions.
 
-        Returns list of triggered orders.
+        Fetches one price per symbol with resting orders and lets that symbol's
+        trigger book pop the crossed orders. Returns list of triggered orders.
         """
         triggered_orders = []
 
-        for order_id, order in list(self.active_orders.items()):
+        for symbol, book in list(self.trigger_books.items()):
+            if not book:
+                continue
             try:
-                current_price, _ = market_data.get_stock_price(order.symbol)
+                current_price, _ = market_data.get_stock_price(symbol)
+            except Exception as e:
+                logger.error(f"Error fetching price for {symbol} while monitoring orders: {e}")
+                continue
+
+            if current_price is None:
+                continue
+
+            triggered_orders.extend(self.process_price(symbol, current_price))
 
-                if current_price is None:
-                    continue
+        return triggered_orders
 
-                should_trigger, reason = order.should_trigger(current_price)
+    def process_price(self, symbol: str, current_price: Decimal) -> List[Dict[str, Any]]:
+        """Execute the resting orders of one symbol that this price triggers, in time priority."""
+        with self._lock:
+            return self._process_price(symbol, current_price)
+
+    def _process_price(self, symbol: str, current_price: Decimal) -> List[Dict[str, Any]]:
+        book = self.trigger_books.get(symbol)
+        if not book:
+            return []
+
+        executions = []
+        for sequence, order_id, trailing_mark in book.crossed(current_price):
+            order = self.active_orders.get(order_id)
+            if order is None:
+                continue
+            try:
+                if trailing_mark is not None:
+                    order.highest_price_since_entry = trailing_mark
+                    factor = 1 - order.trailing_stop_percent if order.side == OrderSide.BUY else 1 + order.trailing_stop_percent
+                    order.trailing_stop_price = trailing_mark * factor
 
-                if should_trigger:
-                    execution_result = self.execute_order(order)
-                    execution_result['trigger_reason'] = reason
-                    triggered_orders.append(execution_result)
+                execution_result = self.execute_order(order, current_price)
+                execution_result['trigger_reason'] = _trigger_reason(order, current_price)
+                executions.append(execution_result)
 
             except Exception as e:
-                # Log error but continue monitoring other orders
-                print(f"Error monitoring order {order_id}: {e}")
+                # Log error but continue monitoring other orders; the order stays resting
+                logger.error(f"Error executing triggered order {order_id}: {e}")
+                if order_id in self.active_orders:
+                    book.add(order, sequence)
 
-        return triggered_orders
+        return executions
 
     def cancel_order(self, order_id: str) -> Optional[Order]:
         """Cancel an active order."""
-        if order_id in self.active_orders:
-            order = self.active_orders[order_id]
-            order.status = OrderStatus.CANCELLED
-            order.updated_at = datetime.now(timezone.utc)
+        with self._lock:
+            if order_id in self.active_orders:
+                order = self.active_orders[order_id]
+                order.status = OrderStatus.CANCELLED
+                order.updated_at = datetime.now(timezone.utc)
 
-            # Move to history
-            self.order_history.append(order)
-            del self.active_orders[order_id]
+                # Move to history
+                self._archive(order)
+                self._journal(order)
 
-            return order
+                return order
 
         return None
 
     def get_order(self, order_id: str) -> Optional[Order]:
         """Get order by ID."""
-        if order_id in self.active_orders:
-            return self.active_orders[order_id]
-
-        # Check history
-        for order in self.order_history:
-            if order.order_id == order_id:
-                return order
-
-        return None
+        return self.orders.get(order_id)
 
     def get_active_orders(self, challenge_id: Optional[str] = None) -> List[Order]:
         """Get active orders, optionally filtered by challenge."""
-        orders = list(self.active_orders.values())
-
         if challenge_id:
-            orders = [o for o in orders if o.challenge_id == challenge_id]
+            return list(self.active_by_challenge.get(challenge_id, {}).values())
 
-        return orders
+        return list(self.active_orders.values())
 
     def create_bracket_order(
         self,
@@ -478,5 +982,118 @@ class OrderEngine:
         return orders
 
 
+class OrderMonitor:
+    """
+    Tick-driven order triggering.
+
+    Subscribes to every quote the market data service caches and evaluates only
+    that symbol's trigger book, on a daemon thread so request threads that
+    happened to fetch the price never pay for it. Ticks are processed in arrival
+    order (trailing stops depend on every extreme). Fills are published on the
+    event bus as ORDER_FILLED, with Decimal amounts as strings.
+
+    Symbols with resting orders that nobody else is fetching are refreshed
+    every `refresh_interval` seconds so their orders still see prices.
+    """
+
+    EVENT_TYPE = 'ORDER_FILLED'
+
+    def __init__(self, engine: OrderEngine = None, market_data_service=None, bus=None,
+                 refresh_interval: float = None):
+        self.engine = engine or order_engine
+        self.market_data = market_data_service or market_data
+        self.bus = bus
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(
+            os.getenv('ORDER_MONITOR_REFRESH_INTERVAL', '15')
+        )
+        self.ticks_processed = 0
+        self.fills_published = 0
+        self._ticks: 'queue.Queue' = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._subscribed = False
+
+    def on_price(self, symbol: str, price: Decimal, fetched_at: float):
+        """Price listener: queue the tick if the symbol has resting orders."""
+        if self.engine.trigger_books.get(symbol):
+            self._ticks.put((symbol, price))
+
+    def process_tick(self, symbol: str, price: Decimal) -> List[Dict[str, Any]]:
+        """Trigger the symbol's crossed orders and publish their fills."""
+        executions = self.engine.process_price(symbol, price)
+        self.ticks_processed += 1
+        for execution in executions:
+            self._publish(execution)
+        return executions
+
+    @staticmethod
+    def _event_payload(execution: Dict[str, Any]) -> Dict[str, Any]:
+        """The execution with Decimals as exact strings, so the WebSocket forwarder can JSON-encode it."""
+        return {key: str(value) if isinstance(value, Decimal) else value for key, value in execution.items()}
+
+    def _publish(self, execution: Dict[str, Any]):
+        bus = self.bus
+        if bus is None:
+            from src.core.event_bus import event_bus as bus
+        try:
+            bus.emit(self.EVENT_TYPE, self._event_payload(execution))
+            self.fills_published += 1
+        except Exception as e:
+            logger.error(f"Failed to publish fill for order {execution.get('order_id')}: {e}")
+
+    def refresh_idle_symbols(self) -> List[str]:
+        """Refresh resting symbols whose cached price is older than refresh_interval."""
+        idle = []
+        for symbol, book in list(self.engine.trigger_books.items()):
+            if not book:
+                continue
+            age = self.market_data.get_price_age(symbol)
+            if age is None or age >= self.refresh_interval:
+                idle.append(symbol)
+        if idle:
+            # The refreshed quotes come back through on_price
+            self.market_data.refresh_prices(idle)
+        return idle
+
+    def _run(self):
+        last_refresh = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                symbol, price = self._ticks.get(timeout=min(self.refresh_interval, 1.0))
+            except queue.Empty:
+                symbol = None
+
+            try:
+                if symbol is not None:
+                    self.process_tick(symbol, price)
+                if time.monotonic() - last_refresh >= self.refresh_interval:
+                    last_refresh = time.monotonic()
+                    self.refresh_idle_symbols()
+            except Exception as e:
+                logger.error(f"Order monitor tick failed: {e}", exc_info=True)
+
+    def start(self):
+        """Subscribe to price updates and start the monitor thread if it is not running."""
+        if not self._subscribed:
+            self.market_data.add_price_listener(self.on_price)
+            self._subscribed = True
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='order-monitor', daemon=True)
+        self._thread.start()
+        logger.info(f"Order monitor started (refresh_interval={self.refresh_interval}s)")
+
+    def stop(self):
+        """Stop the monitor thread; queued ticks are kept for the next start."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+
 # Global order engine instance
-order_engine = OrderEngine()
\ No newline at end of file
+order_engine = OrderEngine()
+
+# Tick-driven trigger daemon for the global engine (started by create_app)
+order_monitor = OrderMonitor(order_engine)
\ No newline at end of file
@@ -7,16 +7,26 @@ Features:
 - Risk exposure monitoring
 - Performance attribution
 - Rebalancing recommendations
+- Mark-to-market across all portfolios, one price fetch per symbol
+- Streaming risk metrics updated on every mark
 """
 
 from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple, Any
 from collections import defaultdict
-import statistics
+import bisect
+import logging
+import math
+import os
+import threading
 
 from app.market_data import market_data
 
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+
 
 class Position:
     """Represents a trading position in a portfolio."""
@@ -57,10 +67,161 @@ class Position:
             return Decimal('0')
         return ((self.current_price - self.average_cost) / self.average_cost) * 100
 
-    def update_price(self, new_price: Decimal):
+    def update_price(self, new_price: Decimal, updated_at: Optional[datetime] = None):
         """Update current price and timestamp."""
         self.current_price = new_price
-        self.last_updated = datetime.now(timezone.utc)
+        self.last_updated = updated_at or datetime.now(timezone.utc)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of one quantile in bounded memory (the P-squared algorithm).
+
+    Values are kept exactly until `exact_limit` have been seen; the sorted
+    buffer then seeds five markers at the minimum, the p/2, p and (1+p)/2
+    quantiles and the maximum, and each later value nudges the inner markers
+    along a piecewise-parabolic fit.
+    """
+
+    def __init__(self, p: float, exact_limit: int = 200):
+        self.p = p
+        self.exact_limit = max(exact_limit, 5)
+        self.count = 0
+        self.exact: Optional[List[float]] = []
+        self.heights: List[float] = []
+        self.positions: List[int] = []
+        self.desired: List[float] = []
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float):
+        self.count += 1
+        if self.exact is not None:
+            bisect.insort(self.exact, x)
+            if len(self.exact) > self.exact_limit:
+                self._seed_markers()
+            return
+
+        heights = self.heights
+        if x < heights[0]:
+            heights[0] = x
+            cell = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            cell = 3
+        else:
+            cell = min(bisect.bisect_right(heights, x) - 1, 3)
+
+        positions = self.positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = candidate
+                positions[i] += step
+
+    def _seed_markers(self):
+        values, n = self.exact, len(self.exact)
+        self.desired = [1 + (n - 1) * increment for increment in self.increments]
+        self.positions = [int(round(d)) for d in self.desired]
+        self.heights = [values[position - 1] for position in self.positions]
+        self.exact = None
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.exact is not None:
+            if not self.exact:
+                return None
+            return self.exact[int(round(self.p * (len(self.exact) - 1)))]
+        return self.heights[2]
+
+
+class RiskAccumulator:
+    """
+    Running risk statistics over a portfolio's marked values, O(1) per update and read.
+
+    Each mark contributes one period return (in percent): Welford's update keeps
+    its mean and variance, a wealth index compounded from the returns keeps the
+    running peak and worst drawdown, and a P-squared sketch tracks the return
+    quantile used for historical VaR. Fills only rebase the previous value, so
+    cash moving into or out of positions is not mistaken for performance.
+    """
+
+    def __init__(self, var_confidence: float = 0.95, periods_per_year: Optional[float] = None):
+        self.var_confidence = var_confidence
+        # One period per mark-to-market cycle unless told otherwise
+        if periods_per_year is None:
+            periods_per_year = SECONDS_PER_YEAR / float(os.getenv('MARK_TO_MARKET_INTERVAL', '300'))
+        self.periods_per_year = periods_per_year
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.last_value: Optional[float] = None
+        self.wealth = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+        self.tail = P2Quantile(1 - var_confidence)
+
+    def observe(self, value: float):
+        """Record a mark-to-market value."""
+        last_value, self.last_value = self.last_value, value
+        if not last_value or last_value <= 0:
+            return
+
+        period_return = (value / last_value - 1) * 100
+        self.count += 1
+        delta = period_return - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (period_return - self.mean)
+
+        self.wealth *= 1 + period_return / 100
+        if self.wealth > self.peak:
+            self.peak = self.wealth
+        elif self.peak > 0:
+            self.max_drawdown = max(self.max_drawdown, (self.peak - self.wealth) / self.peak * 100)
+
+        self.tail.add(period_return)
+
+    def rebase(self, value: float):
+        """Restart the next return from value without recording one (fills, deposits)."""
+        self.last_value = value
+
+    @property
+    def volatility(self) -> float:
+        """Sample standard deviation of period returns, in percent."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
+    def sharpe_ratio(self, annual_risk_free_rate: float = 2.0) -> float:
+        """Annualized Sharpe ratio: mean excess period return over its volatility, times sqrt(periods per year)."""
+        volatility = self.volatility
+        if volatility == 0:
+            return 0.0
+        risk_free_per_period = annual_risk_free_rate / self.periods_per_year
+        return (self.mean - risk_free_per_period) / volatility * math.sqrt(self.periods_per_year)
+
+    def value_at_risk(self, value: float) -> float:
+        """Historical VaR: the loss at the tail return quantile, applied to value."""
+        quantile = self.tail.value
+        if quantile is None or quantile >= 0:
+            return 0.0
+        return -quantile / 100 * value
 
 
 class Portfolio:
@@ -72,9 +233,20 @@ class Portfolio:
         self.current_balance = initial_balance
         self.positions: Dict[str, Position] = {}
         self.realized_pnl = Decimal('0')
-        self.total_pnl = Decimal('0')
         self.created_at = datetime.now(timezone.utc)
         self.last_updated = datetime.now(timezone.utc)
+        # Set by PortfolioManager so positions appear in the symbol index
+        self.mark_to_market: Optional['MarkToMarketService'] = None
+        self.risk = RiskAccumulator()
+
+    def record_mark(self):
+        """Feed the current value to the risk statistics after a reprice."""
+        self.risk.observe(float(self.total_value))
+
+    def _track(self, symbol: str):
+        """Tell the mark-to-market index that the position in symbol changed."""
+        if self.mark_to_market is not None:
+            self.mark_to_market.track(self.challenge_id, symbol, self.positions.get(symbol))
 
     @property
     def total_value(self) -> Decimal:
@@ -155,8 +327,8 @@ class Portfolio:
 
     @property
     def risk_metrics(self) -> Dict[str, Any]:
-        """Portfolio risk metrics."""
-        if not self.positions:
+        """Portfolio risk metrics, read from the running statistics in O(1)."""
+        if not self.positions and self.risk.count == 0:
             return {
                 'volatility': Decimal('0'),
                 'max_drawdown': Decimal('0'),
@@ -165,22 +337,8 @@ class Portfolio:
                 'value_at_risk_95': Decimal('0')
             }
 
-        # Calculate volatility from position returns
-        returns = []
-        for position in self.positions.values():
-            if position.quantity != 0:
-                returns.append(float(position.unrealized_pnl_percent))
-
-        volatility = Decimal('0')
-        if returns:
-            try:
-                volatility = Decimal(str(statistics.stdev(returns))).quantize(Decimal('0.01'))
-            except statistics.StatisticsError:
-                volatility = Decimal('0')
-
-        # Simplified risk metrics (in production, use historical data)
         return {
-            'volatility': volatility,
+            'volatility': Decimal(str(self.risk.volatility)).quantize(Decimal('0.01')),
             'max_drawdown': self._calculate_max_drawdown(),
             'sharpe_ratio': self._calculate_sharpe_ratio(),
             'beta': Decimal('1.0'),  # Market beta
@@ -188,46 +346,17 @@ class Portfolio:
         }
 
     def _calculate_max_drawdown(self) -> Decimal:
-        """Calculate maximum drawdown."""
-        # Simplified calculation - in production use historical data
-        if not self.positions:
-            return Decimal('0')
-
-        max_dd = Decimal('0')
-        for position in self.positions.values():
-            if position.unrealized_pnl < 0:
-                dd_percent = abs(position.unrealized_pnl_percent)
-                max_dd = max(max_dd, dd_percent)
-
-        return max_dd.quantize(Decimal('0.01'))
+        """Worst peak-to-trough decline of the marked value, in percent."""
+        return Decimal(str(self.risk.max_drawdown)).quantize(Decimal('0.01'))
 
     def _calculate_sharpe_ratio(self) -> Decimal:
-        """Calculate Sharpe ratio."""
-        if not self.positions:
-            return Decimal('0')
-
-        # Simplified calculation
-        avg_return = float(self.return_percentage)
-        volatility = float(self.risk_metrics['volatility'])
-
-        if volatility == 0:
-            return Decimal('0')
-
-        # Assume risk-free rate of 2%
-        risk_free_rate = 2.0
-        sharpe = (avg_return - risk_free_rate) / volatility
-
+        """Annualized Sharpe ratio of the mark returns (assumes a 2% risk-free rate)."""
+        sharpe = self.risk.sharpe_ratio(annual_risk_free_rate=2.0)
         return Decimal(str(sharpe)).quantize(Decimal('0.01'))
 
     def _calculate_var_95(self) -> Decimal:
-        """Calculate Value at Risk (95% confidence)."""
-        # Simplified VaR calculation
-        portfolio_value = float(self.total_value)
-        volatility = float(self.risk_metrics['volatility'])
-
-        # Assume normal distribution
-        var_95 = portfolio_value * volatility * 1.645 / 100  # 95% confidence
-
+        """Calculate Value at Risk (95% confidence) from the 5th percentile mark return."""
+        var_95 = self.risk.value_at_risk(float(self.total_value))
         return Decimal(str(var_95)).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
 
     def add_position(self, symbol: str, quantity: Decimal, price: Decimal) -> Position:
@@ -257,6 +386,8 @@ class Portfolio:
         if position.quantity == 0:
             del self.positions[symbol]
 
+        self._track(symbol)
+        self.risk.rebase(float(self.total_value))
         self.last_updated = datetime.now(timezone.utc)
         return position
 
@@ -270,20 +401,25 @@ class Portfolio:
         if quantity is None or quantity >= position.quantity:
             # Close entire position
             del self.positions[symbol]
-            return position
+            self._track(symbol)
         else:
             # Reduce position
             position.quantity -= quantity
-            return position
+
+        self.risk.rebase(float(self.total_value))
+        return position
 
     def update_prices(self):
-        """Update all position prices with current market data."""
-        for symbol, position in self.positions.items():
-            current_price, _ = market_data.get_stock_price(symbol)
+        """Update all position prices with current market data (one batched fetch)."""
+        prices = market_data.get_multiple_prices(list(self.positions)) if self.positions else {}
+        now = datetime.now(timezone.utc)
+        for symbol, position in list(self.positions.items()):
+            current_price, _ = prices.get(symbol, (None, None))
             if current_price:
-                position.update_price(current_price)
+                position.update_price(current_price, now)
 
-        self.last_updated = datetime.now(timezone.utc)
+        self.last_updated = now
+        self.record_mark()
 
     def get_position_summary(self) -> List[Dict[str, Any]]:
         """Get summary of all positions."""
@@ -337,19 +473,125 @@ class Portfolio:
         return sorted(recommendations, key=lambda x: abs(x['difference']), reverse=True)
 
 
+class MarkToMarketService:
+    """
+    Reprices positions across every portfolio with one price fetch per symbol.
+
+    Keeps a reverse index symbol -> {challenge_id: Position}, maintained by the
+    portfolios as positions open and close. A cycle batch-fetches each distinct
+    symbol once through get_multiple_prices and reprices every position holding
+    it in one pass, so all portfolios are marked at the same prices and upstream
+    cost is O(distinct symbols) however many challenges hold them. Symbols the
+    batch could not price keep their previous mark.
+    """
+
+    def __init__(self, portfolios: Dict[str, Portfolio], market_data_service=None,
+                 interval: Optional[float] = None):
+        self.portfolios = portfolios
+        self.market_data = market_data_service or market_data
+        self.interval = interval if interval is not None else float(os.getenv('MARK_TO_MARKET_INTERVAL', '300'))
+        self.positions: Dict[str, Dict[str, Position]] = {}
+        self.prices: Dict[str, Decimal] = {}
+        self.last_cycle: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._cycle_lock = threading.Lock()  # one cycle at a time; see ensure_fresh
+
+    def track(self, challenge_id: str, symbol: str, position: Optional[Position]):
+        """Index (or, with position=None, drop) a challenge's position in symbol."""
+        with self._lock:
+            if position is not None:
+                self.positions.setdefault(symbol, {})[challenge_id] = position
+                return
+            holders = self.positions.get(symbol)
+            if holders is not None:
+                holders.pop(challenge_id, None)
+                if not holders:
+                    del self.positions[symbol]
+
+    def rebuild(self):
+        """Re-index every position from the portfolios."""
+        with self._lock:
+            self.positions = {}
+            for challenge_id, portfolio in list(self.portfolios.items()):
+                for symbol, position in list(portfolio.positions.items()):
+                    self.positions.setdefault(symbol, {})[challenge_id] = position
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self.positions)
+
+    def reprice(self, symbol: str, price: Decimal, updated_at: Optional[datetime] = None) -> set:
+        """Mark every position in symbol at price. Returns the affected challenge ids."""
+        updated_at = updated_at or datetime.now(timezone.utc)
+        with self._lock:
+            holders = list(self.positions.get(symbol, {}).items())
+            self.prices[symbol] = price
+        for _, position in holders:
+            position.update_price(price, updated_at)
+        return {challenge_id for challenge_id, _ in holders}
+
+    def run_cycle(self) -> Dict[str, Decimal]:
+        """Fetch every held symbol once and reprice all positions. Returns the prices applied."""
+        symbols = self.symbols()
+        now = datetime.now(timezone.utc)
+        # Claim the interval before fetching, so a failing fetch is not retried by every caller
+        self.last_cycle = now
+        applied = {}
+        if symbols:
+            quotes = self.market_data.get_multiple_prices(symbols)
+            touched = set()
+            for symbol in symbols:
+                price, _ = quotes.get(symbol, (None, None))
+                if price:
+                    touched |= self.reprice(symbol, price, now)
+                    applied[symbol] = price
+            for challenge_id in touched:
+                portfolio = self.portfolios.get(challenge_id)
+                if portfolio is not None:
+                    portfolio.last_updated = now
+                    portfolio.record_mark()
+
+            missing = len(symbols) - len(applied)
+            if missing:
+                logger.warning(f"Mark-to-market cycle could not price {missing} of {len(symbols)} symbols")
+
+        return applied
+
+    def _is_stale(self) -> bool:
+        last_cycle = self.last_cycle
+        return last_cycle is None or (datetime.now(timezone.utc) - last_cycle).total_seconds() > self.interval
+
+    def ensure_fresh(self) -> bool:
+        """
+        Run a cycle if the last one is older than the interval. Returns True if one ran.
+
+        Concurrent callers wait for the cycle in progress instead of starting
+        their own, so each interval fetches prices and records marks once.
+        """
+        if not self._is_stale():
+            return False
+        with self._cycle_lock:
+            if not self._is_stale():
+                return False
+            self.run_cycle()
+        return True
+
+
 class PortfolioManager:
     """Central portfolio management system."""
 
     def __init__(self):
         self.portfolios: Dict[str, Portfolio] = {}
-        self._last_price_update = datetime.now(timezone.utc)
+        self.mark_to_market = MarkToMarketService(self.portfolios)
 
     def get_portfolio(self, challenge_id: str, initial_balance: Optional[Decimal] = None) -> Portfolio:
         """Get or create a portfolio for a challenge."""
         if challenge_id not in self.portfolios:
             if initial_balance is None:
                 initial_balance = Decimal('100000')  # Default balance
-            self.portfolios[challenge_id] = Portfolio(challenge_id, initial_balance)
+            portfolio = Portfolio(challenge_id, initial_balance)
+            portfolio.mark_to_market = self.mark_to_market
+            self.portfolios[challenge_id] = portfolio
 
         return self.portfolios[challenge_id]
 
@@ -373,11 +615,8 @@ class PortfolioManager:
         """Get comprehensive portfolio summary."""
         portfolio = self.get_portfolio(challenge_id)
 
-        # Update prices if needed (every 5 minutes)
-        now = datetime.now(timezone.utc)
-        if (now - self._last_price_update).total_seconds() > 300:
-            portfolio.update_prices()
-            self._last_price_update = now
+        # Mark every portfolio to market if the last cycle is older than the interval (5 minutes)
+        self.mark_to_market.ensure_fresh()
 
         return {
             'challenge_id': challenge_id,
@@ -0,0 +1,536 @@
+"""
+Streaming Technical Indicators
+
+Stateful indicators that consume one bar at a time in O(1):
+- SMA, EMA (SMA-seeded, as in TechnicalIndicators)
+- RSI with Wilder smoothing
+- MACD (line, signal, histogram)
+- Bollinger Bands with a sliding-window running variance
+- Stochastic oscillator with monotonic deques for the window extremes
+- ATR (EMA of true range, as in TechnicalIndicators)
+
+Every indicator also has peek(), which returns the value the indicator would
+have if the given bar closed now, without changing state. Live ticks use it to
+preview the forming bar at constant cost.
+
+IndicatorRegistry keeps one IndicatorSet per (symbol, timeframe), warmed up
+from the history store once, advanced by stored bars as they land and previewed
+by price ticks from the market data service. The number of sets is bounded;
+the least recently read one is dropped.
+"""
+
+import math
+import os
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.market_data import market_data
+from app.infrastructure.history_store import INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingSMA:
+    """Simple moving average over the last `period` values."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, price: float) -> Optional[float]:
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(price)
+        self.total += price
+        if len(self.window) == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+    def peek(self, price: float) -> Optional[float]:
+        if len(self.window) + 1 < self.period:
+            return None
+        oldest = self.window[0] if len(self.window) == self.period else 0.0
+        return (self.total - oldest + price) / self.period
+
+
+class StreamingEMA:
+    """Exponential moving average seeded with the SMA of the first `period` values."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.multiplier = 2.0 / (period + 1)
+        self.count = 0
+        self.seed_total = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, price: float) -> Optional[float]:
+        if self.value is None:
+            self.count += 1
+            self.seed_total += price
+            if self.count == self.period:
+                self.value = self.seed_total / self.period
+        else:
+            self.value += (price - self.value) * self.multiplier
+        return self.value
+
+    def peek(self, price: float) -> Optional[float]:
+        if self.value is None:
+            if self.count + 1 == self.period:
+                return (self.seed_total + price) / self.period
+            return None
+        return self.value + (price - self.value) * self.multiplier
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class StreamingRSI:
+    """Relative Strength Index with Wilder smoothing."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.count = 0
+        self.gain_total = 0.0
+        self.loss_total = 0.0
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def _averages(self, close: float) -> Tuple[Optional[float], Optional[float]]:
+        """Averages after a bar closing at `close` (None while warming up)."""
+        change = close - self.prev_close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self.avg_gain is None:
+            if self.count + 1 < self.period:
+                return None, None
+            return (self.gain_total + gain) / self.period, (self.loss_total + loss) / self.period
+        return (
+            (self.avg_gain * (self.period - 1) + gain) / self.period,
+            (self.avg_loss * (self.period - 1) + loss) / self.period,
+        )
+
+    def update(self, close: float) -> Optional[float]:
+        if self.prev_close is None:
+            self.prev_close = close
+            return None
+
+        avg_gain, avg_loss = self._averages(close)
+        if avg_gain is None:
+            change = close - self.prev_close
+            self.gain_total += max(change, 0.0)
+            self.loss_total += max(-change, 0.0)
+        else:
+            self.avg_gain, self.avg_loss = avg_gain, avg_loss
+            self.value = _rsi(avg_gain, avg_loss)
+        self.count += 1
+        self.prev_close = close
+        return self.value
+
+    def peek(self, close: float) -> Optional[float]:
+        if self.prev_close is None:
+            return None
+        avg_gain, avg_loss = self._averages(close)
+        return None if avg_gain is None else _rsi(avg_gain, avg_loss)
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram."""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast = StreamingEMA(fast_period)
+        self.slow = StreamingEMA(slow_period)
+        self.signal = StreamingEMA(signal_period)
+        self.value: Tuple[Optional[float], Optional[float], Optional[float]] = (None, None, None)
+
+    @staticmethod
+    def _combine(fast, slow, signal_of):
+        if fast is None or slow is None:
+            return None, None, None
+        line = fast - slow
+        signal = signal_of(line)
+        return line, signal, (line - signal) if signal is not None else None
+
+    def update(self, close: float):
+        self.value = self._combine(self.fast.update(close), self.slow.update(close), self.signal.update)
+        return self.value
+
+    def peek(self, close: float):
+        return self._combine(self.fast.peek(close), self.slow.peek(close), self.signal.peek)
+
+
+class StreamingBollinger:
+    """Bollinger Bands using a sliding-window Welford update for the sample variance."""
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        self.period = period
+        self.std_dev = std_dev
+        self.window = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.value: Tuple[Optional[float], Optional[float], Optional[float]] = (None, None, None)
+
+    def _next(self, price: float) -> Tuple[float, float]:
+        """(mean, m2) after adding price (and dropping the oldest value once full)."""
+        if len(self.window) < self.period:
+            n = len(self.window) + 1
+            delta = price - self.mean
+            mean = self.mean + delta / n
+            return mean, self.m2 + delta * (price - mean)
+
+        oldest = self.window[0]
+        mean = self.mean + (price - oldest) / self.period
+        return mean, self.m2 + (price - oldest) * (price - mean + oldest - self.mean)
+
+    def _bands(self, mean: float, m2: float):
+        std = math.sqrt(max(m2, 0.0) / (self.period - 1)) if self.period > 1 else 0.0
+        return mean, mean + std * self.std_dev, mean - std * self.std_dev
+
+    def update(self, price: float):
+        self.mean, self.m2 = self._next(price)
+        self.window.append(price)
+        if len(self.window) == self.period:
+            self.value = self._bands(self.mean, self.m2)
+        return self.value
+
+    def peek(self, price: float):
+        if len(self.window) + 1 < self.period:
+            return None, None, None
+        return self._bands(*self._next(price))
+
+
+class StreamingStochastic:
+    """Stochastic %K/%D; window extremes come from monotonic deques of (index, value)."""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self.k_period = k_period
+        self.index = -1
+        self.highs = deque()  # decreasing values: front is the window high
+        self.lows = deque()   # increasing values: front is the window low
+        self.d = StreamingSMA(d_period)
+        self.value: Tuple[Optional[float], Optional[float]] = (None, None)
+
+    @staticmethod
+    def _k(high: float, low: float, close: float) -> float:
+        if high == low:
+            return 50.0
+        return (close - low) / (high - low) * 100
+
+    def update(self, high: float, low: float, close: float):
+        self.index += 1
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((self.index, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((self.index, low))
+
+        first = self.index - self.k_period + 1
+        while self.highs[0][0] < first:
+            self.highs.popleft()
+        while self.lows[0][0] < first:
+            self.lows.popleft()
+
+        if first >= 0:
+            k = self._k(self.highs[0][1], self.lows[0][1], close)
+            self.value = (k, self.d.update(k))
+        return self.value
+
+    @staticmethod
+    def _extreme(entries: deque, first: int) -> Optional[float]:
+        """Window extreme once entries before index `first` drop out."""
+        if entries and entries[0][0] >= first:
+            return entries[0][1]
+        if len(entries) > 1:
+            return entries[1][1]
+        return None
+
+    def peek(self, high: float, low: float, close: float):
+        first = self.index + 1 - self.k_period + 1
+        if first < 0:
+            return None, None
+        window_high = self._extreme(self.highs, first)
+        window_low = self._extreme(self.lows, first)
+        window_high = high if window_high is None else max(window_high, high)
+        window_low = low if window_low is None else min(window_low, low)
+        k = self._k(window_high, window_low, close)
+        return k, self.d.peek(k)
+
+
+class StreamingATR:
+    """Average True Range (EMA of true range)."""
+
+    def __init__(self, period: int = 14):
+        self.prev_close: Optional[float] = None
+        self.ema = StreamingEMA(period)
+        self.value: Optional[float] = None
+
+    def _true_range(self, high: float, low: float) -> float:
+        return max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        if self.prev_close is not None:
+            self.value = self.ema.update(self._true_range(high, low))
+        self.prev_close = close
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> Optional[float]:
+        if self.prev_close is None:
+            return None
+        return self.ema.peek(self._true_range(high, low))
+
+
+def _trend(closes) -> str:
+    """Linear-regression trend over the closes, as ChartAnalysis.detect_trend."""
+    n = len(closes)
+    if n < 2:
+        return 'SIDEWAYS'
+    sum_x = n * (n - 1) / 2
+    sum_xx = (n - 1) * n * (2 * n - 1) / 6
+    sum_y = sum(closes)
+    sum_xy = sum(i * y for i, y in enumerate(closes))
+    slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x ** 2)
+    if slope > 0.001:
+        return 'UPTREND'
+    if slope < -0.001:
+        return 'DOWNTREND'
+    return 'SIDEWAYS'
+
+
+class IndicatorSet:
+    """
+    The default indicator suite for one symbol and timeframe.
+
+    Completed bars advance the indicators; ticks update the forming bar and
+    produce a preview through peek(), both in constant time. Tick-built bars
+    stay provisional: only stored bars (see IndicatorRegistry._catch_up) are
+    committed, so a bar assembled from sampled ticks never replaces real OHLC.
+    """
+
+    TREND_PERIOD = 20
+
+    def __init__(self, symbol: str, timeframe: str = '1d'):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.bar_seconds = INTERVAL_SECONDS.get(timeframe, 86400)
+        self.lock = threading.Lock()
+
+        self.sma_20 = StreamingSMA(20)
+        self.sma_50 = StreamingSMA(50)
+        self.ema_12 = StreamingEMA(12)
+        self.ema_26 = StreamingEMA(26)
+        self.rsi_14 = StreamingRSI(14)
+        self.macd = StreamingMACD(12, 26, 9)
+        self.bollinger = StreamingBollinger(20, 2.0)
+        self.stochastic = StreamingStochastic(14, 3)
+        self.atr_14 = StreamingATR(14)
+        self.closes = deque(maxlen=self.TREND_PERIOD)
+
+        self.bars = 0
+        self.last_bar_time: Optional[int] = None
+        self.forming: Optional[List[float]] = None  # [time, open, high, low, close]
+
+    def update_bar(self, timestamp: int, open_price: float, high: float, low: float, close: float):
+        """Advance every indicator by one completed bar."""
+        self.sma_20.update(close)
+        self.sma_50.update(close)
+        self.ema_12.update(close)
+        self.ema_26.update(close)
+        self.rsi_14.update(close)
+        self.macd.update(close)
+        self.bollinger.update(close)
+        self.stochastic.update(high, low, close)
+        self.atr_14.update(high, low, close)
+        self.closes.append(close)
+        self.bars += 1
+        self.last_bar_time = int(timestamp)
+
+    def _bucket(self, timestamp: float) -> int:
+        """Start of the bar containing timestamp, aligned to the stored bars."""
+        origin = self.last_bar_time % self.bar_seconds if self.last_bar_time is not None else 0
+        return int((timestamp - origin) // self.bar_seconds * self.bar_seconds + origin)
+
+    def on_tick(self, price: float, timestamp: float) -> bool:
+        """
+        Fold a tick into the forming bar. Returns True if it started a new bar.
+
+        The bar the ticks had been forming is dropped rather than committed; the
+        stored bar for that period is applied when it lands.
+        """
+        bucket = self._bucket(timestamp)
+        if self.last_bar_time is not None and bucket <= self.last_bar_time:
+            return False  # belongs to a bar we already have
+
+        closed = False
+        if self.forming is not None and bucket > self.forming[0]:
+            self.forming = None
+            closed = True
+
+        if self.forming is None:
+            self.forming = [bucket, price, price, price, price]
+        elif bucket == self.forming[0]:
+            self.forming[2] = max(self.forming[2], price)
+            self.forming[3] = min(self.forming[3], price)
+            self.forming[4] = price
+        return closed
+
+    def snapshot(self, preview: bool = True) -> Dict:
+        """
+        Current indicator values, shaped like TechnicalAnalysisEngine's 'indicators'.
+
+        With preview=True and a forming bar, values are as if that bar closed now.
+        """
+        if preview and self.forming is not None:
+            _, _, high, low, close = self.forming
+            macd = self.macd.peek(close)
+            bollinger = self.bollinger.peek(close)
+            stochastic = self.stochastic.peek(high, low, close)
+            values = {
+                'sma_20': self.sma_20.peek(close),
+                'sma_50': self.sma_50.peek(close),
+                'ema_12': self.ema_12.peek(close),
+                'ema_26': self.ema_26.peek(close),
+                'rsi_14': self.rsi_14.peek(close),
+                'atr_14': self.atr_14.peek(high, low, close),
+            }
+            closes = list(self.closes)[1 - self.TREND_PERIOD:] + [close]
+        else:
+            close = self.closes[-1] if self.closes else None
+            macd = self.macd.value
+            bollinger = self.bollinger.value
+            stochastic = self.stochastic.value
+            values = {
+                'sma_20': self.sma_20.value,
+                'sma_50': self.sma_50.value,
+                'ema_12': self.ema_12.value,
+                'ema_26': self.ema_26.value,
+                'rsi_14': self.rsi_14.value,
+                'atr_14': self.atr_14.value,
+            }
+            closes = list(self.closes)
+
+        values['macd'] = dict(zip(('line', 'signal', 'histogram'), macd))
+        values['bollinger'] = dict(zip(('sma', 'upper', 'lower'), bollinger))
+        values['stochastic'] = dict(zip(('k', 'd'), stochastic))
+
+        return {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'bars': self.bars,
+            'last_bar_time': self.last_bar_time,
+            'forming_bar_time': self.forming[0] if self.forming else None,
+            'current_price': close,
+            'trend': _trend(closes) if len(closes) >= self.TREND_PERIOD else 'SIDEWAYS',
+            'indicators': values,
+        }
+
+
+class IndicatorRegistry:
+    """
+    Streaming indicator state per (symbol, timeframe).
+
+    A set is created and warmed up from the history store on first use, catches
+    up on newly stored bars when read (and from disk when ticks cross a bar
+    boundary), and previews every price the market data service caches.
+    Listeners are called after each tick with (symbol, timeframe, snapshot,
+    bar_closed). At most max_sets are kept; the least recently read is dropped.
+    """
+
+    def __init__(self, market_data_service=None, max_sets: Optional[int] = None):
+        self.market_data = market_data_service or market_data
+        self.max_sets = max_sets or int(os.environ.get('INDICATOR_REGISTRY_MAX_SETS', 256))
+        self._sets: 'OrderedDict[Tuple[str, str], IndicatorSet]' = OrderedDict()
+        self._by_symbol: Dict[str, List[IndicatorSet]] = {}
+        self._listeners: List[Callable] = []
+        self._lock = threading.Lock()
+        self.market_data.add_price_listener(self.on_price)
+
+    def add_listener(self, callback: Callable):
+        """Register callback(symbol, timeframe, snapshot, bar_closed)."""
+        self._listeners.append(callback)
+
+    def get(self, symbol: str, timeframe: str = '1d') -> IndicatorSet:
+        """The indicator set for symbol/timeframe, warmed up and caught up with stored bars."""
+        symbol = symbol.upper()
+        key = (symbol, timeframe)
+        with self._lock:
+            indicator_set = self._sets.get(key)
+            if indicator_set is None:
+                indicator_set = self._sets[key] = IndicatorSet(symbol, timeframe)
+                self._by_symbol.setdefault(symbol, []).append(indicator_set)
+                while len(self._sets) > self.max_sets:
+                    self._evict(*self._sets.popitem(last=False))
+            else:
+                self._sets.move_to_end(key)
+
+        self._catch_up(indicator_set)
+        return indicator_set
+
+    def snapshot(self, symbol: str, timeframe: str = '1d', preview: bool = True) -> Dict:
+        indicator_set = self.get(symbol, timeframe)
+        with indicator_set.lock:
+            return indicator_set.snapshot(preview)
+
+    def tracked(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._sets)
+
+    def _evict(self, key: Tuple[str, str], indicator_set: IndicatorSet):
+        # Caller holds self._lock
+        remaining = [s for s in self._by_symbol.get(key[0], []) if s is not indicator_set]
+        if remaining:
+            self._by_symbol[key[0]] = remaining
+        else:
+            self._by_symbol.pop(key[0], None)
+
+    def _catch_up(self, indicator_set: IndicatorSet, sync: bool = True):
+        """Feed stored bars newer than the last one the set has seen."""
+        last = indicator_set.last_bar_time
+        # May backfill from the provider, so do not hold the set's lock meanwhile
+        bars = self.market_data.get_bars(
+            indicator_set.symbol, indicator_set.timeframe, start=last + 1 if last is not None else None, sync=sync
+        )
+        if len(bars) == 0:
+            return
+
+        with indicator_set.lock:
+            if indicator_set.last_bar_time is not None:
+                bars = bars.between(start=indicator_set.last_bar_time + 1)
+            if len(bars) and indicator_set.forming is not None and indicator_set.forming[0] <= bars.last_timestamp:
+                # Stored bars supersede what ticks assembled so far
+                indicator_set.forming = None
+            for bar in zip(bars.time.tolist(), bars.open.tolist(), bars.high.tolist(),
+                           bars.low.tolist(), bars.close.tolist()):
+                indicator_set.update_bar(*bar)
+
+    def on_price(self, symbol: str, price: float, timestamp: float):
+        """Advance every tracked timeframe of symbol by one tick."""
+        sets = self._by_symbol.get(symbol.upper())
+        if not sets:
+            return
+
+        for indicator_set in list(sets):
+            with indicator_set.lock:
+                closed = indicator_set.on_tick(float(price), timestamp)
+            if closed:
+                # Apply the bar just finished if it is already stored; reads disk only
+                self._catch_up(indicator_set, sync=False)
+            with indicator_set.lock:
+                snapshot = indicator_set.snapshot() if self._listeners else None
+
+            for listener in self._listeners:
+                try:
+                    listener(indicator_set.symbol, indicator_set.timeframe, snapshot, closed)
+                except Exception as e:
+                    logger.error(f"Indicator listener failed for {symbol}: {e}")
+
+
+# Global streaming indicator registry
+indicator_registry = IndicatorRegistry()
@@ -13,11 +13,21 @@ Implements comprehensive technical indicators and analysis tools:
 from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple, Any
-from collections import deque
+from collections import deque, OrderedDict
+import os
+import threading
+import time
 import statistics
 import math
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from app.market_data import market_data
+from app.streaming_indicators import indicator_registry
+
+# Chunk length for the closed-form EMA recursion; keeps decay**-k well inside float64 range
+_EWM_CHUNK = 64
 
 
 class PriceData:
@@ -39,6 +49,25 @@ class PriceData:
         self.close = close_price
         self.volume = volume or Decimal('0')
 
+    @classmethod
+    def from_bars(cls, bars, naive: bool = False) -> List['PriceData']:
+        """Build PriceData objects from HistoryBars (UTC timestamps, tz-naive if naive=True)."""
+        tz = None if naive else timezone.utc
+        return [
+            cls(
+                timestamp=datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=tz),
+                open_price=Decimal(str(o)),
+                high_price=Decimal(str(h)),
+                low_price=Decimal(str(l)),
+                close_price=Decimal(str(c)),
+                volume=Decimal(str(v))
+            )
+            for t, o, h, l, c, v in zip(
+                bars.time.tolist(), bars.open.tolist(), bars.high.tolist(),
+                bars.low.tolist(), bars.close.tolist(), bars.volume.tolist()
+            )
+        ]
+
 
 class TechnicalIndicators:
     """Collection of technical analysis indicators."""
@@ -283,6 +312,189 @@ class TechnicalIndicators:
         }
 
 
+def _ewm(values: np.ndarray, alpha: float, initial: float) -> np.ndarray:
+    """
+    Exponential recursion y[i] = (1 - alpha) * y[i - 1] + alpha * values[i], seeded with initial.
+
+    Evaluated in closed form over fixed-size chunks (cumulative sums scaled by
+    powers of the decay) so the work stays in numpy without overflowing.
+    """
+    decay = 1.0 - alpha
+    out = np.empty(len(values))
+    if decay == 0:
+        out[:] = values
+        return out
+
+    prev = initial
+    for start in range(0, len(values), _EWM_CHUNK):
+        block = values[start:start + _EWM_CHUNK]
+        powers = decay ** np.arange(1, len(block) + 1)
+        out[start:start + len(block)] = powers * (prev + alpha * np.cumsum(block / powers))
+        prev = out[start + len(block) - 1]
+    return out
+
+
+def _rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Sums of each full window of `period` values (length n - period + 1)."""
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    return sums[period:] - sums[:-period]
+
+
+class VectorIndicators:
+    """
+    float64 array implementations of TechnicalIndicators.
+
+    Same signatures and output lengths as the Decimal versions; inputs are any
+    array-like of numbers and outputs are numpy arrays with NaN where the
+    Decimal path returns None.
+    """
+
+    @staticmethod
+    def sma(prices, period: int) -> np.ndarray:
+        """Simple Moving Average."""
+        prices = np.asarray(prices, dtype=float)
+        result = np.full(len(prices), np.nan)
+        if len(prices) < period:
+            return result
+
+        result[period - 1:] = _rolling_sum(prices, period) / period
+        return result
+
+    @staticmethod
+    def ema(prices, period: int) -> np.ndarray:
+        """Exponential Moving Average."""
+        prices = np.asarray(prices, dtype=float)
+        result = np.full(len(prices), np.nan)
+        if len(prices) < period:
+            return result
+
+        # First EMA is SMA
+        result[period - 1] = prices[:period].mean()
+        result[period:] = _ewm(prices[period:], 2.0 / (period + 1), result[period - 1])
+        return result
+
+    @staticmethod
+    def rsi(prices, period: int = 14) -> np.ndarray:
+        """Relative Strength Index (Wilder smoothing)."""
+        prices = np.asarray(prices, dtype=float)
+        result = np.full(len(prices), np.nan)
+        if len(prices) < period + 1:
+            return result
+
+        changes = np.diff(prices)
+        gains = np.maximum(changes, 0.0)
+        losses = np.maximum(-changes, 0.0)
+
+        avg_gain = np.empty(len(changes) - period + 1)
+        avg_loss = np.empty(len(changes) - period + 1)
+        avg_gain[0] = gains[:period].mean()
+        avg_loss[0] = losses[:period].mean()
+        avg_gain[1:] = _ewm(gains[period:], 1.0 / period, avg_gain[0])
+        avg_loss[1:] = _ewm(losses[period:], 1.0 / period, avg_loss[0])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        result[period:] = np.where(avg_loss == 0, 100.0, rsi)
+        return result
+
+    @staticmethod
+    def macd(
+        prices,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """MACD (Moving Average Convergence Divergence)."""
+        prices = np.asarray(prices, dtype=float)
+        macd_line = VectorIndicators.ema(prices, fast_period) - VectorIndicators.ema(prices, slow_period)
+
+        # Signal line is the EMA of the defined part of the MACD line
+        valid = ~np.isnan(macd_line)
+        signal_line = np.full(len(prices), np.nan)
+        signal_line[valid] = VectorIndicators.ema(macd_line[valid], signal_period)
+
+        return macd_line, signal_line, macd_line - signal_line
+
+    @staticmethod
+    def bollinger_bands(
+        prices,
+        period: int = 20,
+        std_dev: float = 2.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Bollinger Bands (sample standard deviation, like the Decimal path)."""
+        prices = np.asarray(prices, dtype=float)
+        sma = np.full(len(prices), np.nan)
+        upper = np.full(len(prices), np.nan)
+        lower = np.full(len(prices), np.nan)
+        if len(prices) < period:
+            return sma, upper, lower
+
+        # Centre before summing squares to limit cancellation
+        centred = prices - prices.mean()
+        sums = _rolling_sum(centred, period)
+        squares = _rolling_sum(centred * centred, period)
+        variance = np.maximum(squares - sums * sums / period, 0.0) / (period - 1)
+        std = np.sqrt(variance)
+
+        sma[period - 1:] = _rolling_sum(prices, period) / period
+        upper[period - 1:] = sma[period - 1:] + std * std_dev
+        lower[period - 1:] = sma[period - 1:] - std * std_dev
+        return sma, upper, lower
+
+    @staticmethod
+    def stochastic_oscillator(
+        high_prices,
+        low_prices,
+        close_prices,
+        k_period: int = 14,
+        d_period: int = 3
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Stochastic Oscillator."""
+        close_prices = np.asarray(close_prices, dtype=float)
+        k_line = np.full(len(close_prices), np.nan)
+        d_line = np.full(len(close_prices), np.nan)
+        if len(close_prices) < k_period:
+            return k_line, d_line
+
+        highest = sliding_window_view(np.asarray(high_prices, dtype=float), k_period).max(axis=1)
+        lowest = sliding_window_view(np.asarray(low_prices, dtype=float), k_period).min(axis=1)
+        span = highest - lowest
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k_values = (close_prices[k_period - 1:] - lowest) / span * 100
+        k_values = np.where(span == 0, 50.0, k_values)
+
+        k_line[k_period - 1:] = k_values
+        d_line[k_period - 1:] = VectorIndicators.sma(k_values, d_period)
+        return k_line, d_line
+
+    @staticmethod
+    def atr(high_prices, low_prices, close_prices, period: int = 14) -> np.ndarray:
+        """Average True Range (one value per bar after the first, like the Decimal path)."""
+        close_prices = np.asarray(close_prices, dtype=float)
+        if len(close_prices) < 2:
+            return np.full(len(close_prices), np.nan)
+
+        high_prices = np.asarray(high_prices, dtype=float)
+        low_prices = np.asarray(low_prices, dtype=float)
+        previous_close = close_prices[:-1]
+        true_ranges = np.maximum.reduce([
+            high_prices[1:] - low_prices[1:],
+            np.abs(high_prices[1:] - previous_close),
+            np.abs(low_prices[1:] - previous_close),
+        ])
+        return VectorIndicators.ema(true_ranges, period)
+
+    @staticmethod
+    def momentum(prices, period: int = 14) -> np.ndarray:
+        """Momentum (close minus the close `period` bars earlier)."""
+        prices = np.asarray(prices, dtype=float)
+        result = np.full(len(prices), np.nan)
+        if len(prices) > period:
+            result[period:] = prices[period:] - prices[:-period]
+        return result
+
+
 class ChartAnalysis:
     """Chart pattern recognition and analysis."""
 
@@ -378,93 +590,384 @@ class ChartAnalysis:
         return momentum
 
 
+_MISSING = object()
+
+
+class IndicatorCache:
+    """
+    LRU memo for indicator results, bounded by entry count and approximate size.
+
+    Keys are (symbol, timeframe, indicator, params, version), where version is the
+    timestamp of the last bar the series ends on, so a new bar naturally misses
+    and stale entries age out through LRU eviction.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Tuple, Tuple[Any, int]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Tuple, compute):
+        """Return the cached value for key, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def get(self, key: Tuple, default=None):
+        """The cached value for key, or default on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        return default
+
+    def put(self, key: Tuple, value):
+        """Store a value, evicting least recently used entries past the limits."""
+        size = _estimate_size(value)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+def _estimate_size(value) -> int:
+    """Rough memory footprint of a cached result."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(_estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return 232 + sum(_estimate_size(v) for v in value.values())
+    if isinstance(value, PriceSeries):
+        return 200 * len(value.price_data) + _estimate_size((value.closes, value.highs, value.lows))
+    return 64
+
+
+class PriceSeries:
+    """Price data for one symbol/timeframe plus the backend arrays derived from it."""
+
+    __slots__ = ('symbol', 'timeframe', 'version', 'price_data', 'closes', 'highs', 'lows')
+
+    def __init__(self, symbol: str, timeframe: str, version, price_data: List[PriceData], to_series):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.version = version
+        self.price_data = price_data
+        self.closes = to_series([p.close for p in price_data])
+        self.highs = to_series([p.high for p in price_data])
+        self.lows = to_series([p.low for p in price_data])
+
+    def key(self, name: str, params: Tuple = ()) -> Tuple:
+        return (self.symbol, self.timeframe, name, params, self.version)
+
+
 class TechnicalAnalysisEngine:
     """Main technical analysis engine."""
 
-    def __init__(self):
-        self.price_cache: Dict[str, List[PriceData]] = {}
+    BACKENDS = {'decimal': TechnicalIndicators, 'numpy': VectorIndicators}
+
+    # Indicators that take (highs, lows, closes) rather than closes
+    HLC_INDICATORS = ('stochastic_oscillator', 'atr')
+
+    def __init__(self, backend: Optional[str] = None, cache: Optional[IndicatorCache] = None):
+        # Price series and indicator results, shared by all analysis endpoints
+        self.cache = cache or IndicatorCache(
+            max_entries=int(os.getenv('INDICATOR_CACHE_MAX_ENTRIES', '4096')),
+            max_bytes=int(os.getenv('INDICATOR_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+        )
+        # Lifetime of synthetic series, which have no bar timestamp to key on
         self.cache_expiry = timedelta(minutes=5)
 
-    def get_technical_analysis(self, symbol: str, indicators: List[str] = None) -> Dict[str, Any]:
+        # Indicator implementation: 'numpy' (float64 arrays) or 'decimal' (exact, slower)
+        self.backend = backend or os.getenv('TECHNICAL_ANALYSIS_BACKEND', 'numpy')
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Unknown technical analysis backend: {self.backend}")
+        self.indicators = self.BACKENDS[self.backend]
+
+    def _series(self, values: List[Decimal]):
+        """Input series in the representation the selected backend works on."""
+        if self.backend == 'numpy':
+            return np.fromiter((float(v) for v in values), dtype=float, count=len(values))
+        return values
+
+    def _value(self, value):
+        """A single indicator output as Decimal/float, with NaN mapped to None."""
+        if value is None or self.backend == 'decimal':
+            return value
+        value = float(value)
+        return None if math.isnan(value) else value
+
+    def _last(self, values):
+        return self._value(values[-1]) if len(values) else None
+
+    def _as_list(self, values) -> List[Optional[float]]:
+        """Indicator outputs as JSON-ready floats (None where undefined)."""
+        return [None if v is None or math.isnan(v) else float(v) for v in (
+            values.tolist() if isinstance(values, np.ndarray) else values
+        )]
+
+    # Indicator helpers on the selected backend, returning JSON-ready lists
+    def sma(self, prices: List[Decimal], period: int) -> List[Optional[float]]:
+        return self._as_list(self.indicators.sma(self._series(prices), period))
+
+    def ema(self, prices: List[Decimal], period: int) -> List[Optional[float]]:
+        return self._as_list(self.indicators.ema(self._series(prices), period))
+
+    def rsi(self, prices: List[Decimal], period: int = 14) -> List[Optional[float]]:
+        return self._as_list(self.indicators.rsi(self._series(prices), period))
+
+    def macd(self, prices: List[Decimal], fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        lines = self.indicators.macd(self._series(prices), fast_period, slow_period, signal_period)
+        return tuple(self._as_list(line) for line in lines)
+
+    def bollinger_bands(self, prices: List[Decimal], period: int = 20, std_dev: float = 2.0):
+        bands = self.indicators.bollinger_bands(self._series(prices), period, std_dev)
+        return tuple(self._as_list(band) for band in bands)
+
+    def stochastic_oscillator(self, highs: List[Decimal], lows: List[Decimal], closes: List[Decimal],
+                              k_period: int = 14, d_period: int = 3):
+        lines = self.indicators.stochastic_oscillator(
+            self._series(highs), self._series(lows), self._series(closes), k_period, d_period
+        )
+        return tuple(self._as_list(line) for line in lines)
+
+    def atr(self, highs: List[Decimal], lows: List[Decimal], closes: List[Decimal], period: int = 14):
+        return self._as_list(self.indicators.atr(
+            self._series(highs), self._series(lows), self._series(closes), period
+        ))
+
+    def calculate_momentum(self, price_data: List[PriceData], period: int = 14) -> List[Optional[float]]:
+        if self.backend == 'numpy':
+            return self._as_list(VectorIndicators.momentum(self._series([p.close for p in price_data]), period))
+        return self._as_list(ChartAnalysis.calculate_momentum(price_data, period))
+
+    def get_technical_analysis(self, symbol: str, indicators: List[str] = None,
+                               timeframe: str = '1d') -> Dict[str, Any]:
         """
         Get comprehensive technical analysis for a symbol.
 
         Args:
             symbol: Stock symbol
             indicators: List of indicators to calculate (optional)
+            timeframe: Bar interval of the price series (default: 1d)
         """
         if indicators is None:
             indicators = ['sma', 'ema', 'rsi', 'macd', 'bollinger', 'stochastic']
 
         # Get price data
-        price_data = self._get_price_data(symbol)
-        if not price_data:
+        series = self._get_series(symbol, timeframe)
+        if not series.price_data:
             return {'error': f'No price data available for {symbol}'}
 
-        closes = [p.close for p in price_data]
-        highs = [p.high for p in price_data]
-        lows = [p.low for p in price_data]
-
         analysis = {
             'symbol': symbol,
             'timestamp': datetime.now(timezone.utc).isoformat(),
+            'current_price': self._value(series.closes[-1]),
             'indicators': {},
             'patterns': {},
-            'trend': ChartAnalysis.detect_trend(price_data),
-            'support_resistance': ChartAnalysis.detect_support_resistance(price_data)
+            'trend': self.cache.get_or_compute(
+                series.key('trend', (20,)), lambda: ChartAnalysis.detect_trend(series.price_data, 20)
+            ),
+            'support_resistance': self._support_resistance(series, 20, 0.02)
         }
 
         # Calculate requested indicators
         if 'sma' in indicators:
-            analysis['indicators']['sma_20'] = TechnicalIndicators.sma(closes, 20)[-1]
-            analysis['indicators']['sma_50'] = TechnicalIndicators.sma(closes, 50)[-1]
+            analysis['indicators']['sma_20'] = self._last(self._indicator(series, 'sma', 20))
+            analysis['indicators']['sma_50'] = self._last(self._indicator(series, 'sma', 50))
 
         if 'ema' in indicators:
-            analysis['indicators']['ema_12'] = TechnicalIndicators.ema(closes, 12)[-1]
-            analysis['indicators']['ema_26'] = TechnicalIndicators.ema(closes, 26)[-1]
+            analysis['indicators']['ema_12'] = self._last(self._indicator(series, 'ema', 12))
+            analysis['indicators']['ema_26'] = self._last(self._indicator(series, 'ema', 26))
 
         if 'rsi' in indicators:
-            analysis['indicators']['rsi_14'] = TechnicalIndicators.rsi(closes, 14)[-1]
+            analysis['indicators']['rsi_14'] = self._last(self._indicator(series, 'rsi', 14))
 
         if 'macd' in indicators:
-            macd_line, signal_line, histogram = TechnicalIndicators.macd(closes)
+            macd_line, signal_line, histogram = self._indicator(series, 'macd', 12, 26, 9)
             analysis['indicators']['macd'] = {
-                'line': macd_line[-1],
-                'signal': signal_line[-1],
-                'histogram': histogram[-1]
+                'line': self._last(macd_line),
+                'signal': self._last(signal_line),
+                'histogram': self._last(histogram)
             }
 
         if 'bollinger' in indicators:
-            sma, upper, lower = TechnicalIndicators.bollinger_bands(closes)
+            sma, upper, lower = self._indicator(series, 'bollinger_bands', 20, 2.0)
             analysis['indicators']['bollinger'] = {
-                'sma': sma[-1],
-                'upper': upper[-1],
-                'lower': lower[-1]
+                'sma': self._last(sma),
+                'upper': self._last(upper),
+                'lower': self._last(lower)
             }
 
         if 'stochastic' in indicators:
-            k_line, d_line = TechnicalIndicators.stochastic_oscillator(highs, lows, closes)
+            k_line, d_line = self._indicator(series, 'stochastic_oscillator', 14, 3)
             analysis['indicators']['stochastic'] = {
-                'k': k_line[-1],
-                'd': d_line[-1]
+                'k': self._last(k_line),
+                'd': self._last(d_line)
             }
 
         if 'atr' in indicators:
-            analysis['indicators']['atr_14'] = TechnicalIndicators.atr(highs, lows, closes, 14)[-1]
+            analysis['indicators']['atr_14'] = self._last(self._indicator(series, 'atr', 14))
 
         if 'momentum' in indicators:
-            analysis['indicators']['momentum_14'] = ChartAnalysis.calculate_momentum(price_data, 14)[-1]
+            momentum = self.cache.get_or_compute(
+                series.key('momentum', (14,)), lambda: self.calculate_momentum(series.price_data, 14)
+            )
+            analysis['indicators']['momentum_14'] = self._last(momentum)
 
         # Generate signals
         analysis['signals'] = self._generate_signals(analysis)
 
         return analysis
 
-    def _get_price_data(self, symbol: str) -> List[PriceData]:
+    STREAMING_INDICATOR_KEYS = {
+        'sma': ('sma_20', 'sma_50'),
+        'ema': ('ema_12', 'ema_26'),
+        'rsi': ('rsi_14',),
+        'macd': ('macd',),
+        'bollinger': ('bollinger',),
+        'stochastic': ('stochastic',),
+        'atr': ('atr_14',),
+    }
+    # Bars needed before every streaming indicator has a value (SMA 50)
+    STREAMING_MIN_BARS = 50
+
+    def get_streaming_analysis(self, symbol: str, timeframe: str = '1d',
+                               indicators: List[str] = None) -> Dict[str, Any]:
+        """
+        Technical analysis from the streaming indicator state for symbol/timeframe.
+
+        Indicators are advanced incrementally by new bars and live ticks, so this
+        costs constant time per call instead of recomputing over the full window.
+        Symbols with too little stored history for the longest indicator fall
+        back to get_technical_analysis (and its synthetic series).
+        """
+        if indicators is None:
+            indicators = ['sma', 'ema', 'rsi', 'macd', 'bollinger', 'stochastic']
+
+        snapshot = indicator_registry.snapshot(symbol, timeframe)
+        if snapshot['bars'] < self.STREAMING_MIN_BARS:
+            analysis = self.get_technical_analysis(symbol, indicators, timeframe)
+            if 'error' not in analysis:
+                analysis['timeframe'] = timeframe
+            return analysis
+
+        wanted = [key for name in indicators for key in self.STREAMING_INDICATOR_KEYS.get(name, ())]
+        analysis = {
+            'symbol': snapshot['symbol'],
+            'timeframe': timeframe,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'current_price': snapshot['current_price'],
+            'indicators': {key: snapshot['indicators'][key] for key in wanted},
+            'trend': snapshot['trend'],
+            'last_bar_time': snapshot['last_bar_time'],
+            'forming_bar_time': snapshot['forming_bar_time'],
+        }
+        analysis['signals'] = self._generate_signals(analysis)
+        return analysis
+
+    def _indicator(self, series: PriceSeries, name: str, *params):
+        """Memoized indicator output for a series on the selected backend."""
+        def compute():
+            inputs = (series.highs, series.lows, series.closes) if name in self.HLC_INDICATORS else (series.closes,)
+            return getattr(self.indicators, name)(*inputs, *params)
+
+        return self.cache.get_or_compute(series.key(name, params), compute)
+
+    def _support_resistance(self, series: PriceSeries, lookback_periods: int, tolerance: float):
+        return self.cache.get_or_compute(
+            series.key('support_resistance', (lookback_periods, tolerance)),
+            lambda: ChartAnalysis.detect_support_resistance(series.price_data, lookback_periods, tolerance)
+        )
+
+    def get_support_resistance(self, symbol: str, lookback_periods: int = 20,
+                               tolerance: float = 0.02) -> Optional[Dict[str, List[Decimal]]]:
+        """Support/resistance levels for a symbol, or None without price data."""
+        series = self._get_series(symbol)
+        if not series.price_data:
+            return None
+        return self._support_resistance(series, lookback_periods, tolerance)
+
+    def get_fibonacci_levels(self, symbol: str, lookback_periods: int = 20) -> Optional[Dict[str, Any]]:
+        """High, low and Fibonacci retracement levels over the lookback, or None without price data."""
+        series = self._get_series(symbol)
+        if not series.price_data:
+            return None
+
+        def compute():
+            recent_prices = series.price_data[-lookback_periods:]
+            high_price = max(p.high for p in recent_prices)
+            low_price = min(p.low for p in recent_prices)
+            return {
+                'high_price': high_price,
+                'low_price': low_price,
+                'levels': TechnicalIndicators.fibonacci_retracement(high_price, low_price)
+            }
+
+        return self.cache.get_or_compute(series.key('fibonacci', (lookback_periods,)), compute)
+
+    def _get_series(self, symbol: str, timeframe: str = '1d', periods: int = 100) -> PriceSeries:
+        """
+        The latest `periods` bars for a symbol, memoized per last bar timestamp.
+
+        Synthetic fallback series are keyed by a cache_expiry-sized time bucket instead.
+        """
+        # Daily bars from the local history store; backfilled incrementally when stale
+        bars = market_data.get_bars(symbol, timeframe)
+        if len(bars) >= periods:
+            version = bars.last_timestamp
+            build = lambda: PriceData.from_bars(bars.tail(periods))
+        else:
+            version = ('synthetic', int(time.time() // self.cache_expiry.total_seconds()))
+            build = lambda: self._synthetic_price_data(symbol, periods)
+
+        return self.cache.get_or_compute(
+            (symbol, timeframe, 'series', (periods,), version),
+            lambda: PriceSeries(symbol, timeframe, version, build(), self._series)
+        )
+
+    def _get_price_data(self, symbol: str, periods: int = 100) -> List[PriceData]:
         """Get historical price data for technical analysis."""
-        # This is a simplified version - in production, you'd fetch real historical data
-        # For now, we'll generate synthetic data based on current price
+        return self._get_series(symbol, periods=periods).price_data
 
+    def _synthetic_price_data(self, symbol: str, periods: int) -> List[PriceData]:
+        """Flat synthetic series anchored at the current price, used when no history is stored."""
         current_price, _ = market_data.get_stock_price(symbol)
         if not current_price:
             return []
@@ -473,7 +976,7 @@ class TechnicalAnalysisEngine:
         price_data = []
         base_price = current_price
 
-        for i in range(100):
+        for i in range(periods):
             # Simple random walk with trend
             change = Decimal(str((0.5 - 0.5) * 0.02))  # Random change
             close_price = base_price * (1 + change)
@@ -481,7 +984,7 @@ class TechnicalAnalysisEngine:
             high_price = max(open_price, close_price) * Decimal('1.005')
             low_price = min(open_price, close_price) * Decimal('0.995')
 
-            timestamp = datetime.now(timezone.utc) - timedelta(days=100 - i)
+            timestamp = datetime.now(timezone.utc) - timedelta(days=periods - i)
 
             price_data.append(PriceData(
                 timestamp=timestamp,
@@ -617,7 +1120,8 @@ class TechnicalAnalysisEngine:
 
     def get_chart_data(self, symbol: str, timeframe: str = '1D', periods: int = 100) -> Dict[str, Any]:
         """Get chart data with technical indicators for frontend visualization."""
-        price_data = self._get_price_data(symbol)
+        series = self._get_series(symbol)
+        price_data = series.price_data
 
         if not price_data:
             return {'error': f'No chart data available for {symbol}'}
@@ -639,38 +1143,27 @@ class TechnicalAnalysisEngine:
                 'volume': float(price.volume)
             })
 
-        # Add technical indicators
-        closes = [p.close for p in price_data]
-        highs = [p.high for p in price_data]
-        lows = [p.low for p in price_data]
-
-        # Simple moving averages
-        sma_20 = TechnicalIndicators.sma(closes, 20)
-        sma_50 = TechnicalIndicators.sma(closes, 50)
-
-        # RSI
-        rsi_values = TechnicalIndicators.rsi(closes, 14)
-
-        # MACD
-        macd_line, signal_line, histogram = TechnicalIndicators.macd(closes)
-
-        # Bollinger Bands
-        bb_sma, bb_upper, bb_lower = TechnicalIndicators.bollinger_bands(closes)
+        # Add technical indicators (shared with get_technical_analysis through the cache)
+        sma_20 = self._as_list(self._indicator(series, 'sma', 20))
+        sma_50 = self._as_list(self._indicator(series, 'sma', 50))
+        rsi_values = self._as_list(self._indicator(series, 'rsi', 14))
+        macd_line, signal_line, histogram = (self._as_list(v) for v in self._indicator(series, 'macd', 12, 26, 9))
+        bb_sma, bb_upper, bb_lower = (self._as_list(v) for v in self._indicator(series, 'bollinger_bands', 20, 2.0))
 
         # Add indicators to chart data
         for i, data_point in enumerate(chart_data['data']):
-            base_idx = len(price_data) - periods + i
+            base_idx = len(price_data) - len(chart_data['data']) + i
 
             data_point.update({
-                'sma_20': float(sma_20[base_idx]) if sma_20[base_idx] else None,
-                'sma_50': float(sma_50[base_idx]) if sma_50[base_idx] else None,
-                'rsi': float(rsi_values[base_idx]) if rsi_values[base_idx] else None,
-                'macd_line': float(macd_line[base_idx]) if macd_line[base_idx] else None,
-                'macd_signal': float(signal_line[base_idx]) if signal_line[base_idx] else None,
-                'macd_histogram': float(histogram[base_idx]) if histogram[base_idx] else None,
-                'bb_sma': float(bb_sma[base_idx]) if bb_sma[base_idx] else None,
-                'bb_upper': float(bb_upper[base_idx]) if bb_upper[base_idx] else None,
-                'bb_lower': float(bb_lower[base_idx]) if bb_lower[base_idx] else None,
+                'sma_20': sma_20[base_idx],
+                'sma_50': sma_50[base_idx],
+                'rsi': rsi_values[base_idx],
+                'macd_line': macd_line[base_idx],
+                'macd_signal': signal_line[base_idx],
+                'macd_histogram': histogram[base_idx],
+                'bb_sma': bb_sma[base_idx],
+                'bb_upper': bb_upper[base_idx],
+                'bb_lower': bb_lower[base_idx],
             })
 
         return chart_data
@@ -31,6 +31,8 @@ def register_socketio_handlers(socketio):
     _socketio.on_event('disconnect', _handle_disconnect)
     _socketio.on_event('join_challenge', _handle_join_challenge)
     _socketio.on_event('leave_challenge', _handle_leave_challenge)
+    _socketio.on_event('subscribe_indicators', _handle_subscribe_indicators)
+    _socketio.on_event('unsubscribe_indicators', _handle_unsubscribe_indicators)
 
 def _handle_connect():
     """
@@ -121,6 +123,65 @@ def _handle_leave_challenge(data):
             print(f"Error leaving challenge room: {e}")
 
 
+def _indicator_room(symbol, timeframe):
+    return f"indicators_{symbol.upper()}_{timeframe}"
+
+def _handle_subscribe_indicators(data):
+        """
+        Handle subscribing to live indicator updates for a symbol/timeframe.
+
+        Sends the current snapshot, then 'indicators_updated' on every tick.
+        """
+        try:
+            if not hasattr(request, 'sid_data'):
+                disconnect()
+                return
+
+            from app.streaming_indicators import indicator_registry
+            from app.infrastructure.history_store import INTERVAL_SECONDS
+
+            symbol = (data.get('symbol') or '').upper()
+            timeframe = data.get('timeframe', '1d')
+            if not symbol or timeframe not in INTERVAL_SECONDS:
+                _socketio.emit('error', {'message': 'symbol and a valid timeframe required'})
+                return
+
+            join_room(_indicator_room(symbol, timeframe))
+            socketio_emit('indicators_snapshot', indicator_registry.snapshot(symbol, timeframe))
+
+        except Exception as e:
+            print(f"Error subscribing to indicators: {e}")
+            _socketio.emit('error', {'message': 'Failed to subscribe to indicators'})
+
+def _handle_unsubscribe_indicators(data):
+        """Handle unsubscribing from live indicator updates."""
+        try:
+            symbol = data.get('symbol')
+            if symbol:
+                leave_room(_indicator_room(symbol, data.get('timeframe', '1d')))
+
+        except Exception as e:
+            print(f"Error unsubscribing from indicators: {e}")
+
+
+def setup_indicator_forwarding():
+    """
+    Forward streaming indicator updates to WebSocket subscribers.
+
+    Each price tick advances the tracked indicator sets in constant time;
+    the resulting snapshot goes to the symbol/timeframe room.
+    """
+    from app.streaming_indicators import indicator_registry
+
+    def indicator_forwarder(symbol, timeframe, snapshot, bar_closed):
+        if _socketio is None:
+            return
+        _socketio.emit('indicators_updated', {**snapshot, 'bar_closed': bar_closed},
+                       room=_indicator_room(symbol, timeframe))
+
+    indicator_registry.add_listener(indicator_forwarder)
+
+
 def validate_jwt_token(token):
     """
     Validate JWT token and extract payload.
@@ -196,6 +257,7 @@ def setup_event_bus_forwarding():
                 'EQUITY_UPDATED': 'equity_updated',
                 'CHALLENGE_STATUS_CHANGED': 'challenge_status_changed',
                 'RISK_ALERT': 'risk_alert',
+                'ORDER_FILLED': 'order_filled',
             }
 
             socketio_event = event_mapping.get(event_type)
@@ -1083,6 +1083,243 @@ CREATE INDEX idx_analytics_user_status ON challenges (user_id, status);
 CREATE INDEX idx_analytics_date_range ON challenges (started_at, ended_at) WHERE started_at IS NOT NULL;
 CREATE INDEX idx_analytics_performance ON challenges (status, current_equity, total_trades);
 
+-- Per-user leaderboard statistics, maintained incrementally by triggers on
+-- challenges and trades so leaderboard reads never join the trade ledger.
+-- leaderboard_user_stats holds one row per user per UTC day of challenge
+-- creation (rolling windows sum the days they cover); leaderboard_user_totals
+-- holds the all-time row per user.
+CREATE TABLE leaderboard_user_stats (
+    user_id UUID NOT NULL REFERENCES users(id),
+    bucket_date DATE NOT NULL, -- UTC day the challenges were created
+
+    total_challenges INTEGER NOT NULL DEFAULT 0,
+    funded_challenges INTEGER NOT NULL DEFAULT 0,
+    funded_pnl NUMERIC(15,2) NOT NULL DEFAULT 0,          -- SUM(current_equity - initial_balance) over FUNDED
+    funded_return_sum NUMERIC(20,8) NOT NULL DEFAULT 0,   -- SUM of FUNDED returns, averaged at read time
+    best_funded_pnl NUMERIC(15,2),
+    total_trades BIGINT NOT NULL DEFAULT 0,
+    trade_pnl_sum NUMERIC(20,2) NOT NULL DEFAULT 0,       -- SUM(realized_pnl), averaged at read time
+    last_challenge_at TIMESTAMPTZ,
+
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, bucket_date)
+);
+
+CREATE INDEX idx_leaderboard_user_stats_bucket ON leaderboard_user_stats (bucket_date, user_id);
+
+CREATE TABLE leaderboard_user_totals (
+    user_id UUID PRIMARY KEY REFERENCES users(id),
+
+    total_challenges INTEGER NOT NULL DEFAULT 0,
+    funded_challenges INTEGER NOT NULL DEFAULT 0,
+    funded_pnl NUMERIC(15,2) NOT NULL DEFAULT 0,
+    funded_return_sum NUMERIC(20,8) NOT NULL DEFAULT 0,
+    best_funded_pnl NUMERIC(15,2),
+    total_trades BIGINT NOT NULL DEFAULT 0,
+    trade_pnl_sum NUMERIC(20,2) NOT NULL DEFAULT 0,
+    last_challenge_at TIMESTAMPTZ,
+    success_rate DOUBLE PRECISION GENERATED ALWAYS AS
+        (funded_challenges::float8 / NULLIF(total_challenges, 0)) STORED,
+
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Matches the global leaderboard ordering so top-N reads walk the index
+CREATE INDEX idx_leaderboard_user_totals_rank
+    ON leaderboard_user_totals (success_rate DESC, funded_pnl DESC, total_challenges DESC);
+CREATE INDEX idx_leaderboard_user_totals_pnl ON leaderboard_user_totals (funded_pnl DESC);
+CREATE INDEX idx_leaderboard_user_totals_challenges ON leaderboard_user_totals (total_challenges DESC);
+
+-- Add a delta to the user's day bucket and all-time row (upsert, concurrency-safe)
+CREATE OR REPLACE FUNCTION apply_leaderboard_stats_delta(
+    p_user_id UUID,
+    p_created_at TIMESTAMPTZ,
+    p_challenges INTEGER,
+    p_funded INTEGER,
+    p_funded_pnl NUMERIC,
+    p_funded_return NUMERIC,
+    p_best_funded_pnl NUMERIC,
+    p_trades INTEGER,
+    p_trade_pnl NUMERIC
+)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO leaderboard_user_stats AS s (
+        user_id, bucket_date, total_challenges, funded_challenges, funded_pnl,
+        funded_return_sum, best_funded_pnl, total_trades, trade_pnl_sum, last_challenge_at
+    ) VALUES (
+        p_user_id, (p_created_at AT TIME ZONE 'UTC')::date, p_challenges, p_funded, p_funded_pnl,
+        p_funded_return, p_best_funded_pnl, p_trades, p_trade_pnl, p_created_at
+    )
+    ON CONFLICT (user_id, bucket_date) DO UPDATE SET
+        total_challenges = s.total_challenges + EXCLUDED.total_challenges,
+        funded_challenges = s.funded_challenges + EXCLUDED.funded_challenges,
+        funded_pnl = s.funded_pnl + EXCLUDED.funded_pnl,
+        funded_return_sum = s.funded_return_sum + EXCLUDED.funded_return_sum,
+        best_funded_pnl = GREATEST(s.best_funded_pnl, EXCLUDED.best_funded_pnl),
+        total_trades = s.total_trades + EXCLUDED.total_trades,
+        trade_pnl_sum = s.trade_pnl_sum + EXCLUDED.trade_pnl_sum,
+        last_challenge_at = GREATEST(s.last_challenge_at, EXCLUDED.last_challenge_at),
+        updated_at = NOW();
+
+    INSERT INTO leaderboard_user_totals AS s (
+        user_id, total_challenges, funded_challenges, funded_pnl,
+        funded_return_sum, best_funded_pnl, total_trades, trade_pnl_sum, last_challenge_at
+    ) VALUES (
+        p_user_id, p_challenges, p_funded, p_funded_pnl,
+        p_funded_return, p_best_funded_pnl, p_trades, p_trade_pnl, p_created_at
+    )
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_challenges = s.total_challenges + EXCLUDED.total_challenges,
+        funded_challenges = s.funded_challenges + EXCLUDED.funded_challenges,
+        funded_pnl = s.funded_pnl + EXCLUDED.funded_pnl,
+        funded_return_sum = s.funded_return_sum + EXCLUDED.funded_return_sum,
+        best_funded_pnl = GREATEST(s.best_funded_pnl, EXCLUDED.best_funded_pnl),
+        total_trades = s.total_trades + EXCLUDED.total_trades,
+        trade_pnl_sum = s.trade_pnl_sum + EXCLUDED.trade_pnl_sum,
+        last_challenge_at = GREATEST(s.last_challenge_at, EXCLUDED.last_challenge_at),
+        updated_at = NOW();
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION leaderboard_stats_on_challenge_insert()
+RETURNS TRIGGER AS $$
+DECLARE
+    funded BOOLEAN := NEW.status = 'FUNDED';
+BEGIN
+    PERFORM apply_leaderboard_stats_delta(
+        NEW.user_id, NEW.created_at,
+        1,
+        CASE WHEN funded THEN 1 ELSE 0 END,
+        CASE WHEN funded THEN NEW.current_equity - NEW.initial_balance ELSE 0 END,
+        CASE WHEN funded THEN (NEW.current_equity - NEW.initial_balance) / NEW.initial_balance ELSE 0 END,
+        CASE WHEN funded THEN NEW.current_equity - NEW.initial_balance END,
+        0, 0
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Swap the old FUNDED contribution for the new one; the best funded PnL can only
+-- be recomputed (from this user's FUNDED challenges) when a contribution leaves
+CREATE OR REPLACE FUNCTION leaderboard_stats_on_challenge_update()
+RETURNS TRIGGER AS $$
+DECLARE
+    was_funded BOOLEAN := OLD.status = 'FUNDED';
+    is_funded BOOLEAN := NEW.status = 'FUNDED';
+    old_pnl NUMERIC := CASE WHEN was_funded THEN OLD.current_equity - OLD.initial_balance ELSE 0 END;
+    new_pnl NUMERIC := CASE WHEN is_funded THEN NEW.current_equity - NEW.initial_balance ELSE 0 END;
+    bucket DATE := (NEW.created_at AT TIME ZONE 'UTC')::date;
+BEGIN
+    PERFORM apply_leaderboard_stats_delta(
+        NEW.user_id, NEW.created_at,
+        0,
+        (CASE WHEN is_funded THEN 1 ELSE 0 END) - (CASE WHEN was_funded THEN 1 ELSE 0 END),
+        new_pnl - old_pnl,
+        new_pnl / NEW.initial_balance - old_pnl / OLD.initial_balance,
+        CASE WHEN is_funded THEN new_pnl END,
+        0, 0
+    );
+
+    IF was_funded THEN
+        UPDATE leaderboard_user_stats SET best_funded_pnl = (
+            SELECT MAX(c.current_equity - c.initial_balance) FROM challenges c
+            WHERE c.user_id = NEW.user_id AND c.status = 'FUNDED'
+            AND (c.created_at AT TIME ZONE 'UTC')::date = bucket
+        )
+        WHERE user_id = NEW.user_id AND bucket_date = bucket;
+
+        UPDATE leaderboard_user_totals SET best_funded_pnl = (
+            SELECT MAX(c.current_equity - c.initial_balance) FROM challenges c
+            WHERE c.user_id = NEW.user_id AND c.status = 'FUNDED'
+        )
+        WHERE user_id = NEW.user_id;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION leaderboard_stats_on_trade_insert()
+RETURNS TRIGGER AS $$
+DECLARE
+    challenge_user_id UUID;
+    challenge_created_at TIMESTAMPTZ;
+BEGIN
+    SELECT user_id, created_at INTO challenge_user_id, challenge_created_at
+    FROM challenges WHERE id = NEW.challenge_id;
+
+    PERFORM apply_leaderboard_stats_delta(
+        challenge_user_id, challenge_created_at,
+        0, 0, 0, 0, NULL,
+        1, NEW.realized_pnl
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_leaderboard_stats_challenge_insert
+    AFTER INSERT ON challenges
+    FOR EACH ROW EXECUTE FUNCTION leaderboard_stats_on_challenge_insert();
+
+CREATE TRIGGER trg_leaderboard_stats_challenge_update
+    AFTER UPDATE OF status, current_equity ON challenges
+    FOR EACH ROW
+    WHEN ((OLD.status = 'FUNDED' OR NEW.status = 'FUNDED')
+          AND (OLD.status IS DISTINCT FROM NEW.status OR OLD.current_equity IS DISTINCT FROM NEW.current_equity))
+    EXECUTE FUNCTION leaderboard_stats_on_challenge_update();
+
+CREATE TRIGGER trg_leaderboard_stats_trade_insert
+    AFTER INSERT ON trades
+    FOR EACH ROW EXECUTE FUNCTION leaderboard_stats_on_trade_insert();
+
+-- Rebuild both stats tables from the write models (initial backfill or repair).
+-- Trades are pre-aggregated per challenge so the rebuild never fans out.
+CREATE OR REPLACE FUNCTION rebuild_leaderboard_user_stats()
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    LOCK TABLE challenges, trades IN SHARE MODE;
+    TRUNCATE leaderboard_user_stats, leaderboard_user_totals;
+
+    INSERT INTO leaderboard_user_stats (
+        user_id, bucket_date, total_challenges, funded_challenges, funded_pnl,
+        funded_return_sum, best_funded_pnl, total_trades, trade_pnl_sum, last_challenge_at
+    )
+    SELECT
+        c.user_id,
+        (c.created_at AT TIME ZONE 'UTC')::date,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE c.status = 'FUNDED'),
+        COALESCE(SUM(c.current_equity - c.initial_balance) FILTER (WHERE c.status = 'FUNDED'), 0),
+        COALESCE(SUM((c.current_equity - c.initial_balance) / c.initial_balance) FILTER (WHERE c.status = 'FUNDED'), 0),
+        MAX(c.current_equity - c.initial_balance) FILTER (WHERE c.status = 'FUNDED'),
+        COALESCE(SUM(t.trade_count), 0),
+        COALESCE(SUM(t.pnl_sum), 0),
+        MAX(c.created_at)
+    FROM challenges c
+    LEFT JOIN (
+        SELECT challenge_id, COUNT(*) AS trade_count, SUM(realized_pnl) AS pnl_sum
+        FROM trades
+        GROUP BY challenge_id
+    ) t ON t.challenge_id = c.id
+    GROUP BY c.user_id, (c.created_at AT TIME ZONE 'UTC')::date;
+
+    INSERT INTO leaderboard_user_totals (
+        user_id, total_challenges, funded_challenges, funded_pnl,
+        funded_return_sum, best_funded_pnl, total_trades, trade_pnl_sum, last_challenge_at
+    )
+    SELECT
+        user_id, SUM(total_challenges), SUM(funded_challenges), SUM(funded_pnl),
+        SUM(funded_return_sum), MAX(best_funded_pnl), SUM(total_trades), SUM(trade_pnl_sum), MAX(last_challenge_at)
+    FROM leaderboard_user_stats
+    GROUP BY user_id;
+END;
+$$;
+
 /*
 TASK 8 EXPLANATION: READ MODELS DESIGN
 
@@ -1105,6 +1342,13 @@ Refresh Strategy:
 - Trigger-based refresh possible but may cause performance issues
 - Manual refresh for immediate accuracy after important events
 
+INCREMENTAL TABLES: leaderboard_user_stats / leaderboard_user_totals
+- Per-user challenge and trade aggregates feeding the global, category and user ranking endpoints
+- Updated in the same transaction as the write by triggers on challenges (insert, FUNDED transitions) and trades (insert)
+- Sums and counts only, so each write is an O(1) upsert; averages and rates are derived at read time
+- Day buckets by challenge creation date serve the today/week/month windows without touching trades
+- rebuild_leaderboard_user_stats() backfills both tables from the write models
+
 Why Read Models are Separated from Write Models:
 1. Performance Isolation: Analytics queries don't impact transactional performance
 2. Different Optimization: Write models optimized for updates, read models for queries
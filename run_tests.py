@@ -51,6 +51,7 @@ def main():
         print("  fast           - Run fast tests only (skip slow tests)")
         print("  api            - Run API endpoint tests only")
         print("  performance    - Run performance tests")
+        print("  benchmark      - Run the benchmark suite (full profile) and write benchmark-results.json")
         print("  security       - Run security tests")
         print("  lint           - Run linting checks")
         print("  type-check     - Run type checking")
@@ -111,6 +112,13 @@ def main():
             '-v', '--tb=short', '-s'
         ], "Performance Tests")
 
+    elif command == 'benchmark':
+        success = run_command([
+            sys.executable, '-m', 'tests.performance.benchmarks',
+            '--profile', 'full',
+            '--output', 'benchmark-results.json'
+        ] + sys.argv[2:], "Benchmark Suite")
+
     elif command == 'security':
         success = run_command([
             'pytest', 'tests/',
@@ -9,8 +9,14 @@ Principes:
 - Gestion d'erreurs et retries avec timeout raisonnable.
 - Simple cache en mémoire pour éviter des requêtes trop fréquentes (paramètre `min_interval`).
 
-Fonction publique:
+- Mode bulk: les pages de cotations listent tous les instruments .MA; elles sont
+  téléchargées une seule fois par fenêtre de rafraîchissement et parsées (lxml) en
+  une table ticker -> (dernier cours, cours de la veille).
+
+Fonctions publiques:
     get_casablanca_price(ticker, timeout=5, retries=2, retry_delay=1.5, min_interval=2.0) -> float
+    get_casablanca_prices(tickers, timeout=5, refresh_window=60.0) -> dict[str, float]
+    get_listing_table(timeout=5, refresh_window=60.0) -> dict[str, tuple[float, Optional[float]]]
 
 Retourne un `float` ou lève `ValueError` en cas d'échec irrécoverable.
 """
@@ -24,6 +30,7 @@ from typing import Optional
 
 import requests
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -31,6 +38,17 @@ logging.basicConfig(level=logging.INFO)
 # In-memory simple cache to prevent excessive scraping frequency
 _LAST_FETCH: dict[str, tuple[float, float]] = {}  # ticker -> (timestamp, price)
 
+# Listing pages quoting every instrument, and their parsed table
+LISTING_URLS = [
+    'https://www.casablanca-bourse.com/fr/live-market/marche-actions-listing',
+    'https://www.casablanca-bourse.com/en/live-market/marche-actions-listing',
+]
+_LISTING_CACHE: dict[str, object] = {'ts': 0.0, 'table': {}}
+
+_TICKER_HEADERS = ('ticker', 'code', 'symbole', 'symbol')
+_PREV_HEADERS = ('veille', 'référence', 'reference', 'previous', 'clôture', 'close')
+_LAST_HEADERS = ('dernier cours', 'cours', 'last', 'dernier', 'price', 'prix')
+
 
 def _parse_number_string(s: str) -> Optional[float]:
     """Parse une chaîne contenant un nombre (avec ., ou ,) en float.
@@ -127,16 +145,122 @@ def _scrape_url_for_price(url: str, ticker: str, timeout: float) -> Optional[flo
     return None
 
 
+def _parse_listing_table(content: str | bytes) -> dict[str, tuple[float, Optional[float]]]:
+    """Parse une page de cotations en table ticker -> (dernier cours, cours de la veille).
+
+    Les colonnes sont repérées par mots-clés dans l'en-tête de chaque tableau.
+    Utilise lxml directement (bien plus rapide que BeautifulSoup sur de grandes pages).
+    """
+    document = lxml_html.fromstring(content)
+    table: dict[str, tuple[float, Optional[float]]] = {}
+
+    def find(headers: list[str], keywords: tuple[str, ...], exclude: tuple[str, ...] = ()) -> Optional[int]:
+        for i, h in enumerate(headers):
+            if any(k in h for k in keywords) and not any(e in h for e in exclude):
+                return i
+        return None
+
+    for tbl in document.iter('table'):
+        rows = tbl.xpath('.//tr')
+        if len(rows) < 2:
+            continue
+
+        headers = [c.text_content().strip().lower() for c in rows[0].xpath('./th|./td')]
+        ticker_col = find(headers, _TICKER_HEADERS)
+        last_col = find(headers, _LAST_HEADERS, exclude=_PREV_HEADERS + ('%', 'variation'))
+        prev_col = find(headers, _PREV_HEADERS)
+        if ticker_col is None or last_col is None:
+            continue
+
+        for row in rows[1:]:
+            cells = [c.text_content().strip() for c in row.xpath('./td|./th')]
+            if len(cells) <= max(ticker_col, last_col):
+                continue
+            ticker = cells[ticker_col].upper()
+            last = _parse_number_string(cells[last_col].replace('\xa0', '').replace(' ', ''))
+            if not ticker or last is None or last <= 0:
+                continue
+            prev = None
+            if prev_col is not None and prev_col < len(cells):
+                prev = _parse_number_string(cells[prev_col].replace('\xa0', '').replace(' ', ''))
+            table[ticker] = (last, prev)
+
+    return table
+
+
+def get_listing_table(timeout: float = 5.0, refresh_window: float = 60.0) -> dict[str, tuple[float, Optional[float]]]:
+    """
+    Retourne la table des cotations de tous les instruments (cache par `refresh_window`).
+
+    Chaque page de cotations n'est téléchargée et parsée qu'une fois par fenêtre;
+    en cas d'échec, la dernière table connue est conservée.
+    """
+    now = time.time()
+    if now - float(_LISTING_CACHE['ts']) < refresh_window:
+        return _LISTING_CACHE['table']  # type: ignore[return-value]
+
+    headers = {
+        'User-Agent': 'TradeSenseBot/1.0 (+https://example.com)'
+    }
+    table: dict[str, tuple[float, Optional[float]]] = {}
+    for url in LISTING_URLS:
+        try:
+            resp = requests.get(url, headers=headers, timeout=timeout)
+            resp.raise_for_status()
+            table = _parse_listing_table(resp.text)
+        except requests.exceptions.RequestException as rexc:
+            logger.warning('Request error for listing %s: %s', url, rexc)
+        except Exception as exc:
+            logger.warning('Unexpected error parsing listing %s: %s', url, exc)
+        if table:
+            break
+
+    if table:
+        logger.info('Parsed %d instruments from listing', len(table))
+        _LISTING_CACHE['table'] = table
+    _LISTING_CACHE['ts'] = now
+    return _LISTING_CACHE['table']  # type: ignore[return-value]
+
+
+def get_casablanca_prices(
+    tickers: list[str],
+    timeout: float = 5.0,
+    refresh_window: float = 60.0,
+) -> dict[str, float]:
+    """
+    Retourne les derniers prix pour plusieurs tickers (mode bulk).
+
+    - Sert tous les tickers présents dans la table de cotations (une ou deux pages téléchargées).
+    - Les tickers absents de la table passent par `get_casablanca_price`; ceux en échec sont omis.
+    """
+    table = get_listing_table(timeout=timeout, refresh_window=refresh_window)
+    prices: dict[str, float] = {}
+
+    for ticker in tickers:
+        t = ticker.strip().upper().replace('.MA', '')
+        if t in table:
+            prices[ticker] = table[t][0]
+            continue
+        try:
+            prices[ticker] = get_casablanca_price(t, timeout=timeout, use_listing=False)
+        except ValueError as exc:
+            logger.warning('No price for %s: %s', ticker, exc)
+
+    return prices
+
+
 def get_casablanca_price(
     ticker: str,
     timeout: float = 5.0,
     retries: int = 2,
     retry_delay: float = 1.5,
     min_interval: float = 2.0,
+    use_listing: bool = True,
 ) -> float:
     """
     Retourne le dernier prix pour `ticker` (float).
 
+    - Consulte d'abord la table de cotations partagée (`use_listing`).
     - Tente plusieurs sources; si l'une échoue, passe à la suivante.
     - Utilise un simple cache pour respecter `min_interval` entre requêtes pour le même ticker.
     - Lève `ValueError` en cas d'échec après tous les essais.
@@ -150,6 +274,12 @@ def get_casablanca_price(
             logger.debug('Returning cached price for %s', t)
             return price
 
+    if use_listing:
+        listed = get_listing_table(timeout=timeout).get(t.replace('.MA', ''))
+        if listed:
+            _LAST_FETCH[t] = (time.time(), listed[0])
+            return listed[0]
+
     # Candidate URLs to try (primary: Casablanca Bourse official site patterns)
     candidate_urls = [
         # Common public endpoints (may change) - try multiple patterns
@@ -216,15 +346,19 @@ def get_casablanca_price(
 if __name__ == '__main__':
     import argparse
 
-    parser = argparse.ArgumentParser(description='Fetch last price for Casablanca ticker')
-    parser.add_argument('ticker', help='Ticker symbol (e.g., CIH)')
+    parser = argparse.ArgumentParser(description='Fetch last price for Casablanca tickers')
+    parser.add_argument('tickers', nargs='+', help='Ticker symbol(s) (e.g., CIH IAM ATW)')
     parser.add_argument('--timeout', type=float, default=5.0)
     parser.add_argument('--retries', type=int, default=2)
     args = parser.parse_args()
 
     try:
-        p = get_casablanca_price(args.ticker, timeout=args.timeout, retries=args.retries)
-        print(float(p))
+        if len(args.tickers) == 1:
+            p = get_casablanca_price(args.tickers[0], timeout=args.timeout, retries=args.retries)
+            print(float(p))
+        else:
+            for t, p in get_casablanca_prices(args.tickers, timeout=args.timeout).items():
+                print(f'{t} {p}')
     except Exception as e:
         logger.error('Error: %s', e)
         raise
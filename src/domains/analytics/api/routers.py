@@ -7,10 +7,13 @@ from fastapi.responses import JSONResponse
 from shared.infrastructure.logging.audit_logger import AuditLogger
 import redis.asyncio as redis
 
+from ..domain.event_projections import LeaderboardProjector
+from ..domain.performance_store import TraderPerformanceStore
 from ..domain.ranking_algorithm import RankingAlgorithm
 from ..infrastructure.cache_service import AnalyticsCacheService
 from ..application.handlers import (
     GetLeaderboardHandler,
+    RecomputeLeaderboardsHandler,
     GetTraderPerformanceHandler,
     GetTopPerformersHandler,
     SearchTradersHandler,
@@ -23,6 +26,7 @@ from ..application.queries import (
     SearchTradersQuery,
     GetAnalyticsMetadataQuery,
 )
+from ....workers.leaderboard_recompute import LeaderboardRecomputeWorker
 from .schemas import (
     LeaderboardResponse,
     TraderPerformanceSchema,
@@ -36,6 +40,28 @@ from .schemas import (
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# Live leaderboard projector, registered by start_leaderboard_projection
+leaderboard_projector: Optional[LeaderboardProjector] = None
+
+
+def start_leaderboard_projection(
+    projector: LeaderboardProjector,
+    audit_logger: AuditLogger,
+    interval_seconds: float = 60.0,
+) -> LeaderboardRecomputeWorker:
+    """
+    Serve leaderboards from the projector's store and schedule the batch recompute on it.
+
+    Call at startup from the running event loop; stop the returned worker on shutdown.
+    """
+    global leaderboard_projector
+    leaderboard_projector = projector
+
+    handler = RecomputeLeaderboardsHandler(projector.store, projector.cache, RankingAlgorithm(), audit_logger)
+    worker = LeaderboardRecomputeWorker(handler, interval_seconds=interval_seconds)
+    worker.schedule()
+    return worker
+
 
 # Rate limiting dependency (simplified)
 async def check_rate_limit(request: Request) -> None:
@@ -77,6 +103,11 @@ async def get_ranking_algorithm():
     return RankingAlgorithm()
 
 
+async def get_performance_store() -> Optional[TraderPerformanceStore]:
+    """The projector's in-memory store, so leaderboards rank without reloading traders."""
+    return leaderboard_projector.store if leaderboard_projector else None
+
+
 async def get_audit_logger():
     """Get audit logger."""
     # Placeholder
@@ -128,11 +159,14 @@ async def get_leaderboard(
     cache_service=Depends(get_cache_service),
     ranking_algorithm=Depends(get_ranking_algorithm),
     audit_logger=Depends(get_audit_logger),
+    performance_store=Depends(get_performance_store),
     rate_limit: None = Depends(check_rate_limit),
 ) -> LeaderboardResponse:
     """Get leaderboard rankings."""
     try:
-        handler = GetLeaderboardHandler(repository, cache_service, ranking_algorithm, audit_logger)
+        handler = GetLeaderboardHandler(
+            repository, cache_service, ranking_algorithm, audit_logger, performance_store=performance_store
+        )
 
         query = GetLeaderboardQuery(
             metric_type=metric_type,
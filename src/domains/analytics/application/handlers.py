@@ -1,12 +1,14 @@
 """Analytics application query handlers."""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from datetime import datetime
 
 from ...shared.infrastructure.logging.audit_logger import AuditLogger
 
 from ..domain.read_models import TraderPerformance, ChallengeAnalytics, LeaderboardEntry
-from ..domain.ranking_algorithm import RankingAlgorithm, RankingMetric, RankingPeriod
+from ..domain.event_projections import LeaderboardProjector
+from ..domain.performance_store import TraderPerformanceStore
+from ..domain.ranking_algorithm import ColumnarRanking, RankingAlgorithm, RankingMetric, RankingPeriod
 from ..infrastructure.cache_service import AnalyticsCacheService
 from .queries import (
     GetLeaderboardQuery,
@@ -20,8 +22,40 @@ from .queries import (
 )
 
 
+def _leaderboard_cache_key(metric_type: str, period: str, challenge_type: Optional[str], limit: int, offset: int) -> str:
+    """Query-result cache key for one page of a leaderboard."""
+    return f"leaderboard:{metric_type}:{period}:{challenge_type or 'all'}:{limit}:{offset}"
+
+
+def _leaderboard_page(rankings: ColumnarRanking, offset: int, limit: int) -> List[Dict[str, Any]]:
+    """Response entries for one page (entry dicts are only built for that page)."""
+    result = []
+    for ranking in rankings.entries(offset, limit):
+        result.append({
+            "rank": ranking["rank"],
+            "trader_id": ranking["trader_id"],
+            "username": ranking["username"],
+            "score": float(ranking["score"]),
+            "raw_value": float(ranking["raw_value"]),
+            "metric_type": ranking["metric_type"],
+            "period": ranking["period"],
+            "challenge_type": ranking["challenge_type"],
+            "rank_change": ranking["rank_change"],
+            "total_challenges": ranking["total_challenges"],
+            "pass_rate": ranking["pass_rate"],
+            "trading_days": ranking["trading_days"],
+            "last_updated": ranking["last_updated"].isoformat(),
+        })
+    return result
+
+
 class GetLeaderboardHandler:
-    """Handler for leaderboard queries."""
+    """
+    Handler for leaderboard queries.
+
+    Ranks from performance_store (e.g. LeaderboardProjector.store) when one is
+    given; otherwise loads traders from the repository for the request.
+    """
 
     def __init__(
         self,
@@ -29,16 +63,18 @@ class GetLeaderboardHandler:
         cache_service: AnalyticsCacheService,
         ranking_algorithm: RankingAlgorithm,
         audit_logger: AuditLogger,
+        performance_store: Optional[TraderPerformanceStore] = None,
     ):
         self.repository = repository
         self.cache = cache_service
         self.ranking = ranking_algorithm
         self.audit_logger = audit_logger
+        self.store = performance_store
 
     async def handle(self, query: GetLeaderboardQuery) -> Dict[str, Any]:
         """Handle leaderboard query with caching."""
         # Try cache first
-        cache_key = f"leaderboard:{query.metric_type}:{query.period}:{query.challenge_type or 'all'}:{query.limit}:{query.offset}"
+        cache_key = _leaderboard_cache_key(query.metric_type, query.period, query.challenge_type, query.limit, query.offset)
         cached_result = await self.cache.get_query_result(cache_key)
 
         if cached_result:
@@ -54,44 +90,26 @@ class GetLeaderboardHandler:
             details={"query": cache_key},
         )
 
-        # Get all trader performances
-        all_traders = await self.repository.get_all_trader_performances(limit=1000)
-
-        # Calculate rankings
         try:
             metric = RankingMetric(query.metric_type)
             period = RankingPeriod(query.period)
         except ValueError:
             raise ValueError(f"Invalid metric '{query.metric_type}' or period '{query.period}'")
 
-        rankings = self.ranking.calculate_rankings(
-            traders=all_traders,
+        store = self.store
+        if store is None:
+            # Get all trader performances
+            all_traders = await self.repository.get_all_trader_performances(limit=1000)
+            store = TraderPerformanceStore.from_performances(all_traders)
+
+        # Calculate rankings
+        rankings = self.ranking.rank_store(
+            store,
             metric=metric,
             period=period,
             challenge_type=query.challenge_type,
         )
-
-        # Apply pagination
-        paginated_rankings = rankings[query.offset:query.offset + query.limit]
-
-        # Convert to response format
-        result = []
-        for ranking in paginated_rankings:
-            result.append({
-                "rank": ranking["rank"],
-                "trader_id": ranking["trader_id"],
-                "username": ranking["username"],
-                "score": float(ranking["score"]),
-                "raw_value": float(ranking["raw_value"]),
-                "metric_type": ranking["metric_type"],
-                "period": ranking["period"],
-                "challenge_type": ranking["challenge_type"],
-                "rank_change": ranking["rank_change"],
-                "total_challenges": ranking["total_challenges"],
-                "pass_rate": ranking["pass_rate"],
-                "trading_days": ranking["trading_days"],
-                "last_updated": ranking["last_updated"].isoformat(),
-            })
+        result = _leaderboard_page(rankings, query.offset, query.limit)
 
         # Cache result
         await self.cache.store_query_result(cache_key, result)
@@ -104,6 +122,45 @@ class GetLeaderboardHandler:
         }
 
 
+class RecomputeLeaderboardsHandler:
+    """
+    Batch job: recompute every leaderboard from the performance store in one
+    RankingAlgorithm.rank_all pass and cache the first page of each, so
+    leaderboard reads hit the cache instead of ranking on demand.
+    """
+
+    def __init__(
+        self,
+        performance_store: TraderPerformanceStore,
+        cache_service: AnalyticsCacheService,
+        ranking_algorithm: RankingAlgorithm,
+        audit_logger: AuditLogger,
+    ):
+        self.store = performance_store
+        self.cache = cache_service
+        self.ranking = ranking_algorithm
+        self.audit_logger = audit_logger
+
+    async def handle(self, page_size: int = 100, challenge_types: Sequence[Optional[str]] = (None,)) -> int:
+        """Rank all metrics and periods and cache page one of each. Returns the number of boards."""
+        started_at = datetime.utcnow()
+        rankings = self.ranking.rank_all(self.store, challenge_types=challenge_types)
+
+        for (metric, period, challenge_type), board in rankings.items():
+            cache_key = _leaderboard_cache_key(metric.value, period.value, challenge_type, page_size, 0)
+            await self.cache.store_query_result(cache_key, _leaderboard_page(board, 0, page_size))
+
+        self.audit_logger.log_business_event(
+            event_type="leaderboards_recomputed",
+            details={
+                "boards": len(rankings),
+                "traders": len(self.store),
+                "duration_ms": int((datetime.utcnow() - started_at).total_seconds() * 1000),
+            },
+        )
+        return len(rankings)
+
+
 class GetTraderPerformanceHandler:
     """Handler for trader performance queries."""
 
@@ -122,7 +179,7 @@ class GetTraderPerformanceHandler:
         # Try cache first
         cached_data = await self.cache.get_trader_performance(query.trader_id)
         if cached_data:
-            return {**cached_data, "cached": True}
+            return {**cached_data, "live_rankings": await self._live_rankings(query.trader_id), "cached": True}
 
         # Cache miss - get from repository
         performance = await self.repository.get_trader_performance(query.trader_id)
@@ -169,7 +226,22 @@ class GetTraderPerformanceHandler:
         # Cache result
         await self.cache.store_trader_performance(query.trader_id, result)
 
-        return result
+        # Ranks move with every other trader's updates, so they are read live
+        return {**result, "live_rankings": await self._live_rankings(query.trader_id)}
+
+    async def _live_rankings(self, trader_id: str) -> Dict[str, Dict[str, Any]]:
+        """Current rank and percentile per leaderboard metric from the rank index."""
+        rankings = {}
+        for metric_name, _ in LeaderboardProjector.METRICS:
+            rank = await self.cache.get_trader_rank(metric_name, LeaderboardProjector.PERIOD, trader_id)
+            if rank is None:
+                continue
+            percentile = await self.cache.get_trader_percentile(metric_name, LeaderboardProjector.PERIOD, trader_id)
+            rankings[metric_name] = {
+                "rank": rank,
+                "percentile": round(float(percentile), 1) if percentile is not None else None,
+            }
+        return rankings
 
 
 class GetTopPerformersHandler:
@@ -323,6 +395,7 @@ class AnalyticsRepository:
     """Repository interface for analytics."""
     async def get_trader_performance(self, trader_id: str) -> Optional[TraderPerformance]: ...
     async def get_all_trader_performances(self, limit: int = 1000) -> List[TraderPerformance]: ...
+    async def save_trader_ranks(self, ranks: Dict[str, Dict[str, int]], ranked_at: datetime) -> None: ...
     async def get_challenge_analytics(self, challenge_id: str) -> Optional[ChallengeAnalytics]: ...
     async def get_trader_count(self) -> int: ...
     async def get_challenge_count(self) -> int: ...
@@ -8,10 +8,13 @@ These projectors:
 - Optimized for bulk updates
 """
 
-from typing import Dict, Any, List, Optional
+import asyncio
+import bisect
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from .performance_store import TraderPerformanceStore
 from .read_models import TraderPerformance, ChallengeAnalytics, LeaderboardEntry
 
 
@@ -229,90 +232,257 @@ class ChallengeAnalyticsProjector:
         await self.repository.save_challenge_analytics(challenge)
 
 
+class OrderedMetricIndex:
+    """
+    Traders ordered by one metric, highest value first.
+
+    Entries are kept as (-value, trader_id) so a trader is found and moved
+    with a binary search; equal values are ordered by trader id.
+    """
+
+    def __init__(self):
+        self.values: Dict[str, Decimal] = {}
+        self._entries: List[Tuple[Decimal, str]] = []
+
+    def move(self, trader_id: str, value: Optional[Decimal]) -> Tuple[Optional[int], Optional[int]]:
+        """Set (or with None, remove) a trader's value. Returns its (old, new) 1-based ranks."""
+        old_rank = self.rank(trader_id)
+        if old_rank is not None:
+            del self._entries[old_rank - 1]
+            del self.values[trader_id]
+
+        if value is None:
+            return old_rank, None
+
+        self.values[trader_id] = value
+        position = bisect.bisect_left(self._entries, (-value, trader_id))
+        self._entries.insert(position, (-value, trader_id))
+        return old_rank, position + 1
+
+    def rank(self, trader_id: str) -> Optional[int]:
+        value = self.values.get(trader_id)
+        if value is None:
+            return None
+        return bisect.bisect_left(self._entries, (-value, trader_id)) + 1
+
+    def ranked(self, first: int, last: int) -> List[Tuple[int, str]]:
+        """(rank, trader_id) for ranks first to last inclusive."""
+        return [(first + i, trader_id) for i, (_, trader_id) in enumerate(self._entries[first - 1:last])]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class LeaderboardProjector:
-    """Projects events to update leaderboards."""
+    """
+    Projects events to update leaderboards.
+
+    Keeps one OrderedMetricIndex per metric in memory. A performance update
+    only moves the changed trader within each index, and only the traders
+    whose rank shifted (those between its old and new position) are written.
+    Updates are debounced: a burst of events for the same trader within
+    debounce_seconds is applied once, and each flush writes all rank
+    changes in one batch (repository.save_trader_ranks and
+    cache.store_leaderboard_entries).
+
+    The projector also keeps a TraderPerformanceStore current with every
+    flush, so batch rankings (RankingAlgorithm.rank_all) run on in-memory
+    columns without reloading traders from the repository. The store object
+    lives as long as the projector (rebuild refills it in place), so handlers
+    can hold on to it.
+    """
+
+    # Ranked metrics and how to read them from a TraderPerformance
+    METRICS = [
+        ("net_pnl", lambda p: p.net_pnl),
+        ("win_rate", lambda p: p.win_rate),
+        ("consistency", lambda p: p.consistency_score),
+        ("profit_factor", lambda p: p.profit_factor),
+    ]
+    PERIOD = "all_time"
 
-    def __init__(self, repository: 'AnalyticsRepository', cache_service: 'AnalyticsCacheService'):
+    def __init__(
+        self,
+        repository: 'AnalyticsRepository',
+        cache_service: 'AnalyticsCacheService',
+        debounce_seconds: float = 0.5,
+        load_limit: int = 100000,
+    ):
         self.repository = repository
         self.cache = cache_service
+        self.debounce_seconds = debounce_seconds
+        self.load_limit = load_limit
+
+        self.indexes: Dict[str, OrderedMetricIndex] = {}
+        self.performances: Dict[str, TraderPerformance] = {}
+        self.store = TraderPerformanceStore()
+        self.ranks: Dict[str, Dict[str, int]] = {}  # metric -> trader -> last written rank
+        self._pending: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
 
     async def project_performance_updated(self, trader_id: str) -> None:
-        """Recalculate leaderboards when trader performance changes."""
-        # Get updated performance
-        performance = await self.repository.get_trader_performance(trader_id)
-        if not performance:
+        """Queue a trader for re-ranking; bursts are applied together after the debounce delay."""
+        self._pending.add(trader_id)
+
+        if self.debounce_seconds <= 0:
+            await self.flush()
             return
 
-        # Recalculate rankings for different metrics and periods
-        await self._recalculate_leaderboards()
-
-    async def _recalculate_leaderboards(self) -> None:
-        """Recalculate all leaderboard rankings."""
-
-        # Get all trader performances
-        all_performances = await self.repository.get_all_trader_performances(limit=1000)
-
-        # Calculate rankings for different metrics
-        metrics = [
-            ("net_pnl", lambda p: p.net_pnl),
-            ("win_rate", lambda p: p.win_rate),
-            ("consistency", lambda p: p.consistency_score),
-            ("profit_factor", lambda p: p.profit_factor),
-        ]
-
-        for metric_name, metric_func in metrics:
-            # Sort by metric (descending for most metrics)
-            sorted_traders = sorted(
-                all_performances,
-                key=metric_func,
-                reverse=True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_delay())
+
+    async def project_event(self, event: Dict[str, Any]) -> None:
+        """Queue the trader named by an event for re-ranking."""
+        trader_id = event.get("trader_id") or event.get("user_id")
+        if trader_id:
+            await self.project_performance_updated(trader_id)
+
+    async def _flush_after_delay(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.debounce_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                # Analytics failures shouldn't block business operations
+                print(f"Leaderboard flush error: {e}")
+
+    async def flush(self) -> None:
+        """Re-rank every queued trader and write the resulting rank changes in one batch."""
+        async with self._flush_lock:
+            if not self.indexes:
+                self._pending.clear()
+                await self.rebuild()
+                return
+
+            trader_ids, self._pending = self._pending, set()
+            if not trader_ids:
+                return
+
+            for trader_id in trader_ids:
+                performance = await self.repository.get_trader_performance(trader_id)
+                if performance:
+                    self.performances[trader_id] = performance
+                    self.store.upsert(performance)
+                else:
+                    self.performances.pop(trader_id, None)
+                    self.store.remove(trader_id)
+
+            rank_updates: Dict[str, Dict[str, int]] = {}
+            entries: List[LeaderboardEntry] = []
+            for metric_name, metric_func in self.METRICS:
+                index = self.indexes[metric_name]
+                ranks = self.ranks[metric_name]
+                size_before = len(index)
+                span = None
+
+                for trader_id in trader_ids:
+                    performance = self.performances.get(trader_id)
+                    value = metric_func(performance) if performance else None
+                    old_rank, new_rank = index.move(trader_id, value)
+                    if new_rank is None:
+                        ranks.pop(trader_id, None)
+
+                    # Ranks between the old and new position shift by one; an
+                    # insertion or removal shifts everything below it
+                    if old_rank is None or new_rank is None:
+                        low, high = old_rank or new_rank, max(len(index), size_before)
+                    else:
+                        low, high = min(old_rank, new_rank), max(old_rank, new_rank)
+                    if low is not None:
+                        span = (min(span[0], low), max(span[1], high)) if span else (low, high)
+
+                if span is None:
+                    continue
+
+                # The cached board expires when idle; rewrite it whole rather than patch a gap
+                if not await self.cache.has_leaderboard(metric_name, self.PERIOD):
+                    span = (1, len(index))
+
+                for rank, trader_id in index.ranked(span[0], min(span[1], len(index))):
+                    previous_rank = ranks.get(trader_id)
+                    if previous_rank != rank:
+                        ranks[trader_id] = rank
+                        rank_updates.setdefault(trader_id, {})[f"{metric_name}_{self.PERIOD}"] = rank
+                    entries.append(self._entry(metric_name, metric_func, rank, trader_id, previous_rank))
+
+                if len(index) < size_before:
+                    await self.cache.remove_leaderboard_ranks(
+                        metric_name, self.PERIOD, list(range(len(index) + 1, size_before + 1))
+                    )
+
+                await self._sync_rank_scores(metric_name, metric_func, trader_ids)
+
+            await self._write(rank_updates, entries)
+
+    async def rebuild(self) -> None:
+        """Reload every trader, rebuild the metric indexes and write all ranks."""
+        all_performances = await self.repository.get_all_trader_performances(limit=self.load_limit)
+
+        self.performances = {performance.trader_id: performance for performance in all_performances}
+        self.store.load(all_performances)
+        self.indexes = {}
+        self.ranks = {}
+
+        rank_updates: Dict[str, Dict[str, int]] = {}
+        entries: List[LeaderboardEntry] = []
+        for metric_name, metric_func in self.METRICS:
+            index = self.indexes[metric_name] = OrderedMetricIndex()
+            ranks = self.ranks[metric_name] = {}
+            for performance in all_performances:
+                index.move(performance.trader_id, metric_func(performance))
+
+            for rank, trader_id in index.ranked(1, len(index)):
+                ranks[trader_id] = rank
+                rank_updates.setdefault(trader_id, {})[f"{metric_name}_{self.PERIOD}"] = rank
+                entries.append(self._entry(metric_name, metric_func, rank, trader_id, None))
+
+            await self.cache.update_rank_scores(
+                metric_name, self.PERIOD, {trader_id: value for trader_id, value in index.values.items()}
             )
 
-            # Update ranks
-            for rank, performance in enumerate(sorted_traders, 1):
-                await self._update_trader_rank(
-                    performance.trader_id,
-                    metric_name,
-                    "all_time",
-                    rank
-                )
-
-                # Create leaderboard entries for caching
-                entry = LeaderboardEntry(
-                    rank=rank,
-                    trader_id=performance.trader_id,
-                    username=performance.username,
-                    metric_value=metric_func(performance),
-                    metric_type=metric_name,
-                    period="all_time",
-                    total_challenges=performance.total_challenges,
-                    pass_rate=performance.pass_rate,
-                    trading_days=performance.trading_days,
-                )
-
-                await self.cache.store_leaderboard_entry(entry)
+        await self._write(rank_updates, entries)
 
-        # Update cache timestamps
-        await self.cache.update_metadata()
+    async def _sync_rank_scores(self, metric_name: str, metric_func, trader_ids: set) -> None:
+        """Mirror the changed traders' scores into the cache's rank index."""
+        scores = {}
+        removed = []
+        for trader_id in trader_ids:
+            performance = self.performances.get(trader_id)
+            if performance:
+                scores[trader_id] = metric_func(performance)
+            else:
+                removed.append(trader_id)
 
-    async def _update_trader_rank(
-        self,
-        trader_id: str,
-        metric_type: str,
-        period: str,
-        rank: int
-    ) -> None:
-        """Update trader's rank for specific metric and period."""
-        performance = await self.repository.get_trader_performance(trader_id)
-        if performance:
-            if not hasattr(performance, 'challenge_type_ranks'):
-                performance.challenge_type_ranks = {}
+        await self.cache.update_rank_scores(metric_name, self.PERIOD, scores)
+        await self.cache.remove_rank_scores(metric_name, self.PERIOD, removed)
 
-            key = f"{metric_type}_{period}"
-            performance.challenge_type_ranks[key] = rank
-            performance.rank_last_updated = datetime.utcnow()
+    async def _write(self, rank_updates: Dict[str, Dict[str, int]], entries: List[LeaderboardEntry]) -> None:
+        """Persist rank changes and leaderboard entries in one batch each."""
+        if rank_updates:
+            await self.repository.save_trader_ranks(rank_updates, datetime.utcnow())
+        if entries:
+            await self.cache.store_leaderboard_entries(entries)
 
-            await self.repository.save_trader_performance(performance)
+        # Update cache timestamps
+        await self.cache.update_metadata()
+
+    def _entry(self, metric_name: str, metric_func, rank: int, trader_id: str,
+               previous_rank: Optional[int]) -> LeaderboardEntry:
+        """Leaderboard entry for a trader at a rank."""
+        performance = self.performances[trader_id]
+        return LeaderboardEntry(
+            rank=rank,
+            trader_id=trader_id,
+            username=performance.username,
+            metric_value=metric_func(performance),
+            metric_type=metric_name,
+            period=self.PERIOD,
+            total_challenges=performance.total_challenges,
+            pass_rate=performance.pass_rate,
+            trading_days=performance.trading_days,
+            rank_change=previous_rank - rank if previous_rank else 0,
+        )
 
 
 class AnalyticsEventHandler:
@@ -333,13 +503,16 @@ class AnalyticsEventHandler:
             "ChallengeStarted": self.trader_projector.project_challenge_started,
             "ChallengePassed": [
                 self.trader_projector.project_challenge_passed,
-                self.leaderboard_projector.project_performance_updated,
+                self.leaderboard_projector.project_event,
             ],
             "ChallengeFailed": [
                 self.trader_projector.project_challenge_failed,
-                self.leaderboard_projector.project_performance_updated,
+                self.leaderboard_projector.project_event,
+            ],
+            "TradeExecuted": [
+                self.trader_projector.project_trade_executed,
+                self.leaderboard_projector.project_event,
             ],
-            "TradeExecuted": self.trader_projector.project_trade_executed,
             "DailyPnLCalculated": self.trader_projector.project_daily_pnl_calculated,
             "TradingMetricsUpdated": self.challenge_projector.project_trading_metrics_updated,
             "RuleViolationDetected": self.challenge_projector.project_rule_violation_detected,
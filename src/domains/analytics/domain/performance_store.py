@@ -0,0 +1,124 @@
+"""
+Columnar TraderPerformance Store
+
+Holds the TraderPerformance fields the ranking algorithm reads as parallel
+float64 arrays, one row per trader, so rankings are computed with array
+operations instead of per-trader attribute access:
+- Rows are addressed through a trader_id -> row index
+- upsert() overwrites a trader's row in place or appends one (amortized growth)
+- remove() moves the last row into the freed slot, so rows stay dense
+- load() refills the store in place, so references held elsewhere stay valid
+- The TraderPerformance objects are kept alongside for display fields
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .read_models import TraderPerformance
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch_seconds(value: Optional[datetime]) -> float:
+    """Naive-UTC seconds since the epoch (aware datetimes are converted to UTC)."""
+    if value is None:
+        return float('-inf')
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH).total_seconds()
+
+
+class TraderPerformanceStore:
+    """Parallel per-metric arrays over all traders with a trader index."""
+
+    # Column name -> how to read it from a TraderPerformance
+    COLUMNS = {
+        'total_challenges': lambda p: p.total_challenges,
+        'passed_challenges': lambda p: p.passed_challenges,
+        'total_trades': lambda p: p.total_trades,
+        'winning_trades': lambda p: p.winning_trades,
+        'losing_trades': lambda p: p.losing_trades,
+        'total_profit': lambda p: p.total_profit,
+        'total_loss': lambda p: p.total_loss,
+        'net_pnl': lambda p: p.net_pnl,
+        'win_rate': lambda p: p.win_rate,
+        'average_drawdown': lambda p: p.average_drawdown,
+        'trading_days': lambda p: p.trading_days,
+        'average_daily_pnl': lambda p: p.average_daily_pnl,
+        'last_active': lambda p: _epoch_seconds(p.last_active),
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self.trader_ids: List[str] = []
+        self.performances: List[TraderPerformance] = []
+        self.index: Dict[str, int] = {}
+        self._columns = {name: np.zeros(max(capacity, 1)) for name in self.COLUMNS}
+
+    @classmethod
+    def from_performances(cls, performances: Iterable[TraderPerformance]) -> 'TraderPerformanceStore':
+        """Build a store in one pass; later duplicates of a trader replace earlier ones."""
+        store = cls(capacity=1)
+        store.load(performances)
+        return store
+
+    def load(self, performances: Iterable[TraderPerformance]) -> None:
+        """Replace every row with the given traders; later duplicates replace earlier ones."""
+        performances = list({p.trader_id: p for p in performances}.values())
+        self.performances = performances
+        self.trader_ids = [p.trader_id for p in performances]
+        self.index = {trader_id: row for row, trader_id in enumerate(self.trader_ids)}
+        self._columns = {name: np.zeros(max(len(performances), 1)) for name in self.COLUMNS}
+        for name, read in self.COLUMNS.items():
+            self._columns[name][:len(performances)] = [float(read(p)) for p in performances]
+
+    def upsert(self, performance: TraderPerformance) -> int:
+        """Write a trader's row, appending it if new. Returns the row index."""
+        row = self.index.get(performance.trader_id)
+        if row is None:
+            row = len(self.trader_ids)
+            if row == len(self._columns['net_pnl']):
+                self._grow()
+            self.index[performance.trader_id] = row
+            self.trader_ids.append(performance.trader_id)
+            self.performances.append(performance)
+        else:
+            self.performances[row] = performance
+
+        for name, read in self.COLUMNS.items():
+            self._columns[name][row] = float(read(performance))
+        return row
+
+    def remove(self, trader_id: str) -> bool:
+        """Drop a trader's row, moving the last row into its place."""
+        row = self.index.pop(trader_id, None)
+        if row is None:
+            return False
+
+        last = len(self.trader_ids) - 1
+        if row != last:
+            moved = self.trader_ids[last]
+            self.trader_ids[row] = moved
+            self.performances[row] = self.performances[last]
+            self.index[moved] = row
+            for values in self._columns.values():
+                values[row] = values[last]
+
+        self.trader_ids.pop()
+        self.performances.pop()
+        return True
+
+    def column(self, name: str) -> np.ndarray:
+        """View of a column over the stored rows."""
+        return self._columns[name][:len(self.trader_ids)]
+
+    def _grow(self):
+        for name, values in self._columns.items():
+            grown = np.zeros(len(values) * 2)
+            grown[:len(values)] = values
+            self._columns[name] = grown
+
+    def __len__(self) -> int:
+        return len(self.trader_ids)
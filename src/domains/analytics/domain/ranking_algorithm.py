@@ -7,14 +7,21 @@ Calculates trader rankings based on multiple factors:
 - Challenge completion rates
 - Trading activity and experience
 
-Supports different ranking periods and challenge types.
+Supports different ranking periods and challenge types. Rankings are
+computed over a columnar TraderPerformanceStore so every leaderboard can be
+recomputed for the whole trader population at once.
 """
 
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Sequence, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 from enum import Enum
 
+import numpy as np
+
+from .performance_store import EPOCH, TraderPerformanceStore
+from .read_models import TraderPerformance
+
 
 class RankingMetric(Enum):
     """Available ranking metrics."""
@@ -39,204 +46,283 @@ class RankingPeriod(Enum):
     DAILY = "daily"
 
 
-class RankingAlgorithm:
-    """Advanced ranking algorithm for trader leaderboards."""
-
-    def __init__(self, minimum_trades: int = 10, minimum_challenges: int = 1):
-        self.minimum_trades = minimum_trades
-        self.minimum_challenges = minimum_challenges
+class ColumnarRanking:
+    """
+    One leaderboard over a TraderPerformanceStore: store rows in rank order
+    with their scores. Entry dicts are only built for the page requested.
+    """
 
-    def calculate_rankings(
+    def __init__(
         self,
-        traders: List['TraderPerformance'],
+        store: TraderPerformanceStore,
         metric: RankingMetric,
         period: RankingPeriod,
-        challenge_type: Optional[str] = None,
-        weights: Optional[Dict[str, float]] = None,
-    ) -> List[Dict[str, Any]]:
-        """
-        Calculate rankings for traders based on specified metric and period.
-
-        Returns list of ranking entries sorted by rank.
-        """
-        # Filter eligible traders
-        eligible_traders = self._filter_eligible_traders(traders, period, challenge_type)
-
-        if not eligible_traders:
-            return []
-
-        # Calculate metric values
-        trader_scores = []
-        for trader in eligible_traders:
-            score = self._calculate_metric_score(trader, metric, weights)
-            if score is not None:
-                trader_scores.append({
-                    'trader': trader,
-                    'score': score,
-                    'raw_value': self._get_raw_metric_value(trader, metric),
-                })
-
-        # Sort by score (descending for most metrics)
-        trader_scores.sort(key=lambda x: x['score'], reverse=self._is_descending_metric(metric))
-
-        # Assign ranks and calculate rank changes
+        challenge_type: Optional[str],
+        rows: np.ndarray,
+        scores: np.ndarray,
+        raw_values: np.ndarray,
+    ):
+        self.store = store
+        self.metric = metric
+        self.period = period
+        self.challenge_type = challenge_type
+        self.rows = rows
+        self.scores = scores
+        self.raw_values = raw_values
+
+    def entries(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Ranking entries for positions offset+1 .. offset+limit."""
+        stop = len(self.rows) if limit is None else min(len(self.rows), offset + limit)
+        now = datetime.utcnow()
         rankings = []
-        for position, entry in enumerate(trader_scores, 1):
-            trader = entry['trader']
+
+        for position in range(offset, stop):
+            trader = self.store.performances[self.rows[position]]
+            rank = position + 1
 
             # Calculate rank change (would need historical data)
-            previous_rank = getattr(trader, f'{metric.value}_rank', 0)
-            rank_change = previous_rank - position if previous_rank > 0 else 0
+            previous_rank = getattr(trader, f'{self.metric.value}_rank', 0)
+            rank_change = previous_rank - rank if previous_rank > 0 else 0
 
-            ranking_entry = {
-                'rank': position,
+            rankings.append({
+                'rank': rank,
                 'trader_id': trader.trader_id,
                 'username': trader.username,
-                'score': entry['score'],
-                'raw_value': entry['raw_value'],
-                'metric_type': metric.value,
-                'period': period.value,
-                'challenge_type': challenge_type,
+                'score': float(self.scores[position]),
+                'raw_value': float(self.raw_values[position]),
+                'metric_type': self.metric.value,
+                'period': self.period.value,
+                'challenge_type': self.challenge_type,
                 'rank_change': rank_change,
                 'total_challenges': trader.total_challenges,
                 'pass_rate': float(trader.pass_rate),
                 'trading_days': trader.trading_days,
-                'last_updated': datetime.utcnow(),
-            }
-
-            rankings.append(ranking_entry)
+                'last_updated': now,
+            })
 
         return rankings
 
-    def _filter_eligible_traders(
-        self,
-        traders: List['TraderPerformance'],
-        period: RankingPeriod,
-        challenge_type: Optional[str],
-    ) -> List['TraderPerformance']:
-        """Filter traders eligible for ranking."""
-        eligible = []
+    def __len__(self) -> int:
+        return len(self.rows)
 
-        for trader in traders:
-            # Must meet minimum activity requirements
-            if trader.total_challenges < self.minimum_challenges:
-                continue
 
-            if trader.total_trades < self.minimum_trades:
-                continue
+class RankingAlgorithm:
+    """
+    Advanced ranking algorithm for trader leaderboards.
 
-            # Must have been active in the period
-            if not self._is_active_in_period(trader, period):
-                continue
+    Works on a TraderPerformanceStore: metrics are computed as whole columns,
+    eligibility/period/challenge-type filters are boolean masks, and each
+    leaderboard is a single stable argsort of the masked scores.
+    """
 
-            # Filter by challenge type if specified
-            if challenge_type and not self._has_challenge_type(trader, challenge_type):
-                continue
+    PERIOD_WINDOWS = {
+        RankingPeriod.DAILY: timedelta(days=1),
+        RankingPeriod.WEEKLY: timedelta(weeks=1),
+        RankingPeriod.MONTHLY: timedelta(days=30),
+        RankingPeriod.YEARLY: timedelta(days=365),
+    }
+
+    def __init__(self, minimum_trades: int = 10, minimum_challenges: int = 1):
+        self.minimum_trades = minimum_trades
+        self.minimum_challenges = minimum_challenges
 
-            eligible.append(trader)
+    def calculate_rankings(
+        self,
+        traders: List[TraderPerformance],
+        metric: RankingMetric,
+        period: RankingPeriod,
+        challenge_type: Optional[str] = None,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate rankings for traders based on specified metric and period.
 
-        return eligible
+        Returns list of ranking entries sorted by rank.
+        """
+        store = TraderPerformanceStore.from_performances(traders)
+        return self.rank_store(store, metric, period, challenge_type, weights).entries()
 
-    def _calculate_metric_score(
+    def rank_store(
         self,
-        trader: 'TraderPerformance',
+        store: TraderPerformanceStore,
         metric: RankingMetric,
-        weights: Optional[Dict[str, float]],
-    ) -> Optional[Decimal]:
-        """Calculate weighted score for ranking."""
-        base_score = self._get_raw_metric_value(trader, metric)
-        if base_score is None:
-            return None
+        period: RankingPeriod,
+        challenge_type: Optional[str] = None,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> ColumnarRanking:
+        """Rank every trader in the store for one metric, period and challenge type."""
+        rankings = self.rank_all(store, [metric], [period], [challenge_type], weights)
+        return rankings[(metric, period, challenge_type)]
 
-        # Apply default or custom weights
-        if weights:
-            # Weighted combination of multiple metrics
-            total_weight = sum(weights.values())
-            if total_weight == 0:
-                return base_score
-
-            weighted_score = Decimal('0')
-            for metric_name, weight in weights.items():
-                metric_value = self._get_raw_metric_value(trader, RankingMetric(metric_name))
-                if metric_value is not None:
-                    # Normalize different metrics to 0-1 scale
-                    normalized_value = self._normalize_metric(metric_value, RankingMetric(metric_name))
-                    weighted_score += normalized_value * Decimal(str(weight))
-
-            return weighted_score / Decimal(str(total_weight))
-        else:
-            return base_score
+    def rank_all(
+        self,
+        store: TraderPerformanceStore,
+        metrics: Sequence[RankingMetric] = tuple(RankingMetric),
+        periods: Sequence[RankingPeriod] = tuple(RankingPeriod),
+        challenge_types: Sequence[Optional[str]] = (None,),
+        weights: Optional[Dict[str, float]] = None,
+    ) -> Dict[Tuple[RankingMetric, RankingPeriod, Optional[str]], ColumnarRanking]:
+        """
+        Rank every combination of metric, period and challenge type in one pass.
 
-    def _get_raw_metric_value(self, trader: 'TraderPerformance', metric: RankingMetric) -> Optional[Decimal]:
-        """Get raw metric value from trader performance."""
-        metric_map = {
-            RankingMetric.NET_PNL: trader.net_pnl,
-            RankingMetric.WIN_RATE: trader.win_rate,
-            RankingMetric.PROFIT_FACTOR: trader.profit_factor,
-            RankingMetric.EXPECTANCY: trader.expectancy,
-            RankingMetric.CONSISTENCY_SCORE: self._calculate_consistency_score(trader),
-            RankingMetric.PASS_RATE: trader.pass_rate,
-            RankingMetric.RISK_ADJUSTED_RETURN: self._calculate_risk_adjusted_return(trader),
-            RankingMetric.SHARPE_RATIO: self._calculate_sharpe_ratio(trader),
+        Metric columns and masks are computed once and shared across all the
+        leaderboards that use them.
+        """
+        columns: Dict[RankingMetric, np.ndarray] = {}
+        eligible = self._eligibility_mask(store)
+        period_masks = {period: eligible & self._period_mask(store, period) for period in periods}
+        type_masks = {
+            challenge_type: self._challenge_type_mask(store, challenge_type)
+            for challenge_type in challenge_types
         }
 
-        return metric_map.get(metric)
+        rankings = {}
+        for metric in metrics:
+            raw_values = self._metric_column(store, metric, columns)
+            scores = self._score_column(store, metric, weights, columns)
+            for period, period_mask in period_masks.items():
+                for challenge_type, type_mask in type_masks.items():
+                    rows = np.flatnonzero(period_mask & type_mask)
+                    masked = scores[rows]
+                    order = np.argsort(-masked if self._is_descending_metric(metric) else masked, kind='stable')
+                    rows = rows[order]
+                    rankings[(metric, period, challenge_type)] = ColumnarRanking(
+                        store, metric, period, challenge_type,
+                        rows, masked[order], raw_values[rows],
+                    )
 
-    def _calculate_consistency_score(self, trader: 'TraderPerformance') -> Decimal:
-        """Calculate consistency score based on steady performance."""
-        if trader.trading_days < 7:  # Need at least a week of data
-            return Decimal('0')
+        return rankings
 
-        # Simplified consistency calculation
-        # In production, this would analyze daily P&L volatility
-        # and consistency of returns over time
+    def _eligibility_mask(self, store: TraderPerformanceStore) -> np.ndarray:
+        """Traders meeting the minimum activity requirements."""
+        return (
+            (store.column('total_challenges') >= self.minimum_challenges)
+            & (store.column('total_trades') >= self.minimum_trades)
+        )
 
-        # Placeholder: average daily P&L divided by standard deviation
-        # For now, return a score based on pass rate and trading days
-        base_score = float(trader.pass_rate) * min(trader.trading_days / 30, 1.0)
-        return Decimal(str(base_score))
+    def _period_mask(self, store: TraderPerformanceStore, period: RankingPeriod) -> np.ndarray:
+        """Traders active in the specified period."""
+        if period == RankingPeriod.ALL_TIME:
+            return np.ones(len(store), dtype=bool)
 
-    def _calculate_risk_adjusted_return(self, trader: 'TraderPerformance') -> Decimal:
-        """Calculate risk-adjusted return (return per unit of risk)."""
-        if trader.average_drawdown == 0:
-            return trader.net_pnl if trader.net_pnl > 0 else Decimal('0')
+        cutoff = datetime.utcnow() - self.PERIOD_WINDOWS.get(period, timedelta(days=365))
+        return store.column('last_active') >= (cutoff - EPOCH).total_seconds()
 
-        # RAR = Total Return / Max Drawdown
-        return trader.net_pnl / abs(trader.average_drawdown)
+    def _challenge_type_mask(self, store: TraderPerformanceStore, challenge_type: Optional[str]) -> np.ndarray:
+        """Traders who have participated in the specified challenge type."""
+        # This would check trader's challenge history
+        # For now, assume all traders have participated in all types
+        return np.ones(len(store), dtype=bool)
 
-    def _calculate_sharpe_ratio(self, trader: 'TraderPerformance') -> Decimal:
-        """Calculate Sharpe ratio (excess return per unit of volatility)."""
-        # Simplified Sharpe ratio calculation
-        # In production, would use historical daily returns and risk-free rate
+    def _score_column(
+        self,
+        store: TraderPerformanceStore,
+        metric: RankingMetric,
+        weights: Optional[Dict[str, float]],
+        columns: Dict[RankingMetric, np.ndarray],
+    ) -> np.ndarray:
+        """Calculate weighted scores for ranking."""
+        base_score = self._metric_column(store, metric, columns)
 
-        if trader.trading_days < 30 or trader.average_daily_pnl == 0:
-            return Decimal('0')
+        # Apply default or custom weights
+        if not weights:
+            return base_score
 
-        # Placeholder: average daily return / volatility estimate
-        # Assume 10% annualized volatility as baseline
-        daily_volatility = Decimal('0.10') / Decimal('16')  # sqrt(256 trading days)
+        # Weighted combination of multiple metrics
+        total_weight = sum(weights.values())
+        if total_weight == 0:
+            return base_score
 
-        if daily_volatility == 0:
-            return Decimal('0')
+        weighted_score = np.zeros(len(store))
+        for metric_name, weight in weights.items():
+            weighted_metric = RankingMetric(metric_name)
+            # Normalize different metrics to 0-1 scale
+            normalized = self._normalize_column(self._metric_column(store, weighted_metric, columns), weighted_metric)
+            weighted_score += normalized * weight
 
-        return trader.average_daily_pnl / daily_volatility
+        return weighted_score / total_weight
 
-    def _normalize_metric(self, value: Decimal, metric: RankingMetric) -> Decimal:
-        """Normalize metric value to 0-1 scale for weighted calculations."""
+    def _metric_column(
+        self,
+        store: TraderPerformanceStore,
+        metric: RankingMetric,
+        columns: Dict[RankingMetric, np.ndarray],
+    ) -> np.ndarray:
+        """Raw metric values for every trader, memoized in columns."""
+        if metric not in columns:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                columns[metric] = self._compute_metric_column(store, metric)
+        return columns[metric]
+
+    def _compute_metric_column(self, store: TraderPerformanceStore, metric: RankingMetric) -> np.ndarray:
+        """Vectorized forms of the TraderPerformance metric properties."""
+        col = store.column
+
+        if metric == RankingMetric.NET_PNL:
+            return col('net_pnl')
+        if metric == RankingMetric.WIN_RATE:
+            return col('win_rate')
+        if metric == RankingMetric.PASS_RATE:
+            return self._pass_rate_column(store)
+
+        if metric == RankingMetric.PROFIT_FACTOR:
+            profit, loss = col('total_profit'), col('total_loss')
+            return np.where(
+                loss == 0,
+                np.where(profit == 0, 0.0, 999.0),
+                profit / np.abs(loss),
+            )
+
+        if metric == RankingMetric.EXPECTANCY:
+            wins, losses = col('winning_trades'), col('losing_trades')
+            avg_win = np.where(wins > 0, col('total_profit') / wins, 0.0)
+            avg_loss = np.where(losses > 0, np.abs(col('total_loss')) / losses, 0.0)
+            win_rate = col('win_rate')
+            expectancy = avg_win * win_rate - avg_loss * (1 - win_rate)
+            return np.where(col('total_trades') == 0, 0.0, expectancy)
+
+        if metric == RankingMetric.CONSISTENCY_SCORE:
+            # Simplified: pass rate scaled by up to a month of trading days,
+            # zero until there is at least a week of data
+            days = col('trading_days')
+            score = self._pass_rate_column(store) * np.minimum(days / 30, 1.0)
+            return np.where(days < 7, 0.0, score)
+
+        if metric == RankingMetric.RISK_ADJUSTED_RETURN:
+            # RAR = Total Return / Max Drawdown
+            net_pnl, drawdown = col('net_pnl'), col('average_drawdown')
+            return np.where(drawdown == 0, np.maximum(net_pnl, 0.0), net_pnl / np.abs(drawdown))
+
+        if metric == RankingMetric.SHARPE_RATIO:
+            # Simplified: average daily return over an assumed 10% annualized
+            # volatility (sqrt(256 trading days) = 16)
+            days, daily_pnl = col('trading_days'), col('average_daily_pnl')
+            daily_volatility = 0.10 / 16
+            return np.where((days < 30) | (daily_pnl == 0), 0.0, daily_pnl / daily_volatility)
+
+        raise ValueError(f"Unsupported ranking metric: {metric}")
+
+    def _pass_rate_column(self, store: TraderPerformanceStore) -> np.ndarray:
+        total = store.column('total_challenges')
+        return np.where(total > 0, store.column('passed_challenges') / total, 0.0)
+
+    def _normalize_column(self, values: np.ndarray, metric: RankingMetric) -> np.ndarray:
+        """Normalize metric values to 0-1 scale for weighted calculations."""
         # Different normalization strategies for different metrics
         if metric in [RankingMetric.WIN_RATE, RankingMetric.PASS_RATE]:
             # Already 0-1 scale
-            return max(Decimal('0'), min(Decimal('1'), value))
+            return np.clip(values, 0.0, 1.0)
         elif metric == RankingMetric.PROFIT_FACTOR:
             # Profit factor: 0.5 = bad, 1.5 = good, 3.0+ = excellent
-            return max(Decimal('0'), min(Decimal('1'), (value - Decimal('0.5')) / Decimal('2.5')))
+            return np.clip((values - 0.5) / 2.5, 0.0, 1.0)
         elif metric in [RankingMetric.NET_PNL, RankingMetric.EXPECTANCY]:
             # P&L metrics: normalize based on magnitude
             # Simple approach: sigmoid function
-            return Decimal('1') / (Decimal('1') + Decimal('2.718').pow(-value / Decimal('1000')))
+            with np.errstate(over='ignore'):
+                return 1.0 / (1.0 + np.power(2.718, -values / 1000))
         else:
             # Default: assume positive is better, normalize to 0-1
-            return max(Decimal('0'), min(Decimal('1'), value / Decimal('100') if value > 0 else Decimal('0')))
+            return np.clip(values / 100, 0.0, 1.0)
 
     def _is_descending_metric(self, metric: RankingMetric) -> bool:
         """Check if higher metric values mean better ranking."""
@@ -245,29 +331,6 @@ class RankingAlgorithm:
         ascending_metrics = []  # Add metrics where lower values are better
         return metric not in ascending_metrics
 
-    def _is_active_in_period(self, trader: 'TraderPerformance', period: RankingPeriod) -> bool:
-        """Check if trader was active in the specified period."""
-        if period == RankingPeriod.ALL_TIME:
-            return True
-
-        # Check last active date against period
-        now = datetime.utcnow()
-        period_map = {
-            RankingPeriod.DAILY: timedelta(days=1),
-            RankingPeriod.WEEKLY: timedelta(weeks=1),
-            RankingPeriod.MONTHLY: timedelta(days=30),
-            RankingPeriod.YEARLY: timedelta(days=365),
-        }
-
-        cutoff = now - period_map.get(period, timedelta(days=365))
-        return trader.last_active >= cutoff
-
-    def _has_challenge_type(self, trader: 'TraderPerformance', challenge_type: str) -> bool:
-        """Check if trader has participated in specified challenge type."""
-        # This would check trader's challenge history
-        # For now, assume all traders have participated in all types
-        return True
-
     def get_recommended_weights(self, metric: RankingMetric) -> Dict[str, float]:
         """Get recommended weights for composite scoring."""
         # Predefined weight combinations for different ranking goals
@@ -301,4 +364,4 @@ class RankingAlgorithm:
         below_count = sum(1 for score in all_scores if score < trader_score)
         total_count = len(all_scores)
 
-        return Decimal(str(below_count)) / Decimal(str(total_count)) * Decimal('100')
\ No newline at end of file
+        return Decimal(str(below_count)) / Decimal(str(total_count)) * Decimal('100')
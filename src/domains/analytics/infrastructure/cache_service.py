@@ -36,7 +36,12 @@ class AnalyticsCacheService:
         key = self._leaderboard_key(entry.metric_type, entry.period, entry.challenge_type)
         field = f"rank:{entry.rank}"
 
-        entry_data = {
+        await self.redis.hset(key, field, json.dumps(self._entry_data(entry)))
+        await self.redis.expire(key, self.leaderboard_ttl)
+
+    def _entry_data(self, entry: LeaderboardEntry) -> Dict[str, Any]:
+        """Serializable form of a leaderboard entry."""
+        return {
             "rank": entry.rank,
             "trader_id": entry.trader_id,
             "username": entry.username,
@@ -52,8 +57,37 @@ class AnalyticsCacheService:
             "last_updated": entry.last_updated.isoformat(),
         }
 
-        await self.redis.hset(key, field, json.dumps(entry_data))
-        await self.redis.expire(key, self.leaderboard_ttl)
+    async def store_leaderboard_entries(self, entries: List[LeaderboardEntry]) -> None:
+        """Store many leaderboard entries with one pipelined round trip."""
+        if not entries:
+            return
+
+        by_key: Dict[str, Dict[str, str]] = {}
+        for entry in entries:
+            key = self._leaderboard_key(entry.metric_type, entry.period, entry.challenge_type)
+            by_key.setdefault(key, {})[f"rank:{entry.rank}"] = json.dumps(self._entry_data(entry))
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, fields in by_key.items():
+                pipe.hset(key, mapping=fields)
+                pipe.expire(key, self.leaderboard_ttl)
+            await pipe.execute()
+
+    async def has_leaderboard(self, metric_type: str, period: str, challenge_type: Optional[str] = None) -> bool:
+        """Check whether a cached leaderboard exists (it expires when idle)."""
+        return bool(await self.redis.exists(self._leaderboard_key(metric_type, period, challenge_type)))
+
+    async def remove_leaderboard_ranks(
+        self,
+        metric_type: str,
+        period: str,
+        ranks: List[int],
+        challenge_type: Optional[str] = None,
+    ) -> None:
+        """Drop entries at ranks past the end of a shrunken leaderboard."""
+        if ranks:
+            key = self._leaderboard_key(metric_type, period, challenge_type)
+            await self.redis.hdel(key, *(f"rank:{rank}" for rank in ranks))
 
     async def get_leaderboard_entries(
         self,
@@ -216,6 +250,67 @@ class AnalyticsCacheService:
             "cache_timestamp": datetime.utcnow().isoformat(),
         }
 
+    async def update_rank_scores(
+        self,
+        metric_type: str,
+        period: str,
+        scores: Dict[str, Decimal],
+        challenge_type: Optional[str] = None,
+    ) -> None:
+        """Set traders' scores in the metric/period rank index (sorted set)."""
+        if not scores:
+            return
+        key = self._rank_key(metric_type, period, challenge_type)
+        await self.redis.zadd(key, {trader_id: float(score) for trader_id, score in scores.items()})
+
+    async def remove_rank_scores(
+        self,
+        metric_type: str,
+        period: str,
+        trader_ids: List[str],
+        challenge_type: Optional[str] = None,
+    ) -> None:
+        """Drop traders from the metric/period rank index."""
+        if trader_ids:
+            await self.redis.zrem(self._rank_key(metric_type, period, challenge_type), *trader_ids)
+
+    async def get_trader_rank(
+        self,
+        metric_type: str,
+        period: str,
+        trader_id: str,
+        challenge_type: Optional[str] = None,
+    ) -> Optional[int]:
+        """1-based rank of a trader (highest score first) in O(log n)."""
+        position = await self.redis.zrevrank(self._rank_key(metric_type, period, challenge_type), trader_id)
+        return None if position is None else int(position) + 1
+
+    async def get_trader_percentile(
+        self,
+        metric_type: str,
+        period: str,
+        trader_id: str,
+        challenge_type: Optional[str] = None,
+    ) -> Optional[Decimal]:
+        """Percentage of ranked traders scoring strictly below the trader, in O(log n)."""
+        key = self._rank_key(metric_type, period, challenge_type)
+        score = await self.redis.zscore(key, trader_id)
+        if score is None:
+            return None
+
+        below = await self.redis.zcount(key, "-inf", f"({score!r}")
+        total = await self.redis.zcard(key)
+        if not total:
+            return None
+        return Decimal(str(below)) / Decimal(str(total)) * Decimal('100')
+
+    def _rank_key(self, metric_type: str, period: str, challenge_type: Optional[str]) -> str:
+        """Generate Redis key for a rank index sorted set."""
+        key_parts = ["leaderboard_rank", metric_type, period]
+        if challenge_type:
+            key_parts.append(challenge_type)
+        return ":".join(key_parts)
+
     def _leaderboard_key(self, metric_type: str, period: str, challenge_type: Optional[str]) -> str:
         """Generate Redis key for leaderboard."""
         key_parts = ["leaderboard", metric_type, period]
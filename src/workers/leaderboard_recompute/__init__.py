@@ -0,0 +1,5 @@
+"""Leaderboard recompute worker module."""
+
+from .worker import LeaderboardRecomputeWorker
+
+__all__ = ["LeaderboardRecomputeWorker"]
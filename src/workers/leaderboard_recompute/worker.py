@@ -0,0 +1,66 @@
+"""Leaderboard recompute worker: runs the batch ranking job on a schedule."""
+
+import asyncio
+from typing import Optional, Sequence
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class LeaderboardRecomputeWorker:
+    """
+    Worker that re-ranks every leaderboard every `interval_seconds`.
+
+    The handler (RecomputeLeaderboardsHandler) ranks the LeaderboardProjector's
+    in-memory store, so a run costs no repository reads; leaderboard requests
+    then hit the cached pages.
+    """
+
+    def __init__(
+        self,
+        handler: 'RecomputeLeaderboardsHandler',
+        interval_seconds: float = 60.0,
+        page_size: int = 100,
+        challenge_types: Sequence[Optional[str]] = (None,),
+    ) -> None:
+        self._handler = handler
+        self._interval = interval_seconds
+        self._page_size = page_size
+        self._challenge_types = challenge_types
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self) -> asyncio.Task:
+        """Run the worker as a background task on the current event loop."""
+        self._task = asyncio.create_task(self.start())
+        return self._task
+
+    async def start(self) -> None:
+        """Start the recompute worker."""
+        logger.info("Starting leaderboard recompute worker", interval_seconds=self._interval)
+        self._running = True
+
+        while self._running:
+            await self.run_once()
+            await asyncio.sleep(self._interval)
+
+    async def stop(self) -> None:
+        """Stop the recompute worker."""
+        logger.info("Stopping leaderboard recompute worker")
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> int:
+        """Recompute all boards once. Returns the number of boards (0 on failure)."""
+        try:
+            return await self._handler.handle(page_size=self._page_size, challenge_types=self._challenge_types)
+        except Exception as e:
+            logger.error("Error recomputing leaderboards", error=str(e))
+            return 0
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the Backtesting Engine and Technical Analysis
+
+Times indicators (NumPy and Decimal backends), run_backtest (vectorized and
+bar-by-bar), optimize_strategy and monte_carlo_simulation on seeded synthetic
+OHLCV data, and writes a JSON report with throughput, peak memory and scaling
+curves. Two reports can be compared to catch regressions between releases.
+
+Usage:
+    python -m tests.performance.benchmarks --profile quick --output bench.json
+    python -m tests.performance.benchmarks --profile full --output bench.json --compare previous.json
+
+Profiles:
+    quick  - seconds; what the performance tests run
+    full   - 1k / 100k / 1M bar series and 1-500 symbol universes (minutes, several GB)
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.backtesting_engine import BacktestingEngine, RSIStrategy, MACDStrategy
+from app.infrastructure.history_store import HistoryBars
+from app.technical_analysis import ChartAnalysis, PriceData, TechnicalIndicators, VectorIndicators
+
+
+SCHEMA_VERSION = 1
+DEFAULT_SEED = 42
+START = datetime(2000, 1, 3, tzinfo=timezone.utc)
+DAY = 86400
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    'quick': {
+        'indicator_bars': [1_000, 10_000],
+        'decimal_indicator_bars': [1_000],
+        # (symbols, bars per symbol)
+        'vectorized_backtests': [(1, 1_000), (10, 1_000)],
+        'bar_backtests': [(1, 300)],
+        'optimize': {'symbols': 2, 'bars': 1_000, 'workers': [1],
+                     'grid': {'rsi_period': [7, 14], 'oversold': [25, 30], 'overbought': [70]}},
+        'monte_carlo': {'bars': 1_000, 'paths': [1_000, 10_000], 'methods': ['bootstrap', 'block']},
+        'repeat': 3,
+    },
+    'full': {
+        'indicator_bars': [1_000, 100_000, 1_000_000],
+        'decimal_indicator_bars': [1_000, 100_000],
+        'vectorized_backtests': [(1, 1_000), (1, 100_000), (1, 1_000_000), (50, 2_000), (500, 2_000)],
+        'bar_backtests': [(1, 1_000), (10, 1_000)],
+        'optimize': {'symbols': 10, 'bars': 2_000, 'workers': [1, os.cpu_count() or 1],
+                     'grid': {'rsi_period': [7, 10, 14, 21], 'oversold': [20, 25, 30, 35], 'overbought': [65, 70, 75, 80]}},
+        'monte_carlo': {'bars': 2_520, 'paths': [1_000, 10_000, 100_000], 'methods': ['bootstrap', 'block', 'trades']},
+        'repeat': 1,
+    },
+}
+
+NUMPY_INDICATORS: Dict[str, Callable] = {
+    'sma': lambda b: VectorIndicators.sma(b.close, 20),
+    'ema': lambda b: VectorIndicators.ema(b.close, 20),
+    'rsi': lambda b: VectorIndicators.rsi(b.close, 14),
+    'macd': lambda b: VectorIndicators.macd(b.close),
+    'bollinger_bands': lambda b: VectorIndicators.bollinger_bands(b.close, 20, 2.0),
+    'stochastic_oscillator': lambda b: VectorIndicators.stochastic_oscillator(b.high, b.low, b.close),
+    'atr': lambda b: VectorIndicators.atr(b.high, b.low, b.close),
+    'momentum': lambda b: VectorIndicators.momentum(b.close),
+}
+
+DECIMAL_INDICATORS: Dict[str, Callable] = {
+    'sma': lambda c: TechnicalIndicators.sma(c['close'], 20),
+    'ema': lambda c: TechnicalIndicators.ema(c['close'], 20),
+    'rsi': lambda c: TechnicalIndicators.rsi(c['close'], 14),
+    'macd': lambda c: TechnicalIndicators.macd(c['close']),
+    'bollinger_bands': lambda c: TechnicalIndicators.bollinger_bands(c['close'], 20, 2.0),
+    'stochastic_oscillator': lambda c: TechnicalIndicators.stochastic_oscillator(c['high'], c['low'], c['close']),
+    'atr': lambda c: TechnicalIndicators.atr(c['high'], c['low'], c['close']),
+    'momentum': lambda c: ChartAnalysis.calculate_momentum(c['price_data']),
+}
+
+
+# --- Synthetic data -----------------------------------------------------------
+
+def synthetic_bars(bars: int, seed: int = DEFAULT_SEED) -> HistoryBars:
+    """Seeded daily OHLCV random walk (geometric, ~1.5% daily volatility)."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.015, bars)))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    spread = np.abs(rng.normal(0.0, 0.008, bars))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.integers(100_000, 5_000_000, bars).astype(float)
+    time_ = int(START.timestamp()) + DAY * np.arange(bars, dtype=np.int64)
+    return HistoryBars(time_, open_, high, low, close, volume)
+
+
+def synthetic_universe(symbols: int, bars: int, seed: int = DEFAULT_SEED) -> Dict[str, List[PriceData]]:
+    """PriceData series for `symbols` symbols, each seeded from (seed, symbol index)."""
+    return {
+        f"SYM{i:03d}": PriceData.from_bars(synthetic_bars(bars, seed * 1000 + i))
+        for i in range(symbols)
+    }
+
+
+class PreloadedEngine(BacktestingEngine):
+    """Backtesting engine reading from in-memory series instead of the history store."""
+
+    def __init__(self, symbol_data: Dict[str, List[PriceData]]):
+        super().__init__()
+        self.symbol_data = symbol_data
+
+    def _load_symbol_data(self, symbols, start_date, end_date):
+        return {symbol: self.symbol_data[symbol] for symbol in symbols}
+
+
+def _period(bars: int) -> Tuple[datetime, datetime]:
+    return START, datetime.fromtimestamp(int(START.timestamp()) + DAY * (bars - 1), timezone.utc)
+
+
+# --- Measurement --------------------------------------------------------------
+
+def measure(func: Callable[[], Any], repeat: int = 1, memory: bool = True) -> Dict[str, Any]:
+    """
+    Best wall time over `repeat` runs, then one run under tracemalloc for the
+    peak of Python and NumPy allocations (timed runs are not traced).
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {'seconds': min(timings), 'peak_memory_bytes': peak}
+
+
+def _record(name: str, group: str, params: Dict[str, Any], work: int, unit: str,
+            measurement: Dict[str, Any]) -> Dict[str, Any]:
+    seconds = measurement['seconds']
+    return {
+        'name': name,
+        'group': group,
+        'params': params,
+        'work': work,
+        'unit': unit,
+        'seconds': round(seconds, 6),
+        'throughput': round(work / seconds, 2) if seconds > 0 else None,
+        'peak_memory_bytes': measurement['peak_memory_bytes'],
+    }
+
+
+# --- Benchmarks -----------------------------------------------------------------
+
+def bench_indicators(profile: Dict[str, Any], seed: int, memory: bool) -> List[Dict[str, Any]]:
+    results = []
+    for bars in profile['indicator_bars']:
+        series = synthetic_bars(bars, seed)
+        for name, func in NUMPY_INDICATORS.items():
+            results.append(_record(
+                f"indicator.numpy.{name}", 'indicator', {'bars': bars}, bars, 'bars',
+                measure(lambda: func(series), profile['repeat'], memory)
+            ))
+
+    for bars in profile['decimal_indicator_bars']:
+        series = synthetic_bars(bars, seed)
+        columns = {c: [Decimal(str(v)) for v in getattr(series, c).tolist()] for c in ('high', 'low', 'close')}
+        columns['price_data'] = PriceData.from_bars(series)
+        for name, func in DECIMAL_INDICATORS.items():
+            results.append(_record(
+                f"indicator.decimal.{name}", 'indicator', {'bars': bars}, bars, 'bars',
+                measure(lambda: func(columns), profile['repeat'], memory)
+            ))
+    return results
+
+
+def bench_backtests(profile: Dict[str, Any], seed: int, memory: bool) -> List[Dict[str, Any]]:
+    results = []
+    cases = [('vectorized', RSIStrategy, case) for case in profile['vectorized_backtests']]
+    cases += [('bar', MACDStrategy, case) for case in profile['bar_backtests']]
+
+    for mode, strategy_class, (symbols, bars) in cases:
+        data = synthetic_universe(symbols, bars, seed)
+        start, end = _period(bars)
+
+        def run():
+            # Fresh engine per run so memoized indicator columns do not hide the work
+            PreloadedEngine(data).run_backtest(strategy_class(), list(data), start, end, mode=mode, symbol_data=data)
+
+        results.append(_record(
+            f"run_backtest.{mode}", 'backtest',
+            {'symbols': symbols, 'bars_per_symbol': bars, 'strategy': strategy_class.__name__},
+            symbols * bars, 'bars', measure(run, profile['repeat'], memory)
+        ))
+        del data
+    return results
+
+
+def bench_optimize(profile: Dict[str, Any], seed: int, memory: bool) -> List[Dict[str, Any]]:
+    config = profile['optimize']
+    data = synthetic_universe(config['symbols'], config['bars'], seed)
+    start, end = _period(config['bars'])
+    combinations = int(np.prod([len(v) for v in config['grid'].values()]))
+
+    results = []
+    for workers in sorted(set(config['workers'])):
+        def run():
+            PreloadedEngine(data).optimize_strategy(
+                RSIStrategy, list(data), start, end, config['grid'], max_workers=workers
+            )
+
+        results.append(_record(
+            'optimize_strategy', 'optimize',
+            {'symbols': config['symbols'], 'bars_per_symbol': config['bars'],
+             'combinations': combinations, 'workers': workers},
+            combinations * config['symbols'] * config['bars'], 'bars',
+            # Pool workers allocate outside this process; tracemalloc only sees the parent
+            measure(run, 1, memory)
+        ))
+    return results
+
+
+def bench_monte_carlo(profile: Dict[str, Any], seed: int, memory: bool) -> List[Dict[str, Any]]:
+    config = profile['monte_carlo']
+    data = synthetic_universe(1, config['bars'], seed)
+    start, end = _period(config['bars'])
+
+    results = []
+    for method in config['methods']:
+        for paths in config['paths']:
+            def run():
+                PreloadedEngine(data).monte_carlo_simulation(
+                    RSIStrategy(), list(data), start, end, num_simulations=paths, method=method, seed=seed
+                )
+
+            results.append(_record(
+                f"monte_carlo.{method}", 'monte_carlo',
+                {'paths': paths, 'bars': config['bars']},
+                paths * config['bars'], 'path_bars', measure(run, profile['repeat'], memory)
+            ))
+    return results
+
+
+BENCHMARKS = {
+    'indicators': bench_indicators,
+    'backtests': bench_backtests,
+    'optimize': bench_optimize,
+    'monte_carlo': bench_monte_carlo,
+}
+
+
+# --- Reporting ------------------------------------------------------------------
+
+def scaling_curves(results: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Throughput against work size for every benchmark that ran at several sizes."""
+    curves: Dict[str, List[Dict[str, Any]]] = {}
+    for result in results:
+        key = result['name']
+        if result['group'] == 'optimize':
+            key = f"{key}.workers={result['params']['workers']}"
+        curves.setdefault(key, []).append({
+            'work': result['work'],
+            'seconds': result['seconds'],
+            'throughput': result['throughput'],
+            'peak_memory_bytes': result['peak_memory_bytes'],
+        })
+    return {key: sorted(points, key=lambda p: p['work']) for key, points in curves.items() if len(points) > 1}
+
+
+def run_suite(profile: str = 'quick', seed: int = DEFAULT_SEED, memory: bool = True,
+              only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the selected benchmarks and return the report."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile: {profile}")
+
+    results = []
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        results.extend(bench(PROFILES[profile], seed, memory))
+
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'profile': profile,
+        'seed': seed,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+        'scaling': scaling_curves(results),
+    }
+
+
+def _result_key(result: Dict[str, Any]) -> str:
+    return f"{result['name']}{json.dumps(result['params'], sort_keys=True)}"
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Benchmarks present in both reports whose time grew by more than `threshold`
+    (0.2 = 20% slower), with the ratio of current to baseline seconds.
+    """
+    previous = {_result_key(r): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = previous.get(_result_key(result))
+        if not before or not before['seconds']:
+            continue
+        ratio = result['seconds'] / before['seconds']
+        if ratio > 1 + threshold:
+            regressions.append({
+                'name': result['name'],
+                'params': result['params'],
+                'baseline_seconds': before['seconds'],
+                'current_seconds': result['seconds'],
+                'ratio': round(ratio, 3),
+            })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run a subset of the benchmarks')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak-memory runs')
+    parser.add_argument('--compare', help='Previous report; exit 1 if anything regressed')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown when comparing (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.profile, args.seed, memory=not args.no_memory, only=args.only)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    for result in report['results']:
+        print(f"{result['name']:<40} {json.dumps(result['params'], sort_keys=True):<70} "
+              f"{result['seconds']:>10.4f}s {result['throughput'] or 0:>16,.0f} {result['unit']}/s")
+    print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']} {regression['params']}: "
+                  f"{regression['baseline_seconds']:.4f}s -> {regression['current_seconds']:.4f}s "
+                  f"(x{regression['ratio']})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Tests for the benchmark suite
+
+Runs the quick profile to check the report format and the regression comparison.
+"""
+
+import json
+import pytest
+import numpy as np
+
+from tests.performance.benchmarks import (
+    run_suite, compare, synthetic_bars, synthetic_universe, main
+)
+
+
+pytestmark = pytest.mark.performance
+
+
+class TestSyntheticData:
+    """Test the seeded datasets."""
+
+    def test_datasets_are_seeded(self):
+        a, b = synthetic_bars(500, seed=1), synthetic_bars(500, seed=1)
+        assert np.array_equal(a.close, b.close)
+        assert not np.array_equal(a.close, synthetic_bars(500, seed=2).close)
+        assert (a.high >= np.maximum(a.open, a.close)).all()
+        assert (a.low <= np.minimum(a.open, a.close)).all()
+        assert (np.diff(a.time) > 0).all()
+
+    def test_universe(self):
+        universe = synthetic_universe(3, 50)
+        assert len(universe) == 3
+        assert all(len(series) == 50 for series in universe.values())
+        closes = [series[-1].close for series in universe.values()]
+        assert len(set(closes)) == 3
+
+
+class TestSuite:
+    """Test the report produced by the quick profile."""
+
+    def test_report_format(self):
+        report = run_suite('quick', only=['backtests', 'monte_carlo'])
+
+        assert report['schema_version'] == 1
+        assert report['profile'] == 'quick'
+        names = {r['name'] for r in report['results']}
+        assert {'run_backtest.vectorized', 'run_backtest.bar', 'monte_carlo.block'} <= names
+        for result in report['results']:
+            assert result['seconds'] > 0
+            assert result['throughput'] > 0
+            assert result['peak_memory_bytes'] > 0
+        assert [p['work'] for p in report['scaling']['run_backtest.vectorized']] == [1_000, 10_000]
+        json.dumps(report)
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            run_suite('huge')
+
+    def test_cli_writes_report_and_flags_regressions(self, tmp_path):
+        output = tmp_path / 'current.json'
+        assert main(['--only', 'optimize', '--no-memory', '--output', str(output)]) == 0
+        report = json.loads(output.read_text())
+        assert report['results'][0]['peak_memory_bytes'] is None
+
+        # A baseline ten times faster than now must be reported as a regression
+        for result in report['results']:
+            result['seconds'] /= 10
+        baseline = tmp_path / 'baseline.json'
+        baseline.write_text(json.dumps(report))
+        assert main(['--only', 'optimize', '--no-memory', '--output', str(output), '--compare', str(baseline)]) == 1
+
+
+class TestCompare:
+    """Test regression detection between two reports."""
+
+    def _report(self, **seconds):
+        return {'results': [
+            {'name': name, 'params': {'bars': 1000}, 'seconds': value} for name, value in seconds.items()
+        ]}
+
+    def test_threshold(self):
+        baseline = self._report(a=1.0, b=1.0, c=1.0)
+        current = self._report(a=1.1, b=1.5, d=9.0)
+        regressions = compare(baseline, current, threshold=0.2)
+        assert [r['name'] for r in regressions] == ['b']
+        assert regressions[0]['ratio'] == 1.5
+
+    def test_params_must_match(self):
+        baseline = self._report(a=1.0)
+        current = {'results': [{'name': 'a', 'params': {'bars': 5000}, 'seconds': 5.0}]}
+        assert compare(baseline, current) == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
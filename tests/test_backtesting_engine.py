@@ -0,0 +1,434 @@
+"""
+Tests for the Backtesting Engine
+
+Covers the aligned timeline, zero-copy price windows, the simulation loop and
+the vectorized signal mode, the parallel optimizer, walk-forward studies and
+Monte Carlo resampling.
+"""
+
+import time
+import random
+import numpy as np
+import pytest
+from decimal import Decimal
+from datetime import datetime, timezone, timedelta
+
+from app.technical_analysis import PriceData
+from app.backtesting_engine import (
+    BacktestingEngine, BacktestTimeline, PriceWindow, TradingStrategy, RSIStrategy,
+    MACDStrategy, MeanReversionStrategy, SharedPriceData, _block_indices
+)
+
+
+START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def make_series(days, start=START, seed=1, skip=()):
+    """Daily random-walk bars, leaving out the day offsets in skip."""
+    rng = random.Random(seed)
+    price = Decimal('100')
+    data = []
+    for day in range(days):
+        price = price * (1 + Decimal(str(round(rng.uniform(-0.03, 0.03), 4))))
+        if day in skip:
+            continue
+        data.append(PriceData(start + timedelta(days=day), price, price * Decimal('1.01'),
+                              price * Decimal('0.99'), price, Decimal('1000')))
+    return data
+
+
+class RecordingStrategy(TradingStrategy):
+    """Buys every few bars, sells after a fixed holding period, and records what it saw."""
+
+    def __init__(self, parameters=None):
+        super().__init__('Recording', parameters)
+        self.seen = []
+
+    def should_enter_long(self, symbol, price_data, current_positions):
+        self.seen.append((symbol, price_data))
+        return len(price_data) % 5 == 0
+
+    def should_enter_short(self, symbol, price_data, current_positions):
+        return False
+
+    def should_exit_long(self, symbol, position, price_data):
+        return price_data[-1].timestamp - position.entry_time >= timedelta(days=3)
+
+    def should_exit_short(self, symbol, position, price_data):
+        return False
+
+
+class TestPriceWindow:
+    """Test the list-like view passed to strategies."""
+
+    def test_behaves_like_prefix_list(self):
+        data = make_series(10)
+        window = PriceWindow(data, 6)
+
+        assert len(window) == 6
+        assert list(window) == data[:6]
+        assert window[-1] is data[5]
+        assert list(window[-3:]) == data[3:6]
+        assert list(window[::2]) == data[:6:2]
+        assert [p.close for p in window] == [p.close for p in data[:6]]
+        with pytest.raises(IndexError):
+            window[6]
+
+    def test_slice_is_a_view(self):
+        data = make_series(10)
+        assert isinstance(PriceWindow(data, 8)[2:5], PriceWindow)
+
+
+class TestBacktestTimeline:
+    """Test symbol alignment on the shared timestamp index."""
+
+    def test_alignment_with_missing_bars(self):
+        a = make_series(6)
+        b = make_series(6, seed=2, skip={2, 3})
+        timeline = BacktestTimeline({'A': a, 'B': b}, START, START + timedelta(days=10))
+
+        assert len(timeline) == 6
+        assert timeline.bar_at('B', 2) is None
+        assert timeline.bar_at('B', 4) is b[2]
+        # No lookahead: on a missing day the window ends at the last known bar
+        assert list(timeline.window('B', 3)) == b[:2]
+
+    def test_bounds(self):
+        a = make_series(10)
+        timeline = BacktestTimeline({'A': a}, START + timedelta(days=2), START + timedelta(days=5))
+        assert timeline.timestamps == [p.timestamp for p in a[2:6]]
+        assert len(timeline.window('A', 0)) == 3  # history before the start stays visible
+
+
+class TestRunBacktest:
+    """Test the simulation loop."""
+
+    def _engine(self, symbol_data):
+        engine = BacktestingEngine()
+        engine._load_historical_data = lambda symbol, start, end: symbol_data[symbol]
+        return engine
+
+    def test_strategies_see_history_up_to_current_bar(self):
+        data = {'A': make_series(30), 'B': make_series(30, seed=2)}
+        strategy = RecordingStrategy()
+        self._engine(data).run_backtest(strategy, ['A', 'B'], START, START + timedelta(days=40))
+
+        for symbol, window in strategy.seen:
+            assert list(window) == data[symbol][:len(window)]
+
+    def test_trades_and_equity(self):
+        data = {'A': make_series(30)}
+        result = self._engine(data).run_backtest(
+            RecordingStrategy(), ['A'], START, START + timedelta(days=40)
+        )
+
+        assert result.total_trades > 0
+        assert all(t.holding_period >= 3 for t in result.trades)
+        assert len(result.equity_curve) == 31
+        assert result.final_balance == result.equity_curve[-1][1]
+
+    def test_max_positions_enforced_within_a_bar(self):
+        data = {s: make_series(30, seed=i) for i, s in enumerate('ABCDEF')}
+        result = self._engine(data).run_backtest(
+            RecordingStrategy(), list(data), START, START + timedelta(days=40), max_positions=2
+        )
+
+        held = [(t.entry_time, t.exit_time) for t in result.trades]
+        for entry_time, _ in held:
+            assert sum(1 for entry, exit_ in held if entry <= entry_time < exit_) <= 2
+
+    def test_empty_period(self):
+        result = self._engine({'A': make_series(5)}).run_backtest(
+            RecordingStrategy(), ['A'], START + timedelta(days=100), START + timedelta(days=200)
+        )
+        assert result.final_balance == result.initial_balance
+
+    def test_large_universe_is_fast(self):
+        """Test that the engine overhead stays small for 50 symbols over 5 years of daily bars."""
+        data = {f"S{i}": make_series(1260, seed=i) for i in range(50)}
+
+        class Idle(RecordingStrategy):
+            def should_enter_long(self, symbol, price_data, current_positions):
+                return False
+
+        started = time.perf_counter()
+        self._engine(data).run_backtest(Idle(), list(data), START, START + timedelta(days=1300))
+        assert time.perf_counter() - started < 5.0
+
+
+class TestVectorizedBacktest:
+    """Test that the vectorized mode reproduces the bar-by-bar simulation."""
+
+    def _engine(self, symbol_data):
+        engine = BacktestingEngine()
+        engine._load_historical_data = lambda symbol, start, end: symbol_data[symbol]
+        return engine
+
+    def _run_both(self, strategy, data, **kwargs):
+        engine = self._engine(data)
+        end = START + timedelta(days=400)
+        bar = engine.run_backtest(strategy, list(data), START, end, mode='bar', **kwargs)
+        vectorized = engine.run_backtest(strategy, list(data), START, end, mode='vectorized', **kwargs)
+        return bar, vectorized
+
+    @pytest.mark.parametrize('strategy', [
+        RSIStrategy(),
+        MACDStrategy(),
+        MeanReversionStrategy(),
+    ], ids=lambda s: s.name)
+    def test_matches_bar_mode(self, strategy):
+        data = {
+            'A': make_series(300),
+            'B': make_series(300, seed=2, skip={10, 11, 50, 120}),
+            'C': make_series(300, seed=3),
+        }
+        bar, vectorized = self._run_both(strategy, data, max_positions=2)
+
+        assert bar.total_trades > 0
+        key = lambda t: (t.symbol, t.side, t.entry_time, t.exit_time, t.quantity, t.exit_price)
+        assert [key(t) for t in vectorized.trades] == [key(t) for t in bar.trades]
+        assert len(vectorized.equity_curve) == len(bar.equity_curve)
+        for (t1, e1), (t2, e2) in zip(vectorized.equity_curve, bar.equity_curve):
+            assert t1 == t2
+            assert float(e1) == pytest.approx(float(e2), rel=1e-9)
+        assert float(vectorized.final_balance) == pytest.approx(float(bar.final_balance), rel=1e-9)
+
+    def test_auto_mode_uses_vectorized_signals(self):
+        engine = self._engine({'A': make_series(60)})
+        strategy = RSIStrategy()
+        strategy.should_enter_long = strategy.should_exit_long = None  # must not be called
+
+        result = engine.run_backtest(strategy, ['A'], START, START + timedelta(days=60))
+        assert len(result.equity_curve) == 61
+
+    def test_callback_strategies_stay_on_bar_path(self):
+        engine = self._engine({'A': make_series(30)})
+        assert engine.run_backtest(RecordingStrategy(), ['A'], START, START + timedelta(days=40)).total_trades > 0
+        with pytest.raises(ValueError):
+            engine.run_backtest(RecordingStrategy(), ['A'], START, START + timedelta(days=40), mode='vectorized')
+
+    def test_empty_period(self):
+        result = self._engine({'A': make_series(5)}).run_backtest(
+            RSIStrategy(), ['A'], START + timedelta(days=100), START + timedelta(days=200)
+        )
+        assert result.final_balance == result.initial_balance
+        assert result.trades == []
+
+
+class TestOptimizeStrategy:
+    """Test the grid search optimizer."""
+
+    RANGES = {'rsi_period': [7, 14], 'oversold': [25, 30, 35], 'overbought': [65, 70]}
+
+    def _engine(self, symbol_data):
+        engine = BacktestingEngine()
+        engine._load_historical_data = lambda symbol, start, end: symbol_data[symbol]
+        return engine
+
+    def _data(self):
+        return {'A': make_series(250), 'B': make_series(250, seed=2)}
+
+    def test_shared_price_data_round_trip(self):
+        data = {'A': make_series(20), 'B': make_series(5, seed=2), 'EMPTY': []}
+        shared = SharedPriceData(data)
+        try:
+            loaded = SharedPriceData.load(shared.descriptor())
+        finally:
+            shared.close()
+
+        assert set(loaded) == set(data)
+        assert loaded['EMPTY'] == []
+        for symbol, bars in data.items():
+            assert [p.timestamp for p in loaded[symbol]] == [p.timestamp for p in bars]
+            assert [float(p.close) for p in loaded[symbol]] == [float(p.close) for p in bars]
+
+    def test_parallel_matches_serial(self):
+        engine = self._engine(self._data())
+        end = START + timedelta(days=300)
+        serial = engine.optimize_strategy(RSIStrategy, ['A', 'B'], START, end, self.RANGES, max_workers=1)
+        parallel = engine.optimize_strategy(RSIStrategy, ['A', 'B'], START, end, self.RANGES, max_workers=2)
+
+        assert serial['evaluated'] == parallel['evaluated'] == 12
+        assert parallel['best_parameters'] == serial['best_parameters']
+        assert parallel['best_score'] == pytest.approx(serial['best_score'], rel=1e-6)
+        assert parallel['best_result'].total_trades == serial['best_result'].total_trades
+
+    def test_progress_updates_track_the_best(self):
+        updates = []
+        outcome = self._engine(self._data()).optimize_strategy(
+            RSIStrategy, ['A', 'B'], START, START + timedelta(days=300), self.RANGES,
+            max_workers=1, on_progress=updates.append
+        )
+
+        progress = [u for u in updates if not u['done']]
+        assert len(progress) == 12
+        assert updates[-1]['done']
+        assert max(u['score'] for u in progress) == outcome['best_score']
+        assert [u['best_score'] for u in progress] == sorted(u['best_score'] for u in progress)
+        assert 'symbol_data' not in outcome
+
+    def test_patience_stops_early(self):
+        ranges = {'rsi_period': list(range(5, 25)), 'oversold': [30], 'overbought': [70]}
+        outcome = self._engine(self._data()).optimize_strategy(
+            RSIStrategy, ['A', 'B'], START, START + timedelta(days=300), ranges,
+            max_workers=1, patience=2
+        )
+
+        assert outcome['stopped_early']
+        assert outcome['evaluated'] < outcome['total_combinations'] == 20
+        assert outcome['best_result'] is not None
+
+    def test_worker_count_is_clamped(self, monkeypatch):
+        monkeypatch.setattr(BacktestingEngine, 'MAX_WORKERS', 2)
+        monkeypatch.setattr('app.backtesting_engine.os.cpu_count', lambda: 8)
+
+        assert BacktestingEngine._worker_count(10_000, 100) == 2
+        assert BacktestingEngine._worker_count(None, 100) == 2
+        assert BacktestingEngine._worker_count(4, 1) == 1
+
+    def test_grid_size_is_capped(self, monkeypatch):
+        monkeypatch.setattr(BacktestingEngine, 'MAX_GRID_COMBINATIONS', 10)
+        engine = self._engine(self._data())
+
+        with pytest.raises(ValueError):
+            engine.optimize_strategy(RSIStrategy, ['A', 'B'], START, START + timedelta(days=300), self.RANGES)
+        assert engine.grid_size({'rsi_period': [7, 14], 'oversold': [25, 30]}) == 4
+
+
+class TestWalkForward:
+    """Test walk-forward optimization."""
+
+    RANGES = {'rsi_period': [7, 14], 'oversold': [30, 35], 'overbought': [65, 70]}
+
+    def _engine(self, symbol_data):
+        engine = BacktestingEngine()
+        engine._load_historical_data = lambda symbol, start, end: symbol_data[symbol]
+        return engine
+
+    def _data(self):
+        return {'A': make_series(400), 'B': make_series(400, seed=2)}
+
+    def test_windows(self):
+        end = START + timedelta(days=100)
+        rolling = BacktestingEngine.walk_forward_windows(START, end, 40, 20)
+        assert [w[2] - START for w in rolling] == [timedelta(days=d) for d in (40, 60, 80)]
+        for in_start, in_end, out_start, out_end in rolling:
+            assert out_start - in_start == timedelta(days=40)
+            assert in_end < out_start <= out_end <= end
+
+        anchored = BacktestingEngine.walk_forward_windows(START, end, 40, 20, anchored=True)
+        assert {w[0] for w in anchored} == {START}
+        with pytest.raises(ValueError):
+            BacktestingEngine.walk_forward_windows(START, end, 0, 20)
+
+    def test_windows_pick_in_sample_best(self):
+        data = self._data()
+        engine = self._engine(data)
+        study = engine.walk_forward(
+            RSIStrategy, ['A', 'B'], START, START + timedelta(days=400), self.RANGES,
+            in_sample_days=120, out_of_sample_days=60, max_workers=1
+        )
+
+        assert study['summary']['windows'] == len(study['windows']) == 5
+        window = study['windows'][0]
+        in_start = datetime.fromisoformat(window['in_sample']['start'])
+        in_end = datetime.fromisoformat(window['in_sample']['end'])
+        best = engine.optimize_strategy(RSIStrategy, ['A', 'B'], in_start, in_end, self.RANGES, max_workers=1)
+        assert window['best_parameters'] == best['best_parameters']
+        assert window['in_sample_score'] == pytest.approx(best['best_score'])
+
+    def test_repeated_study_is_served_from_cache(self):
+        engine = self._engine(self._data())
+        args = (RSIStrategy, ['A', 'B'], START, START + timedelta(days=400), self.RANGES)
+        first = engine.walk_forward(*args, in_sample_days=120, out_of_sample_days=60, max_workers=1)
+
+        engine.run_backtest = None  # any recomputation would fail
+        second = engine.walk_forward(*args, in_sample_days=120, out_of_sample_days=60, max_workers=1)
+        assert second['windows'] == first['windows']
+        assert second['cache']['hits'] > first['cache']['hits']
+
+    def test_parallel_matches_serial(self):
+        args = (RSIStrategy, ['A', 'B'], START, START + timedelta(days=400), self.RANGES)
+        serial = self._engine(self._data()).walk_forward(*args, in_sample_days=120, out_of_sample_days=60, max_workers=1)
+        parallel = self._engine(self._data()).walk_forward(*args, in_sample_days=120, out_of_sample_days=60, max_workers=2)
+        assert [w['best_parameters'] for w in parallel['windows']] == [w['best_parameters'] for w in serial['windows']]
+
+    def test_indicator_columns_are_shared_across_windows(self):
+        engine = self._engine(self._data())
+        engine.walk_forward(
+            RSIStrategy, ['A', 'B'], START, START + timedelta(days=400), self.RANGES,
+            in_sample_days=120, out_of_sample_days=60, max_workers=1
+        )
+        # One entry per symbol and parameter set, reused by every window
+        assert engine.indicator_cache.stats()['entries'] == 2 * 8
+        assert engine.indicator_cache.stats()['hits'] > engine.indicator_cache.stats()['misses']
+
+
+class TestMonteCarloSimulation:
+    """Test resampling-based Monte Carlo."""
+
+    def _engine(self, symbol_data):
+        engine = BacktestingEngine()
+        engine._load_historical_data = lambda symbol, start, end: symbol_data[symbol]
+        return engine
+
+    def _run(self, **kwargs):
+        engine = self._engine({'A': make_series(250), 'B': make_series(250, seed=2)})
+        return engine.monte_carlo_simulation(
+            MeanReversionStrategy(), ['A', 'B'], START, START + timedelta(days=300), **kwargs
+        )
+
+    def test_block_indices(self):
+        indices = _block_indices(np.random.default_rng(0), 3, 10, 4)
+        assert indices.shape == (3, 10)
+        assert ((indices >= 0) & (indices < 10)).all()
+        # Within a block positions are consecutive (circularly)
+        assert ((indices[:, 1:4] - indices[:, 0:3]) % 10 == 1).all()
+
+    @pytest.mark.parametrize('method', ['bootstrap', 'block', 'trades'])
+    def test_seeded_runs_are_reproducible(self, method):
+        first = self._run(num_simulations=500, method=method, seed=7)
+        second = self._run(num_simulations=500, method=method, seed=7)
+        other = self._run(num_simulations=500, method=method, seed=8)
+
+        assert first == second
+        assert first['seed'] == 7
+        assert first['return_stats'] != other['return_stats']
+        assert first['return_stats']['percentile_5'] <= first['return_stats']['percentile_95']
+        assert 0 <= first['sharpe_stats']['positive_sharpe_ratio'] <= 1
+
+    def test_bootstrap_preserves_the_mean_step(self):
+        result = self._run(num_simulations=20000, method='bootstrap', seed=1)
+        base = result['base_result']['total_return']
+        # Compounding the same daily returns in random order ends at the same place
+        assert result['return_stats']['mean'] == pytest.approx(base, abs=max(1.0, abs(base) * 0.2))
+
+    def test_hundred_thousand_paths_are_fast(self):
+        started = time.perf_counter()
+        result = self._run(num_simulations=100_000, method='block', seed=3)
+        assert result['num_simulations'] == 100_000
+        assert time.perf_counter() - started < 10.0
+
+    def test_price_paths_match_across_worker_counts(self):
+        serial = self._run(num_simulations=4, method='price_paths', seed=5, max_workers=1)
+        parallel = self._run(num_simulations=4, method='price_paths', seed=5, max_workers=2)
+        assert serial == parallel
+        assert serial['return_stats']['std'] > 0
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            self._run(num_simulations=10, method='nope')
+
+    def test_simulation_count_is_limited(self, monkeypatch):
+        monkeypatch.setattr(BacktestingEngine, 'MAX_SIMULATIONS', 100)
+        monkeypatch.setattr(BacktestingEngine, 'MAX_PRICE_PATH_SIMULATIONS', 2)
+
+        assert self._run(num_simulations=100, method='block', seed=1)['num_simulations'] == 100
+        with pytest.raises(ValueError):
+            self._run(num_simulations=101, method='block')
+        with pytest.raises(ValueError):
+            self._run(num_simulations=3, method='price_paths')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
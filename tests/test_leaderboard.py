@@ -0,0 +1,218 @@
+"""
+Tests for the Leaderboard Service
+
+Covers reads from the trigger-maintained per-user stats tables and rank
+lookups through the in-process rank index.
+"""
+
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.infrastructure.rank_index import RankIndex
+from app.leaderboard import LeaderboardService, overall_score
+
+
+def _local_index():
+    return RankIndex(client=SimpleNamespace(enabled=False))
+
+
+class FakeRedis:
+    """Shared-mode client over a dict, with just the commands RankIndex uses."""
+
+    def __init__(self):
+        self.enabled = True
+        self.values = {}
+        self.conn = MagicMock()
+        self.conn.set.side_effect = self._set
+        self.conn.eval.side_effect = self._eval
+
+    @contextmanager
+    def connection(self):
+        yield self.conn
+
+    def _set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def _eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+
+def _row(**overrides):
+    row = dict(
+        user_id='u1',
+        email='trader@example.com',
+        joined_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        total_challenges=4,
+        successful_challenges=3,
+        total_pnl=Decimal('1500.00'),
+        avg_return_pct=Decimal('0.125'),
+        best_trade=Decimal('900.00'),
+        total_trades=20,
+        avg_trade_pnl=Decimal('12.345'),
+        last_challenge_date=datetime(2024, 3, 1, tzinfo=timezone.utc),
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    with patch('app.leaderboard.Session') as factory:
+        factory.return_value.__enter__.return_value = session
+        yield session
+
+
+class TestGlobalLeaderboard:
+    """Test LeaderboardService.get_global_leaderboard."""
+
+    def test_all_time_reads_totals(self, session):
+        """Test that the all-time board reads the totals table and never joins trades."""
+        session.execute.return_value.fetchall.return_value = [_row()]
+
+        board = LeaderboardService().get_global_leaderboard(limit=5)
+
+        query, params = session.execute.call_args.args
+        query = str(query)
+        assert 'leaderboard_user_totals' in query
+        assert 'JOIN trades' not in query and 'FROM trades' not in query
+        assert params == {'limit': 5}
+
+        stats = board[0]['stats']
+        assert board[0]['rank'] == 1
+        assert board[0]['email'] == 'trader***'
+        assert stats['success_rate'] == 75.0
+        assert stats['avg_return_pct'] == 12.5
+        assert stats['avg_trade_pnl'] == 12.35
+
+    def test_window_sums_day_buckets(self, session):
+        """Test that a timeframe sums the day buckets from the window's first day."""
+        session.execute.return_value.fetchall.return_value = []
+        service = LeaderboardService()
+
+        service.get_global_leaderboard(timeframe='week')
+
+        query, params = session.execute.call_args.args
+        assert 'leaderboard_user_stats' in str(query)
+        expected = (datetime.now(timezone.utc) - timedelta(days=7)).date()
+        assert params['since'] == expected
+
+
+class TestRankIndex:
+    """Test RankIndex with the in-process sorted fallback."""
+
+    def test_rank_percentile_and_neighbours(self):
+        """Test rank, percentile and neighbourhood lookups by score."""
+        index = _local_index()
+        index.update('pnl:all', {f'u{i}': float(i) for i in range(10)})
+
+        assert index.rank('pnl:all', 'u9') == 1
+        assert index.rank('pnl:all', 'u0') == 10
+        assert index.percentile('pnl:all', 'u5') == 50.0
+        assert index.size('pnl:all') == 10
+        assert [member for _, member, _ in index.around('pnl:all', 'u5', radius=1)] == ['u6', 'u5', 'u4']
+        assert index.rank('pnl:all', 'missing') is None
+
+    def test_update_moves_member(self):
+        """Test that a new score re-ranks a member and removal drops it."""
+        index = _local_index()
+        index.update('pnl:all', {'a': 1.0, 'b': 2.0, 'c': 3.0})
+
+        index.update('pnl:all', {'a': 5.0})
+        assert index.rank('pnl:all', 'a') == 1
+        assert index.size('pnl:all') == 3
+
+        index.remove('pnl:all', 'a')
+        assert index.rank('pnl:all', 'a') is None
+        assert index.rank('pnl:all', 'c') == 1
+
+    def test_ties_order_like_redis(self):
+        """Test that equal scores rank in descending member order, as ZREVRANGE does."""
+        index = _local_index()
+        index.update('pnl:all', {'a': 1.0, 'b': 1.0, 'c': 1.0, 'd': 2.0})
+
+        assert [member for _, member, _ in index.top('pnl:all', limit=4)] == ['d', 'c', 'b', 'a']
+        assert index.rank('pnl:all', 'c') == 2
+        assert index.percentile('pnl:all', 'd') == 75.0
+        assert index.percentile('pnl:all', 'a') == 0.0
+
+    def test_replace_swaps_board(self):
+        """Test that replace discards members missing from the new contents."""
+        index = _local_index()
+        index.update('pnl:week', {'a': 1.0, 'b': 2.0})
+
+        index.replace('pnl:week', {'c': 1.0})
+
+        assert index.size('pnl:week') == 1
+        assert index.rank('pnl:week', 'a') is None
+
+    def test_shared_replace_stages_under_unique_keys(self):
+        """Test that each Redis swap writes its own staging key before renaming it into place."""
+        client = FakeRedis()
+        index = RankIndex(client=client)
+
+        index.replace('pnl:week', {'a': 1.0})
+        index.replace('pnl:week', {'b': 2.0})
+
+        staged = [call.args for call in client.conn.rename.call_args_list]
+        assert [target for _, target in staged] == ['rank:pnl:week', 'rank:pnl:week']
+        assert staged[0][0] != staged[1][0]
+        assert all(source.startswith('rank:pnl:week:staging:') for source, _ in staged)
+
+    def test_lock_excludes_other_holders(self):
+        """Test that the sync lock is held by one caller at a time and released afterwards."""
+        index = RankIndex(client=FakeRedis())
+
+        with index.lock('sync', ttl=60) as first:
+            with index.lock('sync', ttl=60) as second:
+                assert (first, second) == (True, False)
+        with index.lock('sync', ttl=60) as again:
+            assert again is True
+
+
+class TestUserRankings:
+    """Test per-user rank lookups through the rank index."""
+
+    def test_overall_score_orders_rate_then_pnl(self):
+        """Test that the packed score orders by success rate before PnL."""
+        assert overall_score(0.5, -1000) > overall_score(0.25, 1e9)
+        assert overall_score(0.5, 200) > overall_score(0.5, 100)
+
+    def test_user_position_reads_index(self, session):
+        """Test that position and neighbours come from the index, not a full ranking."""
+        service = LeaderboardService(rank_index=_local_index())
+        service.rank_index.update('overall:all', {f'u{i}': float(i) for i in range(20)})
+        session.execute.return_value.fetchall.return_value = [_row(user_id=f'u{i}') for i in (11, 10, 9)]
+
+        with patch.object(service, 'sync_rank_index') as sync:
+            position = service.get_user_position('u10', radius=1)
+
+        sync.assert_not_called()
+
+        assert position['position'] == 10
+        assert position['total_traders'] == 20
+        assert position['percentile'] == 50.0
+        assert [trader['rank'] for trader in position['nearby_traders']] == [9, 10, 11]
+        _, params = session.execute.call_args.args
+        assert sorted(params['user_ids']) == ['u10', 'u11', 'u9']
+
+    def test_sync_skipped_while_another_worker_holds_the_lock(self):
+        """Test that the background sync does nothing when another worker is syncing."""
+        service = LeaderboardService(rank_index=RankIndex(client=FakeRedis()))
+
+        with patch.object(service, 'sync_rank_index', return_value=3) as sync:
+            with service.rank_index.lock('leaderboard-sync', ttl=60):
+                assert service.sync_rank_index_locked() is None
+            assert service.sync_rank_index_locked() == 3
+
+        sync.assert_called_once_with(False)
@@ -0,0 +1,628 @@
+"""
+Tests for Market Data Service performance features
+
+Covers batched quote fetching and the price cache layers in front of the data sources.
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+from decimal import Decimal
+
+from app.market_data import MarketDataService, PriceRefresher, SharedPriceCache, SingleFlight
+from app.infrastructure.rate_limiter import RateLimiter, TokenBucket
+from app.infrastructure.history_store import HistoryBars, HistoryStore
+
+
+class TestBatchedPrices:
+    """Test batched get_multiple_prices."""
+
+    def test_cache_hits_skip_fetch(self):
+        """Test that cached symbols are served without any fetch."""
+        service = MarketDataService()
+        service._cache_price('AAPL', (Decimal('190.00'), Decimal('188.50')))
+
+        with patch.object(service, '_fetch_price_group') as mock_group:
+            prices = service.get_multiple_prices(['AAPL'])
+
+        assert prices['AAPL'] == (Decimal('190.00'), Decimal('188.50'))
+        assert not mock_group.called
+
+    def test_misses_grouped_by_source(self):
+        """Test that one bulk call is made per data source."""
+        service = MarketDataService()
+
+        with patch.object(service, '_get_yahoo_prices_bulk') as mock_bulk, \
+                patch.object(service, '_get_casablanca_price_real') as mock_casa:
+            mock_bulk.return_value = {
+                'AAPL': (Decimal('190.00'), Decimal('188.50')),
+                'MSFT': (Decimal('410.00'), Decimal('405.00')),
+            }
+            mock_casa.return_value = (Decimal('145.25'), Decimal('143.80'))
+
+            prices = service.get_multiple_prices(['AAPL', 'IAM.MA', 'MSFT'])
+
+        assert mock_bulk.call_count == 1
+        assert sorted(mock_bulk.call_args[0][0]) == ['AAPL', 'MSFT']
+        assert prices['IAM.MA'] == (Decimal('145.25'), Decimal('143.80'))
+        assert prices['MSFT'] == (Decimal('410.00'), Decimal('405.00'))
+        assert list(prices) == ['AAPL', 'IAM.MA', 'MSFT']
+        # Results warm the cache
+        assert service._get_cached_price('AAPL') is not None
+
+    def test_bulk_miss_falls_back_to_quote(self):
+        """Test that symbols missing from the bulk download use the quote endpoint."""
+        service = MarketDataService()
+
+        with patch.object(service, '_get_yahoo_prices_bulk', return_value={}), \
+                patch.object(service, '_get_yahoo_price') as mock_quote:
+            mock_quote.return_value = (Decimal('50.00'), Decimal('49.00'))
+            prices = service.get_multiple_prices(['XYZ'])
+
+        assert prices['XYZ'] == (Decimal('50.00'), Decimal('49.00'))
+
+    def test_deadline_returns_partial_results(self):
+        """Test that slow groups are reported as unavailable after the deadline."""
+        service = MarketDataService()
+
+        def slow_casablanca(symbol):
+            time.sleep(0.5)
+            return Decimal('145.25'), Decimal('143.80')
+
+        with patch.object(service, '_get_yahoo_prices_bulk') as mock_bulk, \
+                patch.object(service, '_get_casablanca_price_real', side_effect=slow_casablanca):
+            mock_bulk.return_value = {'AAPL': (Decimal('190.00'), Decimal('188.50'))}
+
+            start = time.time()
+            prices = service.get_multiple_prices(['AAPL', 'IAM.MA'], deadline=0.1)
+            elapsed = time.time() - start
+
+        assert elapsed < 0.5
+        assert prices['AAPL'][0] == Decimal('190.00')
+        assert prices['IAM.MA'] == (None, None)
+
+
+class TestRequestCoalescing:
+    """Test singleflight coalescing of cache misses."""
+
+    def test_single_flight_runs_once(self):
+        """Test that concurrent callers share one execution."""
+        flight = SingleFlight()
+        calls = []
+
+        def fetch(key):
+            calls.append(key)
+            time.sleep(0.2)
+            return key.lower()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: flight.do('IAM.MA', fetch, 'IAM.MA'), range(8)))
+
+        assert calls == ['IAM.MA']
+        assert results == ['iam.ma'] * 8
+        assert flight.stats['coalesced'] == 7
+        assert flight.in_flight() == 0
+
+    def test_single_flight_propagates_errors(self):
+        """Test that followers see the leader's exception."""
+        flight = SingleFlight()
+
+        def failing(key):
+            time.sleep(0.1)
+            raise ValueError('upstream down')
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(flight.do, 'AAPL', failing, 'AAPL') for _ in range(3)]
+
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+        assert flight.in_flight() == 0
+
+    def test_concurrent_cache_misses_fetch_once(self):
+        """Test that concurrent get_stock_price misses hit the data source once."""
+        service = MarketDataService()
+
+        def slow_fetch(symbol):
+            time.sleep(0.2)
+            return Decimal('145.25'), Decimal('143.80')
+
+        with patch.object(service, '_get_casablanca_price_real', side_effect=slow_fetch) as mock_fetch:
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                results = list(executor.map(service.get_stock_price, ['IAM.MA'] * 10))
+
+        assert mock_fetch.call_count == 1
+        assert all(r == (Decimal('145.25'), Decimal('143.80')) for r in results)
+
+    def test_single_fetch_joins_batched_fetch(self):
+        """Test that get_stock_price waits on a symbol already fetched by a batch."""
+        service = MarketDataService()
+
+        def slow_fetch(symbol):
+            time.sleep(0.3)
+            return Decimal('145.25'), Decimal('143.80')
+
+        with patch.object(service, '_get_casablanca_price_real', side_effect=slow_fetch) as mock_fetch:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                batch = executor.submit(service.get_multiple_prices, ['IAM.MA'])
+                time.sleep(0.1)
+                single = executor.submit(service.get_stock_price, 'IAM.MA')
+
+                assert single.result() == (Decimal('145.25'), Decimal('143.80'))
+                assert batch.result()['IAM.MA'] == (Decimal('145.25'), Decimal('143.80'))
+
+        assert mock_fetch.call_count == 1
+
+
+class TestStaleWhileRevalidate:
+    """Test stale serving and the hot-symbol refresher."""
+
+    def test_stale_price_served_while_refreshing(self):
+        """Test that an expired price within the grace window is returned immediately."""
+        service = MarketDataService()
+        service._cache_price('IAM.MA', (Decimal('145.25'), Decimal('143.80')), expiry_seconds=0)
+
+        def slow_fetch(symbol):
+            time.sleep(0.3)
+            return Decimal('146.00'), Decimal('145.25')
+
+        with patch.object(service, '_get_casablanca_price_real', side_effect=slow_fetch) as mock_fetch:
+            start = time.time()
+            price, prev = service.get_stock_price('IAM.MA')
+            assert time.time() - start < 0.2
+            assert price == Decimal('145.25')
+
+            # Background refresh lands in the cache
+            time.sleep(0.5)
+            assert mock_fetch.call_count == 1
+            assert service._get_cached_price('IAM.MA')[0] == Decimal('146.00')
+
+        assert service.get_price_age('IAM.MA') < 1.0
+
+    def test_price_beyond_grace_blocks(self):
+        """Test that prices older than the grace window are fetched synchronously."""
+        service = MarketDataService()
+        service.stale_grace = 0
+        service._cache_price('IAM.MA', (Decimal('145.25'), Decimal('143.80')), expiry_seconds=0)
+        time.sleep(0.01)
+
+        with patch.object(service, '_get_casablanca_price_real') as mock_fetch:
+            mock_fetch.return_value = (Decimal('146.00'), Decimal('145.25'))
+            price, prev = service.get_stock_price('IAM.MA')
+
+        assert price == Decimal('146.00')
+
+    def test_refresher_refreshes_hot_symbols_near_expiry(self):
+        """Test that only hot symbols about to expire are refreshed."""
+        service = MarketDataService()
+        service._cache_price('IAM.MA', (Decimal('145.25'), Decimal('143.80')), expiry_seconds=10)
+        service._cache_price('BCP.MA', (Decimal('285.00'), Decimal('283.50')), expiry_seconds=300)
+        service.symbol_hits.update({'IAM.MA': 8, 'BCP.MA': 5, 'ATW.MA': 1})
+
+        refresher = PriceRefresher(service, top_n=2, refresh_ahead=30)
+
+        with patch.object(service, 'refresh_prices') as mock_refresh:
+            refreshed = refresher.run_once()
+
+        assert refreshed == ['IAM.MA']
+        mock_refresh.assert_called_once_with(['IAM.MA'])
+        # Hit counts decay each cycle
+        assert service.symbol_hits == {'IAM.MA': 4, 'BCP.MA': 2}
+
+    def test_refresh_prices_bypasses_cache(self):
+        """Test that refresh_prices fetches even when the cache is fresh."""
+        service = MarketDataService()
+        service._cache_price('AAPL', (Decimal('190.00'), Decimal('188.50')))
+
+        with patch.object(service, '_get_yahoo_prices_bulk') as mock_bulk:
+            mock_bulk.return_value = {'AAPL': (Decimal('191.00'), Decimal('190.00'))}
+            service.refresh_prices(['AAPL'])
+
+        assert service._get_cached_price('AAPL')[0] == Decimal('191.00')
+
+
+class FakeRedisClient:
+    """In-memory stand-in for RedisClient shared by several services."""
+
+    def __init__(self):
+        self.enabled = True
+        self.store = {}
+        self.published = []
+
+    def get_cache(self, key):
+        return self.store.get(key)
+
+    def set_cache(self, key, value, ttl_seconds=300):
+        self.store[key] = value
+        return True
+
+    def publish_message(self, channel, message):
+        self.published.append((channel, message))
+        return True
+
+
+class TestSharedPriceCache:
+    """Test the Redis-backed L2 price cache."""
+
+    def test_serialization_round_trip(self):
+        """Test compact quote serialization."""
+        value = SharedPriceCache.serialize((Decimal('145.25'), Decimal('143.80')), 1000.0, 1300.0)
+
+        assert value == '145.25|143.80|1000.000|1300.000'
+        assert SharedPriceCache.deserialize(value) == ((Decimal('145.25'), Decimal('143.80')), 1000.0, 1300.0)
+        assert SharedPriceCache.deserialize('garbage') is None
+
+    def test_fetch_in_one_worker_warms_another(self):
+        """Test that a price cached by one service is read from L2 by another."""
+        client = FakeRedisClient()
+        worker_a = MarketDataService(shared_cache=SharedPriceCache(client))
+        worker_b = MarketDataService(shared_cache=SharedPriceCache(client))
+
+        with patch.object(worker_a, '_get_casablanca_price_real') as mock_fetch:
+            mock_fetch.return_value = (Decimal('145.25'), Decimal('143.80'))
+            worker_a.get_stock_price('IAM.MA')
+
+        with patch.object(worker_b, '_get_casablanca_price_real') as mock_fetch:
+            price, prev = worker_b.get_stock_price('IAM.MA')
+            assert not mock_fetch.called
+
+        assert price == Decimal('145.25')
+        # Promoted into worker B's local cache
+        assert 'IAM.MA' in worker_b.price_cache
+        assert client.published[0][1]['symbol'] == 'IAM.MA'
+
+    def test_published_update_applied_to_local_cache(self):
+        """Test that quotes published by other workers update L1, ignoring own messages."""
+        client = FakeRedisClient()
+        service = MarketDataService(shared_cache=SharedPriceCache(client))
+        handlers = []
+        client.subscribe_to_channel = lambda channel, callback: handlers.append(callback)
+
+        service.start_shared_cache_listener()
+        service.shared_cache._listener.join(timeout=1)
+        handle = handlers[0]
+
+        now = time.time()
+        quote = SharedPriceCache.serialize((Decimal('146.00'), Decimal('145.25')), now, now + 300)
+        handle({'symbol': 'IAM.MA', 'quote': quote, 'origin': service.shared_cache.instance_id})
+        assert 'IAM.MA' not in service.price_cache
+
+        handle({'symbol': 'IAM.MA', 'quote': quote, 'origin': 'other-worker'})
+        assert service._get_cached_price('IAM.MA') == (Decimal('146.00'), Decimal('145.25'))
+
+    def test_disabled_redis_falls_back_to_local_cache(self):
+        """Test that the L2 tier is a no-op when Redis is disabled."""
+        client = FakeRedisClient()
+        client.enabled = False
+        service = MarketDataService(shared_cache=SharedPriceCache(client))
+
+        service._cache_price('IAM.MA', (Decimal('145.25'), Decimal('143.80')))
+
+        assert client.store == {}
+        assert service._get_cached_price('IAM.MA') == (Decimal('145.25'), Decimal('143.80'))
+
+
+class TestTokenBucketRateLimiter:
+    """Test the non-blocking token bucket limiter."""
+
+    def test_burst_then_reject(self):
+        """Test that the burst is granted and further requests are rejected."""
+        bucket = TokenBucket(rate=1.0, burst=3)
+
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() is None
+
+    def test_queued_reservation_returns_wait(self):
+        """Test that max_wait reserves a slot and reports the wait instead of sleeping."""
+        bucket = TokenBucket(rate=10.0, burst=1)
+        bucket.acquire()
+
+        start = time.time()
+        first = bucket.acquire(max_wait=1.0)
+        second = bucket.acquire(max_wait=1.0)
+
+        assert time.time() - start < 0.05
+        assert 0.05 < first <= 0.1
+        assert 0.15 < second <= 0.2
+
+    def test_refill(self):
+        """Test that tokens refill over time."""
+        bucket = TokenBucket(rate=20.0, burst=1)
+        bucket.acquire()
+        assert bucket.acquire() is None
+
+        time.sleep(0.06)
+        assert bucket.acquire() == 0.0
+
+    def test_local_fallback_and_metrics(self):
+        """Test that a disabled Redis client uses local buckets and records metrics."""
+        client = FakeRedisClient()
+        client.enabled = False
+        limiter = RateLimiter(limits={'yahoo': (10.0, 1)}, client=client)
+
+        assert limiter.acquire('yahoo') == 0.0
+        assert limiter.acquire('yahoo') is None
+        assert limiter.acquire('yahoo', max_wait=1.0) > 0
+
+        stats = limiter.stats()['yahoo']
+        assert stats['allowed'] == 2
+        assert stats['rejected'] == 1
+        assert stats['queued'] == 1
+        assert stats['max_wait'] > 0
+
+    def test_rate_limited_fetch_skips_upstream(self):
+        """Test that an exhausted Yahoo budget skips the request without sleeping."""
+        service = MarketDataService()
+        service.rate_limiter.configure('yahoo', rate=0.1, burst=1)
+        service._rate_limit('yahoo')
+
+        with patch('app.market_data.yf.Ticker') as mock_ticker:
+            start = time.time()
+            assert service._get_yahoo_price('AAPL') == (None, None)
+            assert time.time() - start < 0.05
+            assert not mock_ticker.called
+
+
+LISTING_HTML = """
+<html>
+    <table>
+        <thead>
+            <tr><th>Ticker</th><th>Instrument</th><th>Cours de référence</th><th>Dernier cours</th><th>Variation %</th></tr>
+        </thead>
+        <tbody>
+            <tr><td>IAM</td><td>Maroc Telecom</td><td>143,80</td><td>145,25</td><td>+1,01 %</td></tr>
+            <tr><td>ATW</td><td>Attijariwafa Bank</td><td></td><td>1 485,50</td><td>-0,50 %</td></tr>
+            <tr><td>BCP</td><td>Banque Centrale Populaire</td><td>283,50</td><td>285,00</td><td>+0,53 %</td></tr>
+        </tbody>
+    </table>
+</html>
+"""
+
+
+class TestCasablancaListing:
+    """Test bulk Casablanca listing scraping."""
+
+    def test_parse_listing_table(self):
+        """Test parsing every instrument of a listing page."""
+        service = MarketDataService()
+        table = service._parse_casablanca_listing(LISTING_HTML)
+
+        assert table['IAM'] == (Decimal('145.25'), Decimal('143.80'))
+        assert table['BCP'] == (Decimal('285.00'), Decimal('283.50'))
+        # Previous close derived from the variation column when missing
+        assert table['ATW'][0] == Decimal('1485.50')
+        assert Decimal('1492') < table['ATW'][1] < Decimal('1494')
+
+    def test_listing_downloaded_once_for_many_symbols(self):
+        """Test that many .MA lookups share one listing download."""
+        service = MarketDataService()
+        response = Mock()
+        response.text = LISTING_HTML
+        response.raise_for_status = Mock()
+
+        with patch.object(service.session, 'get', return_value=response) as mock_get:
+            prices = service.get_multiple_prices(['IAM.MA', 'ATW.MA', 'BCP.MA'])
+
+        assert mock_get.call_count == 1
+        assert prices['IAM.MA'] == (Decimal('145.25'), Decimal('143.80'))
+        assert prices['BCP.MA'][0] == Decimal('285.00')
+
+    def test_listing_failure_falls_back_to_ticker_pages(self):
+        """Test that an unavailable listing is not retried within the refresh window."""
+        service = MarketDataService()
+
+        with patch.object(service, '_parse_casablanca_listing', return_value={}):
+            with patch.object(service.session, 'get') as mock_get:
+                assert service.get_casablanca_listing() == {}
+                assert service.get_casablanca_listing() == {}
+
+        assert mock_get.call_count == len(service.casablanca_listing_urls)
+
+
+def make_bars(times, base=100.0):
+    """HistoryBars with a simple rising close for the given timestamps."""
+    times = np.asarray(times, dtype=np.int64)
+    close = base + np.arange(len(times), dtype=float)
+    return HistoryBars(times, close - 0.5, close + 1.0, close - 1.0, close, np.full(len(times), 1000.0))
+
+
+def make_frame(times, base=100.0):
+    """A yfinance-style history DataFrame for the given timestamps."""
+    bars = make_bars(times, base)
+    index = pd.to_datetime(bars.time, unit='s', utc=True)
+    return pd.DataFrame({
+        'Open': bars.open, 'High': bars.high, 'Low': bars.low,
+        'Close': bars.close, 'Volume': bars.volume,
+    }, index=index)
+
+
+class TestHistoryStore:
+    """Test the append-only columnar OHLCV store."""
+
+    def test_append_and_read(self, tmp_path):
+        """Test that appended bars are read back memory-mapped."""
+        store = HistoryStore(str(tmp_path))
+        assert store.append('AAPL', '1d', make_bars([100, 200, 300])) == 3
+
+        bars = store.read('AAPL', '1d')
+        assert isinstance(bars.close, np.memmap)
+        assert bars.time.tolist() == [100, 200, 300]
+        assert bars.close.tolist() == [100.0, 101.0, 102.0]
+        assert store.last_timestamp('AAPL', '1d') == 300
+
+    def test_append_only_newer_bars(self, tmp_path):
+        """Test that overlapping and duplicate bars are dropped on append."""
+        store = HistoryStore(str(tmp_path))
+        store.append('AAPL', '1d', make_bars([100, 200]))
+
+        assert store.append('AAPL', '1d', make_bars([200, 300, 300, 400])) == 2
+        assert store.read('AAPL', '1d').time.tolist() == [100, 200, 300, 400]
+
+    def test_between_and_tail(self, tmp_path):
+        """Test window selection by timestamp and by count."""
+        store = HistoryStore(str(tmp_path))
+        store.append('AAPL', '1d', make_bars([100, 200, 300, 400]))
+        bars = store.read('AAPL', '1d')
+
+        assert bars.between(150, 300).time.tolist() == [200, 300]
+        assert bars.between(start=300).time.tolist() == [300, 400]
+        assert bars.tail(2).time.tolist() == [300, 400]
+
+    def test_torn_append_is_ignored(self, tmp_path):
+        """Test that a partially written append is trimmed rather than misaligning columns."""
+        store = HistoryStore(str(tmp_path))
+        store.append('AAPL', '1d', make_bars([100, 200]))
+        with open(store._column_path('AAPL', '1d', 'time'), 'ab') as f:
+            f.write(np.array([300], dtype='<i8').tobytes())
+
+        assert len(store.read('AAPL', '1d')) == 2
+        assert store.append('AAPL', '1d', make_bars([300])) == 1
+        assert store.read('AAPL', '1d').time.tolist() == [100, 200, 300]
+
+    def test_open_mappings_are_bounded(self, tmp_path):
+        """Test that only the most recently read series stay mapped, so descriptors do not pile up."""
+        store = HistoryStore(str(tmp_path), max_open_series=3)
+        for i in range(10):
+            store.append(f'S{i}', '1d', make_bars([100, 200]))
+
+        fds_before = len(os.listdir('/proc/self/fd')) if os.path.isdir('/proc/self/fd') else None
+        for i in range(10):
+            assert store.read(f'S{i}', '1d').time.tolist() == [100, 200]
+        store.read('S7', '1d')
+
+        assert list(store._maps) == [('S8', '1d'), ('S9', '1d'), ('S7', '1d')]
+        if fds_before is not None:
+            assert len(os.listdir('/proc/self/fd')) - fds_before <= 3 * 6
+
+    def test_symbol_cannot_escape_base_dir(self, tmp_path):
+        """Test that symbols are sanitised into a single path component."""
+        store = HistoryStore(str(tmp_path))
+        path = store.series_dir('../../etc', '1d')
+        assert os.path.dirname(path) == os.path.join(str(tmp_path), '1d')
+        assert os.path.basename(path) not in ('', '.', '..')
+
+
+class TestHistoryBackfill:
+    """Test get_history and incremental backfill from the history store."""
+
+    def _service(self, tmp_path):
+        service = MarketDataService()
+        service.history_store = HistoryStore(str(tmp_path))
+        service.history_symbols = {'AAPL'}
+        return service
+
+    def test_initial_backfill_then_served_from_disk(self, tmp_path):
+        """Test that a second chart request does not call the provider."""
+        service = self._service(tmp_path)
+        day = 86400
+        now = int(time.time()) // day * day
+        frame = make_frame([now - 5 * day, now - 4 * day, now - 3 * day, now - 2 * day])
+
+        with patch('app.market_data.yf.Ticker') as mock_ticker:
+            mock_ticker.return_value.history.return_value = frame
+            first = service.get_history('AAPL', '1mo', '1d')
+            second = service.get_history('AAPL', '1mo', '1d')
+
+        assert first['success'] and second['success']
+        assert second['count'] == 4
+        assert second['data'][-1] == {
+            'time': now - 2 * day, 'open': 102.5, 'high': 104.0, 'low': 102.0, 'close': 103.0, 'volume': 1000
+        }
+        assert mock_ticker.return_value.history.call_count == 1
+        mock_ticker.return_value.history.assert_called_with(period='max', interval='1d')
+
+    def test_incremental_backfill_requests_only_newer_bars(self, tmp_path):
+        """Test that a stale series is extended from its last stored timestamp."""
+        service = self._service(tmp_path)
+        day = 86400
+        now = int(time.time()) // day * day
+        service.history_store.append('AAPL', '1d', make_bars([now - 10 * day, now - 9 * day]))
+
+        with patch('app.market_data.yf.Ticker') as mock_ticker:
+            mock_ticker.return_value.history.return_value = make_frame(
+                [now - 9 * day, now - 8 * day, now - 7 * day], base=200.0
+            )
+            appended = service.sync_history('AAPL', '1d')
+
+        assert appended == 2
+        _, kwargs = mock_ticker.return_value.history.call_args
+        assert int(kwargs['start'].timestamp()) == now - 9 * day
+        assert service.history_store.read('AAPL', '1d').time.tolist() == [
+            now - 10 * day, now - 9 * day, now - 8 * day, now - 7 * day
+        ]
+
+    def test_forming_bar_not_persisted(self, tmp_path):
+        """Test that the current, still-forming bar is not appended."""
+        service = self._service(tmp_path)
+        now = int(time.time())
+
+        with patch('app.market_data.yf.Ticker') as mock_ticker:
+            mock_ticker.return_value.history.return_value = make_frame([now - 7200, now - 60])
+            service.sync_history('AAPL', '1h')
+
+        assert service.history_store.read('AAPL', '1h').time.tolist() == [now - 7200]
+
+    def test_forming_bar_served_but_not_persisted(self, tmp_path):
+        """Test that the forming bar is appended to the response from memory only."""
+        service = self._service(tmp_path)
+        day = 86400
+        today = int(time.time()) // day * day
+
+        with patch('app.market_data.yf.Ticker') as mock_ticker:
+            mock_ticker.return_value.history.return_value = make_frame([today - 2 * day, today - day, today])
+            first = service.get_history('AAPL', '1mo', '1d')
+            second = service.get_history('AAPL', '1mo', '1d')
+
+        assert [bar['time'] for bar in first['data']] == [today - 2 * day, today - day, today]
+        assert second['data'] == first['data']
+        assert mock_ticker.return_value.history.call_count == 1
+        assert service.history_store.read('AAPL', '1d').time.tolist() == [today - 2 * day, today - day]
+
+    def test_rate_limited_with_empty_store(self, tmp_path):
+        """Test that an empty series under rate limiting returns an error instead of fetching."""
+        service = self._service(tmp_path)
+        service.rate_limiter.configure('yahoo', rate=0.001, burst=1)
+        service.rate_limiter.acquire('yahoo')
+
+        with patch('app.market_data.yf.Ticker') as mock_ticker:
+            result = service.get_history('AAPL', '1mo', '1d')
+
+        assert result['success'] is False
+        assert 'rate limit' in result['error']
+        assert not mock_ticker.called
+
+    def test_unresolved_symbol_not_backfilled(self, tmp_path):
+        """Test that a symbol off the allow-list is only backfilled once the price provider resolves it."""
+        service = self._service(tmp_path)
+        day = 86400
+        now = int(time.time()) // day * day
+
+        with patch.object(service, '_fetch_price', return_value=(None, None)), \
+                patch('app.market_data.yf.Ticker') as mock_ticker:
+            result = service.get_history('NOSUCH', '1mo', '1d')
+            assert service.get_bars('NOSUCH', '1d').time.tolist() == []
+
+        assert result['success'] is False
+        assert not mock_ticker.return_value.history.called
+        assert not os.path.exists(service.history_store.series_dir('NOSUCH', '1d'))
+
+        with patch.object(service, '_fetch_price', return_value=(Decimal('10'), Decimal('9'))), \
+                patch('app.market_data.yf.Ticker') as mock_ticker:
+            mock_ticker.return_value.history.return_value = make_frame([now - 3 * day, now - 2 * day])
+            result = service.get_history('MSFT', '1mo', '1d')
+
+        assert result['success'] and result['count'] == 2
+
+    def test_invalid_symbol_rejected(self, tmp_path):
+        """Test that symbols outside the ticker alphabet are rejected."""
+        service = self._service(tmp_path)
+        result = service.get_history('../etc', '1mo', '1d')
+        assert result['success'] is False
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -107,31 +107,32 @@ class TestCaching:
 class TestRateLimiting:
     """Test rate limiting mechanism."""
     
-    def test_rate_limit_delay(self):
-        """Test that rate limiting adds delay between requests."""
+    def test_rate_limit_does_not_block(self):
+        """Test that an exhausted budget rejects instead of sleeping."""
         service = MarketDataService()
-        service.request_delay = 0.1  # 100ms for testing
+        service.rate_limiter.configure('test_source', rate=10, burst=1)
         
         import time
         start = time.time()
         
-        # First request
-        service._rate_limit('test_source')
+        # First request takes the only token
+        assert service._rate_limit('test_source') is True
         
-        # Second request should be delayed
-        service._rate_limit('test_source')
+        # Second request is rejected immediately
+        assert service._rate_limit('test_source') is False
         
         elapsed = time.time() - start
-        assert elapsed >= 0.1  # At least 100ms delay
+        assert elapsed < 0.05
     
     def test_rate_limit_per_source(self):
         """Test that rate limiting is per-source."""
         service = MarketDataService()
-        service.request_delay = 0.1
+        service.rate_limiter.configure('source1', rate=10, burst=1)
+        service.rate_limiter.configure('source2', rate=10, burst=1)
         
         # Different sources should not interfere
-        service._rate_limit('source1')
-        service._rate_limit('source2')  # Should not be delayed
+        assert service._rate_limit('source1')
+        assert service._rate_limit('source2')
 
 
 class TestScrapingStrategies:
@@ -0,0 +1,324 @@
+"""
+Tests for the Order Engine trigger books and order monitor
+
+Covers the per-symbol price-indexed books behind OrderEngine.monitor_orders,
+the tick-driven OrderMonitor and journal-backed recovery.
+"""
+
+import copy
+import json
+import random
+import time
+import pytest
+from unittest.mock import Mock, patch
+from datetime import timedelta
+from decimal import Decimal
+
+from app.infrastructure.order_journal import OrderJournal
+from app.order_engine import OrderEngine, OrderMonitor, OrderSide, OrderStatus, PriceTriggerBook
+from src.core.event_bus import EventBus
+
+
+def _prices(table):
+    """get_stock_price stand-in serving prices from a dict."""
+    def get_stock_price(symbol):
+        return table[symbol], table[symbol]
+    return get_stock_price
+
+
+class TestTriggerBook:
+    """Test PriceTriggerBook against Order.should_trigger."""
+
+    def _random_orders(self, engine, rng, count):
+        orders = []
+        for _ in range(count):
+            order_type = rng.choice(['LIMIT', 'STOP_LOSS', 'TAKE_PROFIT', 'TRAILING_STOP'])
+            level = Decimal(rng.randint(80, 120))
+            kwargs = {
+                'LIMIT': {'limit_price': level},
+                'STOP_LOSS': {'stop_price': level},
+                'TAKE_PROFIT': {'take_profit_price': level},
+                'TRAILING_STOP': {'trailing_stop_percent': Decimal(rng.randint(1, 10)) / 100},
+            }[order_type]
+            with patch.object(engine, '_validate_order_inputs'):
+                orders.append(engine.create_order(
+                    'challenge-1', 'AAPL', rng.choice(['BUY', 'SELL']), Decimal('1'), order_type, **kwargs
+                ))
+        return orders
+
+    def test_matches_should_trigger(self):
+        """Test that monitoring triggers exactly the orders should_trigger would, in creation order."""
+        rng = random.Random(7)
+        engine = OrderEngine()
+        reference = [copy.deepcopy(order) for order in self._random_orders(engine, rng, 300)]
+
+        price = Decimal('100')
+        table = {'AAPL': price}
+        with patch('app.order_engine.market_data.get_stock_price', side_effect=_prices(table)):
+            for _ in range(200):
+                price = max(Decimal('50'), price + Decimal(rng.randint(-3, 3)))
+                table['AAPL'] = price
+
+                expected = []
+                for order in reference:
+                    if order.status == OrderStatus.OPEN:
+                        triggered, reason = order.should_trigger(price)
+                        if triggered:
+                            order.status = OrderStatus.FILLED
+                            expected.append((order.order_id, reason))
+
+                executions = engine.monitor_orders()
+                assert [(e['order_id'], e['trigger_reason']) for e in executions] == expected
+
+        assert set(engine.active_orders) == {o.order_id for o in reference if o.status == OrderStatus.OPEN}
+
+    def test_trailing_mark_written_back(self):
+        """Test that a triggered trailing stop carries the high-water mark it fired from."""
+        engine = OrderEngine()
+        with patch.object(engine, '_validate_order_inputs'):
+            order = engine.create_order('c', 'AAPL', 'BUY', Decimal('1'), 'TRAILING_STOP',
+                                        trailing_stop_percent=Decimal('0.1'))
+
+        table = {'AAPL': Decimal('100')}
+        with patch('app.order_engine.market_data.get_stock_price', side_effect=_prices(table)):
+            for price in ('100', '120', '110', '107'):
+                table['AAPL'] = Decimal(price)
+                executions = engine.monitor_orders()
+
+        assert [e['order_id'] for e in executions] == [order.order_id]
+        assert order.highest_price_since_entry == Decimal('120')
+        assert order.trailing_stop_price == Decimal('108.0')
+
+    def test_cancel_removes_from_book(self):
+        """Test that cancelled orders are never triggered."""
+        engine = OrderEngine()
+        with patch.object(engine, '_validate_order_inputs'):
+            order = engine.create_order('c', 'AAPL', 'BUY', Decimal('1'), 'LIMIT', limit_price=Decimal('100'))
+        engine.cancel_order(order.order_id)
+
+        assert len(engine.trigger_books['AAPL']) == 0
+        with patch('app.order_engine.market_data.get_stock_price') as mock_price:
+            assert engine.monitor_orders() == []
+        mock_price.assert_not_called()
+
+    def test_crossed_pops_only_crossed(self):
+        """Test that a tick pops the crossed prefix and suffix and leaves the rest."""
+        engine = OrderEngine()
+        book = PriceTriggerBook()
+        with patch.object(engine, '_validate_order_inputs'):
+            for side, level in (('SELL', '101'), ('SELL', '105'), ('BUY', '99'), ('BUY', '95')):
+                order = engine.create_order('c', 'AAPL', side, Decimal('1'), 'LIMIT', limit_price=Decimal(level))
+                book.add(order, int(level))
+
+        assert [seq for seq, _, _ in book.crossed(Decimal('101'))] == [101]
+        assert [seq for seq, _, _ in book.crossed(Decimal('97'))] == [99]
+        assert len(book) == 2
+
+
+class TestMonitorOrders:
+    """Test OrderEngine.monitor_orders."""
+
+    def test_one_price_fetch_per_symbol(self):
+        """Test that a sweep fetches each symbol's price once and fills at that price."""
+        engine = OrderEngine()
+        with patch.object(engine, '_validate_order_inputs'):
+            for symbol in ('AAPL', 'MSFT'):
+                for level in ('90', '95', '100', '105'):
+                    engine.create_order('c', symbol, 'BUY', Decimal('2'), 'LIMIT', limit_price=Decimal(level))
+
+        table = {'AAPL': Decimal('97'), 'MSFT': Decimal('200')}
+        with patch('app.order_engine.market_data.get_stock_price', side_effect=_prices(table)) as mock_price:
+            executions = engine.monitor_orders()
+
+        assert sorted(call.args[0] for call in mock_price.call_args_list) == ['AAPL', 'MSFT']
+        assert len(executions) == 2
+        assert all(e['execution_price'] == Decimal('97') for e in executions)
+        assert all(e['challenge_id'] == 'c' and e['fill_quantity'] == Decimal('2') for e in executions)
+        assert len(engine.active_orders) == 6
+
+    def test_failed_execution_stays_resting(self):
+        """Test that an order whose execution fails is triggered again on the next sweep."""
+        engine = OrderEngine()
+        with patch.object(engine, '_validate_order_inputs'):
+            order = engine.create_order('c', 'AAPL', 'SELL', Decimal('1'), 'LIMIT', limit_price=Decimal('100'))
+
+        table = {'AAPL': Decimal('101')}
+        with patch('app.order_engine.market_data.get_stock_price', side_effect=_prices(table)):
+            with patch.object(engine, 'execute_order', side_effect=RuntimeError('broker down')):
+                assert engine.monitor_orders() == []
+            executions = engine.monitor_orders()
+
+        assert [e['order_id'] for e in executions] == [order.order_id]
+        assert order.side == OrderSide.SELL and order.status == OrderStatus.FILLED
+
+
+class TestOrderMonitor:
+    """Test the tick-driven OrderMonitor."""
+
+    def _monitor(self):
+        engine = OrderEngine()
+        with patch.object(engine, '_validate_order_inputs'):
+            order = engine.create_order('c', 'AAPL', 'BUY', Decimal('1'), 'LIMIT', limit_price=Decimal('100'))
+        bus = Mock()
+        service = Mock()
+        return OrderMonitor(engine, service, bus, refresh_interval=60), order, bus, service
+
+    def test_ignores_symbols_without_orders(self):
+        """Test that ticks for symbols with no resting orders are not queued."""
+        monitor, _, _, _ = self._monitor()
+        monitor.on_price('MSFT', Decimal('50'), time.time())
+        assert monitor._ticks.empty()
+
+    def test_tick_publishes_fill(self):
+        """Test that a crossing tick executes the order and publishes ORDER_FILLED."""
+        monitor, order, bus, _ = self._monitor()
+        monitor.process_tick('AAPL', Decimal('101'))
+        bus.emit.assert_not_called()
+
+        monitor.process_tick('AAPL', Decimal('99.5'))
+        bus.emit.assert_called_once()
+        event_type, payload = bus.emit.call_args.args
+        assert event_type == 'ORDER_FILLED'
+        assert payload['order_id'] == order.order_id
+        assert Decimal(payload['execution_price']) == Decimal('99.5')
+
+    def test_forwarded_fill_is_json_serializable(self):
+        """Test that the ORDER_FILLED payload reaching the WebSocket forwarder encodes as JSON."""
+        monitor, order, _, _ = self._monitor()
+        monitor.bus = EventBus()
+        forwarded = []
+        monitor.bus.set_websocket_forwarder(lambda event_type, payload: forwarded.append(json.dumps(payload)))
+
+        monitor.process_tick('AAPL', Decimal('99.5'))
+
+        assert monitor.fills_published == 1
+        message = json.loads(forwarded[0])
+        assert message['order_id'] == order.order_id
+        assert Decimal(message['total_value']) == Decimal('99.5')
+
+    def test_thread_processes_listener_ticks(self):
+        """Test that ticks delivered to the listener are triggered on the monitor thread."""
+        monitor, order, bus, service = self._monitor()
+        monitor.start()
+        try:
+            service.add_price_listener.assert_called_once_with(monitor.on_price)
+            monitor.on_price('AAPL', Decimal('98'), time.time())
+            deadline = time.time() + 5
+            while not bus.emit.called and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            monitor.stop()
+
+        assert order.status == OrderStatus.FILLED
+        assert monitor.fills_published == 1
+
+    def test_refreshes_idle_symbols(self):
+        """Test that resting symbols with stale prices are refreshed."""
+        monitor, _, _, service = self._monitor()
+        service.get_price_age.return_value = 120.0
+        assert monitor.refresh_idle_symbols() == ['AAPL']
+        service.refresh_prices.assert_called_once_with(['AAPL'])
+
+        service.get_price_age.return_value = 1.0
+        assert monitor.refresh_idle_symbols() == []
+
+
+class TestOrderJournal:
+    """Test write-ahead logging and recovery."""
+
+    def _create(self, engine, side, order_type, **kwargs):
+        with patch.object(engine, '_validate_order_inputs'):
+            return engine.create_order(kwargs.pop('challenge_id', 'c'), kwargs.pop('symbol', 'AAPL'),
+                                       side, Decimal('1'), order_type, **kwargs)
+
+    def test_recovers_from_log_and_snapshot(self, tmp_path):
+        """Test that resting and archived orders survive a restart, with and without a snapshot."""
+        journal = OrderJournal(str(tmp_path), snapshot_every=3)
+        engine = OrderEngine(journal)
+        kept = self._create(engine, 'BUY', 'LIMIT', limit_price=Decimal('90'), challenge_id='c1')
+        cancelled = self._create(engine, 'SELL', 'STOP_LOSS', stop_price=Decimal('120'))
+        engine.cancel_order(cancelled.order_id)
+        trailing = self._create(engine, 'BUY', 'TRAILING_STOP', trailing_stop_percent=Decimal('0.1'))
+        engine.process_price('AAPL', Decimal('100'))
+        engine.process_price('AAPL', Decimal('110'))
+        engine.snapshot()
+        late = self._create(engine, 'SELL', 'TAKE_PROFIT', take_profit_price=Decimal('80'), challenge_id='c1')
+        journal.close()
+
+        recovered = OrderEngine(OrderJournal(str(tmp_path)))
+
+        assert list(recovered.active_orders) == [kept.order_id, trailing.order_id, late.order_id]
+        assert recovered.get_order(cancelled.order_id).status == OrderStatus.CANCELLED
+        assert recovered.get_order(kept.order_id).limit_price == Decimal('90')
+        assert [o.order_id for o in recovered.get_active_orders('c1')] == [kept.order_id, late.order_id]
+        # The trailing stop keeps its mark: 98 is below 110 * 0.9 but not 100 * 0.9
+        executions = recovered.process_price('AAPL', Decimal('98'))
+        assert [e['order_id'] for e in executions] == [trailing.order_id]
+
+    def test_torn_tail_ignored(self, tmp_path):
+        """Test that a partially written last log line is dropped on recovery."""
+        journal = OrderJournal(str(tmp_path))
+        engine = OrderEngine(journal)
+        order = self._create(engine, 'BUY', 'LIMIT', limit_price=Decimal('90'))
+        journal.close()
+        with open(tmp_path / 'wal.jsonl', 'a') as f:
+            f.write('["torn-order","c","AAPL"')
+
+        recovered = OrderEngine(OrderJournal(str(tmp_path)))
+        assert list(recovered.active_orders) == [order.order_id]
+
+    def test_snapshot_drops_expired_history(self, tmp_path):
+        """Test that finished orders past the retention are left out of the snapshot."""
+        journal = OrderJournal(str(tmp_path))
+        engine = OrderEngine(journal, history_retention=timedelta(days=1))
+        resting = self._create(engine, 'BUY', 'LIMIT', limit_price=Decimal('90'))
+        old = self._create(engine, 'SELL', 'STOP_LOSS', stop_price=Decimal('120'))
+        recent = self._create(engine, 'SELL', 'STOP_LOSS', stop_price=Decimal('130'))
+        engine.cancel_order(old.order_id)
+        engine.cancel_order(recent.order_id)
+        old.updated_at -= timedelta(days=2)
+        resting.updated_at -= timedelta(days=2)
+
+        engine.snapshot()
+        journal.close()
+
+        assert engine.get_order(old.order_id) is None
+        assert [o.order_id for o in engine.order_history] == [recent.order_id]
+        recovered = OrderEngine(OrderJournal(str(tmp_path)))
+        assert set(recovered.orders) == {resting.order_id, recent.order_id}
+        assert list(recovered.active_orders) == [resting.order_id]
+
+    def test_indexes_follow_mutations(self):
+        """Test that the id and challenge indexes track creation, fills and cancels."""
+        engine = OrderEngine()
+        order = self._create(engine, 'BUY', 'LIMIT', limit_price=Decimal('90'), challenge_id='c1')
+        other = self._create(engine, 'BUY', 'LIMIT', limit_price=Decimal('80'), challenge_id='c2')
+        engine.cancel_order(order.order_id)
+
+        assert engine.get_order(order.order_id) is order
+        assert engine.get_active_orders('c1') == []
+        assert engine.get_active_orders('c2') == [other]
+        assert 'c1' not in engine.active_by_challenge
+
+    def test_recovers_100k_orders_quickly(self, tmp_path):
+        """Test that 100k orders come back from snapshot plus log quickly (with slack for slow CI machines)."""
+        journal = OrderJournal(str(tmp_path), snapshot_every=10**9)
+        engine = OrderEngine(journal)
+        with patch.object(engine, '_validate_order_inputs'):
+            for i in range(100_000):
+                engine.create_order(f'c{i % 500}', f'S{i % 200}', 'BUY', Decimal('1'), 'LIMIT',
+                                    limit_price=Decimal(50 + i % 100))
+                if i == 80_000:
+                    engine.snapshot()
+        journal.close()
+
+        started = time.perf_counter()
+        recovered = OrderEngine(OrderJournal(str(tmp_path)))
+        elapsed = time.perf_counter() - started
+
+        assert len(recovered.active_orders) == 100_000
+        assert elapsed < 2.0
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
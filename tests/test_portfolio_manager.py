@@ -0,0 +1,202 @@
+"""
+Tests for the Portfolio Manager mark-to-market service and risk metrics
+
+Covers the symbol -> positions index, batched repricing across portfolios and
+the streaming risk statistics fed by each mark.
+"""
+
+import random
+import statistics
+import threading
+import time
+import numpy as np
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+from decimal import Decimal
+
+from app.portfolio_manager import P2Quantile, PortfolioManager, RiskAccumulator
+
+
+def _manager(quotes):
+    manager = PortfolioManager()
+    service = Mock()
+    service.get_multiple_prices.side_effect = lambda symbols: {s: quotes[s] for s in symbols if s in quotes}
+    manager.mark_to_market.market_data = service
+    return manager, service
+
+
+class TestMarkToMarket:
+    """Test MarkToMarketService."""
+
+    def test_index_follows_positions(self):
+        """Test that opening and closing positions updates the symbol index."""
+        manager, _ = _manager({})
+        first = manager.get_portfolio('c1')
+        second = manager.get_portfolio('c2')
+        first.add_position('AAPL', Decimal('10'), Decimal('100'))
+        second.add_position('AAPL', Decimal('5'), Decimal('101'))
+        second.add_position('MSFT', Decimal('2'), Decimal('300'))
+
+        index = manager.mark_to_market.positions
+        assert set(index['AAPL']) == {'c1', 'c2'}
+
+        second.remove_position('AAPL')
+        first.add_position('AAPL', Decimal('-10'), Decimal('105'))
+        assert 'AAPL' not in index
+        assert set(index['MSFT']) == {'c2'}
+
+    def test_cycle_fetches_each_symbol_once(self):
+        """Test that one cycle batch-fetches distinct symbols and reprices every holder."""
+        manager, service = _manager({'AAPL': (Decimal('110'), Decimal('100')), 'MSFT': (Decimal('320'), Decimal('300'))})
+        for i in range(50):
+            portfolio = manager.get_portfolio(f'c{i}')
+            portfolio.add_position('AAPL', Decimal('1'), Decimal('100'))
+            portfolio.add_position('MSFT', Decimal('1'), Decimal('300'))
+
+        applied = manager.mark_to_market.run_cycle()
+
+        service.get_multiple_prices.assert_called_once()
+        assert sorted(service.get_multiple_prices.call_args.args[0]) == ['AAPL', 'MSFT']
+        assert applied == {'AAPL': Decimal('110'), 'MSFT': Decimal('320')}
+        assert all(p.positions['AAPL'].current_price == Decimal('110') for p in manager.portfolios.values())
+        assert len({p.last_updated for p in manager.portfolios.values()}) == 1
+
+    def test_unpriced_symbol_keeps_mark(self):
+        """Test that a symbol the batch could not price keeps its previous price."""
+        manager, _ = _manager({'AAPL': (None, None)})
+        portfolio = manager.get_portfolio('c1')
+        portfolio.add_position('AAPL', Decimal('1'), Decimal('100'))
+
+        assert manager.mark_to_market.run_cycle() == {}
+        assert portfolio.positions['AAPL'].current_price == Decimal('100')
+
+    def test_cycles_once_per_interval(self):
+        """Test that portfolios for different challenges share one cycle per interval."""
+        manager, service = _manager({'AAPL': (Decimal('110'), Decimal('100'))})
+        for challenge_id in ('c1', 'c2'):
+            manager.get_portfolio(challenge_id).add_position('AAPL', Decimal('1'), Decimal('100'))
+        mark_to_market = manager.mark_to_market
+
+        assert mark_to_market.ensure_fresh() is True
+        assert mark_to_market.ensure_fresh() is False
+        assert service.get_multiple_prices.call_count == 1
+        assert manager.get_portfolio('c2').get_position_summary()[0]['current_price'] == 110.0
+
+        mark_to_market.last_cycle = datetime.now(timezone.utc) - timedelta(seconds=301)
+        assert mark_to_market.ensure_fresh() is True
+        assert service.get_multiple_prices.call_count == 2
+
+    def test_concurrent_callers_share_one_cycle(self):
+        """Test that requests arriving during a cycle wait for it instead of running their own."""
+        manager, service = _manager({'AAPL': (Decimal('110'), Decimal('100'))})
+        portfolio = manager.get_portfolio('c1')
+        portfolio.add_position('AAPL', Decimal('1'), Decimal('100'))
+        quotes = service.get_multiple_prices.side_effect
+        service.get_multiple_prices.side_effect = lambda symbols: time.sleep(0.05) or quotes(symbols)
+        marks_before = portfolio.risk.count
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.mark_to_market.ensure_fresh()))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert service.get_multiple_prices.call_count == 1
+        assert sorted(results) == [False] * 7 + [True]
+        assert portfolio.risk.count == marks_before + 1
+
+
+class TestRiskAccumulator:
+    """Test the streaming risk statistics."""
+
+    def test_matches_batch_statistics(self):
+        """Test that running mean, volatility and drawdown match a full recomputation."""
+        rng = random.Random(3)
+        values = [100000.0]
+        for _ in range(500):
+            values.append(values[-1] * (1 + rng.gauss(0, 0.01)))
+
+        accumulator = RiskAccumulator()
+        for value in values:
+            accumulator.observe(value)
+
+        returns = [(b / a - 1) * 100 for a, b in zip(values, values[1:])]
+        assert accumulator.mean == pytest.approx(statistics.mean(returns))
+        assert accumulator.volatility == pytest.approx(statistics.stdev(returns))
+
+        peak, worst = values[0], 0.0
+        for value in values:
+            peak = max(peak, value)
+            worst = max(worst, (peak - value) / peak * 100)
+        assert accumulator.max_drawdown == pytest.approx(worst)
+
+    def test_rebase_skips_flows(self):
+        """Test that a fill moving the value is not counted as a return."""
+        accumulator = RiskAccumulator()
+        accumulator.observe(100.0)
+        accumulator.rebase(50.0)
+        accumulator.observe(51.0)
+        assert accumulator.count == 1
+        assert accumulator.mean == pytest.approx(2.0)
+        assert accumulator.max_drawdown == 0.0
+
+    def test_sharpe_ratio_is_annualized_from_period_returns(self):
+        """Test that Sharpe uses the mean period return, per-period risk-free rate and sqrt scaling."""
+        accumulator = RiskAccumulator(periods_per_year=252)
+        for value in (100.0, 110.0, 99.0, 108.9):
+            accumulator.observe(value)
+
+        # Returns of +10%, -10%, +10%: mean 3.33%, sample stdev 11.55%
+        expected = (10 / 3 - 2.0 / 252) / statistics.stdev([10.0, -10.0, 10.0]) * 252 ** 0.5
+        assert accumulator.sharpe_ratio(annual_risk_free_rate=2.0) == pytest.approx(expected)
+        assert accumulator.sharpe_ratio() == pytest.approx(4.5717, abs=1e-4)
+
+        flat = RiskAccumulator(periods_per_year=252)
+        for value in (100.0, 100.0, 100.0):
+            flat.observe(value)
+        assert flat.sharpe_ratio() == 0.0
+
+    def test_quantile_sketch_tracks_percentile(self):
+        """Test that the P-squared estimate stays close to the exact 5th percentile."""
+        rng = np.random.default_rng(5)
+        samples = rng.normal(0, 1, 20000)
+        sketch = P2Quantile(0.05)
+        for x in samples:
+            sketch.add(float(x))
+        assert sketch.value == pytest.approx(np.percentile(samples, 5), abs=0.05)
+
+        small = P2Quantile(0.5)
+        for x in (3.0, 1.0, 2.0):
+            small.add(x)
+        assert small.value == 2.0
+
+
+class TestPortfolioRiskMetrics:
+    """Test Portfolio.risk_metrics over marks."""
+
+    def test_metrics_follow_marks(self):
+        """Test that marks feed drawdown and VaR and the summary can be built."""
+        manager, service = _manager({})
+        portfolio = manager.get_portfolio('c1', Decimal('0'))
+        portfolio.add_position('AAPL', Decimal('10'), Decimal('100'))
+
+        for price in ('110', '99', '104', '95', '101'):
+            manager.mark_to_market.reprice('AAPL', Decimal(price))
+            portfolio.record_mark()
+
+        metrics = portfolio.risk_metrics
+        # Peak 1100 -> trough 950
+        assert metrics['max_drawdown'] == Decimal('13.64')
+        assert metrics['value_at_risk_95'] > 0
+        assert metrics['volatility'] > 0
+
+        service.get_multiple_prices.side_effect = lambda symbols: {}
+        summary = manager.get_portfolio_summary('c1')
+        assert summary['risk_metrics']['max_drawdown'] == 13.64
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
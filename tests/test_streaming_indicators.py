@@ -0,0 +1,257 @@
+"""
+Tests for Streaming Technical Indicators
+
+Checks the incremental indicators against the batch implementations and the
+per-symbol registry's tick handling.
+"""
+
+import math
+import random
+from collections import deque
+import pytest
+import numpy as np
+
+from app.technical_analysis import VectorIndicators
+from app.infrastructure.history_store import HistoryBars
+from app.streaming_indicators import (
+    StreamingSMA, StreamingEMA, StreamingRSI, StreamingMACD, StreamingBollinger,
+    StreamingStochastic, StreamingATR, IndicatorSet, IndicatorRegistry
+)
+
+
+def random_bars(length=200, seed=3):
+    rng = random.Random(seed)
+    highs, lows, closes = [], [], []
+    price = 50.0
+    for _ in range(length):
+        price *= 1 + rng.uniform(-0.03, 0.03)
+        closes.append(price)
+        highs.append(price * (1 + rng.uniform(0, 0.02)))
+        lows.append(price * (1 - rng.uniform(0, 0.02)))
+    return highs, lows, closes
+
+
+def assert_series(expected, actual, rel=1e-9):
+    """Batch output (NaN while undefined) matches streamed values (None while undefined)."""
+    assert len(expected) == len(actual)
+    for i, (e, a) in enumerate(zip(expected, actual)):
+        if math.isnan(e):
+            assert a is None, f"index {i}: expected undefined, got {a}"
+        else:
+            assert a == pytest.approx(e, rel=rel, abs=1e-9), f"index {i}"
+
+
+class TestStreamingParity:
+    """Test that streaming indicators reproduce the batch indicators bar by bar."""
+
+    def setup_method(self):
+        self.highs, self.lows, self.closes = random_bars()
+
+    def test_sma(self):
+        sma = StreamingSMA(20)
+        assert_series(VectorIndicators.sma(self.closes, 20), [sma.update(c) for c in self.closes])
+
+    def test_ema(self):
+        ema = StreamingEMA(12)
+        assert_series(VectorIndicators.ema(self.closes, 12), [ema.update(c) for c in self.closes])
+
+    def test_rsi(self):
+        rsi = StreamingRSI(14)
+        assert_series(VectorIndicators.rsi(self.closes, 14), [rsi.update(c) for c in self.closes])
+
+    def test_macd(self):
+        macd = StreamingMACD()
+        streamed = [macd.update(c) for c in self.closes]
+        for column, expected in enumerate(VectorIndicators.macd(self.closes)):
+            assert_series(expected, [values[column] for values in streamed])
+
+    def test_bollinger(self):
+        bollinger = StreamingBollinger(20, 2.0)
+        streamed = [bollinger.update(c) for c in self.closes]
+        for column, expected in enumerate(VectorIndicators.bollinger_bands(self.closes, 20, 2.0)):
+            assert_series(expected, [values[column] for values in streamed], rel=1e-7)
+
+    def test_stochastic(self):
+        stochastic = StreamingStochastic(14, 3)
+        streamed = [stochastic.update(h, l, c) for h, l, c in zip(self.highs, self.lows, self.closes)]
+        for column, expected in enumerate(VectorIndicators.stochastic_oscillator(self.highs, self.lows, self.closes)):
+            assert_series(expected, [values[column] for values in streamed])
+
+    def test_atr(self):
+        """Test ATR parity (the batch ATR has one value per bar after the first)."""
+        atr = StreamingATR(14)
+        streamed = [atr.update(h, l, c) for h, l, c in zip(self.highs, self.lows, self.closes)]
+        assert_series(VectorIndicators.atr(self.highs, self.lows, self.closes), streamed[1:])
+
+    def test_peek_matches_update_without_mutating(self):
+        """Test that peek() predicts update() and leaves state untouched."""
+        indicators = [StreamingSMA(5), StreamingEMA(5), StreamingRSI(5), StreamingMACD(3, 6, 3),
+                      StreamingBollinger(5), StreamingStochastic(5, 3), StreamingATR(5)]
+
+        for h, l, c in zip(self.highs[:40], self.lows[:40], self.closes[:40]):
+            for indicator in indicators:
+                args = (h, l, c) if isinstance(indicator, (StreamingStochastic, StreamingATR)) else (c,)
+                before = state(indicator)
+                peeked = indicator.peek(*args)
+                assert state(indicator) == before
+                assert same_value(peeked, indicator.update(*args))
+
+
+def state(obj):
+    """Recursive snapshot of an indicator's attributes."""
+    if hasattr(obj, '__dict__'):
+        return {k: state(v) for k, v in vars(obj).items()}
+    if isinstance(obj, deque):
+        return list(obj)
+    return obj
+
+
+def same_value(a, b):
+    if isinstance(a, tuple):
+        return all(same_value(x, y) for x, y in zip(a, b))
+    if a is None or b is None:
+        return a is b
+    return a == pytest.approx(b)
+
+
+class TestIndicatorSet:
+    """Test IndicatorSet's forming bar and snapshots."""
+
+    def test_ticks_fold_into_forming_bar(self):
+        """Test that ticks build one OHLC bar, stale ticks are ignored and a new bucket replaces it uncommitted."""
+        indicator_set = IndicatorSet('AAPL', '1d')
+        indicator_set.update_bar(0, 10.0, 11.0, 9.0, 10.0)
+
+        assert indicator_set.on_tick(12.0, 5) is False  # inside the stored bar
+        assert indicator_set.forming is None
+
+        assert indicator_set.on_tick(10.5, 86400 + 10) is False
+        assert indicator_set.on_tick(12.5, 86400 + 20) is False
+        assert indicator_set.on_tick(10.2, 86400 + 30) is False
+        assert indicator_set.forming == [86400, 10.5, 12.5, 10.2, 10.2]
+        assert indicator_set.snapshot()['current_price'] == 10.2
+        assert indicator_set.snapshot(preview=False)['current_price'] == 10.0
+
+        assert indicator_set.on_tick(11.0, 2 * 86400 + 1) is True
+        assert indicator_set.bars == 1
+        assert indicator_set.last_bar_time == 0
+        assert indicator_set.forming == [2 * 86400, 11.0, 11.0, 11.0, 11.0]
+
+
+class FakeMarketData:
+    """Stands in for MarketDataService: serves stored bars and records listeners."""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.listeners = []
+        self.syncs = []
+
+    def add_price_listener(self, callback):
+        self.listeners.append(callback)
+
+    def get_bars(self, symbol, interval='1d', start=None, end=None, sync=True):
+        self.syncs.append(sync)
+        return self.bars.between(start, end)
+
+
+class TestIndicatorRegistry:
+    """Test warm-up, catch-up and tick handling."""
+
+    def _bars(self, count, day=86400, offset=4 * 3600):
+        highs, lows, closes = random_bars(count)
+        times = np.arange(count, dtype=np.int64) * day + offset
+        return HistoryBars(times, np.array(closes), np.array(highs), np.array(lows), np.array(closes), np.ones(count))
+
+    def test_warm_up_from_history(self):
+        """Test that a new set replays stored bars."""
+        bars = self._bars(100)
+        registry = IndicatorRegistry(FakeMarketData(bars))
+
+        snapshot = registry.snapshot('aapl', '1d')
+        expected = VectorIndicators.rsi(bars.close, 14)[-1]
+        assert snapshot['bars'] == 100
+        assert snapshot['indicators']['rsi_14'] == pytest.approx(expected)
+        assert snapshot['current_price'] == pytest.approx(bars.close[-1])
+
+    def test_ticks_build_bars_aligned_to_history(self):
+        """Test that ticks form a bar in the stored bars' phase and the stored bar replaces it once it lands."""
+        bars = self._bars(60)
+        market_data = FakeMarketData(bars)
+        registry = IndicatorRegistry(market_data)
+        registry.get('AAPL', '1d')
+        updates = []
+        registry.add_listener(lambda *args: updates.append(args))
+        on_price = market_data.listeners[0]
+
+        next_bar = bars.last_timestamp + 86400
+        on_price('AAPL', 10.0, next_bar + 100)
+        on_price('AAPL', 12.0, next_bar + 200)
+        on_price('MSFT', 99.0, next_bar + 300)  # untracked symbol is ignored
+
+        indicator_set = registry.get('AAPL', '1d')
+        assert indicator_set.forming == [next_bar, 10.0, 12.0, 10.0, 12.0]
+        assert len(updates) == 2 and updates[-1][3] is False
+        assert updates[-1][2]['current_price'] == 12.0
+
+        on_price('AAPL', 11.0, next_bar + 86400 + 5)
+        assert updates[-1][3] is True
+        assert indicator_set.bars == 60  # not stored yet, so nothing is committed
+
+        stored = self._bars(61)
+        stored.close[-1] = 11.5
+        market_data.bars = stored
+        registry.get('AAPL', '1d')
+        assert indicator_set.bars == 61
+        assert indicator_set.last_bar_time == next_bar
+        assert indicator_set.closes[-1] == 11.5
+        assert indicator_set.forming == [next_bar + 86400, 11.0, 11.0, 11.0, 11.0]
+
+    def test_stored_bar_applied_when_ticks_cross_boundary(self):
+        """Test that crossing a bar boundary applies the finished bar from the store without a sync."""
+        bars = self._bars(61)
+        market_data = FakeMarketData(bars[:60])
+        registry = IndicatorRegistry(market_data)
+        indicator_set = registry.get('AAPL', '1d')
+        on_price = market_data.listeners[0]
+
+        on_price('AAPL', 10.0, bars.last_timestamp + 100)
+        market_data.bars = bars
+        on_price('AAPL', 11.0, bars.last_timestamp + 86400 + 100)
+
+        assert indicator_set.bars == 61
+        assert indicator_set.closes[-1] == bars.close[-1]
+        assert market_data.syncs == [True, False]
+
+    def test_sets_are_bounded(self):
+        """Test that the least recently read set is dropped past max_sets."""
+        market_data = FakeMarketData(self._bars(5))
+        registry = IndicatorRegistry(market_data, max_sets=2)
+
+        registry.get('AAPL', '1d')
+        registry.get('MSFT', '1d')
+        registry.get('AAPL', '1d')
+        registry.get('TSLA', '1d')
+
+        assert registry.tracked() == [('AAPL', '1d'), ('TSLA', '1d')]
+        assert 'MSFT' not in registry._by_symbol
+
+    def test_preview_matches_committed_bar(self):
+        """Test that the tick preview equals the values once the same bar is stored."""
+        bars = self._bars(60)
+        market_data = FakeMarketData(bars)
+        registry = IndicatorRegistry(market_data)
+        indicator_set = registry.get('AAPL', '1d')
+
+        next_bar = bars.last_timestamp + 86400
+        indicator_set.on_tick(10.0, next_bar + 1)
+        preview = indicator_set.snapshot(preview=True)
+        indicator_set.update_bar(next_bar, 10.0, 10.0, 10.0, 10.0)
+        committed = indicator_set.snapshot(preview=False)
+
+        assert preview['indicators']['rsi_14'] == pytest.approx(committed['indicators']['rsi_14'])
+        assert preview['indicators']['macd'] == pytest.approx(committed['indicators']['macd'])
+        assert preview['trend'] == committed['trend']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
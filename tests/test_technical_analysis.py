@@ -0,0 +1,234 @@
+"""
+Tests for Technical Analysis indicators
+
+Checks the float64 array indicators against the Decimal reference implementation
+and the indicator result cache shared by the analysis endpoints.
+"""
+
+import math
+import random
+import pytest
+from decimal import Decimal
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
+
+import numpy as np
+
+from app.infrastructure.history_store import HistoryBars
+from app.technical_analysis import (
+    PriceData, PriceSeries, TechnicalIndicators, VectorIndicators, TechnicalAnalysisEngine,
+    IndicatorCache
+)
+
+
+def random_walk(length=300, seed=7):
+    """Deterministic OHLC random walk as Decimal lists."""
+    rng = random.Random(seed)
+    closes, highs, lows = [], [], []
+    price = 100.0
+    for _ in range(length):
+        price *= 1 + rng.uniform(-0.03, 0.03)
+        closes.append(Decimal(str(round(price, 4))))
+        highs.append(Decimal(str(round(price * (1 + rng.uniform(0, 0.02)), 4))))
+        lows.append(Decimal(str(round(price * (1 - rng.uniform(0, 0.02)), 4))))
+    return highs, lows, closes
+
+
+def assert_parity(expected, actual, rel=1e-9, abs_tol=1e-9):
+    """Decimal output (None for undefined) matches float output (NaN for undefined)."""
+    assert len(expected) == len(actual)
+    for i, (e, a) in enumerate(zip(expected, actual)):
+        if e is None:
+            assert math.isnan(a), f"index {i}: expected undefined, got {a}"
+        else:
+            assert a == pytest.approx(float(e), rel=rel, abs=abs_tol), f"index {i}"
+
+
+class TestVectorIndicatorParity:
+    """Test that VectorIndicators match TechnicalIndicators."""
+
+    def setup_method(self):
+        self.highs, self.lows, self.closes = random_walk()
+
+    @pytest.mark.parametrize('period', [1, 5, 20, 50])
+    def test_sma(self, period):
+        """Test SMA parity."""
+        assert_parity(TechnicalIndicators.sma(self.closes, period), VectorIndicators.sma(self.closes, period))
+
+    @pytest.mark.parametrize('period', [2, 12, 26])
+    def test_ema(self, period):
+        """Test EMA parity, including past the first recursion chunk."""
+        assert_parity(TechnicalIndicators.ema(self.closes, period), VectorIndicators.ema(self.closes, period))
+
+    @pytest.mark.parametrize('period', [2, 14])
+    def test_rsi(self, period):
+        """Test RSI parity."""
+        assert_parity(TechnicalIndicators.rsi(self.closes, period), VectorIndicators.rsi(self.closes, period))
+
+    def test_rsi_no_losses(self):
+        """Test that a monotonically rising series gives RSI 100."""
+        rising = [Decimal(i) for i in range(1, 40)]
+        assert_parity(TechnicalIndicators.rsi(rising), VectorIndicators.rsi(rising))
+
+    def test_macd(self):
+        """Test MACD line, signal and histogram parity."""
+        for expected, actual in zip(TechnicalIndicators.macd(self.closes), VectorIndicators.macd(self.closes)):
+            assert_parity(expected, actual, abs_tol=1e-8)
+
+    def test_bollinger_bands(self):
+        """Test Bollinger Bands parity."""
+        for expected, actual in zip(TechnicalIndicators.bollinger_bands(self.closes),
+                                    VectorIndicators.bollinger_bands(self.closes)):
+            assert_parity(expected, actual, rel=1e-7)
+
+    def test_stochastic(self):
+        """Test stochastic %K and %D parity."""
+        for expected, actual in zip(
+            TechnicalIndicators.stochastic_oscillator(self.highs, self.lows, self.closes),
+            VectorIndicators.stochastic_oscillator(self.highs, self.lows, self.closes)
+        ):
+            assert_parity(expected, actual)
+
+    def test_atr(self):
+        """Test ATR parity."""
+        assert_parity(
+            TechnicalIndicators.atr(self.highs, self.lows, self.closes),
+            VectorIndicators.atr(self.highs, self.lows, self.closes)
+        )
+
+    def test_short_series(self):
+        """Test that series shorter than the period are entirely undefined."""
+        short = self.closes[:5]
+        assert_parity(TechnicalIndicators.sma(short, 10), VectorIndicators.sma(short, 10))
+        assert_parity(TechnicalIndicators.ema(short, 10), VectorIndicators.ema(short, 10))
+        assert_parity(TechnicalIndicators.rsi(short, 10), VectorIndicators.rsi(short, 10))
+
+
+class TestTechnicalAnalysisBackends:
+    """Test that both engine backends produce the same analysis."""
+
+    def _price_data(self):
+        highs, lows, closes = random_walk(100)
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return [
+            PriceData(start + timedelta(days=i), c, h, l, c, Decimal('1000'))
+            for i, (h, l, c) in enumerate(zip(highs, lows, closes))
+        ]
+
+    def test_backends_agree(self):
+        """Test that numpy and decimal backends give the same indicator values and signals."""
+        price_data = self._price_data()
+        indicators = ['sma', 'ema', 'rsi', 'macd', 'bollinger', 'stochastic', 'atr', 'momentum']
+        results = {}
+
+        for backend in ('decimal', 'numpy'):
+            engine = TechnicalAnalysisEngine(backend=backend)
+            series = PriceSeries('TEST', '1d', 1, price_data, engine._series)
+            with patch.object(engine, '_get_series', return_value=series):
+                results[backend] = engine.get_technical_analysis('TEST', indicators)
+
+        decimal_values, numpy_values = results['decimal']['indicators'], results['numpy']['indicators']
+        for name, value in decimal_values.items():
+            if isinstance(value, dict):
+                for key, inner in value.items():
+                    assert numpy_values[name][key] == pytest.approx(float(inner), rel=1e-7)
+            else:
+                assert numpy_values[name] == pytest.approx(float(value), rel=1e-7)
+
+        assert [s['indicator'] for s in results['numpy']['signals']] == \
+            [s['indicator'] for s in results['decimal']['signals']]
+
+    def test_unknown_backend_rejected(self):
+        """Test that an unknown backend name raises."""
+        with pytest.raises(ValueError):
+            TechnicalAnalysisEngine(backend='gpu')
+
+
+class TestIndicatorCache:
+    """Test the shared indicator memoization layer."""
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = IndicatorCache(max_entries=2)
+        cache.get_or_compute('a', lambda: 1)
+        cache.get_or_compute('b', lambda: 2)
+        cache.get_or_compute('a', lambda: 0)  # touch a
+        cache.get_or_compute('c', lambda: 3)
+
+        assert cache.get_or_compute('a', lambda: 'recomputed') == 1
+        assert cache.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+        assert cache.stats()['evictions'] >= 1
+
+    def test_eviction_by_size(self):
+        """Test that large results are evicted to stay under the byte limit."""
+        cache = IndicatorCache(max_entries=100, max_bytes=10_000)
+        for i in range(5):
+            cache.get_or_compute(i, lambda: np.zeros(500))  # ~4KB each
+
+        stats = cache.stats()
+        assert stats['bytes'] <= 10_000
+        assert stats['entries'] == 2
+
+    def test_dashboard_computes_each_indicator_once(self):
+        """Test that analysis, chart, support/resistance and fibonacci share cached results."""
+        highs, lows, closes = random_walk(150)
+        times = np.arange(150, dtype=np.int64) * 86400
+        bars = HistoryBars(times, np.array(closes, dtype=float), np.array(highs, dtype=float),
+                           np.array(lows, dtype=float), np.array(closes, dtype=float), np.ones(150))
+        engine = TechnicalAnalysisEngine(backend='numpy', cache=IndicatorCache())
+
+        with patch('app.technical_analysis.market_data') as mock_market_data, \
+                patch.object(VectorIndicators, 'rsi', wraps=VectorIndicators.rsi) as rsi, \
+                patch.object(PriceData, 'from_bars', wraps=PriceData.from_bars) as from_bars:
+            mock_market_data.get_bars.return_value = bars
+            engine.get_technical_analysis('TEST')
+            engine.get_chart_data('TEST')
+            engine.get_support_resistance('TEST')
+            engine.get_fibonacci_levels('TEST')
+            engine.get_technical_analysis('TEST')
+
+        assert rsi.call_count == 1
+        assert from_bars.call_count == 1
+
+    def test_new_bar_invalidates(self):
+        """Test that a new last bar timestamp produces a fresh result."""
+        engine = TechnicalAnalysisEngine(backend='numpy', cache=IndicatorCache())
+        highs, lows, closes = random_walk(101)
+        times = np.arange(101, dtype=np.int64) * 86400
+
+        def bars(count):
+            return HistoryBars(times[:count], np.array(closes[:count], dtype=float),
+                               np.array(highs[:count], dtype=float), np.array(lows[:count], dtype=float),
+                               np.array(closes[:count], dtype=float), np.ones(count))
+
+        with patch('app.technical_analysis.market_data') as mock_market_data:
+            mock_market_data.get_bars.return_value = bars(100)
+            first = engine.get_technical_analysis('TEST', ['rsi'])
+            mock_market_data.get_bars.return_value = bars(101)
+            second = engine.get_technical_analysis('TEST', ['rsi'])
+
+        assert first['current_price'] == pytest.approx(float(closes[99]))
+        assert second['current_price'] == pytest.approx(float(closes[100]))
+
+    def test_streaming_analysis_falls_back_without_history(self):
+        """Test that a symbol with too few streamed bars gets the batch analysis instead of an error."""
+        engine = TechnicalAnalysisEngine(backend='numpy', cache=IndicatorCache())
+        highs, lows, closes = random_walk(150)
+        times = np.arange(150, dtype=np.int64) * 86400
+        bars = HistoryBars(times, np.array(closes, dtype=float), np.array(highs, dtype=float),
+                           np.array(lows, dtype=float), np.array(closes, dtype=float), np.ones(150))
+
+        with patch('app.technical_analysis.indicator_registry') as registry, \
+                patch('app.technical_analysis.market_data') as mock_market_data:
+            registry.snapshot.return_value = {'bars': 3}
+            mock_market_data.get_bars.return_value = bars
+            analysis = engine.get_streaming_analysis('TEST', '1d', ['rsi'])
+
+        assert 'error' not in analysis
+        assert analysis['timeframe'] == '1d'
+        assert analysis['current_price'] == pytest.approx(float(closes[-1]))
+        assert 'rsi_14' in analysis['indicators'] and 'signals' in analysis
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
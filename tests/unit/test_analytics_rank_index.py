@@ -0,0 +1,53 @@
+"""
+Unit Tests for the Analytics Rank Index
+
+Tests the sorted-set rank and percentile reads on AnalyticsCacheService.
+"""
+
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from src.domains.analytics.infrastructure.cache_service import AnalyticsCacheService
+
+
+def _cache():
+    redis_client = AsyncMock()
+    return AnalyticsCacheService(redis_client), redis_client
+
+
+class TestRankIndexReads:
+    """Test cases for rank index reads."""
+
+    def test_rank_is_one_based_from_the_top(self):
+        """Test that ZREVRANK positions become 1-based ranks and absent traders have none."""
+        cache, redis_client = _cache()
+        redis_client.zrevrank.side_effect = [0, 4, None]
+
+        ranks = [
+            asyncio.run(cache.get_trader_rank("net_pnl", "all_time", trader_id))
+            for trader_id in ("t1", "t2", "missing")
+        ]
+
+        assert ranks == [1, 5, None]
+        redis_client.zrevrank.assert_any_await("leaderboard_rank:net_pnl:all_time", "t1")
+
+    def test_percentile_counts_strictly_lower_scores(self):
+        """Test that the percentile is the share of the board scoring strictly below."""
+        cache, redis_client = _cache()
+        redis_client.zscore.return_value = 12.5
+        redis_client.zcount.return_value = 3
+        redis_client.zcard.return_value = 4
+
+        percentile = asyncio.run(cache.get_trader_percentile("win_rate", "all_time", "t1", challenge_type="pro"))
+
+        assert percentile == Decimal("75")
+        redis_client.zcount.assert_awaited_once_with("leaderboard_rank:win_rate:all_time:pro", "-inf", "(12.5")
+
+    def test_percentile_of_unranked_trader_is_none(self):
+        """Test that a trader missing from the board has no percentile."""
+        cache, redis_client = _cache()
+        redis_client.zscore.return_value = None
+
+        assert asyncio.run(cache.get_trader_percentile("net_pnl", "all_time", "t9")) is None
+        redis_client.zcard.assert_not_awaited()
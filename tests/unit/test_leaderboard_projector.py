@@ -0,0 +1,125 @@
+"""
+Unit Tests for LeaderboardProjector
+
+Tests incremental re-ranking, batched rank writes and event debouncing.
+"""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from src.domains.analytics.domain.event_projections import LeaderboardProjector, OrderedMetricIndex
+from src.domains.analytics.domain.read_models import TraderPerformance
+
+
+def _performance(trader_id, net_pnl):
+    return TraderPerformance(
+        trader_id=trader_id,
+        username=trader_id,
+        registration_date=datetime(2024, 1, 1),
+        last_active=datetime(2024, 1, 1),
+        net_pnl=Decimal(str(net_pnl)),
+    )
+
+
+def _projector(performances, debounce_seconds=0.0):
+    repository = AsyncMock()
+    repository.get_all_trader_performances.return_value = list(performances.values())
+    repository.get_trader_performance.side_effect = lambda trader_id: performances.get(trader_id)
+    cache = AsyncMock()
+    cache.has_leaderboard.return_value = True
+    return LeaderboardProjector(repository, cache, debounce_seconds=debounce_seconds), repository, cache
+
+
+class TestOrderedMetricIndex:
+    """Test cases for OrderedMetricIndex."""
+
+    def test_move_reports_old_and_new_rank(self):
+        """Test that moving a trader returns its old and new positions."""
+        index = OrderedMetricIndex()
+        for i in range(5):
+            index.move(f"t{i}", Decimal(i))
+
+        assert index.move("t0", Decimal("10")) == (5, 1)
+        assert index.ranked(1, 2) == [(1, "t0"), (2, "t4")]
+        assert index.move("t0", None) == (1, None)
+        assert len(index) == 4
+
+
+class TestLeaderboardProjector:
+    """Test cases for LeaderboardProjector."""
+
+    def test_update_writes_only_shifted_ranks(self):
+        """Test that one trader's update writes ranks only for traders it passed."""
+        performances = {f"t{i}": _performance(f"t{i}", i) for i in range(10)}
+        projector, repository, cache = _projector(performances)
+
+        async def scenario():
+            await projector.rebuild()
+            repository.save_trader_ranks.reset_mock()
+
+            performances["t2"] = _performance("t2", "5.5")
+            await projector.project_performance_updated("t2")
+
+        asyncio.run(scenario())
+
+        repository.save_trader_ranks.assert_awaited_once()
+        updates = repository.save_trader_ranks.await_args.args[0]
+        assert updates == {
+            "t2": {"net_pnl_all_time": 5},
+            "t5": {"net_pnl_all_time": 6},
+            "t4": {"net_pnl_all_time": 7},
+            "t3": {"net_pnl_all_time": 8},
+        }
+        repository.get_trader_performance.assert_awaited_once_with("t2")
+
+    def test_burst_is_debounced(self):
+        """Test that a burst of events for one trader is applied once."""
+        performances = {f"t{i}": _performance(f"t{i}", i) for i in range(3)}
+        projector, repository, cache = _projector(performances, debounce_seconds=0.01)
+
+        async def scenario():
+            await projector.rebuild()
+            for _ in range(5):
+                await projector.project_performance_updated("t1")
+            await asyncio.sleep(0.05)
+
+        asyncio.run(scenario())
+
+        repository.get_trader_performance.assert_awaited_once_with("t1")
+
+    def test_removed_trader_drops_trailing_rank(self):
+        """Test that removing a trader clears the now-empty last cached rank."""
+        performances = {f"t{i}": _performance(f"t{i}", i) for i in range(3)}
+        projector, repository, cache = _projector(performances)
+
+        async def scenario():
+            await projector.rebuild()
+            del performances["t2"]
+            await projector.project_performance_updated("t2")
+
+        asyncio.run(scenario())
+
+        cache.remove_leaderboard_ranks.assert_any_await("net_pnl", "all_time", [3])
+        assert projector.indexes["net_pnl"].rank("t1") == 1
+
+    def test_store_follows_flushes(self):
+        """Test that the columnar store is refilled in place, updated and trimmed with the indexes."""
+        performances = {f"t{i}": _performance(f"t{i}", i) for i in range(3)}
+        projector, repository, cache = _projector(performances)
+        held = projector.store
+
+        async def scenario():
+            await projector.rebuild()
+            performances["t0"] = _performance("t0", 10)
+            del performances["t2"]
+            await projector.project_performance_updated("t0")
+            await projector.project_performance_updated("t2")
+
+        asyncio.run(scenario())
+
+        store = projector.store
+        assert store is held
+        assert sorted(store.trader_ids) == ["t0", "t1"]
+        assert store.column("net_pnl")[store.index["t0"]] == 10.0
@@ -0,0 +1,40 @@
+"""
+Unit Tests for LeaderboardRecomputeWorker
+
+Tests the scheduled batch leaderboard recompute.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from src.workers.leaderboard_recompute import LeaderboardRecomputeWorker
+
+
+class TestLeaderboardRecomputeWorker:
+    """Test cases for LeaderboardRecomputeWorker."""
+
+    def test_scheduled_runs_until_stopped(self):
+        """Test that the scheduled worker recomputes repeatedly and stops cleanly."""
+        handler = AsyncMock()
+        handler.handle.return_value = 20
+        worker = LeaderboardRecomputeWorker(handler, interval_seconds=0.01, page_size=50)
+
+        async def scenario():
+            task = worker.schedule()
+            while handler.handle.await_count < 2:
+                await asyncio.sleep(0.005)
+            await worker.stop()
+            return task
+
+        task = asyncio.run(scenario())
+
+        assert task.done()
+        handler.handle.assert_awaited_with(page_size=50, challenge_types=(None,))
+
+    def test_failed_run_is_logged_not_raised(self):
+        """Test that a failing recompute does not stop the worker loop."""
+        handler = AsyncMock()
+        handler.handle.side_effect = RuntimeError("redis down")
+        worker = LeaderboardRecomputeWorker(handler)
+
+        assert asyncio.run(worker.run_once()) == 0
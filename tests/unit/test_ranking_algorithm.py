@@ -0,0 +1,123 @@
+"""
+Unit Tests for RankingAlgorithm
+
+Tests columnar ranking over TraderPerformanceStore: metric columns,
+eligibility and period masks, weighted scores and one-pass ranking.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.domains.analytics.domain.performance_store import TraderPerformanceStore
+from src.domains.analytics.domain.ranking_algorithm import RankingAlgorithm, RankingMetric, RankingPeriod
+from src.domains.analytics.domain.read_models import TraderPerformance
+
+
+def _performance(trader_id, net_pnl, **overrides):
+    fields = dict(
+        trader_id=trader_id,
+        username=trader_id,
+        registration_date=datetime(2024, 1, 1),
+        last_active=datetime.utcnow(),
+        total_challenges=2,
+        passed_challenges=1,
+        total_trades=20,
+        winning_trades=12,
+        losing_trades=8,
+        total_profit=Decimal('1200'),
+        total_loss=Decimal('-400'),
+        win_rate=Decimal('0.6'),
+        trading_days=40,
+        average_daily_pnl=Decimal('20'),
+        net_pnl=Decimal(str(net_pnl)),
+    )
+    fields.update(overrides)
+    return TraderPerformance(**fields)
+
+
+class TestTraderPerformanceStore:
+    """Test cases for TraderPerformanceStore."""
+
+    def test_upsert_overwrites_and_grows(self):
+        """Test that upsert replaces an existing row and appends past capacity."""
+        store = TraderPerformanceStore(capacity=1)
+        store.upsert(_performance("a", 1))
+        store.upsert(_performance("b", 2))
+        store.upsert(_performance("a", 5))
+
+        assert len(store) == 2
+        assert store.index == {"a": 0, "b": 1}
+        assert store.column("net_pnl").tolist() == [5.0, 2.0]
+
+    def test_remove_keeps_rows_dense(self):
+        """Test that removing a trader moves the last row into its slot."""
+        store = TraderPerformanceStore.from_performances([_performance(t, i) for i, t in enumerate("abc")])
+
+        assert store.remove("a") is True
+        assert store.remove("a") is False
+        assert store.trader_ids == ["c", "b"]
+        assert store.index == {"c": 0, "b": 1}
+        assert store.column("net_pnl").tolist() == [2.0, 1.0]
+
+
+class TestRankingAlgorithm:
+    """Test cases for RankingAlgorithm."""
+
+    def test_metric_columns_match_performance_properties(self):
+        """Test that vectorized metrics agree with the TraderPerformance properties."""
+        traders = [
+            _performance("a", 100),
+            _performance("b", 50, total_loss=Decimal('0')),
+            _performance("c", 10, total_profit=Decimal('0'), total_loss=Decimal('0'), winning_trades=0),
+        ]
+        store = TraderPerformanceStore.from_performances(traders)
+        algorithm = RankingAlgorithm()
+
+        for metric in (RankingMetric.PASS_RATE, RankingMetric.PROFIT_FACTOR, RankingMetric.EXPECTANCY):
+            column = algorithm._metric_column(store, metric, {})
+            expected = [float(getattr(trader, metric.value)) for trader in traders]
+            assert column.tolist() == expected
+
+    def test_ineligible_and_inactive_traders_are_masked(self):
+        """Test that minimum activity and the period window filter traders out."""
+        traders = [
+            _performance("active", 100),
+            _performance("few_trades", 300, total_trades=3),
+            _performance("stale", 200, last_active=datetime.utcnow() - timedelta(days=10)),
+        ]
+        algorithm = RankingAlgorithm()
+
+        weekly = algorithm.calculate_rankings(traders, RankingMetric.NET_PNL, RankingPeriod.WEEKLY)
+        all_time = algorithm.calculate_rankings(traders, RankingMetric.NET_PNL, RankingPeriod.ALL_TIME)
+
+        assert [entry["trader_id"] for entry in weekly] == ["active"]
+        assert [entry["trader_id"] for entry in all_time] == ["stale", "active"]
+        assert all_time[0]["rank"] == 1 and all_time[0]["raw_value"] == 200.0
+
+    def test_rank_all_covers_every_combination(self):
+        """Test that one pass ranks each metric and period, with ties kept in input order."""
+        store = TraderPerformanceStore.from_performances(
+            [_performance(f"t{i}", i % 3) for i in range(6)]
+        )
+
+        rankings = RankingAlgorithm().rank_all(store)
+
+        assert len(rankings) == len(RankingMetric) * len(RankingPeriod)
+        board = rankings[(RankingMetric.NET_PNL, RankingPeriod.ALL_TIME, None)]
+        assert [entry["trader_id"] for entry in board.entries()] == ["t2", "t5", "t1", "t4", "t0", "t3"]
+        assert [entry["rank"] for entry in board.entries(offset=2, limit=2)] == [3, 4]
+
+    def test_weighted_score_normalizes_metrics(self):
+        """Test that weights combine normalized metrics into a 0-1 score."""
+        traders = [_performance("a", 0, passed_challenges=2), _performance("b", 0, passed_challenges=0)]
+
+        rankings = RankingAlgorithm().calculate_rankings(
+            traders,
+            RankingMetric.NET_PNL,
+            RankingPeriod.ALL_TIME,
+            weights={"net_pnl": 0.5, "pass_rate": 0.5},
+        )
+
+        assert [entry["trader_id"] for entry in rankings] == ["a", "b"]
+        assert rankings[0]["score"] == 0.75
+        assert rankings[1]["score"] == 0.25